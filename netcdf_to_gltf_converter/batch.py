@@ -0,0 +1,295 @@
+import csv
+import json
+import logging
+import os
+import time
+import traceback
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+from netcdf_to_gltf_converter.config import Config
+from netcdf_to_gltf_converter.converter import Converter
+from netcdf_to_gltf_converter.netcdf.importer import Importer
+
+
+@dataclass
+class BatchJob:
+    """Data class representing one conversion of a batch."""
+
+    netcdf: Path
+    """Path: Path to the source NetCDF file."""
+
+    gltf: Path
+    """Path: Path to the destination glTF file."""
+
+    config: Path
+    """Path: Path to the converter configuration file."""
+
+
+@dataclass
+class BatchJobResult:
+    """Data class containing the outcome of one conversion of a batch."""
+
+    job: BatchJob
+    """BatchJob: The conversion."""
+
+    succeeded: bool
+    """bool: Whether the conversion succeeded."""
+
+    attempts: int
+    """int: The number of times the conversion was started."""
+
+    duration: float
+    """float: The duration of the last attempt in seconds."""
+
+    estimated_memory: int
+    """int: The estimated peak memory of the conversion in bytes."""
+
+    error: Optional[str] = None
+    """Optional[str]: The error of the last failed attempt. None when the conversion succeeded."""
+
+
+def read_manifest(manifest: Path, default_config: Optional[Path] = None) -> List[BatchJob]:
+    """Read the conversions of a batch from a manifest file.
+
+    A JSON manifest contains a list of jobs, or an object with a list of `jobs` and an optional default `config`.
+    A CSV manifest contains a header and one job per row. A job consists of the paths `netcdf`, `gltf` and optionally `config`.
+    Relative paths are relative to the folder of the manifest.
+
+    Args:
+        manifest (Path): Path to the manifest, a .json or .csv file.
+        default_config (Optional[Path], optional): Path to the configuration file of the jobs without configuration file. Defaults to None.
+
+    Returns:
+        List[BatchJob]: The conversions.
+
+    Raises:
+        ValueError: When the manifest file type is not supported or a job does not have a configuration file.
+    """
+    file_extension = manifest.suffix.lower()
+    if file_extension == ".json":
+        with open(manifest) as manifest_file:
+            content = json.load(manifest_file)
+        if isinstance(content, dict):
+            if "config" in content:
+                default_config = manifest.parent / content["config"]
+            content = content["jobs"]
+        rows = content
+    elif file_extension == ".csv":
+        with open(manifest, newline="") as manifest_file:
+            rows = list(csv.DictReader(manifest_file))
+    else:
+        raise ValueError(
+            f"Manifest cannot be read: unsupported file type '{manifest.suffix}'. Supported: .json, .csv"
+        )
+
+    jobs = []
+    for row in rows:
+        config = manifest.parent / row["config"] if row.get("config") else default_config
+        if config is None:
+            raise ValueError(f"No configuration file for NetCDF file: {row['netcdf']}")
+        jobs.append(
+            BatchJob(manifest.parent / row["netcdf"], manifest.parent / row["gltf"], config)
+        )
+
+    return jobs
+
+
+def find_jobs(pattern: str, config: Path, output_dir: Path, file_extension: str = ".glb") -> List[BatchJob]:
+    """Create a conversion for each NetCDF file that matches a glob pattern.
+
+    Args:
+        pattern (str): The glob pattern of the NetCDF files, relative to the current working directory.
+        config (Path): Path to the configuration file of the conversions.
+        output_dir (Path): The folder of the glTF files. Each glTF file is named after its NetCDF file.
+        file_extension (str, optional): The file extension of the glTF files, .gltf or .glb. Defaults to ".glb".
+
+    Returns:
+        List[BatchJob]: The conversions, sorted by the path of the NetCDF file.
+    """
+    netcdf_files = sorted(Path().glob(pattern))
+    return [
+        BatchJob(netcdf, output_dir / f"{netcdf.stem}{file_extension}", config)
+        for netcdf in netcdf_files
+    ]
+
+
+def estimate_memory(job: BatchJob) -> int:
+    """Estimate the peak memory of a conversion from the dimensions in the NetCDF file, without reading any data values.
+
+    This is the same estimate as that of a dry run of the converter.
+
+    Args:
+        job (BatchJob): The conversion.
+
+    Returns:
+        int: The estimated peak memory in bytes.
+    """
+    config = Config.from_file(job.config)
+    return Importer().estimate(job.netcdf, config).peak_memory
+
+
+class BatchRunner:
+    """Class to run the conversions of a batch in parallel processes.
+
+    Conversions are only started when their estimated peak memory fits in the memory that is not claimed by
+    the running conversions. A conversion that does not fit in the memory limit at all is run on its own.
+    Failed conversions are retried. When a conversion process terminates abruptly, all running conversions fail,
+    so these are restarted on their own without counting the attempt, until the conversion that terminated is found.
+    Each conversion writes its own log file next to its glTF file.
+    """
+
+    def __init__(
+        self,
+        n_workers: Optional[int] = None,
+        memory_limit: Optional[int] = None,
+        retries: int = 0,
+        grid_cache_dir: Optional[Path] = None,
+    ) -> None:
+        """Initialize a BatchRunner with the specified arguments.
+
+        Args:
+            n_workers (Optional[int], optional): The maximum number of conversions that run at the same time. Defaults to the number of processors on the machine.
+            memory_limit (Optional[int], optional): The memory in bytes that the running conversions may claim together. Defaults to no limit.
+            retries (int, optional): The number of times a failed conversion is retried. Defaults to 0.
+            grid_cache_dir (Optional[Path], optional): The directory in which grid data is cached, such that conversions of models with the same grid share it. Defaults to None.
+        """
+        self._n_workers = n_workers or os.cpu_count() or 1
+        self._memory_limit = memory_limit
+        self._retries = retries
+        self._grid_cache_dir = grid_cache_dir
+
+    def run(self, jobs: List[BatchJob]) -> List[BatchJobResult]:
+        """Run the conversions.
+
+        Args:
+            jobs (List[BatchJob]): The conversions.
+
+        Returns:
+            List[BatchJobResult]: The outcome per conversion, in the order of the conversions.
+        """
+        results: Dict[int, BatchJobResult] = {}
+        pending: Deque[Tuple[int, int]] = deque()
+        estimates: Dict[int, int] = {}
+        for job_index, job in enumerate(jobs):
+            try:
+                estimates[job_index] = estimate_memory(job)
+            except Exception:
+                results[job_index] = BatchJobResult(job, False, 0, 0.0, 0, traceback.format_exc())
+                continue
+            pending.append((job_index, 1))
+
+        running: Dict[Future, Tuple[int, int]] = {}
+        isolated: Set[int] = set()
+        executor = ProcessPoolExecutor(max_workers=self._n_workers)
+        try:
+            while pending or running:
+                self._submit_admitted(executor, jobs, pending, running, estimates, isolated)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                if any(_is_broken(future) for future in done):
+                    # All running conversions of a broken pool fail, so they are handled at once
+                    done, _ = wait(running)
+                broken = [future for future in done if _is_broken(future)]
+
+                for future in done:
+                    job_index, attempt = running.pop(future)
+                    job = jobs[job_index]
+                    if future in broken:
+                        # It is unknown which conversion broke the pool, unless it ran on its own
+                        isolated.add(job_index)
+                        if len(broken) > 1:
+                            logging.warning(f"RESTART conversion of {job.netcdf} on its own after its process pool broke")
+                            pending.append((job_index, attempt))
+                            continue
+                        duration, error = 0.0, "The conversion process terminated abruptly, e.g. because it ran out of memory."
+                    else:
+                        duration, error = future.result()
+
+                    if error is not None and attempt <= self._retries:
+                        logging.warning(f"RETRY conversion of {job.netcdf} after attempt {attempt}")
+                        pending.append((job_index, attempt + 1))
+                        continue
+
+                    results[job_index] = BatchJobResult(
+                        job, error is None, attempt, duration, estimates[job_index], error
+                    )
+
+                if broken:
+                    executor.shutdown(wait=False)
+                    executor = ProcessPoolExecutor(max_workers=self._n_workers)
+        finally:
+            executor.shutdown()
+
+        return [results[job_index] for job_index in range(len(jobs))]
+
+    def _submit_admitted(
+        self,
+        executor: ProcessPoolExecutor,
+        jobs: List[BatchJob],
+        pending: Deque[Tuple[int, int]],
+        running: Dict[Future, Tuple[int, int]],
+        estimates: Dict[int, int],
+        isolated: Set[int],
+    ):
+        claimed_memory = sum(estimates[job_index] for job_index, _ in running.values())
+        while pending and len(running) < self._n_workers:
+            job_index, attempt = pending[0]
+            if any(running_index in isolated for running_index, _ in running.values()):
+                break
+            if job_index in isolated and running:
+                break
+
+            fits = (
+                self._memory_limit is None
+                or claimed_memory + estimates[job_index] <= self._memory_limit
+            )
+            if not fits and running:
+                break
+
+            pending.popleft()
+            claimed_memory += estimates[job_index]
+            logging.info(
+                f"START conversion of {jobs[job_index].netcdf} (attempt {attempt}, estimated memory {estimates[job_index]} bytes)"
+            )
+            future = executor.submit(_run_job, jobs[job_index], self._grid_cache_dir)
+            running[future] = (job_index, attempt)
+
+
+def write_summary(results: List[BatchJobResult], file_path: Path):
+    """Write a summary report of the conversions of a batch as JSON.
+
+    Args:
+        results (List[BatchJobResult]): The outcome per conversion.
+        file_path (Path): The path of the report.
+    """
+    summary = {
+        "n_jobs": len(results),
+        "n_succeeded": sum(result.succeeded for result in results),
+        "n_failed": sum(not result.succeeded for result in results),
+        "jobs": [asdict(result) for result in results],
+    }
+    with open(file_path, "w") as summary_file:
+        json.dump(summary, summary_file, indent=2, default=str)
+
+
+def _is_broken(future: Future) -> bool:
+    return isinstance(future.exception(), BrokenProcessPool)
+
+
+def _run_job(job: BatchJob, grid_cache_dir: Optional[Path]) -> Tuple[float, Optional[str]]:
+    # Errors are returned as text, since not all exceptions can be sent back to the main process
+    start = time.perf_counter()
+    try:
+        job.gltf.parent.mkdir(parents=True, exist_ok=True)
+        converter = Converter(job.netcdf, job.gltf, job.config, grid_cache_dir=grid_cache_dir)
+        converter.run()
+    except Exception:
+        logging.exception(f"Conversion of {job.netcdf} failed")
+        return time.perf_counter() - start, traceback.format_exc()
+
+    return time.perf_counter() - start, None
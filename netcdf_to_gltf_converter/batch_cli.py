@@ -0,0 +1,61 @@
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from netcdf_to_gltf_converter.batch import (BatchRunner, find_jobs,
+                                            read_manifest, write_summary)
+from netcdf_to_gltf_converter.utils.profiling import get_available_memory
+
+BYTES_PER_GIGABYTE = 1024**3
+"""The number of bytes in a gigabyte."""
+
+
+def get_args():
+    """Parses and returns the arguments"""
+    parser = argparse.ArgumentParser(description="Convert many NetCDF files to glTF files in parallel processes.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--manifest", help="Path to a JSON or CSV file with the NetCDF, glTF and configuration file per conversion")
+    source.add_argument("--glob", help="Glob pattern of the NetCDF files to convert, e.g. 'runs/*/output/*_map.nc'")
+    parser.add_argument("--config", help="Path to the converter configuration file of conversions without configuration file")
+    parser.add_argument("--output-dir", default=".", help="Folder of the glTF files when converting the files matching the glob pattern")
+    parser.add_argument("--format", choices=[".glb", ".gltf"], default=".glb", help="File type of the glTF files when converting the files matching the glob pattern")
+    parser.add_argument("--workers", type=int, help="Maximum number of conversions that run at the same time. Defaults to the number of processors")
+    parser.add_argument("--memory-limit", type=float, help="Memory in GB that the running conversions may claim together. Defaults to the available memory")
+    parser.add_argument("--retries", type=int, default=0, help="Number of times a failed conversion is retried")
+    parser.add_argument("--grid-cache-dir", help="Folder in which grid data is cached and shared between conversions")
+    parser.add_argument("--summary", default="batch_summary.json", help="Path to the JSON summary report")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = get_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-8s %(message)s", datefmt="%H:%M:%S")
+
+    config = Path(args.config) if args.config else None
+    if args.manifest:
+        jobs = read_manifest(Path(args.manifest), config)
+    elif config is None:
+        sys.exit("A configuration file is required when converting the files matching a glob pattern.")
+    else:
+        jobs = find_jobs(args.glob, config, Path(args.output_dir), args.format)
+
+    if args.memory_limit is not None:
+        memory_limit = int(args.memory_limit * BYTES_PER_GIGABYTE)
+    else:
+        memory_limit = get_available_memory()
+
+    runner = BatchRunner(
+        n_workers=args.workers,
+        memory_limit=memory_limit,
+        retries=args.retries,
+        grid_cache_dir=Path(args.grid_cache_dir) if args.grid_cache_dir else None,
+    )
+    results = runner.run(jobs)
+    write_summary(results, Path(args.summary))
+
+    n_failed = sum(not result.succeeded for result in results)
+    logging.info(f"FINISHED {len(results) - n_failed} of {len(results)} conversions succeeded, summary: {args.summary}")
+    if n_failed > 0:
+        sys.exit(1)
@@ -0,0 +1,213 @@
+import math
+from pathlib import Path
+from typing import Tuple
+
+import netCDF4
+import numpy as np
+
+FILL_VALUE = -1
+"""The fill value of the face node connectivity of the synthetic UGRID datasets."""
+MAX_FACE_NODES = 6
+"""The maximum number of nodes per face of the synthetic UGRID datasets: the hexagons."""
+CELL_SIZE = 10.0
+"""The distance between the nodes of the synthetic grids."""
+TIME_STEP = 3600.0
+"""The time between the time steps of the synthetic datasets in seconds."""
+VALUES_PER_WRITE = 10_000_000
+"""The number of variable values that are generated and written at once, which limits the memory use of the generators."""
+UGRID_VARIABLE = "mesh2d_waterdepth"
+"""The name of the face variable of the synthetic UGRID datasets."""
+XBEACH_VARIABLE = "zs"
+"""The name of the node variable of the synthetic XBEACH datasets."""
+
+
+def get_lattice_shape(n_nodes: int) -> Tuple[int, int]:
+    """Get the number of node rows and columns of a square lattice with at least the requested number of nodes.
+
+    Args:
+        n_nodes (int): The requested number of nodes.
+
+    Returns:
+        Tuple[int, int]: The number of rows and columns.
+    """
+    n_cols = max(math.ceil(math.sqrt(n_nodes)), 2)
+    n_rows = max(math.ceil(n_nodes / n_cols), 2)
+    return n_rows, n_cols
+
+
+def create_mixed_faces(n_rows: int, n_cols: int) -> np.ndarray:
+    """Create the faces of a lattice of nodes as a mix of triangles, quadrilaterals and hexagons.
+
+    The rows of cells alternate between triangles (each cell split in two), quadrilaterals (the cells themselves)
+    and hexagons (each pair of neighboring cells merged). The nodes of each face are ordered counterclockwise.
+
+    Args:
+        n_rows (int): The number of node rows.
+        n_cols (int): The number of node columns.
+
+    Returns:
+        np.ndarray: The face node connectivity, an ndarray of integers with shape (n, 6) padded with the fill value -1.
+    """
+    cell_rows = np.arange(n_rows - 1)
+    cell_cols = np.arange(n_cols - 1)
+
+    def get_nodes(rows: np.ndarray, cols: np.ndarray) -> Tuple[np.ndarray, ...]:
+        row_grid, col_grid = np.meshgrid(rows, cols, indexing="ij")
+        lower_left = (row_grid * n_cols + col_grid).ravel()
+        return lower_left, lower_left + 1, lower_left + n_cols + 1, lower_left + n_cols
+
+    triangle_rows = cell_rows[cell_rows % 3 == 0]
+    n00, n10, n11, n01 = get_nodes(triangle_rows, cell_cols)
+    triangles = np.concatenate([np.column_stack([n00, n10, n11]), np.column_stack([n00, n11, n01])])
+
+    quad_rows = cell_rows[cell_rows % 3 == 1]
+    # Rows of hexagons end with a quadrilateral when the number of cells is odd
+    hexagon_rows = cell_rows[cell_rows % 3 == 2]
+    if len(cell_cols) % 2 == 1:
+        hexagon_quads = get_nodes(hexagon_rows, cell_cols[-1:])
+    else:
+        hexagon_quads = get_nodes(hexagon_rows, cell_cols[:0])
+    n00, n10, n11, n01 = get_nodes(quad_rows, cell_cols)
+    quads = np.concatenate([np.column_stack([n00, n10, n11, n01]), np.column_stack(hexagon_quads)])
+
+    n00, n10, n11, n01 = get_nodes(hexagon_rows, cell_cols[: len(cell_cols) // 2 * 2 : 2])
+    hexagons = np.column_stack([n00, n10, n10 + 1, n11 + 1, n11, n01])
+
+    faces = np.full((len(triangles) + len(quads) + len(hexagons), MAX_FACE_NODES), FILL_VALUE, dtype=np.int32)
+    faces[: len(triangles), :3] = triangles
+    faces[len(triangles) : len(triangles) + len(quads), :4] = quads
+    faces[len(triangles) + len(quads) :] = hexagons
+    return faces
+
+
+def get_values(x: np.ndarray, y: np.ndarray, time_indices: np.ndarray) -> np.ndarray:
+    """Get the synthetic variable values: a wave that travels through the domain.
+
+    Args:
+        x (np.ndarray): The x-coordinates, an ndarray of floats with shape (n,).
+        y (np.ndarray): The y-coordinates, an ndarray of floats with shape (n,).
+        time_indices (np.ndarray): The time indices, an ndarray of integers with shape (m,).
+
+    Returns:
+        np.ndarray: The values, an ndarray of floats with shape (m, n).
+    """
+    wave_length = 50 * CELL_SIZE
+    phase = (x + 0.5 * y) / wave_length
+    return (2.0 + np.sin(phase[np.newaxis, :] - 0.1 * time_indices[:, np.newaxis])).astype(np.float32)
+
+
+def generate_ugrid_dataset(file_path: Path, n_nodes: int, n_times: int):
+    """Generate a D-HYDRO map file with a synthetic UGRID 2D mesh of mixed triangles, quadrilaterals and hexagons.
+
+    The variable `mesh2d_waterdepth` is defined on the faces. The values are written per block of time steps,
+    such that datasets larger than the memory can be generated.
+
+    Args:
+        file_path (Path): The path of the NetCDF file.
+        n_nodes (int): The minimum number of nodes of the mesh.
+        n_times (int): The number of time steps.
+    """
+    n_rows, n_cols = get_lattice_shape(n_nodes)
+    node_y, node_x = np.divmod(np.arange(n_rows * n_cols), n_cols)
+    node_x = node_x * CELL_SIZE
+    node_y = node_y * CELL_SIZE
+    faces = create_mixed_faces(n_rows, n_cols)
+
+    is_valid = faces != FILL_VALUE
+    n_face_nodes = is_valid.sum(axis=1)
+    face_x = np.where(is_valid, node_x[faces], 0.0).sum(axis=1) / n_face_nodes
+    face_y = np.where(is_valid, node_y[faces], 0.0).sum(axis=1) / n_face_nodes
+
+    with netCDF4.Dataset(file_path, "w") as dataset:
+        dataset.Conventions = "CF-1.8 UGRID-1.0 Deltares-0.10"
+        dataset.createDimension("mesh2d_nNodes", len(node_x))
+        dataset.createDimension("mesh2d_nFaces", len(faces))
+        dataset.createDimension("mesh2d_nMax_face_nodes", MAX_FACE_NODES)
+        dataset.createDimension("time", n_times)
+
+        topology = dataset.createVariable("mesh2d", "i4")
+        topology.setncatts(
+            {
+                "cf_role": "mesh_topology",
+                "topology_dimension": 2,
+                "node_coordinates": "mesh2d_node_x mesh2d_node_y",
+                "face_node_connectivity": "mesh2d_face_nodes",
+                "face_dimension": "mesh2d_nFaces",
+                "max_face_nodes_dimension": "mesh2d_nMax_face_nodes",
+                "face_coordinates": "mesh2d_face_x mesh2d_face_y",
+            }
+        )
+
+        _add_coordinate(dataset, "mesh2d_node_x", ("mesh2d_nNodes",), node_x, "projection_x_coordinate")
+        _add_coordinate(dataset, "mesh2d_node_y", ("mesh2d_nNodes",), node_y, "projection_y_coordinate")
+        _add_coordinate(dataset, "mesh2d_face_x", ("mesh2d_nFaces",), face_x, "projection_x_coordinate")
+        _add_coordinate(dataset, "mesh2d_face_y", ("mesh2d_nFaces",), face_y, "projection_y_coordinate")
+
+        face_nodes = dataset.createVariable(
+            "mesh2d_face_nodes", "i4", ("mesh2d_nFaces", "mesh2d_nMax_face_nodes"), fill_value=FILL_VALUE
+        )
+        face_nodes.setncatts({"cf_role": "face_node_connectivity", "mesh": "mesh2d", "location": "face", "start_index": 0})
+        face_nodes[:] = faces
+
+        _add_time(dataset, "time", n_times)
+
+        variable = dataset.createVariable(UGRID_VARIABLE, "f4", ("time", "mesh2d_nFaces"))
+        variable.setncatts(
+            {
+                "mesh": "mesh2d",
+                "location": "face",
+                "coordinates": "mesh2d_face_x mesh2d_face_y",
+                "standard_name": "sea_floor_depth_below_sea_surface",
+                "units": "m",
+            }
+        )
+        _write_values(variable, face_x, face_y, n_times)
+
+
+def generate_xbeach_dataset(file_path: Path, n_nodes: int, n_times: int):
+    """Generate an XBEACH output file with a synthetic regular grid.
+
+    The variable `zs` is defined on the nodes. The values are written per block of time steps,
+    such that datasets larger than the memory can be generated.
+
+    Args:
+        file_path (Path): The path of the NetCDF file.
+        n_nodes (int): The minimum number of nodes of the grid.
+        n_times (int): The number of time steps.
+    """
+    n_rows, n_cols = get_lattice_shape(n_nodes)
+    node_x, node_y = np.meshgrid(np.arange(n_cols) * CELL_SIZE, np.arange(n_rows) * CELL_SIZE)
+
+    with netCDF4.Dataset(file_path, "w") as dataset:
+        dataset.createDimension("ny", n_rows)
+        dataset.createDimension("nx", n_cols)
+        dataset.createDimension("globaltime", n_times)
+
+        _add_coordinate(dataset, "globalx", ("ny", "nx"), node_x, "projection_x_coordinate")
+        _add_coordinate(dataset, "globaly", ("ny", "nx"), node_y, "projection_y_coordinate")
+        _add_time(dataset, "globaltime", n_times)
+
+        variable = dataset.createVariable(XBEACH_VARIABLE, "f4", ("globaltime", "ny", "nx"))
+        variable.setncatts({"coordinates": "globalx globaly", "long_name": "water level", "units": "m"})
+        _write_values(variable, node_x.ravel(), node_y.ravel(), n_times)
+
+
+def _add_coordinate(dataset: netCDF4.Dataset, name: str, dimensions: Tuple[str, ...], values: np.ndarray, standard_name: str):
+    variable = dataset.createVariable(name, "f8", dimensions)
+    variable.setncatts({"standard_name": standard_name, "units": "m"})
+    variable[:] = values
+
+
+def _add_time(dataset: netCDF4.Dataset, name: str, n_times: int):
+    variable = dataset.createVariable(name, "f8", (name,))
+    variable.setncatts({"standard_name": "time", "units": "seconds since 2000-01-01 00:00:00"})
+    variable[:] = np.arange(n_times) * TIME_STEP
+
+
+def _write_values(variable: netCDF4.Variable, x: np.ndarray, y: np.ndarray, n_times: int):
+    shape = variable.shape[1:]
+    times_per_write = max(VALUES_PER_WRITE // len(x), 1)
+    for time_index_start in range(0, n_times, times_per_write):
+        time_indices = np.arange(time_index_start, min(time_index_start + times_per_write, n_times))
+        values = get_values(x, y, time_indices)
+        variable[time_indices[0] : time_indices[-1] + 1] = values.reshape(len(time_indices), *shape)
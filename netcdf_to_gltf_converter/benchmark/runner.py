@@ -0,0 +1,305 @@
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from netcdf_to_gltf_converter.benchmark.datasets import (
+    UGRID_VARIABLE, XBEACH_VARIABLE, generate_ugrid_dataset,
+    generate_xbeach_dataset)
+from netcdf_to_gltf_converter.config import Config, ModelType, Variable
+from netcdf_to_gltf_converter.gltf.builder import GLTFBuilder
+from netcdf_to_gltf_converter.gltf.exporter import Exporter
+from netcdf_to_gltf_converter.netcdf.importer import Importer
+from netcdf_to_gltf_converter.utils.events import Event, EventEmitter, EventType
+from netcdf_to_gltf_converter.utils.profiling import get_peak_rss
+
+STAGES = ("open", "read_grid", "transform", "triangulate", "interpolate", "build", "export")
+"""The stages of the conversion pipeline that are timed separately."""
+
+
+@dataclass
+class BenchmarkCase:
+    """Data class representing one benchmark: the conversion of one synthetic dataset."""
+
+    model_type: ModelType
+    """ModelType: The model type of the synthetic dataset."""
+
+    n_nodes: int
+    """int: The minimum number of nodes of the grid."""
+
+    n_times: int
+    """int: The number of time steps."""
+
+    @property
+    def name(self) -> str:
+        """str: The name that identifies the benchmark in the results."""
+        return f"{self.model_type}_{self.n_nodes}nodes_{self.n_times}times"
+
+
+@dataclass
+class BenchmarkResult:
+    """Data class containing the measurements of one benchmark."""
+
+    case: BenchmarkCase
+    """BenchmarkCase: The benchmark."""
+
+    stages: Dict[str, float]
+    """Dict[str, float]: The duration of each stage in seconds."""
+
+    n_vertices: int
+    """int: The number of vertices of the converted mesh."""
+
+    n_frames: int
+    """int: The number of frames of the animation, including the base geometry."""
+
+    peak_rss: Optional[int] = None
+    """Optional[int]: The peak resident set size of the process that ran the conversion in bytes. None when it cannot be determined on this platform."""
+
+    total: float = field(init=False)
+    """float: The total duration of all stages in seconds."""
+
+    throughput: float = field(init=False)
+    """float: The number of converted vertices times frames per second."""
+
+    def __post_init__(self):
+        self.total = sum(self.stages.values())
+        self.throughput = self.n_vertices * self.n_frames / self.total if self.total > 0 else 0.0
+
+
+@dataclass
+class Regression:
+    """Data class representing a measurement of a benchmark that is worse than the baseline."""
+
+    case: str
+    """str: The name of the benchmark."""
+
+    metric: str
+    """str: The name of the measurement, e.g. a stage, `throughput` or `peak_rss`."""
+
+    baseline: float
+    """float: The value of the baseline."""
+
+    value: float
+    """float: The measured value."""
+
+    def __str__(self) -> str:
+        change = (self.value - self.baseline) / self.baseline * 100 if self.baseline else float("inf")
+        return f"{self.case} {self.metric}: {self.value:.6g} (baseline {self.baseline:.6g}, {change:+.1f}%)"
+
+
+def create_config(case: BenchmarkCase) -> Config:
+    """Create the converter configuration of a benchmark, which converts all time steps of the synthetic variable.
+
+    Args:
+        case (BenchmarkCase): The benchmark.
+
+    Returns:
+        Config: The converter configuration.
+    """
+    variable_name = UGRID_VARIABLE if case.model_type == ModelType.DHYDRO else XBEACH_VARIABLE
+    variable = Variable(
+        name=variable_name,
+        color=[0.38, 0.73, 0.78, 1.0],
+        metallic_factor=0.0,
+        roughness_factor=0.11,
+        use_threshold=False,
+    )
+    return Config(
+        model_type=case.model_type,
+        time_index_start=0,
+        times_per_frame=1,
+        shift_coordinates="min",
+        scale_horizontal=1.0,
+        scale_vertical=1.0,
+        variables=[variable],
+    )
+
+
+def generate_dataset(case: BenchmarkCase, file_path: Path):
+    """Generate the synthetic dataset of a benchmark.
+
+    Args:
+        case (BenchmarkCase): The benchmark.
+        file_path (Path): The path of the NetCDF file.
+    """
+    if case.model_type == ModelType.DHYDRO:
+        generate_ugrid_dataset(file_path, case.n_nodes, case.n_times)
+    elif case.model_type == ModelType.XBEACH:
+        generate_xbeach_dataset(file_path, case.n_nodes, case.n_times)
+
+
+class BenchmarkRunner:
+    """Class to run benchmarks of the conversion pipeline on synthetic datasets.
+
+    The synthetic dataset of each benchmark is generated in the work directory, after which the conversion runs in
+    a separate process, such that the peak memory of each benchmark is measured on its own.
+    """
+
+    def __init__(self, work_dir: Path, keep_files: bool = False) -> None:
+        """Initialize a BenchmarkRunner with the specified arguments.
+
+        Args:
+            work_dir (Path): The directory in which the synthetic datasets and glTF files are written.
+            keep_files (bool, optional): Whether to keep the synthetic datasets and glTF files after each benchmark. Defaults to False.
+        """
+        self._work_dir = work_dir
+        self._keep_files = keep_files
+
+    def run(self, cases: List[BenchmarkCase]) -> List[BenchmarkResult]:
+        """Run the benchmarks.
+
+        Args:
+            cases (List[BenchmarkCase]): The benchmarks.
+
+        Returns:
+            List[BenchmarkResult]: The measurements of each benchmark.
+        """
+        self._work_dir.mkdir(parents=True, exist_ok=True)
+
+        results = []
+        for case in cases:
+            netcdf_path = self._work_dir / f"{case.name}.nc"
+            gltf_path = self._work_dir / f"{case.name}.glb"
+
+            logging.info(f"GENERATE {case.name}")
+            generate_dataset(case, netcdf_path)
+
+            logging.info(f"BENCHMARK {case.name}")
+            with ProcessPoolExecutor(max_workers=1) as executor:
+                result = executor.submit(run_case, case, netcdf_path, gltf_path).result()
+            logging.info(
+                f"FINISHED {case.name} in {result.total:.3f} seconds, {result.throughput:.0f} vertices x frames per second"
+            )
+            results.append(result)
+
+            if not self._keep_files:
+                netcdf_path.unlink(missing_ok=True)
+                gltf_path.unlink(missing_ok=True)
+
+        return results
+
+
+def run_case(case: BenchmarkCase, netcdf_path: Path, gltf_path: Path) -> BenchmarkResult:
+    """Convert the synthetic dataset of a benchmark and time each stage of the conversion with the stage events.
+
+    Args:
+        case (BenchmarkCase): The benchmark.
+        netcdf_path (Path): The path of the synthetic dataset.
+        gltf_path (Path): The path of the glTF file.
+
+    Returns:
+        BenchmarkResult: The measurements of the benchmark.
+    """
+    config = create_config(case)
+    stages: Dict[str, float] = {}
+
+    def on_event(event: Event):
+        # The interpolation stage is named after the variable, nested stages are part of their parent stage
+        if event.type == EventType.STAGE_END and "/" not in event.name:
+            stage = event.name.split(":")[0]
+            stages[stage] = stages.get(stage, 0.0) + event.value
+
+    events = EventEmitter()
+    events.add_listener(on_event)
+
+    triangular_mesh = Importer(events).import_from(netcdf_path, config)[0]
+
+    with events.stage("build"):
+        builder = GLTFBuilder(events=events)
+        builder.add_triangular_mesh(triangular_mesh)
+        gltf = builder.finish()
+
+    with events.stage("export"):
+        Exporter().export(gltf, gltf_path)
+
+    return BenchmarkResult(
+        case=case,
+        stages=stages,
+        n_vertices=len(triangular_mesh.base.vertex_positions),
+        n_frames=len(triangular_mesh.transformations) + 1,
+        peak_rss=get_peak_rss(),
+    )
+
+
+def write_results(results: List[BenchmarkResult], file_path: Path):
+    """Write the measurements of the benchmarks to a JSON file.
+
+    Args:
+        results (List[BenchmarkResult]): The measurements of each benchmark.
+        file_path (Path): The path of the JSON file.
+    """
+    content = {result.case.name: _to_dict(result) for result in results}
+    with open(file_path, "w") as results_file:
+        json.dump(content, results_file, indent=2)
+
+
+def read_results(file_path: Path) -> Dict[str, dict]:
+    """Read the measurements of benchmarks from a JSON file written by `write_results`.
+
+    Args:
+        file_path (Path): The path of the JSON file.
+
+    Returns:
+        Dict[str, dict]: The measurements per benchmark name.
+
+    Raises:
+        ValueError: When the file does not exist.
+    """
+    if not file_path.is_file():
+        raise ValueError(f"Benchmark results file does not exist: {file_path}")
+
+    with open(file_path) as results_file:
+        return json.load(results_file)
+
+
+def compare(
+    results: Dict[str, dict],
+    baseline: Dict[str, dict],
+    tolerance: float = 0.1,
+    min_duration: float = 0.05,
+) -> List[Regression]:
+    """Compare the measurements of benchmarks with a baseline.
+
+    A stage is a regression when it takes more than the tolerance longer than in the baseline. Stages that take less
+    than the minimum duration in both the results and the baseline are not compared, since their timings are dominated
+    by noise. The throughput is a regression when it is more than the tolerance lower, and the peak memory when it is
+    more than the tolerance higher. Benchmarks that are not in the baseline are not compared.
+
+    Args:
+        results (Dict[str, dict]): The measurements per benchmark name.
+        baseline (Dict[str, dict]): The measurements of the baseline per benchmark name.
+        tolerance (float, optional): The relative difference with the baseline that is accepted. Defaults to 0.1.
+        min_duration (float, optional): The duration in seconds below which stages are not compared. Defaults to 0.05.
+
+    Returns:
+        List[Regression]: The regressions.
+    """
+    regressions = []
+    for name, result in results.items():
+        baseline_result = baseline.get(name)
+        if baseline_result is None:
+            continue
+
+        for stage, duration in result["stages"].items():
+            baseline_duration = baseline_result["stages"].get(stage)
+            if baseline_duration is None or max(duration, baseline_duration) < min_duration:
+                continue
+            if duration > baseline_duration * (1 + tolerance):
+                regressions.append(Regression(name, stage, baseline_duration, duration))
+
+        if result["throughput"] < baseline_result["throughput"] * (1 - tolerance):
+            regressions.append(Regression(name, "throughput", baseline_result["throughput"], result["throughput"]))
+
+        peak_rss, baseline_peak_rss = result.get("peak_rss"), baseline_result.get("peak_rss")
+        if peak_rss is not None and baseline_peak_rss is not None and peak_rss > baseline_peak_rss * (1 + tolerance):
+            regressions.append(Regression(name, "peak_rss", baseline_peak_rss, peak_rss))
+
+    return regressions
+
+
+def _to_dict(result: BenchmarkResult) -> dict:
+    content = asdict(result)
+    content["case"]["model_type"] = str(result.case.model_type)
+    return content
@@ -0,0 +1,60 @@
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+from netcdf_to_gltf_converter.benchmark.runner import (BenchmarkCase,
+                                                       BenchmarkRunner,
+                                                       compare, read_results,
+                                                       write_results)
+from netcdf_to_gltf_converter.config import ModelType
+
+
+def get_args():
+    """Parses and returns the arguments"""
+    parser = argparse.ArgumentParser(description="Benchmark the conversion pipeline on synthetic datasets.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run the benchmarks and write the measurements to a JSON file")
+    run_parser.add_argument("--models", nargs="+", choices=[str(model_type) for model_type in ModelType], default=[str(model_type) for model_type in ModelType], help="Model types of the synthetic datasets")
+    run_parser.add_argument("--nodes", nargs="+", type=int, default=[10_000, 100_000], help="Numbers of grid nodes of the synthetic datasets")
+    run_parser.add_argument("--times", nargs="+", type=int, default=[10, 100], help="Numbers of time steps of the synthetic datasets")
+    run_parser.add_argument("--work-dir", default="benchmark_data", help="Folder in which the synthetic datasets and glTF files are written")
+    run_parser.add_argument("--keep-files", action="store_true", help="Keep the synthetic datasets and glTF files")
+    run_parser.add_argument("--output", default="benchmark_results.json", help="Path to the JSON file with the measurements")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare measurements with a baseline and exit with a non-zero exit code on regressions")
+    compare_parser.add_argument("results", help="Path to the JSON file with the measurements")
+    compare_parser.add_argument("baseline", help="Path to the JSON file with the measurements of the baseline")
+    compare_parser.add_argument("--tolerance", type=float, default=0.1, help="Relative difference with the baseline that is accepted")
+    compare_parser.add_argument("--min-duration", type=float, default=0.05, help="Duration in seconds below which stages are not compared")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = get_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-8s %(message)s", datefmt="%H:%M:%S")
+
+    if args.command == "run":
+        cases = [
+            BenchmarkCase(ModelType(model_type), n_nodes, n_times)
+            for model_type in args.models
+            for n_nodes in args.nodes
+            for n_times in args.times
+        ]
+        results = BenchmarkRunner(Path(args.work_dir), args.keep_files).run(cases)
+        write_results(results, Path(args.output))
+        logging.info(f"FINISHED {len(results)} benchmarks, results: {args.output}")
+    else:
+        regressions = compare(
+            read_results(Path(args.results)),
+            read_results(Path(args.baseline)),
+            args.tolerance,
+            args.min_duration,
+        )
+        for regression in regressions:
+            logging.warning(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        logging.info("FINISHED no regressions")
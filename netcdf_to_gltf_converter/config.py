@@ -10,6 +10,10 @@ from pyproj import CRS
 from strenum import StrEnum
 
 from netcdf_to_gltf_converter.preprocessing.crs import create_compound_crs, create_crs
+from netcdf_to_gltf_converter.preprocessing.subset import (Geometry,
+                                                           create_box,
+                                                           parse_geometry,
+                                                           read_geometry)
 from netcdf_to_gltf_converter.utils.validation import in_range
 
 Color = List[float]
@@ -107,6 +111,60 @@ class ShiftType(StrEnum):
     MIN = "min"
     """The smalles x- and -y coordinate become the origin (0,0,z)."""
     
+class TriangleOrder(StrEnum):
+    """The method to order the triangles of the mesh."""
+
+    TIPSIFY = "tipsify"
+    """Triangles are ordered for post-transform vertex cache efficiency with the Tipsify algorithm."""
+
+    MORTON = "morton"
+    """Triangles are ordered along the Morton (Z-order) space-filling curve through their centroids."""
+
+class TriangleDiagonal(StrEnum):
+    """The diagonal along which the cells of a regular grid are split into triangles."""
+
+    FORWARD = "forward"
+    """Cells are split along the diagonal from the lower left to the upper right node."""
+
+    BACKWARD = "backward"
+    """Cells are split along the diagonal from the lower right to the upper left node."""
+
+    ALTERNATING = "alternating"
+    """Cells are split along alternating diagonals in a checkerboard pattern, which avoids a directional bias in the surface."""
+
+
+class NanFillMethod(StrEnum):
+    """The method to replace invalid (NaN) variable values."""
+
+    CONSTANT = "constant"
+    """Invalid values are replaced by a constant value."""
+
+    BED_LEVEL = "bed_level"
+    """Invalid values are replaced by the bed level at the same location and time."""
+
+    DRY = "dry"
+    """Invalid values are replaced by the dry threshold, such that the vertices are considered dry and can be culled."""
+
+
+class ColorMode(StrEnum):
+    """The method to store the uniform color of the meshes."""
+
+    VERTEX = "vertex"
+    """The color is stored per vertex in a color attribute."""
+
+    MATERIAL = "material"
+    """The color is stored once as the base color of the mesh material."""
+
+class AnimationMode(StrEnum):
+    """The method to animate the meshes."""
+
+    MORPH_TARGETS = "morph_targets"
+    """Each frame is a morph target with an animated weight."""
+
+    VERTEX_TEXTURE = "vertex_texture"
+    """The z-displacements of all frames are stored in a vertex animation texture (VAT) that is sampled by a custom shader."""
+
+
 class CrsTransformation(BaseModel):
     """The configuration settings for transforming the coordinates."""
 
@@ -148,7 +206,167 @@ class CrsShifting(BaseModel):
     
     shift_z: float
     """float: Value to shift the variables values (z-coordinates) with. All variable values will be subtracted with this value."""
-    
+
+
+class ProjSettings(BaseModel):
+    """The configuration settings of PROJ, the library that transforms the coordinates."""
+
+    data_dir: Optional[Path]
+    """Optional[Path]: The directory with transformation grids, which is added to the PROJ search paths. Grids are downloaded to this directory by the grid prefetch command. When not specified, the PROJ user data directory is used for downloads."""
+
+    network: bool = False
+    """bool: Whether PROJ may download missing transformation grids while converting. Defaults to False."""
+
+
+class Reprojection(BaseModel):
+    """The configuration settings for reprojecting the grid from the model coordinate system to another coordinate system."""
+
+    crs_transformation: CrsTransformation
+    """CrsTransformation: The coordinate systems. The source coordinate system should be the coordinate system of the model."""
+
+    transform_z: bool = False
+    """bool: Whether to transform the variable values (z-coordinates) as well, e.g. to another vertical datum. Requires compound or 3D coordinate systems. Defaults to False."""
+
+    chunk_size: int = 100000
+    """int: The number of coordinates that are transformed per task. Defaults to 100000."""
+
+    n_workers: Optional[int]
+    """Optional[int]: The number of threads that transform the coordinates in parallel. Defaults to the default number of threads of a ThreadPoolExecutor."""
+
+    cache_dir: Optional[Path]
+    """Optional[Path]: The directory in which the reprojected coordinates are cached per grid, such that conversions of models with the same grid reuse them. When not specified, they are only cached in memory during the conversion."""
+
+    @validator("chunk_size", "n_workers")
+    def validate_positive(cls, value: Optional[int]) -> Optional[int]:
+        if value is not None and value <= 0:
+            raise ValueError("Value must be larger than 0")
+
+        return value
+
+    @validator("crs_transformation")
+    def validate_target_crs(cls, value: CrsTransformation) -> CrsTransformation:
+        if value.target_crs.is_geocentric:
+            raise ValueError(
+                "Reprojection to a geocentric coordinate system is not supported, since the variable values should remain vertical."
+            )
+
+        return value
+
+
+class SpatialSubset(BaseModel):
+    """The configuration settings for converting only the part of the grid within an area. Exactly one of the areas should be specified."""
+
+    bbox: Optional[List[float]]
+    """Optional[List[float]]: The bounding box of the area: min x, min y, max x, max y."""
+
+    polygon: Optional[str]
+    """Optional[str]: The polygon of the area, as WKT (e.g. 'POLYGON ((0 0, 10 0, 10 10, 0 0))') or GeoJSON geometry."""
+
+    polygon_file: Optional[Path]
+    """Optional[Path]: Path to a file with the polygons of the area, in any format that geopandas can read (e.g. GeoJSON or shapefile). The area is the union of all polygons."""
+
+    @validator("bbox")
+    def validate_bbox(cls, value: Optional[List[float]]) -> Optional[List[float]]:
+        if value is None:
+            return value
+
+        if len(value) != 4:
+            raise ValueError("A bounding box should be defined as a list of 4 floating values: min x, min y, max x, max y.")
+        min_x, min_y, max_x, max_y = value
+        if min_x >= max_x or min_y >= max_y:
+            raise ValueError("The minimum coordinates of a bounding box should be smaller than the maximum coordinates.")
+
+        return value
+
+    @validator("polygon")
+    def validate_polygon(cls, value: Optional[str]) -> Optional[str]:
+        if value is not None:
+            parse_geometry(value)
+
+        return value
+
+    @root_validator(skip_on_failure=True)
+    def validate_single_area(cls, values: Dict[str, Any]):
+        n_areas = sum(values.get(field) is not None for field in ("bbox", "polygon", "polygon_file"))
+        if n_areas != 1:
+            raise ValueError("Exactly one of 'bbox', 'polygon' and 'polygon_file' should be specified.")
+
+        return values
+
+    @property
+    def geometry(self) -> Geometry:
+        """Get the geometry of the area.
+
+        Returns:
+            Geometry: The bounding box or polygon.
+        """
+        if self.bbox is not None:
+            return create_box(*self.bbox)
+        if self.polygon is not None:
+            return parse_geometry(self.polygon)
+        return read_geometry(self.polygon_file)
+
+
+def _validate_color(color: Color) -> Color:
+    if len(color) != 4:
+        msg = "A color should be defined as a list of 4 floating values: the normalized red, green, blue and alpha (RGBA) values."
+        raise ValueError(msg)
+
+    for channel in color:
+        if not in_range(channel, 0.0, 1.0):
+            msg = f"The color channel {channel} is outside of range 0.0-1.0. A color should be defined by the normalized red, green, blue and alpha (RGBA) values."
+            raise ValueError(msg)
+
+    return color
+
+
+class NanFill(BaseModel):
+    """The configuration settings for replacing invalid (NaN) variable values."""
+
+    method: NanFillMethod = NanFillMethod.CONSTANT
+    """NanFillMethod: The method to replace invalid values. Defaults to NanFillMethod.CONSTANT."""
+
+    value: float = 0.0
+    """float: The variable value that replaces invalid values when the method is NanFillMethod.CONSTANT. Defaults to 0.0."""
+
+    bed_level_variable: str = "zb"
+    """str: The name of the NetCDF variable with the bed level when the method is NanFillMethod.BED_LEVEL. Defaults to 'zb'."""
+
+
+class Colormap(BaseModel):
+    """The configuration settings for coloring a mesh by the variable values."""
+
+    colors: List[Color]
+    """List[Color]: The colors of the colormap, evenly spaced from the minimum to the maximum value, each defined by the normalized red, green, blue and alpha (RGBA) values."""
+
+    value_min: Optional[float]
+    """Optional[float]: The variable value that maps to the first color. Defaults to the minimum variable value in the animation."""
+
+    value_max: Optional[float]
+    """Optional[float]: The variable value that maps to the last color. Defaults to the maximum variable value in the animation."""
+
+    @validator("colors")
+    def validate_colors(cls, colors: List[Color]) -> List[Color]:
+        """Validate the colors. The colormap should contain at least two valid colors."""
+
+        if len(colors) < 2:
+            raise ValueError("A colormap should contain at least 2 colors.")
+
+        for color in colors:
+            _validate_color(color)
+
+        return colors
+
+    @root_validator(skip_on_failure=True)
+    def validate_value_range(cls, values: Dict[str, Any]):
+        value_min = values.get("value_min")
+        value_max = values.get("value_max")
+        if value_min is not None and value_max is not None and value_min >= value_max:
+            raise ValueError("The minimum value should be smaller than the maximum value.")
+
+        return values
+
+
 class Variable(BaseModel):
     """Configuration properties of a variable."""
 
@@ -173,6 +391,15 @@ class Variable(BaseModel):
     threshold_height: Optional[float]
     """Optional[float]: The height (vertex z-values) of the threshold mesh."""
 
+    dry_threshold: Optional[float]
+    """Optional[float]: The variable value at or below which a vertex is considered dry. When specified, triangles of which all vertices are dry or invalid (NaN) in every frame are removed from the mesh."""
+
+    colormap: Optional[Colormap]
+    """Optional[Colormap]: The configuration settings for coloring the mesh by the variable values. When specified, the mesh is colored by the colormap instead of the uniform color."""
+
+    nan_fill: Optional[NanFill]
+    """Optional[NanFill]: The configuration settings for replacing invalid (NaN) variable values, which are applied to each frame when it is read. When not specified, invalid values of XBEACH models are replaced by 0.0 and invalid values of D-HYDRO models are kept."""
+
     @root_validator
     def validate_threshold(cls, values: Dict[str, Any]):
         def validate_required(field: str):
@@ -186,6 +413,14 @@ class Variable(BaseModel):
 
         return values
 
+    @root_validator(skip_on_failure=True)
+    def validate_nan_fill(cls, values: Dict[str, Any]):
+        nan_fill = values.get("nan_fill")
+        if nan_fill and nan_fill.method == NanFillMethod.DRY and values.get("dry_threshold") is None:
+            raise ValueError("'dry_threshold' is required when the NaN fill method is 'dry'.")
+
+        return values
+
     @validator("color", "threshold_color")
     def validate_color(cls, color: Color) -> Color:
         """Validate a color. The color should be a list that contains 4 floating values between 0.0 and 1.0 (inclusive)."""
@@ -193,16 +428,7 @@ class Variable(BaseModel):
         if color is None:
             return color
 
-        if len(color) != 4:
-            msg = "A color should be defined as a list of 4 floating values: the normalized red, green, blue and alpha (RGBA) values."
-            raise ValueError(msg)
-
-        for channel in color:
-            if not in_range(channel, 0.0, 1.0):
-                msg = f"The color channel {channel} is outside of range 0.0-1.0. A color should be defined by the normalized red, green, blue and alpha (RGBA) values."
-                raise ValueError(msg)
-
-        return color
+        return _validate_color(color)
 
     @validator("metallic_factor", "roughness_factor")
     def validate_in_range(cls, value: float) -> float:
@@ -213,6 +439,197 @@ class Variable(BaseModel):
         return value
 
 
+class LevelOfDetail(BaseModel):
+    """Configuration properties of a coarser level of detail of the meshes."""
+
+    cell_size: float
+    """float: The size of the grid cells that are used to cluster the mesh vertices, in the horizontal units of the model. When a scaling factor is applied to the conversion, this size will also be multiplied by this factor."""
+
+    screen_coverage: float
+    """float: The minimum screen coverage (0.0-1.0) at which this level of detail is rendered."""
+
+    @validator("cell_size")
+    def validate_positive(cls, value: float) -> float:
+        if value <= 0.0:
+            raise ValueError("Value must be larger than 0.0")
+
+        return value
+
+    @validator("screen_coverage")
+    def validate_in_range(cls, value: float) -> float:
+        if not in_range(value, 0.0, 1.0):
+            raise ValueError("Value must be between 0.0 and 1.0")
+
+        return value
+
+
+class LevelsOfDetail(BaseModel):
+    """The configuration settings for generating coarser levels of detail of the meshes."""
+
+    screen_coverage: float
+    """float: The minimum screen coverage (0.0-1.0) at which the full resolution meshes are rendered."""
+
+    levels: List[LevelOfDetail]
+    """List[LevelOfDetail]: The coarser levels of detail, ordered from fine to coarse."""
+
+    @validator("screen_coverage")
+    def validate_in_range(cls, value: float) -> float:
+        if not in_range(value, 0.0, 1.0):
+            raise ValueError("Value must be between 0.0 and 1.0")
+
+        return value
+
+    @root_validator(skip_on_failure=True)
+    def validate_order(cls, values: Dict[str, Any]):
+        screen_coverages = [values["screen_coverage"]] + [
+            level.screen_coverage for level in values["levels"]
+        ]
+        if any(
+            previous <= current
+            for previous, current in zip(screen_coverages, screen_coverages[1:])
+        ):
+            raise ValueError(
+                "The screen coverage should decrease with each coarser level of detail."
+            )
+
+        return values
+
+
+class Tiling(BaseModel):
+    """The configuration settings for exporting the meshes as a set of spatial tiles."""
+
+    max_triangles_per_tile: int
+    """int: The maximum number of triangles per tile. Tiles with more triangles are split into four quadrants, until the maximum depth is reached."""
+
+    max_depth: int = 8
+    """int: The maximum depth of the quadtree that partitions the meshes into tiles. Defaults to 8."""
+
+    n_workers: Optional[int]
+    """Optional[int]: The number of processes that write the tiles in parallel. Defaults to the number of processors on the machine."""
+
+    @validator("max_triangles_per_tile", "n_workers")
+    def validate_positive(cls, value: Optional[int]) -> Optional[int]:
+        if value is not None and value <= 0:
+            raise ValueError("Value must be larger than 0")
+
+        return value
+
+    @validator("max_depth")
+    def validate_not_negative(cls, value: int) -> int:
+        if value < 0:
+            raise ValueError("Value must be larger than or equal to 0")
+
+        return value
+
+
+class Segmentation(BaseModel):
+    """The configuration settings for exporting the animation as a sequence of glTF files that each contain the frames of a fixed time span."""
+
+    duration: float
+    """float: The model time span of each segment in seconds. A segment contains the frames of which the time lies within its time span."""
+
+    shared_geometry: bool = False
+    """bool: Whether the segments refer to one shared binary file with the base geometry, instead of each segment embedding the base geometry. Defaults to False."""
+
+    n_workers: Optional[int]
+    """Optional[int]: The number of processes that write the segments in parallel. Defaults to the number of processors on the machine."""
+
+    @validator("duration")
+    def validate_positive_duration(cls, value: float) -> float:
+        if value <= 0.0:
+            raise ValueError("Value must be larger than 0.0")
+
+        return value
+
+    @validator("n_workers")
+    def validate_positive(cls, value: Optional[int]) -> Optional[int]:
+        if value is not None and value <= 0:
+            raise ValueError("Value must be larger than 0")
+
+        return value
+
+
+class MeshOptimization(BaseModel):
+    """The configuration settings for reordering the triangles and vertices of the meshes."""
+
+    triangle_order: TriangleOrder = TriangleOrder.TIPSIFY
+    """TriangleOrder: The method to order the triangles. Defaults to `tipsify`."""
+
+    cache_size: int = 16
+    """int: The size of the simulated vertex cache that is used by the Tipsify algorithm. Defaults to 16."""
+
+    @validator("cache_size")
+    def validate_cache_size(cls, value: int) -> int:
+        if value < 3:
+            raise ValueError("Value must be larger than or equal to 3")
+
+        return value
+
+
+class RegularGridOptions(BaseModel):
+    """The configuration settings for the regular grids of XBEACH models."""
+
+    diagonal: TriangleDiagonal = TriangleDiagonal.FORWARD
+    """TriangleDiagonal: The diagonal along which the cells of the grid are split into triangles. Defaults to TriangleDiagonal.FORWARD."""
+
+    row_stride: int = 1
+    """int: The step between the node rows that are read from the grid. Defaults to 1 (every row)."""
+
+    column_stride: int = 1
+    """int: The step between the node columns that are read from the grid. Defaults to 1 (every column)."""
+
+    row_index_start: int = 0
+    """int: The index of the first node row that is read from the grid. Defaults to 0."""
+
+    row_index_end: Optional[int]
+    """Optional[int]: The index of the last node row that is read from the grid (inclusive). Defaults to the last row."""
+
+    column_index_start: int = 0
+    """int: The index of the first node column that is read from the grid. Defaults to 0."""
+
+    column_index_end: Optional[int]
+    """Optional[int]: The index of the last node column that is read from the grid (inclusive). Defaults to the last column."""
+
+    @validator("row_stride", "column_stride")
+    def validate_positive(cls, value: int) -> int:
+        if value <= 0:
+            raise ValueError("Value must be larger than 0")
+
+        return value
+
+    @validator("row_index_start", "row_index_end", "column_index_start", "column_index_end")
+    def validate_not_negative(cls, value: Optional[int]) -> Optional[int]:
+        if value is not None and value < 0:
+            raise ValueError("Value must be larger than or equal to 0")
+
+        return value
+
+    @root_validator(skip_on_failure=True)
+    def validate_window(cls, values: Dict[str, Any]):
+        for dimension in ("row", "column"):
+            index_end = values.get(f"{dimension}_index_end")
+            if index_end is not None and index_end < values[f"{dimension}_index_start"]:
+                raise ValueError(f"The {dimension} index end should be larger than or equal to the {dimension} index start.")
+
+        return values
+
+    @property
+    def is_subsampled(self) -> bool:
+        """Get whether only a part of the nodes of the grid is read.
+
+        Returns:
+            bool: True when a stride or index window is specified; otherwise, False.
+        """
+        return (
+            self.row_stride != 1
+            or self.column_stride != 1
+            or self.row_index_start != 0
+            or self.column_index_start != 0
+            or self.row_index_end is not None
+            or self.column_index_end is not None
+        )
+
+
 class Config(AbstractJsonConfigFile, AbstractFileVersionFile):
     """The configuration settings described in the configuration JSON file."""
 
@@ -233,6 +650,12 @@ class Config(AbstractJsonConfigFile, AbstractFileVersionFile):
     shift_coordinates: Optional[Union[ShiftType, CrsShifting]]
     """Optional[Union[ShiftType, CrsShifting]]: The options how to shift the x-, y- and optionally z-coordinates. Typically used to create a reference point, such that an x-, y- and z-coordinate become the origin (0,0,0)."""
 
+    reprojection: Optional[Reprojection]
+    """Optional[Reprojection]: The configuration settings for reprojecting the grid to another coordinate system. The reprojection is applied before the coordinates are shifted and scaled. When not specified, the model coordinate system is kept."""
+
+    subset: Optional[SpatialSubset]
+    """Optional[SpatialSubset]: The configuration settings for converting only the faces of the grid of which the centroid lies within an area, in the model coordinate system. When not specified, the whole grid is converted."""
+
     scale_horizontal: float
     """float: The horizontal scaling factor of the mesh coordinates compared to the coordinates from file."""
 
@@ -240,4 +663,57 @@ class Config(AbstractJsonConfigFile, AbstractFileVersionFile):
     """float: The vertical scaling factor of the mesh coordinates compared to the coordinates from file."""
 
     variables: List[Variable]
-    """List[Variable]: List of configuration of the variables that should be converted to glTF."""
\ No newline at end of file
+    """List[Variable]: List of configuration of the variables that should be converted to glTF."""
+
+    levels_of_detail: Optional[LevelsOfDetail]
+    """Optional[LevelsOfDetail]: The configuration settings for generating coarser levels of detail of the meshes. When not specified, only the full resolution meshes are converted."""
+
+    mesh_optimization: Optional[MeshOptimization]
+    """Optional[MeshOptimization]: The configuration settings for reordering the triangles and vertices of the meshes for rendering performance. When not specified, the triangles and vertices keep the order of the grid."""
+
+    tiling: Optional[Tiling]
+    """Optional[Tiling]: The configuration settings for exporting the meshes as a set of spatial tiles. When not specified, all meshes are exported to a single glTF file."""
+
+    segmentation: Optional[Segmentation]
+    """Optional[Segmentation]: The configuration settings for exporting the animation as a sequence of time segments. When not specified, all frames are exported to a single glTF file."""
+
+    split_primitives: bool = False
+    """bool: Whether to split meshes with more than 65,535 vertices into multiple primitives, such that each primitive can use 16-bit indices. Defaults to False."""
+
+    color_mode: ColorMode = ColorMode.VERTEX
+    """ColorMode: The method to store the uniform color of the meshes. Defaults to ColorMode.VERTEX."""
+
+    animation_mode: AnimationMode = AnimationMode.MORPH_TARGETS
+    """AnimationMode: The method to animate the meshes. Defaults to AnimationMode.MORPH_TARGETS."""
+
+    regular_grid: RegularGridOptions = RegularGridOptions()
+    """RegularGridOptions: The configuration settings for regular grids. Only used for XBEACH models."""
+
+    proj: ProjSettings = ProjSettings()
+    """ProjSettings: The configuration settings of PROJ for the coordinate transformations."""
+
+    @root_validator(skip_on_failure=True)
+    def validate_segmentation(cls, values: Dict[str, Any]):
+        if values.get("segmentation") is None:
+            return values
+
+        if values.get("tiling") is not None:
+            raise ValueError("Segmentation cannot be combined with tiling.")
+        if values["segmentation"].shared_geometry and values.get("animation_mode") == AnimationMode.VERTEX_TEXTURE:
+            raise ValueError("Segments with shared geometry require the 'morph_targets' animation mode.")
+
+        return values
+
+    @property
+    def crs_transformations(self) -> List[CrsTransformation]:
+        """Get the coordinate transformations that are used during the conversion.
+
+        Returns:
+            List[CrsTransformation]: The transformations of the shift values and the reprojection.
+        """
+        crs_transformations = []
+        if isinstance(self.shift_coordinates, CrsShifting) and self.shift_coordinates.crs_transformation:
+            crs_transformations.append(self.shift_coordinates.crs_transformation)
+        if self.reprojection:
+            crs_transformations.append(self.reprojection.crs_transformation)
+        return crs_transformations
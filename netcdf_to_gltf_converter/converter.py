@@ -1,26 +1,61 @@
 import logging
 from datetime import datetime
+from functools import partial
 from pathlib import Path
+from typing import List, Optional
 
-from netcdf_to_gltf_converter.config import Config
-from netcdf_to_gltf_converter.gltf.builder import GLTFBuilder
+from pygltflib import GLTF2
+
+from netcdf_to_gltf_converter.config import AnimationMode, Config
+from netcdf_to_gltf_converter.data.mesh import TriangularMesh
+from netcdf_to_gltf_converter.data.state import (ConversionState,
+                                                 get_file_fingerprint)
+from netcdf_to_gltf_converter.gltf.appender import GLTFAppender
+from netcdf_to_gltf_converter.gltf.builder import BuilderOptions, GLTFBuilder
 from netcdf_to_gltf_converter.gltf.exporter import Exporter
+from netcdf_to_gltf_converter.gltf.segments import SegmentExporter
+from netcdf_to_gltf_converter.gltf.tileset import TilesetExporter
+from netcdf_to_gltf_converter.netcdf.estimator import ConversionEstimate
 from netcdf_to_gltf_converter.netcdf.importer import Importer
+from netcdf_to_gltf_converter.utils.events import EventEmitter, EventType
+from netcdf_to_gltf_converter.utils.metrics import MetricsExporter
+from netcdf_to_gltf_converter.utils.profiling import Profiler
 
 
 class Converter:
     """Converter class for converting the NetCDF file to a glTF file."""
 
-    def __init__(self, netcdf: Path, gltf: Path, config: Path) -> None:
+    def __init__(
+        self,
+        netcdf: Path,
+        gltf: Path,
+        config: Path,
+        verbose: bool = False,
+        grid_cache_dir: Optional[Path] = None,
+        append: bool = False,
+        profile: bool = False,
+        trace_memory: bool = False,
+        metrics_file: Optional[Path] = None,
+    ) -> None:
         """Initialize a Converter with the specified arguments.
 
         Args:
             netcdf (Path): Path to the source NetCDF file.
             gltf (Path): Path to the destination glTF file.
             config (Path): Path to the converter configuration file.
+            verbose (bool, optional): Whether to write debug messages to the log file. Defaults to False.
+            grid_cache_dir (Optional[Path], optional): The directory in which grid data is cached, such that conversions of models with the same grid share it.
+                Used when the configuration does not specify a cache directory. Defaults to None.
+            append (bool, optional): Whether to append the time steps that were added to the NetCDF file since the previous conversion to the existing glTF file,
+                as recorded in the state file next to the glTF file. When there is no previous conversion, all time steps are converted and the state file is created.
+                When not appending, the state file of a previous conversion is removed. Defaults to False.
+            profile (bool, optional): Whether to measure the time and memory of each stage of the conversion and write them to a JSON profile next to the log file. Defaults to False.
+            trace_memory (bool, optional): Whether the profile includes the peak memory per stage traced by tracemalloc, which slows down the conversion. Defaults to False.
+            metrics_file (Optional[Path], optional): Path to a text file to which the progress of the conversion is written as Prometheus metrics, labeled with the name of the glTF file. Defaults to None.
 
         Raises:
             ValueError: When the NetCDF or configuration file does not exist.
+            ValueError: When appending is combined with tiling, segmentation or a vertex animation texture.
         """
 
         if not netcdf.is_file():
@@ -31,21 +66,42 @@ class Converter:
         self._netcdf = netcdf
         self._gltf = gltf
         self._config = Config.from_file(config)
+        self._config_fingerprint = get_file_fingerprint(config)
+        self._append = append
+        if append and self._config.tiling:
+            raise ValueError("Time steps cannot be appended to a tileset.")
+        if append and self._config.segmentation:
+            raise ValueError("Time steps cannot be appended to time segments.")
+        if append and self._config.animation_mode == AnimationMode.VERTEX_TEXTURE:
+            raise ValueError("Time steps cannot be appended to a vertex animation texture.")
+        if grid_cache_dir and self._config.reprojection and not self._config.reprojection.cache_dir:
+            self._config.reprojection.cache_dir = grid_cache_dir
 
-        self._importer = Importer()
+        self._events = EventEmitter()
+        self._importer = Importer(self._events)
         self._exporter = Exporter()
+
+        self._profiler = None
+        if profile or trace_memory:
+            self._profiler = Profiler(trace_memory)
+            self._events.add_listener(self._profiler.on_event)
+
+        self._metrics_exporter = None
+        if metrics_file is not None:
+            self._metrics_exporter = MetricsExporter(metrics_file, {"gltf": self._gltf.name})
+            self._events.add_listener(self._metrics_exporter.on_event)
         
-        self._configure_logging()
+        self._configure_logging(logging.DEBUG if verbose else logging.INFO)
 
-    def _configure_logging(self) -> None:
+    def _configure_logging(self, level: int) -> None:
         self._reset_logger()
         
         time_stamp = datetime.now().strftime("%y%m%d_%H%M%S")
-        log_file = self._gltf.parent / f"gltf_converter_{time_stamp}_{self._gltf.stem}.log"
+        self._log_file = self._gltf.parent / f"gltf_converter_{time_stamp}_{self._gltf.stem}.log"
         
         logging.basicConfig(
-            level=logging.DEBUG,
-            filename=log_file,
+            level=level,
+            filename=self._log_file,
             filemode="w",
             format="%(asctime)s %(levelname)-8s %(filename)-20s %(funcName)-20s %(message)s",
             datefmt="%H:%M:%S",
@@ -55,15 +111,147 @@ class Converter:
         for handler in logging.root.handlers[:]:
             logging.root.removeHandler(handler)
             
+    @property
+    def events(self) -> EventEmitter:
+        """EventEmitter: The emitter of the conversion events, to which listeners can be added.
+
+        The converter emits the start and end of each stage and the bytes of each written file, and shares the emitter with
+        the parser, which emits the progress of the frames, and the glTF builder, which emits the hits of its accessor cache.
+        """
+        return self._events
+
     def run(self):
-        """Run the conversion."""
+        """Run the conversion.
+
+        When profiling, the profile is written to `<log file name>.profile.json` next to the log file.
+        When a metrics file is provided, the final metrics are written to it, also when the conversion fails.
+        """
+        try:
+            self._run()
+        finally:
+            if self._metrics_exporter is not None:
+                self._metrics_exporter.write()
+
+    def estimate(self, memory_budget: Optional[int] = None) -> ConversionEstimate:
+        """Estimate the peak memory and output size of the conversion in a dry run, which reads the grid but no data values and writes no glTF file.
+
+        Args:
+            memory_budget (Optional[int], optional): The memory budget in bytes. When the estimated peak memory exceeds it,
+                a `times_per_frame` or, for XBEACH, a regular grid stride is suggested with which the conversion fits. Defaults to None.
+
+        Returns:
+            ConversionEstimate: The estimate.
+        """
+        with self._events.stage("estimate"):
+            return self._importer.estimate(self._netcdf, self._config, memory_budget)
+
+    def _run(self):
+        state = self._read_state()
+        appending = state is not None and bool(state.variables)
+        builder_options = BuilderOptions(
+            split_primitives=self._config.split_primitives,
+            color_mode=self._config.color_mode,
+            animation_mode=self._config.animation_mode,
+        )
+
+        if self._config.segmentation:
+            self._export_segments(builder_options)
+            self._finish_output(self._get_tile_and_segment_files())
+            return
+
+        with self._events.stage("import"):
+            triangular_meshes = self._importer.import_from(self._netcdf, self._config, state)
+
+        if self._config.tiling:
+            with self._events.stage("export"):
+                tileset_exporter = TilesetExporter(self._config.tiling, builder_options)
+                tileset_exporter.export(triangular_meshes, self._gltf)
+            self._finish_output(self._get_tile_and_segment_files())
+            return
+
+        if appending:
+            with self._events.stage("append"):
+                gltf = self._append_frames(triangular_meshes, builder_options)
+            if gltf is None:
+                self._finish_output([])
+                return
+        else:
+            with self._events.stage("build"):
+                builder = GLTFBuilder(builder_options, self._events)
+                for triangular_grid in triangular_meshes:
+                    builder.add_triangular_mesh(triangular_grid)
+
+            with self._events.stage("finish"):
+                gltf = builder.finish()
+
+        if self._profiler is not None:
+            self._profiler.count_accessor_bytes(gltf)
+        with self._events.stage("export"):
+            self._exporter.export(gltf, self._gltf)
+        if state is not None:
+            state.to_file(ConversionState.get_path(self._gltf))
+        self._finish_output([self._gltf])
+
+    def _export_segments(self, builder_options: BuilderOptions):
+        # The whole animation is read once for the color scales and wet areas, after which the frames of each segment are imported by its worker
+        with self._events.stage("import"):
+            state = ConversionState(self._config_fingerprint)
+            self._importer.import_state(self._netcdf, self._config, state)
+            time_indices, frame_times = self._importer.import_frame_times(self._netcdf, self._config)
+
+        # Frames that are not converted, e.g. because partitions contain fewer time steps, are not included
+        time_index_last = min(variable_state.time_index_last for variable_state in state.variables.values())
+        n_frames = sum(time_index <= time_index_last for time_index in time_indices)
+
+        with self._events.stage("export"):
+            import_segment = partial(Importer().import_window, self._netcdf, self._config, state)
+            segment_exporter = SegmentExporter(self._config.segmentation, builder_options)
+            segment_exporter.export(import_segment, time_indices[:n_frames], frame_times[:n_frames], self._gltf)
+
+    def _get_tile_and_segment_files(self) -> List[Path]:
+        # Tiles, segments and their manifests are named after the glTF file: <name>_<suffix>
+        return list(self._gltf.parent.glob(f"{self._gltf.stem}_*"))
+
+    def _finish_output(self, output_files: List[Path]):
+        for output_file in output_files:
+            self._events.emit(EventType.BYTES_WRITTEN, output_file.name, output_file.stat().st_size)
+
+        if self._profiler is None:
+            return
+
+        profile_path = self._log_file.with_suffix(".profile.json")
+        self._profiler.to_file(profile_path, netcdf=str(self._netcdf), gltf=str(self._gltf))
+        logging.info(f"PROFILE written to: {profile_path}")
+
+    def _read_state(self) -> Optional[ConversionState]:
+        state_path = ConversionState.get_path(self._gltf)
+        if not self._append:
+            # The glTF file is rewritten, so the state of a previous conversion no longer describes it
+            if state_path.is_file():
+                logging.info(f"APPEND removing the state of the previous conversion: {state_path}")
+                state_path.unlink()
+            return None
+
+        if not state_path.is_file() or not self._gltf.is_file():
+            logging.info("APPEND no previous conversion found, converting all time steps")
+            return ConversionState(self._config_fingerprint)
 
-        triangular_meshes = self._importer.import_from(self._netcdf, self._config)
+        state = ConversionState.from_file(state_path)
+        if state.config_fingerprint != self._config_fingerprint:
+            raise ValueError(
+                f"The configuration file differs from the configuration of the previous conversion, recorded in: {state_path}"
+            )
+        return state
 
-        builder = GLTFBuilder()
-        for triangular_grid in triangular_meshes:
-            builder.add_triangular_mesh(triangular_grid)
+    def _append_frames(
+        self, triangular_meshes: List[TriangularMesh], builder_options: BuilderOptions
+    ) -> Optional[GLTF2]:
+        if not any(mesh.transformations for mesh in triangular_meshes):
+            logging.info("APPEND no new time steps, the glTF file is unchanged")
+            return None
 
-        gltf = builder.finish()
+        appender = GLTFAppender(GLTF2.load(self._gltf), builder_options)
+        for mesh_index, triangular_mesh in enumerate(triangular_meshes):
+            appender.append_triangular_mesh(mesh_index, triangular_mesh)
 
-        self._exporter.export(gltf, self._gltf)
+        return appender.finish()
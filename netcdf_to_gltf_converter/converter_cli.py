@@ -1,7 +1,12 @@
 import argparse
+import json
 from pathlib import Path
 
 from netcdf_to_gltf_converter.converter import Converter
+from netcdf_to_gltf_converter.utils.profiling import get_available_memory
+
+BYTES_PER_GIGABYTE = 1024**3
+"""The number of bytes in a gigabyte."""
 
 
 def get_args():
@@ -10,6 +15,25 @@ def get_args():
     parser.add_argument("netcdf", help="Path to the source NetCDF file")
     parser.add_argument("gltf", help="Path to the destination glTF file")
     parser.add_argument("config", help="Path to the converter configuration file")
+    parser.add_argument("--verbose", action="store_true", help="Write debug messages to the log file")
+    parser.add_argument(
+        "--append",
+        action="store_true",
+        help="Append the time steps that were added to the NetCDF file since the previous conversion to the existing glTF file",
+    )
+    parser.add_argument("--profile", action="store_true", help="Write the time and memory of each stage of the conversion to a JSON profile next to the log file")
+    parser.add_argument("--trace-memory", action="store_true", help="Include the peak memory per stage traced by tracemalloc in the profile, which slows down the conversion")
+    parser.add_argument("--metrics-file", help="Path to a text file to which the progress of the conversion is written as Prometheus metrics, e.g. for the textfile collector of the node exporter")
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Only estimate the peak memory and output size of the conversion from the grid, without reading any data values, and print the estimate as JSON",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=float,
+        help="The memory budget of the dry run in GB, for which settings are suggested when the conversion does not fit. Defaults to the available memory",
+    )
 
     return parser.parse_args()
 
@@ -20,5 +44,19 @@ if __name__ == "__main__":
     gltf = Path(args.gltf)
     config = Path(args.config)
 
-    converter = Converter(netcdf, gltf, config)
-    converter.run()
+    converter = Converter(
+        netcdf,
+        gltf,
+        config,
+        args.verbose,
+        append=args.append,
+        profile=args.profile,
+        trace_memory=args.trace_memory,
+        metrics_file=Path(args.metrics_file) if args.metrics_file else None,
+    )
+    if args.dry_run:
+        memory_budget = int(args.memory_budget * BYTES_PER_GIGABYTE) if args.memory_budget is not None else get_available_memory()
+        estimate = converter.estimate(memory_budget)
+        print(json.dumps(estimate.to_dict(), indent=2))
+    else:
+        converter.run()
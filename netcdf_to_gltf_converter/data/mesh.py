@@ -1,12 +1,29 @@
-from typing import List
+from dataclasses import dataclass
+from typing import List, Optional
 
 import numpy as np
 
+from netcdf_to_gltf_converter.preprocessing.simplification import \
+    cluster_vertices
 from netcdf_to_gltf_converter.typing.custom_types import Color
-from netcdf_to_gltf_converter.utils.arrays import (float32_array,
+from netcdf_to_gltf_converter.utils.arrays import (float32_array, uint32_array,
                                                    validate_2d_array)
 
 
+@dataclass
+class ColorScale:
+    """Data class containing the colormap that colors a mesh by the z-coordinates of its vertices."""
+
+    colors: List[Color]
+    """List[Color]: The colors, evenly spaced from the minimum to the maximum z-coordinate."""
+
+    min_value: float
+    """float: The z-coordinate that maps to the first color."""
+
+    max_value: float
+    """float: The z-coordinate that maps to the last color."""
+
+
 class MeshAttributes:
     def __init__(self, vertex_positions: np.ndarray, mesh_color: Color) -> None:
         """Initialize a MeshAttributes with the specified arguments.
@@ -16,16 +33,24 @@ class MeshAttributes:
             mesh_color (Color): The mesh color, a list of floats with shape (, 4). The four values represent a color defined by its normalized red, green, blue and alpha (RGBA) values.
         Raises:
             AssertionError: When the shape or dtype of the arrays do not match the requirements.
-            AssertionError: When the number of vertex colors does not correspond with the number of vertex positions (number of vertices).
+            AssertionError: When the mesh color does not consist of four values.
         """
         self.vertex_positions = vertex_positions
-        self.vertex_colors = float32_array(len(vertex_positions) * [mesh_color])
+        self.mesh_color = mesh_color
         self._validate()
 
+    @property
+    def vertex_colors(self) -> np.ndarray:
+        """Get the vertex colors, which are created on request from the uniform mesh color.
+
+        Returns:
+            np.ndarray: The vertex colors, an ndarray of floats with shape (n, 4). Each row contains the RGBA values of one vertex.
+        """
+        return np.tile(float32_array(self.mesh_color), (len(self.vertex_positions), 1))
+
     def _validate(self):
         validate_2d_array(self.vertex_positions, np.float32, n_col=3)
-        validate_2d_array(self.vertex_colors, np.float32, n_col=4)
-        assert len(self.vertex_positions) == len(self.vertex_colors)
+        assert len(self.mesh_color) == 4
 
 
 class TriangularMesh:
@@ -57,6 +82,18 @@ class TriangularMesh:
         self.metallic_factor = metallic_factor
         self.roughness_factor = roughness_factor
 
+        self.levels_of_detail: List[TriangularMesh] = []
+        """List[TriangularMesh]: The coarser representations of this mesh, ordered from fine to coarse."""
+
+        self.screen_coverage: List[float] = []
+        """List[float]: The minimum screen coverage per level of detail, starting with this mesh followed by each of the `levels_of_detail`."""
+
+        self.constant_height: Optional[float] = None
+        """Optional[float]: The z-coordinate of all vertices when the mesh is flat and not animated, such as a threshold mesh; otherwise, None."""
+
+        self.color_scale: Optional[ColorScale] = None
+        """Optional[ColorScale]: The colormap that colors the mesh by the z-coordinates of its vertices. When None, the mesh has the uniform color of its attributes."""
+
         self._validate()
 
     def get_threshold_mesh(self, height: float, color: Color) -> "TriangularMesh":
@@ -76,13 +113,125 @@ class TriangularMesh:
             vertex_positions=vertex_positions, mesh_color=color
         )
 
-        return TriangularMesh(
+        threshold_mesh = TriangularMesh(
             base=mesh_attributes,
             triangles=self.triangles,
             transformations=[],
             metallic_factor=0.0,
             roughness_factor=1.0,
         )
+        threshold_mesh.levels_of_detail = [
+            level_of_detail.get_threshold_mesh(height, color)
+            for level_of_detail in self.levels_of_detail
+        ]
+        threshold_mesh.screen_coverage = self.screen_coverage.copy()
+        threshold_mesh.constant_height = height
+
+        return threshold_mesh
+
+    def select_frames(self, frame_indices: List[int]) -> "TriangularMesh":
+        """Gets this mesh with only the specified transformations, for this mesh and its levels of detail.
+
+        Args:
+            frame_indices (List[int]): The indices of the transformations to keep.
+
+        Returns:
+            TriangularMesh: The triangular mesh with the same base geometry and the selected transformations.
+        """
+        selected_mesh = TriangularMesh(
+            self.base,
+            self.triangles,
+            [self.transformations[i] for i in frame_indices] if self.transformations else [],
+            self.metallic_factor,
+            self.roughness_factor,
+        )
+        selected_mesh.levels_of_detail = [
+            level_of_detail.select_frames(frame_indices)
+            for level_of_detail in self.levels_of_detail
+        ]
+        selected_mesh.screen_coverage = self.screen_coverage.copy()
+        selected_mesh.constant_height = self.constant_height
+        selected_mesh.color_scale = self.color_scale
+
+        return selected_mesh
+
+    def extract(self, triangle_indices: np.ndarray) -> "TriangularMesh":
+        """Gets the part of this mesh that consists of the specified triangles.
+
+        Only the vertices that are used by these triangles are kept, and the triangles are renumbered accordingly.
+        The levels of detail are not included in the extracted mesh.
+
+        Args:
+            triangle_indices (np.ndarray): The indices of the triangles to extract, an ndarray of integers with shape (k,).
+
+        Returns:
+            TriangularMesh: The extracted triangular mesh.
+        """
+        vertex_indices, triangles = np.unique(
+            self.triangles[triangle_indices], return_inverse=True
+        )
+
+        base = MeshAttributes(
+            self.base.vertex_positions[vertex_indices], self.base.mesh_color
+        )
+        transformations = [
+            MeshAttributes(
+                transformation.vertex_positions[vertex_indices],
+                transformation.mesh_color,
+            )
+            for transformation in self.transformations
+        ]
+
+        extracted_mesh = TriangularMesh(
+            base,
+            uint32_array(triangles.reshape(-1, 3)),
+            transformations,
+            self.metallic_factor,
+            self.roughness_factor,
+        )
+        extracted_mesh.constant_height = self.constant_height
+        extracted_mesh.color_scale = self.color_scale
+
+        return extracted_mesh
+
+    def simplify(self, cell_size: float) -> "TriangularMesh":
+        """Gets a coarser representation of this mesh by clustering the vertices on a regular grid.
+
+        Each cluster is represented by one of the original vertices, such that the base geometry and
+        the transformations of the simplified mesh are the values that were interpolated onto these vertices.
+
+        Args:
+            cell_size (float): The size of the grid cells that are used to cluster the vertices.
+
+        Returns:
+            TriangularMesh: The simplified triangular mesh.
+        """
+        vertex_indices, triangles = cluster_vertices(
+            self.base.vertex_positions[:, :2], self.triangles, cell_size
+        )
+
+        base = MeshAttributes(
+            self.base.vertex_positions[vertex_indices], self.base.mesh_color
+        )
+        transformations = [
+            MeshAttributes(
+                transformation.vertex_positions[vertex_indices],
+                transformation.mesh_color,
+            )
+            for transformation in self.transformations
+        ]
+
+        simplified_mesh = TriangularMesh(
+            base,
+            triangles,
+            transformations,
+            self.metallic_factor,
+            self.roughness_factor,
+        )
+        simplified_mesh.constant_height = self.constant_height
+        simplified_mesh.color_scale = self.color_scale
+
+        return simplified_mesh
 
     def _validate(self):
         validate_2d_array(self.triangles, np.uint32, n_col=3)
@@ -0,0 +1,143 @@
+import base64
+import hashlib
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+STATE_FILE_SUFFIX = ".state.json"
+"""The suffix that is appended to the name of a glTF file to get the name of its state file."""
+
+
+def get_fingerprint(*arrays: np.ndarray) -> str:
+    """Get a fingerprint of the content of a set of arrays.
+
+    Args:
+        *arrays (np.ndarray): The arrays.
+
+    Returns:
+        str: The fingerprint, a hexadecimal string.
+    """
+    fingerprint = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        fingerprint.update(np.ascontiguousarray(array).tobytes())
+    return fingerprint.hexdigest()
+
+
+def get_file_fingerprint(file_path: Path) -> str:
+    """Get a fingerprint of the content of a file.
+
+    Args:
+        file_path (Path): Path to the file.
+
+    Returns:
+        str: The fingerprint, a hexadecimal string.
+    """
+    return hashlib.blake2b(file_path.read_bytes(), digest_size=16).hexdigest()
+
+
+@dataclass
+class VariableState:
+    """Data class containing the state of the conversion of one variable, such that new time steps can be appended."""
+
+    base_fingerprint: str
+    """str: The fingerprint of the base geometry: the vertex positions of the first time step and the triangles."""
+
+    time_index_last: int
+    """int: The last converted time index."""
+
+    color_range: Optional[Tuple[float, float]] = None
+    """Optional[Tuple[float, float]]: The z-coordinates that map to the first and last color of the colormap. None when the variable has no colormap."""
+
+    wet_vertices: Optional[np.ndarray] = None
+    """Optional[np.ndarray]: Whether each vertex was wet in any converted time step, an ndarray of bools with shape (n,). None when the variable has no dry threshold."""
+
+
+@dataclass
+class ConversionState:
+    """Data class containing the state of a conversion, such that the time steps that are added to a NetCDF file later on can be appended to the glTF file.
+
+    The geometry, color scales and culled triangles of the first conversion are kept when time steps are appended.
+    """
+
+    config_fingerprint: str
+    """str: The fingerprint of the converter configuration file."""
+
+    variables: Dict[str, VariableState] = field(default_factory=dict)
+    """Dict[str, VariableState]: The state per converted variable name."""
+
+    @staticmethod
+    def get_path(gltf: Path) -> Path:
+        """Get the path of the state file of a glTF file.
+
+        Args:
+            gltf (Path): Path to the glTF file.
+
+        Returns:
+            Path: Path to the state file, next to the glTF file.
+        """
+        return gltf.with_name(gltf.name + STATE_FILE_SUFFIX)
+
+    @classmethod
+    def from_file(cls, file_path: Path) -> "ConversionState":
+        """Read the conversion state from a JSON file.
+
+        Args:
+            file_path (Path): Path to the state file.
+
+        Returns:
+            ConversionState: The conversion state.
+        """
+        with open(file_path) as state_file:
+            content = json.load(state_file)
+
+        variables = {}
+        for name, variable in content["variables"].items():
+            color_range = variable.get("color_range")
+            wet_vertices = variable.get("wet_vertices")
+            if wet_vertices is not None:
+                packed = np.frombuffer(base64.b64decode(wet_vertices["packed"]), dtype=np.uint8)
+                wet_vertices = np.unpackbits(packed, count=wet_vertices["count"]).astype(bool)
+
+            variables[name] = VariableState(
+                variable["base_fingerprint"],
+                variable["time_index_last"],
+                tuple(color_range) if color_range is not None else None,
+                wet_vertices,
+            )
+
+        return cls(content["config_fingerprint"], variables)
+
+    def to_file(self, file_path: Path):
+        """Write the conversion state to a JSON file.
+
+        The file is replaced at once, such that an interrupted write does not leave a corrupt state file behind.
+
+        Args:
+            file_path (Path): Path to the state file.
+        """
+        variables = {}
+        for name, variable in self.variables.items():
+            content = {
+                "base_fingerprint": variable.base_fingerprint,
+                "time_index_last": variable.time_index_last,
+            }
+            if variable.color_range is not None:
+                content["color_range"] = list(variable.color_range)
+            if variable.wet_vertices is not None:
+                content["wet_vertices"] = {
+                    "count": len(variable.wet_vertices),
+                    "packed": base64.b64encode(np.packbits(variable.wet_vertices)).decode("utf-8"),
+                }
+            variables[name] = content
+
+        temporary_path = file_path.with_name(f"{file_path.name}.tmp")
+        with open(temporary_path, "w") as state_file:
+            json.dump(
+                {"config_fingerprint": self.config_fingerprint, "variables": variables},
+                state_file,
+                indent=2,
+            )
+        temporary_path.replace(file_path)
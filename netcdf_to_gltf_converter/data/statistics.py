@@ -0,0 +1,88 @@
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+from netcdf_to_gltf_converter.data.transform import AffineTransform
+
+
+@dataclass
+class VariableStatistics:
+    """Data class containing statistics of the values of a variable, collected in a single pass over the time steps."""
+
+    min: float = np.nan
+    """float: The smallest valid value. NaN when there are no valid values."""
+
+    max: float = np.nan
+    """float: The largest valid value. NaN when there are no valid values."""
+
+    sum: float = 0.0
+    """float: The sum of the valid values."""
+
+    n_values: int = 0
+    """int: The number of valid values."""
+
+    n_nan_values: int = 0
+    """int: The number of invalid (NaN) values."""
+
+    frame_ranges: List[Tuple[float, float]] = field(default_factory=list)
+    """List[Tuple[float, float]]: The smallest and largest valid value per time step, in the order in which they were added."""
+
+    @property
+    def mean(self) -> float:
+        """Get the mean of the valid values.
+
+        Returns:
+            float: The mean value. NaN when there are no valid values.
+        """
+        if self.n_values == 0:
+            return np.nan
+        return self.sum / self.n_values
+
+    def add(self, values: np.ndarray):
+        """Add the values of a time step to the statistics.
+
+        Args:
+            values (np.ndarray): The values of one time step, an ndarray of floats.
+        """
+        is_nan = np.isnan(values)
+        n_nan_values = int(np.count_nonzero(is_nan))
+        self.n_nan_values += n_nan_values
+        if n_nan_values == values.size:
+            self.frame_ranges.append((np.nan, np.nan))
+            return
+
+        valid_values = values[~is_nan] if n_nan_values > 0 else values
+        frame_min = float(valid_values.min())
+        frame_max = float(valid_values.max())
+        self.frame_ranges.append((frame_min, frame_max))
+
+        self.min = frame_min if np.isnan(self.min) else min(self.min, frame_min)
+        self.max = frame_max if np.isnan(self.max) else max(self.max, frame_max)
+        self.sum += float(valid_values.sum(dtype=np.float64))
+        self.n_values += valid_values.size
+
+    def transformed(self, transform: AffineTransform) -> "VariableStatistics":
+        """Get the statistics of the values after the vertical transformation, without revisiting the values.
+
+        Args:
+            transform (AffineTransform): The transformation of the values.
+
+        Returns:
+            VariableStatistics: The statistics of the transformed values.
+        """
+
+        def to_range(min_value: float, max_value: float) -> Tuple[float, float]:
+            # A negative scale reverses the order of the values
+            transformed_range = transform.transform_vertical(np.array([min_value, max_value]))
+            return float(np.min(transformed_range)), float(np.max(transformed_range))
+
+        min_value, max_value = to_range(self.min, self.max)
+        return VariableStatistics(
+            min=min_value,
+            max=max_value,
+            sum=(self.sum - transform.shift.z * self.n_values) * transform.scale_vertical,
+            n_values=self.n_values,
+            n_nan_values=self.n_nan_values,
+            frame_ranges=[to_range(*frame_range) for frame_range in self.frame_ranges],
+        )
@@ -0,0 +1,87 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from netcdf_to_gltf_converter.data.vector import Vec3
+
+
+@dataclass
+class AffineTransform:
+    """Data class representing the transformation of model coordinates to mesh coordinates.
+
+    The coordinates are first shifted and then scaled:
+    x' = (x - shift.x) * scale_horizontal, y' = (y - shift.y) * scale_horizontal and z' = (z - shift.z) * scale_vertical.
+    """
+
+    shift: Vec3 = field(default_factory=Vec3)
+    """Vec3: The values to subtract from the x-, y- and z-coordinates. Defaults to no shift."""
+
+    scale_horizontal: float = 1.0
+    """float: The scaling factor of the shifted x- and y-coordinates. Defaults to 1.0."""
+
+    scale_vertical: float = 1.0
+    """float: The scaling factor of the shifted z-coordinates. Defaults to 1.0."""
+
+    @property
+    def is_identity(self) -> bool:
+        """Get whether this transformation leaves all coordinates unchanged.
+
+        Returns:
+            bool: True when the shift is zero and the scaling factors are one; otherwise, False.
+        """
+        return (
+            self.shift == Vec3()
+            and self.scale_horizontal == 1.0
+            and self.scale_vertical == 1.0
+        )
+
+    def then(self, other: "AffineTransform") -> "AffineTransform":
+        """Get the transformation that applies this transformation followed by the other transformation.
+
+        ((v - s1) * k1 - s2) * k2 equals (v - (s1 + s2 / k1)) * (k1 * k2), so the result is a single shift and scale.
+
+        Args:
+            other (AffineTransform): The transformation to apply after this transformation.
+
+        Returns:
+            AffineTransform: The combined transformation.
+
+        Raises:
+            ValueError: When a scaling factor of this transformation is zero.
+        """
+        if self.scale_horizontal == 0.0 or self.scale_vertical == 0.0:
+            raise ValueError("A transformation with a zero scaling factor cannot be followed by another transformation.")
+
+        shift = Vec3(
+            self.shift.x + other.shift.x / self.scale_horizontal,
+            self.shift.y + other.shift.y / self.scale_horizontal,
+            self.shift.z + other.shift.z / self.scale_vertical,
+        )
+        return AffineTransform(
+            shift,
+            self.scale_horizontal * other.scale_horizontal,
+            self.scale_vertical * other.scale_vertical,
+        )
+
+    def transform_horizontal(self, coordinates: np.ndarray) -> np.ndarray:
+        """Transform x- and y-coordinates.
+
+        Args:
+            coordinates (np.ndarray): An ndarray of floats with shape (n, 2). Each row contains the x- and y-coordinate of a point.
+
+        Returns:
+            np.ndarray: The transformed coordinates, a new ndarray of floats with shape (n, 2).
+        """
+        shift = np.array([self.shift.x, self.shift.y])
+        return (coordinates - shift) * self.scale_horizontal
+
+    def transform_vertical(self, values: np.ndarray) -> np.ndarray:
+        """Transform z-coordinates, e.g. variable values.
+
+        Args:
+            values (np.ndarray): An ndarray of floats with the z-coordinates.
+
+        Returns:
+            np.ndarray: The transformed z-coordinates, a new ndarray of floats with the same shape.
+        """
+        return (values - self.shift.z) * self.scale_vertical
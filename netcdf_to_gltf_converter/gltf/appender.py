@@ -0,0 +1,179 @@
+import base64
+from typing import Iterator, List, Optional, Tuple
+
+from pygltflib import (ARRAY_BUFFER, DATA_URI_HEADER, GLTF2, Animation,
+                       AnimationChannel, AnimationChannelTarget,
+                       AnimationSampler, Attributes, Buffer, BufferView,
+                       Primitive)
+
+from netcdf_to_gltf_converter.data.mesh import TriangularMesh
+from netcdf_to_gltf_converter.gltf.builder import (MSFT_LOD, BuilderOptions,
+                                                   GLTFBuilder, add)
+
+
+class GLTFAppender(GLTFBuilder):
+    def __init__(self, gltf: GLTF2, options: Optional[BuilderOptions] = None) -> None:
+        """Initialize a GLTFAppender to append animation frames to the meshes of an existing glTF.
+
+        The data of the new frames is written to a new buffer. The existing buffers are kept as they are,
+        only the accessors of the animation samplers are replaced, since they cover all frames.
+
+        Assumption: the glTF was created by the GLTFBuilder with the same options and from the same triangular meshes,
+        with the morph target animation mode.
+
+        Args:
+            gltf (GLTF2): The existing glTF.
+            options (Optional[BuilderOptions], optional): The builder options. Defaults to the default BuilderOptions.
+        """
+        super().__init__(options)
+
+        self._gltf = gltf
+        self._scene_index = gltf.scene or 0
+        self._buffer = Buffer(byteLength=0, uri=b"")
+        self._buffer_index = add(self._gltf.buffers, self._buffer)
+
+        # Loaded morph targets are plain dictionaries
+        for mesh in self._gltf.meshes:
+            for primitive in mesh.primitives:
+                primitive.targets = [
+                    Attributes(**target) if isinstance(target, dict) else target
+                    for target in primitive.targets
+                ]
+
+    def append_triangular_mesh(self, mesh_index: int, triangular_mesh: TriangularMesh):
+        """Append the transformations of a triangular mesh as new frames to its node, and those of its levels of detail to their nodes.
+
+        Args:
+            mesh_index (int): The index of the triangular mesh in the order in which the meshes were added to the glTF.
+            triangular_mesh (TriangularMesh): The triangular mesh with only the new transformations.
+
+        Raises:
+            ValueError: When the triangular mesh does not match the mesh in the glTF.
+        """
+        scene = self._gltf.scenes[self._scene_index]
+        if mesh_index >= len(scene.nodes):
+            raise ValueError(f"The glTF does not contain a mesh with index {mesh_index}.")
+
+        node_index = scene.nodes[mesh_index]
+        lod_node_indices = self._gltf.nodes[node_index].extensions.get(MSFT_LOD, {}).get("ids", [])
+        if len(lod_node_indices) != len(triangular_mesh.levels_of_detail):
+            raise ValueError(
+                f"The levels of detail of mesh {mesh_index} do not match the levels of detail in the glTF."
+            )
+
+        animation = Animation()
+        self._append_frames(node_index, triangular_mesh, animation)
+        for lod_node_index, level_of_detail in zip(
+            lod_node_indices, triangular_mesh.levels_of_detail
+        ):
+            self._append_frames(lod_node_index, level_of_detail, animation)
+
+        if animation.channels:
+            self._gltf.animations.append(animation)
+
+    def _append_frames(
+        self, node_index: int, triangular_mesh: TriangularMesh, animation: Animation
+    ):
+        if len(triangular_mesh.transformations) == 0:
+            return
+
+        mesh = self._gltf.meshes[self._gltf.nodes[node_index].mesh]
+        primitive_meshes = self._get_primitive_meshes(triangular_mesh)
+        self._validate_primitives(mesh.primitives, primitive_meshes, node_index)
+
+        positions_buffer_view_index = self._add_buffer_view(byte_stride=12)
+        values_buffer_view_index = None
+        if triangular_mesh.color_scale is not None:
+            values_buffer_view_index = self._add_buffer_view(byte_stride=4)
+
+        for frame_index in range(len(triangular_mesh.transformations)):
+            self._add_morph_targets(
+                primitive_meshes,
+                mesh.primitives,
+                frame_index,
+                positions_buffer_view_index,
+                values_buffer_view_index,
+                triangular_mesh.color_scale,
+            )
+            mesh.weights.append(0.0)
+
+        sampler = self._create_weights_sampler(
+            len(mesh.weights), self._add_buffer_view(), self._add_buffer_view()
+        )
+
+        # The previous sampler accessors are replaced and removed when the append is finished
+        existing_sampler = self._get_weights_sampler(node_index)
+        if existing_sampler is not None:
+            existing_sampler.input = sampler.input
+            existing_sampler.output = sampler.output
+            return
+
+        sampler_index = add(animation.samplers, sampler)
+        target = AnimationChannelTarget(node=node_index, path="weights")
+        animation.channels.append(AnimationChannel(sampler=sampler_index, target=target))
+
+    def _validate_primitives(
+        self,
+        primitives: List[Primitive],
+        primitive_meshes: List[TriangularMesh],
+        node_index: int,
+    ):
+        n_vertices = [len(mesh.base.vertex_positions) for mesh in primitive_meshes]
+        n_positions = [self._gltf.accessors[primitive.attributes.POSITION].count for primitive in primitives]
+        if n_vertices != n_positions:
+            raise ValueError(
+                f"The vertices of the mesh of node {node_index} do not match the vertices in the glTF: {n_vertices} (mesh), {n_positions} (glTF)"
+            )
+
+    def _add_buffer_view(self, byte_stride: Optional[int] = None) -> int:
+        buffer_view = BufferView(buffer=self._buffer_index, byteOffset=0, byteLength=0)
+        if byte_stride is not None:
+            buffer_view.byteStride = byte_stride
+            buffer_view.target = ARRAY_BUFFER
+
+        return add(self._gltf.bufferViews, buffer_view)
+
+    def _get_weights_sampler(self, node_index: int) -> Optional[AnimationSampler]:
+        for animation in self._gltf.animations:
+            for channel in animation.channels:
+                if channel.target.node == node_index and channel.target.path == "weights":
+                    return animation.samplers[channel.sampler]
+
+        return None
+
+    def finish(self) -> GLTF2:
+        """Finish appending and return the results.
+
+        Returns:
+            GLTF2: The updated GLTF2 object.
+        """
+        self._remove_unused_accessors()
+        self._write_buffer_views()
+        self._remove_unused_buffer_views()
+
+        self._buffer.uri = DATA_URI_HEADER + base64.b64encode(self._buffer.uri).decode("utf-8")
+
+        return self._gltf
+
+    def _remove_unused_accessors(self):
+        references = list(self._get_accessor_references())
+        used_accessors = sorted({getattr(owner, name) for owner, name in references})
+        new_accessor_index = {old: new for new, old in enumerate(used_accessors)}
+        self._gltf.accessors = [self._gltf.accessors[i] for i in used_accessors]
+        for owner, name in references:
+            setattr(owner, name, new_accessor_index[getattr(owner, name)])
+
+    def _get_accessor_references(self) -> Iterator[Tuple[object, str]]:
+        for mesh in self._gltf.meshes:
+            for primitive in mesh.primitives:
+                if primitive.indices is not None:
+                    yield primitive, "indices"
+                for attributes in [primitive.attributes, *primitive.targets]:
+                    for name, accessor_index in vars(attributes).items():
+                        if accessor_index is not None:
+                            yield attributes, name
+
+        for animation in self._gltf.animations:
+            for sampler in animation.samplers:
+                yield sampler, "input"
+                yield sampler, "output"
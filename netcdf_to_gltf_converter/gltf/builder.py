@@ -1,17 +1,25 @@
 import base64
-from typing import Any, List
+import hashlib
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import numpy as np
-from pygltflib import (ANIM_LINEAR, ARRAY_BUFFER, DATA_URI_HEADER,
-                       ELEMENT_ARRAY_BUFFER, FLOAT, GLTF2, SCALAR,
-                       UNSIGNED_INT, VEC3, VEC4, Accessor, Animation,
+from pygltflib import (ANIM_LINEAR, ARRAY_BUFFER, CLAMP_TO_EDGE,
+                       DATA_URI_HEADER, ELEMENT_ARRAY_BUFFER, FLOAT, GLTF2,
+                       LINEAR, NEAREST, SCALAR, SHORT, UNSIGNED_BYTE, UNSIGNED_INT,
+                       UNSIGNED_SHORT, VEC2, VEC3, VEC4, Accessor, Animation,
                        AnimationChannel, AnimationChannelTarget,
-                       AnimationSampler, Attributes, Buffer, BufferView,
+                       AnimationSampler, Attributes, Buffer, BufferView, Image,
                        Material, Mesh, Node, PbrMetallicRoughness, Primitive,
-                       Scene)
+                       Sampler, Scene, Texture, TextureInfo)
 
-from netcdf_to_gltf_converter.data.mesh import TriangularMesh
+from netcdf_to_gltf_converter.config import AnimationMode, ColorMode
+from netcdf_to_gltf_converter.data.mesh import ColorScale, TriangularMesh
+from netcdf_to_gltf_converter.preprocessing.tiling import split_triangles
 from netcdf_to_gltf_converter.utils.arrays import float32_array
+from netcdf_to_gltf_converter.utils.events import EventEmitter, EventType
+from netcdf_to_gltf_converter.utils.images import encode_png
 
 PADDING_BYTE = b"\x00"
 ROTATION_MATRIX = [-0.9998477, 0, 0.0174524, 0,
@@ -19,6 +27,24 @@ ROTATION_MATRIX = [-0.9998477, 0, 0.0174524, 0,
                     0, 1, 0, 0,
                     0, 0, 0, 1]
 """Rotation matrix to flip the y and z axes and rotate the model 179 degrees around the up-axis."""
+MAX_PRIMITIVE_VERTICES = 65535
+"""The maximum number of vertices in a primitive when meshes are split, such that 16-bit indices can be used."""
+MSFT_LOD = "MSFT_lod"
+"""Name of the glTF extension that defines the levels of detail of a node."""
+MSFT_SCREENCOVERAGE = "MSFT_screencoverage"
+"""Name of the node extras property that defines the minimum screen coverage per level of detail."""
+COLORMAP_WIDTH = 256
+"""The number of pixels of the 1D colormap textures."""
+PNG_DATA_URI_HEADER = "data:image/png;base64,"
+"""Header of the data URI of embedded PNG images."""
+MAX_VERTEX_TEXTURE_WIDTH = 4096
+"""The maximum width of a vertex animation texture. The vertices of a frame are wrapped over multiple rows when they exceed this width."""
+MAX_VERTEX_TEXTURE_HEIGHT = 16384
+"""The maximum height of a vertex animation texture, the maximum texture size that most GPUs support. The frames are split over multiple textures when they exceed this height."""
+VERTEX_ANIMATION_TEXTURE = "vertexAnimationTexture"
+"""Name of the primitive extras property that describes the vertex animation texture of the primitive."""
+ACCESSOR_CACHE_NAME = "accessors"
+"""The name of the cache of accessors with identical content in the cache events."""
 
 def add(list: List, item: Any) -> int:
     index = len(list)
@@ -26,38 +52,122 @@ def add(list: List, item: Any) -> int:
     return index
 
 
+@dataclass
+class BuilderOptions:
+    """Data class containing the options of the GLTFBuilder."""
+
+    split_primitives: bool = False
+    """bool: Whether to split meshes with more than 65,535 vertices into multiple primitives, such that each primitive can use 16-bit indices. Defaults to False."""
+
+    color_mode: ColorMode = ColorMode.VERTEX
+    """ColorMode: The method to store the uniform color of the meshes. Defaults to ColorMode.VERTEX."""
+
+    animation_mode: AnimationMode = AnimationMode.MORPH_TARGETS
+    """AnimationMode: The method to animate the meshes. Defaults to AnimationMode.MORPH_TARGETS."""
+
+    separate_morph_targets: bool = False
+    """bool: Whether to store the morph targets in the animation buffers instead of the geometry buffers, such that the geometry and color buffers only contain the base geometry and are the same for any selection of frames. Defaults to False."""
+
+
 class GLTFBuilder:
-    def __init__(self) -> None:
+    def __init__(
+        self, options: Optional[BuilderOptions] = None, events: Optional[EventEmitter] = None
+    ) -> None:
         """Initialize a GLTFBuilder.
 
+        The indices of each primitive are stored with the narrowest component type that can hold them.
+        Accessors with identical content, such as the indices of meshes that share a triangulation,
+        are written only once and shared between the primitives. Each accessor that is shared emits a cache hit event
+        of the `accessors` cache, and each accessor that is written a cache miss event.
+
         Assumption: the GLTF will contain only one scene.
+
+        Args:
+            options (Optional[BuilderOptions], optional): The builder options. Defaults to the default BuilderOptions.
+            events (Optional[EventEmitter], optional): The emitter of the conversion events. Defaults to a new EventEmitter.
         """
 
+        self._options = options or BuilderOptions()
+        self._events = events or EventEmitter()
+        self._accessors_by_content: Dict[Tuple[int, str, bool, bool, bytes], int] = {}
+        self._textures_by_colors: Dict[Tuple[Tuple[float, ...], ...], int] = {}
+        self._samplers_by_filter: Dict[int, int] = {}
+        self._buffer_view_data: Dict[int, List[bytes]] = defaultdict(list)
+        self._morph_target_buffer_views: Set[int] = set()
         self._gltf = GLTF2()
         self._scene_index = add(self._gltf.scenes, Scene())
         self._gltf.scene = self._scene_index
 
+    @property
+    def events(self) -> EventEmitter:
+        """EventEmitter: The emitter of the conversion events, to which listeners can be added."""
+        return self._events
+
     def add_triangular_mesh(self, triangular_mesh: TriangularMesh):
         """Add a new mesh given the triangular mesh geometry.
 
+        When the triangular mesh has coarser levels of detail, these are added as
+        alternative nodes with the MSFT_lod extension.
+
         Args:
             triangular_mesh (TriangularMesh): The triangular mesh.
         """
 
+        animation = Animation()
+
+        node_index = self._add_mesh_node(triangular_mesh, animation)
+        scene = self._gltf.scenes[self._scene_index]
+        scene.nodes.append(node_index)
+
+        if triangular_mesh.levels_of_detail:
+            lod_node_indices = [
+                self._add_mesh_node(level_of_detail, animation)
+                for level_of_detail in triangular_mesh.levels_of_detail
+            ]
+            self._add_levels_of_detail(
+                node_index, lod_node_indices, triangular_mesh.screen_coverage
+            )
+
+        if animation.channels:
+            self._gltf.animations.append(animation)
+
+    def _add_levels_of_detail(
+        self, node_index: int, lod_node_indices: List[int], screen_coverage: List[float]
+    ):
+        node = self._gltf.nodes[node_index]
+        node.extensions[MSFT_LOD] = {"ids": lod_node_indices}
+        node.extras[MSFT_SCREENCOVERAGE] = screen_coverage
+
+        if MSFT_LOD not in self._gltf.extensionsUsed:
+            self._gltf.extensionsUsed.append(MSFT_LOD)
+
+    def _add_mesh_node(
+        self, triangular_mesh: TriangularMesh, animation: Animation
+    ) -> int:
+        color_scale = triangular_mesh.color_scale
+        use_vertex_colors = (
+            color_scale is None and self._options.color_mode == ColorMode.VERTEX
+        )
         material_model = PbrMetallicRoughness(
             metallicFactor=triangular_mesh.metallic_factor,
             roughnessFactor=triangular_mesh.roughness_factor,
         )
+        if color_scale is not None:
+            material_model.baseColorTexture = TextureInfo(
+                index=self._get_colormap_texture(color_scale.colors), texCoord=0
+            )
+        elif not use_vertex_colors:
+            material_model.baseColorFactor = list(triangular_mesh.base.mesh_color)
         material = Material(pbrMetallicRoughness=material_model)
         material_index = add(self._gltf.materials, material)
         mesh_index = add(self._gltf.meshes, Mesh())
-        node_index = add(self._gltf.nodes, Node(mesh=mesh_index, matrix=ROTATION_MATRIX))
-        scene = self._gltf.scenes[self._scene_index]
-        scene.nodes.append(node_index)
+        node_matrix = GLTFBuilder._get_node_matrix(triangular_mesh.constant_height)
+        node_index = add(self._gltf.nodes, Node(mesh=mesh_index, matrix=node_matrix))
 
         # Add a buffer for the mesh geometry, colors and animation
         geometry_buffer_index = add(self._gltf.buffers, Buffer(byteLength=0, uri=b""))
-        color_buffer_index = add(self._gltf.buffers, Buffer(byteLength=0, uri=b""))
+        if use_vertex_colors:
+            color_buffer_index = add(self._gltf.buffers, Buffer(byteLength=0, uri=b""))
 
         # Add a buffer view for the indices
         indices_buffer_view_index = add(
@@ -82,47 +192,109 @@ class GLTFBuilder:
             ),
         )
 
+        # Add buffer view for the normalized values that are looked up in the colormap and their displacements
+        values_buffer_view_index = None
+        if color_scale is not None:
+            values_buffer_view_index = add(
+                self._gltf.bufferViews,
+                BufferView(
+                    buffer=geometry_buffer_index,
+                    byteOffset=0,
+                    byteLength=0,
+                    byteStride=4,
+                    target=ARRAY_BUFFER,
+                ),
+            )
+
         # Add buffer view for the vertex colors
-        colors_buffer_view_index = add(
-            self._gltf.bufferViews,
-            BufferView(
-                buffer=color_buffer_index,
-                byteOffset=0,
-                byteLength=0,
-            ),
-        )
+        if use_vertex_colors:
+            colors_buffer_view_index = add(
+                self._gltf.bufferViews,
+                BufferView(
+                    buffer=color_buffer_index,
+                    byteOffset=0,
+                    byteLength=0,
+                ),
+            )
 
-        indices_accessor_index = self._add_accessor_to_bufferview(
-            triangular_mesh.triangles,
-            indices_buffer_view_index,
-            UNSIGNED_INT,
-            SCALAR,
-        )
-        positions_accessor_index = self._add_accessor_to_bufferview(
-            triangular_mesh.base.vertex_positions,
-            positions_buffer_view_index,
-            FLOAT,
-            VEC3,
-        )
-        colors_accessor_index = self._add_accessor_to_bufferview(
-            triangular_mesh.base.vertex_colors,
-            colors_buffer_view_index,
-            FLOAT,
-            VEC4,
-        )
+        primitive_meshes = self._get_primitive_meshes(triangular_mesh)
+        primitives = []
 
-        primitive = Primitive(
-            attributes=Attributes(
-                POSITION=positions_accessor_index, COLOR_0=colors_accessor_index
-            ),
-            indices=indices_accessor_index,
-            material=material_index,
-        )
-        self._gltf.meshes[mesh_index].primitives.append(primitive)
+        for primitive_mesh in primitive_meshes:
+            triangles, index_component_type = GLTFBuilder._narrow_indices(
+                primitive_mesh.triangles
+            )
+            indices_accessor_index = self._add_accessor_to_bufferview(
+                triangles,
+                indices_buffer_view_index,
+                index_component_type,
+                SCALAR,
+            )
+            # Flat meshes share the positions of other flat meshes on the same grid, their height is set by the node
+            vertex_positions = primitive_mesh.base.vertex_positions
+            if triangular_mesh.constant_height is not None:
+                vertex_positions = vertex_positions.copy()
+                vertex_positions[:, -1] = 0.0
+
+            positions_accessor_index = self._add_accessor_to_bufferview(
+                vertex_positions,
+                positions_buffer_view_index,
+                FLOAT,
+                VEC3,
+            )
+            attributes = Attributes(POSITION=positions_accessor_index)
+            if use_vertex_colors:
+                attributes.COLOR_0 = self._add_accessor_to_bufferview(
+                    primitive_mesh.base.vertex_colors,
+                    colors_buffer_view_index,
+                    FLOAT,
+                    VEC4,
+                )
+            if color_scale is not None:
+                attributes.TEXCOORD_0 = self._add_accessor_to_bufferview(
+                    GLTFBuilder._get_texture_coordinates(
+                        primitive_mesh.base.vertex_positions[:, -1], color_scale
+                    ),
+                    values_buffer_view_index,
+                    UNSIGNED_SHORT,
+                    VEC2,
+                    normalized=True,
+                )
+
+            primitive = Primitive(
+                attributes=attributes,
+                indices=indices_accessor_index,
+                material=material_index,
+            )
+            self._gltf.meshes[mesh_index].primitives.append(primitive)
+            primitives.append(primitive)
 
         n_transformations = len(triangular_mesh.transformations)
         if n_transformations == 0:
-            return
+            return node_index
+
+        if self._options.animation_mode == AnimationMode.VERTEX_TEXTURE:
+            # Add buffer view for the coordinates of the vertices in the vertex animation texture
+            lookup_buffer_view_index = add(
+                self._gltf.bufferViews,
+                BufferView(
+                    buffer=geometry_buffer_index,
+                    byteOffset=0,
+                    byteLength=0,
+                    byteStride=8,
+                    target=ARRAY_BUFFER,
+                ),
+            )
+            texture_coordinate_set = 0 if color_scale is None else 1
+            for primitive_mesh, primitive in zip(primitive_meshes, primitives):
+                self._add_vertex_animation_texture(
+                    primitive_mesh,
+                    primitive,
+                    lookup_buffer_view_index,
+                    texture_coordinate_set,
+                )
+
+            return node_index
 
         animation_buffer_index = add(self._gltf.buffers, Buffer(byteLength=0, uri=b""))
 
@@ -138,112 +310,404 @@ class GLTFBuilder:
             BufferView(buffer=animation_buffer_index, byteOffset=0, byteLength=0),
         )
 
-        time_frames = []
-        weights = []
+        # Add buffer views for the morph targets, separate from the base geometry
+        if self._options.separate_morph_targets:
+            positions_buffer_view_index = self._add_morph_target_buffer_view(
+                animation_buffer_index, byte_stride=12
+            )
+            if color_scale is not None:
+                values_buffer_view_index = self._add_morph_target_buffer_view(
+                    animation_buffer_index, byte_stride=4
+                )
+
+        for frame_index in range(n_transformations):
+            self._add_morph_targets(
+                primitive_meshes,
+                primitives,
+                frame_index,
+                positions_buffer_view_index,
+                values_buffer_view_index,
+                color_scale,
+            )
+            self._gltf.meshes[mesh_index].weights.append(0.0)
+
+        sampler = self._create_weights_sampler(
+            n_transformations,
+            time_frames_buffer_view_index,
+            weights_buffer_view_index,
+        )
+        sample_index = add(animation.samplers, sampler)
+        target = AnimationChannelTarget(node=node_index, path="weights")
+        channel = AnimationChannel(sampler=sample_index, target=target)
+        animation.channels.append(channel)
+
+        return node_index
 
-        for frame_index, transformation in enumerate(triangular_mesh.transformations):
+    def _add_morph_target_buffer_view(self, buffer_index: int, byte_stride: int) -> int:
+        buffer_view = BufferView(
+            buffer=buffer_index,
+            byteOffset=0,
+            byteLength=0,
+            byteStride=byte_stride,
+            target=ARRAY_BUFFER,
+        )
+        buffer_view_index = add(self._gltf.bufferViews, buffer_view)
+        self._morph_target_buffer_views.add(buffer_view_index)
+        return buffer_view_index
+
+    def _add_morph_targets(
+        self,
+        primitive_meshes: List[TriangularMesh],
+        primitives: List[Primitive],
+        frame_index: int,
+        positions_buffer_view_index: int,
+        values_buffer_view_index: Optional[int],
+        color_scale: Optional[ColorScale],
+    ):
+        for primitive_mesh, primitive in zip(primitive_meshes, primitives):
             positions_accessor_index = self._add_accessor_to_bufferview(
-                transformation.vertex_positions,
+                primitive_mesh.transformations[frame_index].vertex_positions,
                 positions_buffer_view_index,
                 FLOAT,
                 VEC3,
             )
 
             target_attr = Attributes(POSITION=positions_accessor_index)
+            if color_scale is not None:
+                target_attr.TEXCOORD_0 = self._add_accessor_to_bufferview(
+                    GLTFBuilder._get_texture_coordinate_displacements(
+                        primitive_mesh, frame_index, color_scale
+                    ),
+                    values_buffer_view_index,
+                    SHORT,
+                    VEC2,
+                    normalized=True,
+                )
             primitive.targets.append(target_attr)
 
-            self._gltf.meshes[mesh_index].weights.append(0.0)
-
-            time_frames.append(float(frame_index))
-
-            weights_for_frame = n_transformations * [0.0]
-            weights_for_frame[frame_index] = 1.0
-            weights.append(weights_for_frame)
-
-        # Add time frames accessor
+    def _create_weights_sampler(
+        self,
+        n_frames: int,
+        time_frames_buffer_view_index: int,
+        weights_buffer_view_index: int,
+    ) -> AnimationSampler:
+        # Each time frame, one per second, shows one morph target at full weight
         time_frames_accessor_index = self._add_accessor_to_bufferview(
-            float32_array(time_frames),
+            float32_array(np.arange(n_frames)),
             time_frames_buffer_view_index,
             FLOAT,
             SCALAR,
         )
-
-        # Add weights accessor
         weights_accessor_index = self._add_accessor_to_bufferview(
-            float32_array(weights),
+            float32_array(np.eye(n_frames)),
             weights_buffer_view_index,
             FLOAT,
             SCALAR,
         )
 
-        animation = Animation()
-        sampler = AnimationSampler(
+        return AnimationSampler(
             input=time_frames_accessor_index,
             interpolation=ANIM_LINEAR,
             output=weights_accessor_index,
         )
-        sample_index = add(animation.samplers, sampler)
-        target = AnimationChannelTarget(node=node_index, path="weights")
-        channel = AnimationChannel(sampler=sample_index, target=target)
-        animation.channels.append(channel)
 
-        self._gltf.animations.append(animation)
+    def _get_primitive_meshes(
+        self, triangular_mesh: TriangularMesh
+    ) -> List[TriangularMesh]:
+        n_vertices = len(triangular_mesh.base.vertex_positions)
+        if not self._options.split_primitives or n_vertices <= MAX_PRIMITIVE_VERTICES:
+            return [triangular_mesh]
+
+        return [
+            triangular_mesh.extract(triangle_indices)
+            for triangle_indices in split_triangles(
+                triangular_mesh.triangles, MAX_PRIMITIVE_VERTICES
+            )
+        ]
+
+    def _get_colormap_texture(self, colors: List[List[float]]) -> int:
+        colors_key = tuple(tuple(color) for color in colors)
+        texture_index = self._textures_by_colors.get(colors_key)
+        if texture_index is not None:
+            return texture_index
+
+        # Resample the evenly spaced colors to a 1D image, such that linear filtering interpolates between them
+        color_positions = np.linspace(0.0, 1.0, len(colors))
+        pixel_positions = (np.arange(COLORMAP_WIDTH) + 0.5) / COLORMAP_WIDTH
+        pixels = np.column_stack(
+            [
+                np.interp(pixel_positions, color_positions, channel)
+                for channel in np.transpose(colors)
+            ]
+        )
+        pixels = np.round(pixels * 255).astype(np.uint8).reshape(1, COLORMAP_WIDTH, 4)
+        png = encode_png(pixels)
+
+        image = Image(
+            uri=PNG_DATA_URI_HEADER + base64.b64encode(png).decode("utf-8"),
+            mimeType="image/png",
+        )
+        image_index = add(self._gltf.images, image)
+        texture = Texture(sampler=self._get_sampler(LINEAR), source=image_index)
+        texture_index = add(self._gltf.textures, texture)
+        self._textures_by_colors[colors_key] = texture_index
+
+        return texture_index
+
+    def _get_sampler(self, filter: int) -> int:
+        sampler_index = self._samplers_by_filter.get(filter)
+        if sampler_index is None:
+            sampler = Sampler(
+                magFilter=filter,
+                minFilter=filter,
+                wrapS=CLAMP_TO_EDGE,
+                wrapT=CLAMP_TO_EDGE,
+            )
+            sampler_index = add(self._gltf.samplers, sampler)
+            self._samplers_by_filter[filter] = sampler_index
+
+        return sampler_index
+
+    def _add_vertex_animation_texture(
+        self,
+        triangular_mesh: TriangularMesh,
+        primitive: Primitive,
+        lookup_buffer_view_index: int,
+        texture_coordinate_set: int,
+    ):
+        displacements = np.array(
+            [
+                transformation.vertex_positions[:, -1]
+                for transformation in triangular_mesh.transformations
+            ]
+        )
+        textures, lookup_coordinates, rows_per_frame, min_value, max_value = (
+            GLTFBuilder._encode_vertex_animation_texture(displacements)
+        )
+
+        texture_indices = []
+        for pixels in textures:
+            image = Image(
+                uri=PNG_DATA_URI_HEADER + base64.b64encode(encode_png(pixels)).decode("utf-8"),
+                mimeType="image/png",
+            )
+            image_index = add(self._gltf.images, image)
+            texture = Texture(sampler=self._get_sampler(NEAREST), source=image_index)
+            texture_indices.append(add(self._gltf.textures, texture))
+
+        lookup_accessor_index = self._add_accessor_to_bufferview(
+            lookup_coordinates, lookup_buffer_view_index, FLOAT, VEC2
+        )
+        setattr(
+            primitive.attributes,
+            f"TEXCOORD_{texture_coordinate_set}",
+            lookup_accessor_index,
+        )
+
+        primitive.extras[VERTEX_ANIMATION_TEXTURE] = {
+            "textures": texture_indices,
+            "texCoord": texture_coordinate_set,
+            "frameCount": len(displacements),
+            "framesPerTexture": textures[0].shape[0] // rows_per_frame,
+            "rowsPerFrame": rows_per_frame,
+            "encoding": "RG16",
+            "minDisplacement": min_value,
+            "maxDisplacement": max_value,
+        }
+
+    @staticmethod
+    def _encode_vertex_animation_texture(
+        displacements: np.ndarray,
+    ) -> Tuple[List[np.ndarray], np.ndarray, int, float, float]:
+        n_frames, n_vertices = displacements.shape
+        width = max(min(n_vertices, MAX_VERTEX_TEXTURE_WIDTH), 1)
+        rows_per_frame = max(-(-n_vertices // width), 1)
+        if rows_per_frame > MAX_VERTEX_TEXTURE_HEIGHT:
+            raise ValueError(
+                f"A vertex animation texture supports at most {MAX_VERTEX_TEXTURE_WIDTH * MAX_VERTEX_TEXTURE_HEIGHT} vertices per primitive, got {n_vertices}."
+            )
+
+        # All textures have the same height, such that the lookup coordinates apply to each texture
+        frames_per_texture = min(n_frames, MAX_VERTEX_TEXTURE_HEIGHT // rows_per_frame)
+        n_textures = -(-n_frames // frames_per_texture)
+        height = frames_per_texture * rows_per_frame
+
+        is_valid = np.isfinite(displacements)
+        min_value = float(displacements[is_valid].min()) if is_valid.any() else 0.0
+        max_value = float(displacements[is_valid].max()) if is_valid.any() else 0.0
+        value_range = max_value - min_value if max_value > min_value else 1.0
+
+        # Quantize to 16 bits, stored as the high byte in the red channel and the low byte in the green channel
+        normalized = np.nan_to_num((displacements - min_value) / value_range)
+        quantized = np.round(np.clip(normalized, 0.0, 1.0) * np.iinfo(np.uint16).max)
+        quantized = quantized.astype(np.uint16)
+
+        pixels = np.zeros((n_textures * frames_per_texture, rows_per_frame * width, 4), dtype=np.uint8)
+        pixels[:n_frames, :n_vertices, 0] = quantized >> 8
+        pixels[:n_frames, :n_vertices, 1] = quantized & 0xFF
+        pixels[:, :, 3] = 255
+        textures = list(pixels.reshape(n_textures, height, width, 4))
+
+        # Pixel centers in the first frame of a texture, a shader selects texture frame // frames per texture
+        # and offsets v by (frame % frames per texture) * rows per frame / height
+        vertex_indices = np.arange(n_vertices)
+        lookup_coordinates = np.column_stack(
+            [
+                (vertex_indices % width + 0.5) / width,
+                (vertex_indices // width + 0.5) / height,
+            ]
+        ).astype(np.float32)
+
+        return textures, lookup_coordinates, rows_per_frame, min_value, max_value
+
+    @staticmethod
+    def _normalize_values(values: np.ndarray, color_scale: ColorScale) -> np.ndarray:
+        value_range = color_scale.max_value - color_scale.min_value
+        if value_range <= 0:
+            value_range = 1.0
+
+        normalized_values = (values - color_scale.min_value) / value_range
+        return np.clip(np.nan_to_num(normalized_values), 0.0, 1.0)
+
+    @staticmethod
+    def _get_texture_coordinates(
+        values: np.ndarray, color_scale: ColorScale
+    ) -> np.ndarray:
+        # The u-coordinate is the normalized value, the v-coordinate is the middle of the 1D colormap
+        texture_coordinates = np.empty((len(values), 2), dtype=np.uint16)
+        texture_coordinates[:, 0] = np.round(
+            GLTFBuilder._normalize_values(values, color_scale) * np.iinfo(np.uint16).max
+        )
+        texture_coordinates[:, 1] = np.iinfo(np.uint16).max // 2
+        return texture_coordinates
+
+    @staticmethod
+    def _get_texture_coordinate_displacements(
+        triangular_mesh: TriangularMesh, frame_index: int, color_scale: ColorScale
+    ) -> np.ndarray:
+        base_values = triangular_mesh.base.vertex_positions[:, -1]
+        frame_values = (
+            base_values
+            + triangular_mesh.transformations[frame_index].vertex_positions[:, -1]
+        )
+
+        # Displacements relative to the quantized base coordinates, such that quantization errors do not accumulate
+        base_coordinates = GLTFBuilder._get_texture_coordinates(base_values, color_scale)
+        displacements = np.zeros((len(base_values), 2), dtype=np.int16)
+        displacements[:, 0] = np.round(
+            (
+                GLTFBuilder._normalize_values(frame_values, color_scale)
+                - base_coordinates[:, 0] / np.iinfo(np.uint16).max
+            )
+            * np.iinfo(np.int16).max
+        )
+        return displacements
+
+    @staticmethod
+    def _get_node_matrix(height: Optional[float]) -> List[float]:
+        if height is None:
+            return ROTATION_MATRIX
+
+        # Translate along the mesh z-axis, which the rotation maps onto the up-axis
+        matrix = np.array(ROTATION_MATRIX, dtype=np.float64).reshape(4, 4).T
+        matrix[:3, 3] = matrix[:3, :3] @ [0.0, 0.0, height]
+        return matrix.T.ravel().tolist()
+
+    @staticmethod
+    def _narrow_indices(triangles: np.ndarray) -> Tuple[np.ndarray, int]:
+        # The maximum value of a component type is reserved for primitive restart
+        max_index = int(triangles.max())
+        if max_index < np.iinfo(np.uint8).max:
+            return triangles.astype(np.uint8), UNSIGNED_BYTE
+        if max_index < np.iinfo(np.uint16).max:
+            return triangles.astype(np.uint16), UNSIGNED_SHORT
+
+        return triangles, UNSIGNED_INT
 
     def add_data_to_buffer(self, data: bytes, buffer: Buffer):
         buffer.uri += data
         buffer.byteLength += len(data)
 
     def _add_accessor_to_bufferview(
-        self, data: np.ndarray, buffer_view_index: int, component_type: int, type: str
+        self,
+        data: np.ndarray,
+        buffer_view_index: int,
+        component_type: int,
+        type: str,
+        normalized: bool = False,
     ) -> int:
         data_binary_blob = data.flatten().tobytes()
 
-        # Get offset and length accessor where offset is the offset within the bufferview
+        # Morph targets are not shared with the base geometry, since they may be stored in other buffers
+        content_key = (
+            component_type,
+            type,
+            normalized,
+            buffer_view_index in self._morph_target_buffer_views,
+            hashlib.blake2b(data_binary_blob, digest_size=16).digest(),
+        )
+        accessor_index = self._accessors_by_content.get(content_key)
+        if accessor_index is not None:
+            self._events.emit(EventType.CACHE_HIT, ACCESSOR_CACHE_NAME, len(data_binary_blob))
+            return accessor_index
+        self._events.emit(EventType.CACHE_MISS, ACCESSOR_CACHE_NAME, len(data_binary_blob))
+
+        # Get offset of the accessor within the bufferview, aligned to 4 bytes
         buffer_view = self._gltf.bufferViews[buffer_view_index]
+        buffer_view_data = self._buffer_view_data[buffer_view_index]
+        n_padding_bytes = -buffer_view.byteLength % 4
+        if n_padding_bytes != 0:
+            buffer_view_data.append(n_padding_bytes * PADDING_BYTE)
+            buffer_view.byteLength += n_padding_bytes
         accessor_byte_offset = buffer_view.byteLength
-        accessor_byte_length = len(data_binary_blob)
-
-        # Set offset and length buffer view
-        buffer_ = self._gltf.buffers[buffer_view.buffer]
-        if buffer_view.byteLength == 0:
-            self._set_offset_bufferview_including_padding(buffer_view, buffer_)
-        buffer_view.byteLength += accessor_byte_length
 
-        # Add data to buffer
-        self.add_data_to_buffer(data_binary_blob, buffer_)
+        # The data of the buffer views is written to the buffers when the build is finished,
+        # such that the data of each buffer view stays contiguous
+        buffer_view_data.append(data_binary_blob)
+        buffer_view.byteLength += len(data_binary_blob)
 
         data_max, data_min, data_count = self._get_min_max_count(data, type)
         accessor = Accessor(
-            bufferView=self._gltf.bufferViews.index(buffer_view),
+            bufferView=buffer_view_index,
             byteOffset=accessor_byte_offset,
             componentType=component_type,
+            normalized=normalized,
             count=data_count,
             type=type,
             max=data_max,
             min=data_min,
         )
 
-        return add(self._gltf.accessors, accessor)
+        accessor_index = add(self._gltf.accessors, accessor)
+        self._accessors_by_content[content_key] = accessor_index
+        return accessor_index
 
     def _set_offset_bufferview_including_padding(
         self, buffer_view: BufferView, buffer: Buffer
     ):
         byte_offset = buffer.byteLength
-        n_padding_bytes = (
-            byte_offset % 4
-        )  # add padding bytes between bufferviews if needed, TODO number of bytes should be according to accessor componenttype,
+        # Align buffer views to 4 bytes, which satisfies the alignment of every component type and of vertex attributes
+        n_padding_bytes = -byte_offset % 4
         if n_padding_bytes != 0:
             byte_offset += n_padding_bytes
             self.add_data_to_buffer(n_padding_bytes * PADDING_BYTE, buffer)
 
         buffer_view.byteOffset = byte_offset
 
+    def _write_buffer_views(self):
+        for buffer_view_index in sorted(self._buffer_view_data):
+            buffer_view = self._gltf.bufferViews[buffer_view_index]
+            buffer = self._gltf.buffers[buffer_view.buffer]
+            self._set_offset_bufferview_including_padding(buffer_view, buffer)
+            for data in self._buffer_view_data.pop(buffer_view_index):
+                self.add_data_to_buffer(data, buffer)
+
     def _get_min_max_count(self, data: np.ndarray, type: str):
         if type == SCALAR:
             data_max = [int(data.max())]
             data_min = [int(data.min())]
             data_count = data.size
-        elif type == VEC3 or type == VEC4:
+        elif type == VEC2 or type == VEC3 or type == VEC4:
             data_max = data.max(axis=0).tolist()
             data_min = data.min(axis=0).tolist()
             data_count = len(data)
@@ -258,7 +722,26 @@ class GLTFBuilder:
         Returns:
             GLTF2: The created GLTF2 object.
         """
+        self._write_buffer_views()
+        self._remove_unused_buffer_views()
+
         for buffer in self._gltf.buffers:
             buffer.uri = DATA_URI_HEADER + base64.b64encode(buffer.uri).decode("utf-8")
 
         return self._gltf
+
+    def _remove_unused_buffer_views(self):
+        # Buffer views and buffers stay unused when all their accessors were shared with other meshes
+        buffer_views = self._gltf.bufferViews
+        used_buffer_views = sorted({accessor.bufferView for accessor in self._gltf.accessors})
+        new_buffer_view_index = {old: new for new, old in enumerate(used_buffer_views)}
+        self._gltf.bufferViews = [buffer_views[i] for i in used_buffer_views]
+        for accessor in self._gltf.accessors:
+            accessor.bufferView = new_buffer_view_index[accessor.bufferView]
+
+        buffers = self._gltf.buffers
+        used_buffers = sorted({buffer_view.buffer for buffer_view in self._gltf.bufferViews})
+        new_buffer_index = {old: new for new, old in enumerate(used_buffers)}
+        self._gltf.buffers = [buffers[i] for i in used_buffers]
+        for buffer_view in self._gltf.bufferViews:
+            buffer_view.buffer = new_buffer_index[buffer_view.buffer]
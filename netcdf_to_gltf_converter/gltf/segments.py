@@ -0,0 +1,298 @@
+import base64
+import json
+import logging
+import struct
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+from pygltflib import BIN, DATA_URI_HEADER, GLTF2, GLTF_VERSION, JSON, MAGIC, Buffer
+
+from netcdf_to_gltf_converter.config import Segmentation
+from netcdf_to_gltf_converter.data.mesh import TriangularMesh
+from netcdf_to_gltf_converter.gltf.builder import (PADDING_BYTE,
+                                                   BuilderOptions,
+                                                   GLTFBuilder)
+from netcdf_to_gltf_converter.gltf.exporter import Exporter
+
+SegmentImporter = Callable[[List[int]], List[TriangularMesh]]
+"""A callable that imports the triangular meshes with only the frames of the given time indices."""
+
+
+@dataclass
+class Segment:
+    """Data class representing a time span of the animation that is exported to its own glTF file."""
+
+    frame_indices: List[int]
+    """List[int]: The indices of the frames (transformations) of the meshes within the segment."""
+
+    time_indices: List[int]
+    """List[int]: The time index of each frame."""
+
+    times: np.ndarray
+    """np.ndarray: The time of each frame."""
+
+
+def split_into_segments(
+    time_indices: List[int], frame_times: np.ndarray, duration: float
+) -> List[Segment]:
+    """Split the frames of an animation into segments with a fixed time span.
+
+    The time spans start at the time of the first frame. Time spans without frames are skipped.
+
+    Args:
+        time_indices (List[int]): The time index of each frame.
+        frame_times (np.ndarray): The time of each frame, in ascending order: datetimes or numbers in seconds.
+        duration (float): The time span of each segment in seconds.
+
+    Returns:
+        List[Segment]: The segments, in chronological order.
+    """
+    if len(frame_times) == 0:
+        return [Segment([], [], frame_times)]
+
+    elapsed_times = frame_times - frame_times[0]
+    if np.issubdtype(elapsed_times.dtype, np.timedelta64):
+        elapsed_times = elapsed_times / np.timedelta64(1, "s")
+
+    segment_numbers = np.floor(elapsed_times / duration).astype(np.int64)
+    _, segment_starts = np.unique(segment_numbers, return_index=True)
+    return [
+        Segment(
+            frame_indices.tolist(),
+            [time_indices[i] for i in frame_indices],
+            frame_times[frame_indices],
+        )
+        for frame_indices in np.split(np.arange(len(frame_times)), segment_starts[1:])
+    ]
+
+
+class SegmentExporter:
+    """Class to export the animation of triangular meshes as a sequence of time segments.
+
+    Each segment is exported to its own animated glTF file, containing the base geometry and only the frames within
+    the time span of the segment. A JSON manifest describes the segments and their time ranges, such that a viewer can
+    load only the segment of the time window that is played. The frames of each segment are imported in the process
+    that exports the segment, such that only the frames of the segments that are exported at the same time are in memory.
+    """
+
+    def __init__(
+        self, segmentation: Segmentation, builder_options: Optional[BuilderOptions] = None
+    ) -> None:
+        """Initialize a SegmentExporter with the specified arguments.
+
+        Args:
+            segmentation (Segmentation): The configuration settings for the segmentation.
+            builder_options (Optional[BuilderOptions], optional): The options of the glTF builder for each segment. Defaults to the default BuilderOptions.
+        """
+        self._segmentation = segmentation
+        self._builder_options = builder_options or BuilderOptions()
+        if segmentation.shared_geometry:
+            self._builder_options = replace(self._builder_options, separate_morph_targets=True)
+
+    def export(
+        self,
+        import_segment: SegmentImporter,
+        time_indices: List[int],
+        frame_times: np.ndarray,
+        file_path: Path,
+    ) -> Path:
+        """Export the animation of the triangular meshes as a sequence of time segments.
+
+        The segments are written next to the provided file path with the name `<name>_segment<number><extension>`.
+        With shared geometry, the base geometry is written once to `<name>_base.bin`, which each segment refers to.
+        The manifest is written to `<name>_segments.json`.
+
+        Args:
+            import_segment (SegmentImporter): Imports the triangular meshes with the frames of a segment, given the time indices of the segment.
+                It is called in the worker process of the segment, so it should be picklable.
+            time_indices (List[int]): The time index of each frame of the animation.
+            frame_times (np.ndarray): The time of each frame of the animation.
+            file_path (Path): The file path of the glTF file, a .gltf or .glb file, that determines the location, name and format of the segments.
+
+        Returns:
+            Path: The file path of the manifest.
+        """
+        segments = split_into_segments(time_indices, frame_times, self._segmentation.duration)
+        logging.info(f"SEGMENT animation into {len(segments)} segments of {self._segmentation.duration} seconds")
+
+        base_path = None
+        if self._segmentation.shared_geometry:
+            base_path = file_path.with_name(f"{file_path.stem}_base.bin")
+
+        with ProcessPoolExecutor(max_workers=self._segmentation.n_workers) as executor:
+            futures = []
+            for segment_index, segment in enumerate(segments):
+                future = executor.submit(
+                    _export_segment,
+                    import_segment,
+                    segment.time_indices,
+                    SegmentExporter._get_segment_path(file_path, segment_index),
+                    self._builder_options,
+                    base_path,
+                    segment_index == 0,
+                )
+                futures.append(future)
+
+            for future in futures:
+                future.result()
+
+        manifest: Dict[str, Any] = {"duration": self._segmentation.duration}
+        if base_path is not None:
+            manifest["base"] = base_path.name
+        manifest["segments"] = [
+            self._get_manifest_segment(segment, SegmentExporter._get_segment_path(file_path, segment_index))
+            for segment_index, segment in enumerate(segments)
+        ]
+
+        manifest_path = file_path.with_name(f"{file_path.stem}_segments.json")
+        with open(manifest_path, "w") as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+
+        return manifest_path
+
+    @staticmethod
+    def _get_manifest_segment(segment: Segment, segment_path: Path) -> Dict[str, Any]:
+        manifest_segment: Dict[str, Any] = {
+            "uri": segment_path.name,
+            "n_frames": len(segment.frame_indices),
+        }
+        if segment.frame_indices:
+            manifest_segment.update(
+                {
+                    "time_index_start": segment.time_indices[0],
+                    "time_index_end": segment.time_indices[-1],
+                    "time_start": SegmentExporter._format_time(segment.times[0]),
+                    "time_end": SegmentExporter._format_time(segment.times[-1]),
+                }
+            )
+        return manifest_segment
+
+    @staticmethod
+    def _format_time(time: Any) -> Any:
+        if isinstance(time, np.datetime64):
+            return str(np.datetime_as_string(time, unit="s"))
+        return float(time)
+
+    @staticmethod
+    def _get_segment_path(file_path: Path, segment_index: int) -> Path:
+        return file_path.with_name(
+            f"{file_path.stem}_segment{segment_index:03d}{file_path.suffix}"
+        )
+
+
+def share_base_geometry(gltf: GLTF2, base_uri: str) -> Tuple[bytes, bytes]:
+    """Move the buffers with the base geometry of a glTF to one external buffer.
+
+    The buffers that are not used by morph targets or animation samplers contain the base geometry.
+    These are combined into one buffer that refers to an external binary file, and the other buffers are combined into
+    one embedded buffer. The embedded buffer is the first buffer, such that it can be stored in the binary chunk of a GLB file.
+
+    Assumption: the glTF was created by the GLTFBuilder with the `separate_morph_targets` option and has data URI buffers.
+
+    Args:
+        gltf (GLTF2): The glTF, which is updated.
+        base_uri (str): The URI of the external binary file, relative to the glTF file.
+
+    Returns:
+        Tuple[bytes, bytes]: The content of the external buffer with the base geometry, and of the embedded buffer.
+    """
+    animation_buffers = {
+        gltf.bufferViews[gltf.accessors[accessor_index].bufferView].buffer
+        for accessor_index in _get_animation_accessors(gltf)
+    }
+    base_blob, base_offsets = _concatenate_buffers(
+        gltf, [i for i in range(len(gltf.buffers)) if i not in animation_buffers]
+    )
+    embedded_blob, embedded_offsets = _concatenate_buffers(gltf, sorted(animation_buffers))
+
+    buffers = []
+    if embedded_offsets:
+        encoded_blob = base64.b64encode(embedded_blob).decode("utf-8")
+        buffers.append(Buffer(byteLength=len(embedded_blob), uri=DATA_URI_HEADER + encoded_blob))
+    buffers.append(Buffer(byteLength=len(base_blob), uri=base_uri))
+
+    for buffer_view in gltf.bufferViews:
+        if buffer_view.buffer in base_offsets:
+            buffer_view.byteOffset += base_offsets[buffer_view.buffer]
+            buffer_view.buffer = len(buffers) - 1
+        else:
+            buffer_view.byteOffset += embedded_offsets[buffer_view.buffer]
+            buffer_view.buffer = 0
+    gltf.buffers = buffers
+
+    return base_blob, embedded_blob
+
+
+def _get_animation_accessors(gltf: GLTF2):
+    for mesh in gltf.meshes:
+        for primitive in mesh.primitives:
+            for target in primitive.targets:
+                for accessor_index in vars(target).values():
+                    if accessor_index is not None:
+                        yield accessor_index
+
+    for animation in gltf.animations:
+        for sampler in animation.samplers:
+            yield sampler.input
+            yield sampler.output
+
+
+def _concatenate_buffers(gltf: GLTF2, buffer_indices: List[int]) -> Tuple[bytes, Dict[int, int]]:
+    blob = bytearray()
+    offsets = {}
+    for buffer_index in buffer_indices:
+        # Align buffers to 4 bytes, such that the alignment of their buffer views is kept
+        blob += -len(blob) % 4 * PADDING_BYTE
+        offsets[buffer_index] = len(blob)
+        blob += gltf.decode_data_uri(gltf.buffers[buffer_index].uri)
+
+    return bytes(blob), offsets
+
+
+def _save_binary(gltf: GLTF2, embedded_blob: bytes, file_path: Path):
+    # pygltflib embeds external buffers when it saves a GLB file, so the GLB file is composed here
+    if gltf.buffers[0].uri.startswith("data"):
+        gltf.buffers[0].uri = None
+
+    json_blob = gltf.gltf_to_json(separators=(",", ":"), indent=None).encode("utf-8")
+    json_blob += -len(json_blob) % 4 * b" "
+    chunks = struct.pack("<I", len(json_blob)) + JSON.encode("utf-8") + json_blob
+    if gltf.buffers[0].uri is None:
+        embedded_blob += -len(embedded_blob) % 4 * PADDING_BYTE
+        chunks += struct.pack("<I", len(embedded_blob)) + BIN.encode("utf-8") + embedded_blob
+
+    header = MAGIC + struct.pack("<II", GLTF_VERSION, 12 + len(chunks))
+    file_path.write_bytes(header + chunks)
+
+
+def _export_segment(
+    import_segment: SegmentImporter,
+    time_indices: List[int],
+    file_path: Path,
+    builder_options: BuilderOptions,
+    base_path: Optional[Path],
+    write_base: bool,
+):
+    triangular_meshes = import_segment(time_indices)
+    builder = GLTFBuilder(builder_options)
+    for triangular_mesh in triangular_meshes:
+        builder.add_triangular_mesh(triangular_mesh)
+    gltf = builder.finish()
+
+    if base_path is None:
+        Exporter().export(gltf, file_path)
+        return
+
+    # The base geometry is the same in each segment, so it is written by one of the segments
+    base_blob, embedded_blob = share_base_geometry(gltf, base_path.name)
+    if write_base:
+        base_path.write_bytes(base_blob)
+
+    file_extension = file_path.suffix.lower()
+    if file_extension == ".glb":
+        _save_binary(gltf, embedded_blob, file_path)
+    else:
+        Exporter().export(gltf, file_path)
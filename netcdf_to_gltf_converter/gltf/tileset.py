@@ -0,0 +1,197 @@
+import json
+import logging
+import os
+from concurrent.futures import (FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                wait)
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from netcdf_to_gltf_converter.config import Tiling
+from netcdf_to_gltf_converter.data.mesh import TriangularMesh
+from netcdf_to_gltf_converter.gltf.builder import (ROTATION_MATRIX, BuilderOptions,
+                                              GLTFBuilder)
+from netcdf_to_gltf_converter.gltf.exporter import Exporter
+from netcdf_to_gltf_converter.preprocessing.tiling import (Tile,
+                                                           partition_quadtree)
+
+TILESET_VERSION = "1.1"
+"""The 3D Tiles version of the tileset manifest."""
+Y_UP_TO_Z_UP = np.array([[1, 0, 0], [0, 0, -1], [0, 1, 0]])
+"""Rotation matrix that 3D Tiles applies to glTF content to convert the y-up axis to the z-up axis."""
+CONTENT_ROTATION = Y_UP_TO_Z_UP @ np.array(ROTATION_MATRIX).reshape(4, 4).T[:3, :3]
+"""Rotation matrix from the mesh coordinates to the coordinates of the tileset."""
+
+Box = Tuple[np.ndarray, np.ndarray]
+"""An axis aligned box in mesh coordinates, defined by the minimum and maximum x-, y- and z-coordinate."""
+
+
+class TilesetExporter:
+    """Class to export triangular meshes as a set of spatial tiles.
+
+    Each tile is exported to its own animated glTF file, containing only the vertices and frames within the tile.
+    A 3D Tiles tileset manifest describes the tiles and their bounding volumes.
+    """
+
+    def __init__(
+        self, tiling: Tiling, builder_options: Optional[BuilderOptions] = None
+    ) -> None:
+        """Initialize a TilesetExporter with the specified arguments.
+
+        Args:
+            tiling (Tiling): The configuration settings for the tiling.
+            builder_options (Optional[BuilderOptions], optional): The options of the glTF builder for each tile. Defaults to the default BuilderOptions.
+        """
+        self._tiling = tiling
+        self._builder_options = builder_options or BuilderOptions()
+
+    def export(self, triangular_meshes: List[TriangularMesh], file_path: Path) -> Path:
+        """Export the triangular meshes as a set of spatial tiles.
+
+        The quadtree is built over the triangle centroids of all meshes, such that meshes with a
+        different triangulation (e.g. after culling dry triangles) are partitioned into the same tiles.
+        The tiles are written next to the provided file path with the name `<name>_tile<quadkey><extension>`.
+        The tileset manifest is written to `<name>_tileset.json`.
+        Levels of detail are not included in the tiles.
+
+        Args:
+            triangular_meshes (List[TriangularMesh]): The triangular meshes to export.
+            file_path (Path): The file path of the glTF file, a .gltf or .glb file, that determines the location, name and format of the tiles.
+
+        Returns:
+            Path: The file path of the tileset manifest.
+        """
+        centroids = [
+            TilesetExporter._get_triangle_centroids(triangular_mesh)
+            for triangular_mesh in triangular_meshes
+        ]
+        root = partition_quadtree(
+            np.unique(np.concatenate(centroids), axis=0),
+            self._tiling.max_triangles_per_tile,
+            self._tiling.max_depth,
+        )
+        assignments = [root.assign(mesh_centroids) for mesh_centroids in centroids]
+        leaves = root.leaves()
+        logging.info(f"TILING meshes into {len(leaves)} tiles")
+
+        boxes: Dict[str, Box] = {}
+        n_workers = self._tiling.n_workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            # Tiles are extracted when a worker is free, such that only the meshes of the running tiles are in memory
+            running: Set[Future] = set()
+            for leaf in leaves:
+                if len(running) >= n_workers:
+                    done, running = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        future.result()
+
+                tile_meshes = [
+                    triangular_mesh.extract(assignment[leaf.quadkey])
+                    for triangular_mesh, assignment in zip(
+                        triangular_meshes, assignments
+                    )
+                    if len(assignment[leaf.quadkey]) > 0
+                ]
+                boxes[leaf.quadkey] = TilesetExporter._get_box(tile_meshes)
+
+                tile_path = TilesetExporter._get_tile_path(file_path, leaf)
+                running.add(
+                    executor.submit(_export_tile, tile_meshes, tile_path, self._builder_options)
+                )
+                del tile_meshes
+
+            for future in running:
+                future.result()
+
+        root_tile = self._get_tileset_tile(root, boxes, file_path)
+        root_tile["refine"] = "ADD"
+        tileset = {
+            "asset": {"version": TILESET_VERSION},
+            "geometricError": root_tile["geometricError"],
+            "root": root_tile,
+        }
+
+        tileset_path = file_path.with_name(f"{file_path.stem}_tileset.json")
+        with open(tileset_path, "w") as tileset_file:
+            json.dump(tileset, tileset_file, indent=2)
+
+        return tileset_path
+
+    def _get_tileset_tile(
+        self, tile: Tile, boxes: Dict[str, Box], file_path: Path
+    ) -> Dict[str, Any]:
+        if tile.is_leaf:
+            box = boxes[tile.quadkey]
+            return {
+                "boundingVolume": {"box": TilesetExporter._to_bounding_box(box)},
+                "geometricError": 0.0,
+                "content": {
+                    "uri": TilesetExporter._get_tile_path(file_path, tile).name
+                },
+            }
+
+        children = [
+            self._get_tileset_tile(child, boxes, file_path) for child in tile.children
+        ]
+        box = TilesetExporter._get_union(
+            [boxes[leaf.quadkey] for leaf in tile.leaves()]
+        )
+        min_corner, max_corner = box
+        return {
+            "boundingVolume": {"box": TilesetExporter._to_bounding_box(box)},
+            "geometricError": float(np.linalg.norm(max_corner - min_corner)),
+            "children": children,
+        }
+
+    @staticmethod
+    def _get_triangle_centroids(triangular_mesh: TriangularMesh) -> np.ndarray:
+        node_coordinates = triangular_mesh.base.vertex_positions[:, :2]
+        return node_coordinates[triangular_mesh.triangles].mean(axis=1)
+
+    @staticmethod
+    def _get_tile_path(file_path: Path, tile: Tile) -> Path:
+        return file_path.with_name(
+            f"{file_path.stem}_tile{tile.quadkey}{file_path.suffix}"
+        )
+
+    @staticmethod
+    def _get_box(triangular_meshes: List[TriangularMesh]) -> Box:
+        min_corners = []
+        max_corners = []
+        for triangular_mesh in triangular_meshes:
+            vertex_positions = triangular_mesh.base.vertex_positions
+            min_corners.append(np.nanmin(vertex_positions, axis=0))
+            max_corners.append(np.nanmax(vertex_positions, axis=0))
+
+            for transformation in triangular_mesh.transformations:
+                frame_positions = vertex_positions + transformation.vertex_positions
+                min_corners.append(np.nanmin(frame_positions, axis=0))
+                max_corners.append(np.nanmax(frame_positions, axis=0))
+
+        return np.min(min_corners, axis=0), np.max(max_corners, axis=0)
+
+    @staticmethod
+    def _get_union(boxes: List[Box]) -> Box:
+        min_corner = np.min([min_corner for min_corner, _ in boxes], axis=0)
+        max_corner = np.max([max_corner for _, max_corner in boxes], axis=0)
+        return min_corner, max_corner
+
+    @staticmethod
+    def _to_bounding_box(box: Box) -> List[float]:
+        min_corner, max_corner = box
+        center = CONTENT_ROTATION @ ((min_corner + max_corner) / 2)
+        half_axes = CONTENT_ROTATION * ((max_corner - min_corner) / 2)
+        return [float(value) for value in np.concatenate([center, half_axes.T.ravel()])]
+
+
+def _export_tile(
+    triangular_meshes: List[TriangularMesh],
+    file_path: Path,
+    builder_options: BuilderOptions,
+):
+    builder = GLTFBuilder(builder_options)
+    for triangular_mesh in triangular_meshes:
+        builder.add_triangular_mesh(triangular_mesh)
+
+    Exporter().export(builder.finish(), file_path)
@@ -0,0 +1,412 @@
+import logging
+import math
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import xarray as xr
+
+from netcdf_to_gltf_converter.config import (AnimationMode, ColorMode, Config,
+                                             ModelType)
+from netcdf_to_gltf_converter.netcdf.netcdf_data import (
+    DatasetBase, get_coordinate_variables)
+from netcdf_to_gltf_converter.netcdf.parser import Parser
+from netcdf_to_gltf_converter.netcdf.ugrid.ugrid_data import UgridDataset
+from netcdf_to_gltf_converter.netcdf.xbeach.xbeach_data import XBeachDataset
+
+BYTES_PER_VERTEX_FRAME = 48
+"""The estimated peak memory per vertex per frame per variable: the vertex positions of the mesh (12 bytes), the glTF buffer data (12 bytes), its base64 encoding (16 bytes) and the interpolation (8 bytes)."""
+BYTES_PER_TRIANGLE = 52
+"""The estimated peak memory per triangle per mesh: the triangles of the mesh (24 bytes), the glTF buffer data (12 bytes) and its base64 encoding (16 bytes)."""
+BYTES_PER_ACCESSOR = 200
+"""The estimated size of the compact JSON of one glTF accessor and its buffer view."""
+BYTES_PER_MESH = 400
+"""The estimated size of the compact JSON of one glTF mesh, its node and its material."""
+MAX_STRIDE = 64
+"""The largest row and column stride of a regular grid that is suggested."""
+
+
+@dataclass
+class GridSize:
+    """Data class containing the size of a triangulated grid."""
+
+    n_vertices: int
+    """int: The number of vertices."""
+
+    n_triangles: int
+    """int: The number of triangles."""
+
+    width: float
+    """float: The width of the bounding box of the grid in model units."""
+
+    height: float
+    """float: The height of the bounding box of the grid in model units."""
+
+    def subsample(self, stride: int) -> "GridSize":
+        """Get the approximate size of the grid when every stride-th row and column is kept.
+
+        Args:
+            stride (int): The row and column stride.
+
+        Returns:
+            GridSize: The size of the subsampled grid.
+        """
+        return GridSize(
+            math.ceil(self.n_vertices / stride**2),
+            math.ceil(self.n_triangles / stride**2),
+            self.width,
+            self.height,
+        )
+
+
+@dataclass
+class MeshEstimate:
+    """Data class containing the estimated size of one glTF mesh."""
+
+    name: str
+    """str: The name of the mesh: the variable name, followed by the threshold or the cell size of the level of detail."""
+
+    n_vertices: int
+    """int: The number of vertices."""
+
+    n_triangles: int
+    """int: The number of triangles."""
+
+    n_frames: int
+    """int: The number of frames of the animation, excluding the base geometry."""
+
+    vertex_colors: bool
+    """bool: Whether the mesh has vertex colors."""
+
+    colormap: bool
+    """bool: Whether the mesh is colored with a colormap texture."""
+
+    def get_peak_memory(self) -> int:
+        """Get the estimated peak memory of the conversion of the mesh.
+
+        Returns:
+            int: The estimated peak memory in bytes.
+        """
+        return (
+            self.n_vertices * (self.n_frames + 1) * BYTES_PER_VERTEX_FRAME
+            + self.n_triangles * BYTES_PER_TRIANGLE
+        )
+
+    def get_buffer_bytes(self, animation_mode: AnimationMode) -> int:
+        """Get the estimated size of the binary data of the mesh.
+
+        The vertex animation texture is counted uncompressed, so the size of its PNG image is an upper bound.
+
+        Args:
+            animation_mode (AnimationMode): The animation mode.
+
+        Returns:
+            int: The estimated size in bytes.
+        """
+        n_bytes = 3 * self.n_triangles * _get_index_size(self.n_vertices) + 12 * self.n_vertices
+        if self.vertex_colors:
+            n_bytes += 16 * self.n_vertices
+        if self.colormap:
+            n_bytes += 4 * self.n_vertices
+
+        if self.n_frames == 0:
+            return n_bytes
+
+        if animation_mode == AnimationMode.VERTEX_TEXTURE:
+            # The RGBA pixels of the texture and the float VEC2 texture coordinates of the vertices in the texture
+            return n_bytes + 4 * self.n_vertices * self.n_frames + 8 * self.n_vertices
+
+        bytes_per_target = 12 * self.n_vertices + (4 * self.n_vertices if self.colormap else 0)
+        # The times and the weights of all morph targets per time
+        animation_bytes = 4 * self.n_frames + 4 * self.n_frames**2
+        return n_bytes + self.n_frames * bytes_per_target + animation_bytes
+
+    def get_accessor_count(self, animation_mode: AnimationMode) -> int:
+        """Get the number of glTF accessors of the mesh.
+
+        Args:
+            animation_mode (AnimationMode): The animation mode.
+
+        Returns:
+            int: The number of accessors.
+        """
+        n_accessors = 2 + int(self.vertex_colors) + int(self.colormap)
+        if self.n_frames == 0:
+            return n_accessors
+        if animation_mode == AnimationMode.VERTEX_TEXTURE:
+            return n_accessors + 1
+        return n_accessors + self.n_frames * (1 + int(self.colormap)) + 2
+
+
+@dataclass
+class Suggestion:
+    """Data class representing configuration settings with which a conversion fits in the memory budget."""
+
+    settings: Dict[str, int]
+    """Dict[str, int]: The value per setting, e.g. `times_per_frame`. Nested settings are separated by a dot, e.g. `regular_grid.row_stride`."""
+
+    peak_memory: int
+    """int: The estimated peak memory of the conversion with these settings in bytes."""
+
+    n_frames: int
+    """int: The number of frames of the animation with these settings, excluding the base geometry."""
+
+
+@dataclass
+class ConversionEstimate:
+    """Data class containing the estimated peak memory and output size of a conversion."""
+
+    n_vertices: int
+    """int: The number of vertices of the triangulated grid."""
+
+    n_triangles: int
+    """int: The number of triangles of the triangulated grid."""
+
+    meshes: List[MeshEstimate]
+    """List[MeshEstimate]: The estimated size of each glTF mesh, including the threshold meshes and levels of detail."""
+
+    peak_memory: int
+    """int: The estimated peak memory of the conversion in bytes."""
+
+    output_bytes: Dict[str, Dict[str, int]]
+    """Dict[str, Dict[str, int]]: The estimated size of the glTF file in bytes per animation mode and per file extension, .glb or .gltf."""
+
+    memory_budget: Optional[int] = None
+    """Optional[int]: The memory budget in bytes. None when there is no budget."""
+
+    suggestions: List[Suggestion] = field(default_factory=list)
+    """List[Suggestion]: The settings with which the conversion fits in the memory budget, when it does not fit with the current settings."""
+
+    @property
+    def fits_in_budget(self) -> bool:
+        """bool: Whether the estimated peak memory fits in the memory budget. True when there is no budget."""
+        return self.memory_budget is None or self.peak_memory <= self.memory_budget
+
+    def to_dict(self) -> dict:
+        """Get the estimate as a dictionary that can be written as JSON.
+
+        Returns:
+            dict: The estimate.
+        """
+        return {**asdict(self), "fits_in_budget": self.fits_in_budget}
+
+
+class Estimator:
+    """Class to estimate the peak memory and output size of a conversion from the grid and the dimensions in the NetCDF file.
+
+    Only the grid is read; no data values are read. The estimates assume that all triangles are wet, so they are an
+    upper bound for variables of which the dry triangles are culled. The vertex and triangle counts of the levels of
+    detail are estimated from the number of cells of their cell size within the bounding box of the grid.
+    """
+
+    def estimate(
+        self,
+        netcdf_dataset: xr.Dataset,
+        config: Config,
+        memory_budget: Optional[int] = None,
+    ) -> ConversionEstimate:
+        """Estimate the peak memory and output size of a conversion.
+
+        Args:
+            netcdf_dataset (xr.Dataset): The NetCDF dataset.
+            config (Config): The converter configuration.
+            memory_budget (Optional[int], optional): The memory budget in bytes. When the estimated peak memory exceeds it,
+                settings are suggested with which the conversion fits. Defaults to None.
+
+        Returns:
+            ConversionEstimate: The estimate.
+
+        Raises:
+            ValueError: When the dataset does not contain a variable of the configuration.
+        """
+        subset = config.subset.geometry if config.subset else None
+        if config.model_type == ModelType.DHYDRO:
+            dataset = UgridDataset(netcdf_dataset, subset)
+        elif config.model_type == ModelType.XBEACH:
+            dataset = XBeachDataset(netcdf_dataset, config.regular_grid, subset)
+
+        grid_size = Estimator._get_grid_size(dataset)
+        n_time_steps = Estimator._get_n_time_steps(dataset, config)
+        meshes = Estimator._get_meshes(config, grid_size, n_time_steps)
+        estimate = ConversionEstimate(
+            n_vertices=grid_size.n_vertices,
+            n_triangles=grid_size.n_triangles,
+            meshes=meshes,
+            peak_memory=Estimator._get_peak_memory(meshes),
+            output_bytes={
+                str(animation_mode): Estimator._get_output_bytes(meshes, animation_mode)
+                for animation_mode in AnimationMode
+            },
+            memory_budget=memory_budget,
+        )
+
+        logging.info(
+            f"ESTIMATE {estimate.n_vertices} vertices, {estimate.n_triangles} triangles, {len(meshes)} meshes: "
+            f"peak memory {estimate.peak_memory} bytes"
+        )
+
+        if not estimate.fits_in_budget:
+            estimate.suggestions = Estimator._get_suggestions(config, grid_size, n_time_steps, memory_budget)
+            for suggestion in estimate.suggestions:
+                logging.info(f"SUGGEST {suggestion.settings}: peak memory {suggestion.peak_memory} bytes")
+
+        return estimate
+
+    @staticmethod
+    def _get_grid_size(dataset: DatasetBase) -> GridSize:
+        # Each face with n nodes is triangulated into n - 2 triangles
+        face_node_connectivity = dataset.face_node_connectivity
+        n_face_nodes = np.count_nonzero(face_node_connectivity != dataset.fill_value, axis=1)
+        min_x, min_y, max_x, max_y = dataset.bounds
+        return GridSize(
+            n_vertices=len(dataset.node_coordinates),
+            n_triangles=int(np.sum(n_face_nodes - 2)),
+            width=max_x - min_x,
+            height=max_y - min_y,
+        )
+
+    @staticmethod
+    def _get_n_time_steps(dataset: DatasetBase, config: Config) -> Dict[str, int]:
+        n_time_steps = {}
+        for variable in config.variables:
+            data = dataset.get_array(variable.name)
+            time_var = get_coordinate_variables(data, ("time",))[0]
+            n_time_steps[variable.name] = time_var.size
+        return n_time_steps
+
+    @staticmethod
+    def _get_meshes(config: Config, grid_size: GridSize, n_time_steps: Dict[str, int]) -> List[MeshEstimate]:
+        meshes = []
+        for variable in config.variables:
+            n_frames = len(Parser._get_time_indices(n_time_steps[variable.name] - 1, config))
+            colormap = variable.colormap is not None
+            vertex_colors = not colormap and config.color_mode == ColorMode.VERTEX
+            meshes.append(
+                MeshEstimate(variable.name, grid_size.n_vertices, grid_size.n_triangles, n_frames, vertex_colors, colormap)
+            )
+
+            if config.levels_of_detail:
+                for level in config.levels_of_detail.levels:
+                    n_rows = max(math.ceil(grid_size.height / level.cell_size), 1)
+                    n_columns = max(math.ceil(grid_size.width / level.cell_size), 1)
+                    meshes.append(
+                        MeshEstimate(
+                            f"{variable.name} LOD {level.cell_size}",
+                            min(grid_size.n_vertices, (n_rows + 1) * (n_columns + 1)),
+                            min(grid_size.n_triangles, 2 * n_rows * n_columns),
+                            n_frames,
+                            vertex_colors,
+                            colormap,
+                        )
+                    )
+
+            if variable.use_threshold:
+                meshes.append(
+                    MeshEstimate(
+                        f"{variable.name} threshold",
+                        grid_size.n_vertices,
+                        grid_size.n_triangles,
+                        0,
+                        config.color_mode == ColorMode.VERTEX,
+                        False,
+                    )
+                )
+
+        return meshes
+
+    @staticmethod
+    def _get_peak_memory(meshes: List[MeshEstimate]) -> int:
+        return sum(mesh.get_peak_memory() for mesh in meshes)
+
+    @staticmethod
+    def _get_output_bytes(meshes: List[MeshEstimate], animation_mode: AnimationMode) -> Dict[str, int]:
+        buffer_bytes = sum(mesh.get_buffer_bytes(animation_mode) for mesh in meshes)
+        json_bytes = BYTES_PER_ACCESSOR * sum(mesh.get_accessor_count(animation_mode) for mesh in meshes)
+        json_bytes += BYTES_PER_MESH * len(meshes)
+        # A .gltf file contains indented JSON, about twice the size, and embeds the buffers as base64 data URIs
+        return {
+            ".glb": json_bytes + buffer_bytes,
+            ".gltf": 2 * json_bytes + math.ceil(buffer_bytes / 3) * 4,
+        }
+
+    @staticmethod
+    def _get_suggestions(
+        config: Config,
+        grid_size: GridSize,
+        n_time_steps: Dict[str, int],
+        memory_budget: int,
+    ) -> List[Suggestion]:
+        suggestions = []
+
+        times_per_frame = Estimator._find_times_per_frame(config, grid_size, n_time_steps, memory_budget)
+        if times_per_frame is not None:
+            suggestions.append(
+                Estimator._create_suggestion(
+                    {"times_per_frame": times_per_frame},
+                    config.copy(update={"times_per_frame": times_per_frame}),
+                    grid_size,
+                    n_time_steps,
+                )
+            )
+
+        if config.model_type == ModelType.XBEACH:
+            for stride in range(2, MAX_STRIDE + 1):
+                subsampled_size = grid_size.subsample(stride)
+                meshes = Estimator._get_meshes(config, subsampled_size, n_time_steps)
+                if Estimator._get_peak_memory(meshes) <= memory_budget:
+                    settings = {
+                        "regular_grid.row_stride": config.regular_grid.row_stride * stride,
+                        "regular_grid.column_stride": config.regular_grid.column_stride * stride,
+                    }
+                    suggestions.append(Estimator._create_suggestion(settings, config, subsampled_size, n_time_steps))
+                    break
+
+        return suggestions
+
+    @staticmethod
+    def _find_times_per_frame(
+        config: Config,
+        grid_size: GridSize,
+        n_time_steps: Dict[str, int],
+        memory_budget: int,
+    ) -> Optional[int]:
+        # The peak memory decreases with the times per frame, so the smallest times per frame that fits is searched by bisection
+        def fits(times_per_frame: int) -> bool:
+            meshes = Estimator._get_meshes(config.copy(update={"times_per_frame": times_per_frame}), grid_size, n_time_steps)
+            return Estimator._get_peak_memory(meshes) <= memory_budget
+
+        low = config.times_per_frame + 1
+        high = max(max(n_time_steps.values()), low)
+        if not fits(high):
+            return None
+
+        while low < high:
+            middle = (low + high) // 2
+            if fits(middle):
+                high = middle
+            else:
+                low = middle + 1
+        return low
+
+    @staticmethod
+    def _create_suggestion(
+        settings: Dict[str, int],
+        config: Config,
+        grid_size: GridSize,
+        n_time_steps: Dict[str, int],
+    ) -> Suggestion:
+        meshes = Estimator._get_meshes(config, grid_size, n_time_steps)
+        return Suggestion(
+            settings=settings,
+            peak_memory=Estimator._get_peak_memory(meshes),
+            n_frames=max((mesh.n_frames for mesh in meshes), default=0),
+        )
+
+
+def _get_index_size(n_vertices: int) -> int:
+    # The indices are narrowed to the smallest unsigned integer type that fits the largest vertex index
+    if n_vertices - 1 < np.iinfo(np.uint8).max:
+        return 1
+    if n_vertices - 1 < np.iinfo(np.uint16).max:
+        return 2
+    return 4
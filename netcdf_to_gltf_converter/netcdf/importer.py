@@ -1,35 +1,170 @@
+from copy import deepcopy
 from pathlib import Path
-from typing import List
+from typing import List, Optional, Tuple
 
+import numpy as np
 import xarray as xr
 
-from netcdf_to_gltf_converter.config import Config
+from netcdf_to_gltf_converter.config import Config, ModelType
 from netcdf_to_gltf_converter.data.mesh import TriangularMesh
+from netcdf_to_gltf_converter.data.state import ConversionState
+from netcdf_to_gltf_converter.netcdf.estimator import (ConversionEstimate,
+                                                       Estimator)
 from netcdf_to_gltf_converter.netcdf.parser import Parser
+from netcdf_to_gltf_converter.netcdf.ugrid.partitions import (
+    find_partition_files, merge_partitions)
+from netcdf_to_gltf_converter.utils.events import EventEmitter
 
 
 class Importer:
     """Class to import TriangularMeshes from a source file."""
 
-    def __init__(self) -> None:
-        """Initialize an Importer."""
-        self._parser = Parser()
+    def __init__(self, events: Optional[EventEmitter] = None) -> None:
+        """Initialize an Importer.
 
-    def import_from(self, file_path: Path, config: Config) -> List[TriangularMesh]:
+        Args:
+            events (Optional[EventEmitter], optional): The emitter of the conversion events, which is shared with the parser. Defaults to a new EventEmitter.
+        """
+        self._events = events or EventEmitter()
+        self._parser = Parser(self._events)
+
+    def import_from(
+        self,
+        file_path: Path,
+        config: Config,
+        state: Optional[ConversionState] = None,
+    ) -> List[TriangularMesh]:
         """Imports triangular meshes from the given NetCDF file.
 
+        When the NetCDF file is the map file of one partition of a partitioned D-HYDRO model, e.g. model_0000_map.nc,
+        the map files of all partitions are merged into one grid.
+
         Args:
             file_path (Path): Path to the source NetCDF file.
             config (Path): Path to the converter configuration file.
+            state (Optional[ConversionState], optional): The state of a previous conversion, which is updated with this conversion.
+                For the variables in the state, only the new time steps are imported as transformations. Defaults to None.
+
+        Returns:
+            List[TriangularMesh]: The list of imported triangular meshes.
+
+        Raises:
+            ValueError: When the NetCDF file does not exist.
+        """
+        if not file_path.is_file():
+            raise ValueError(f"NetCDF file does not exist: {file_path}")
+
+        with self._events.stage("open"):
+            ds = Importer._open_dataset(file_path, config)
+        return self._parser.parse(ds, config, state)
+
+    def import_state(self, file_path: Path, config: Config, state: ConversionState):
+        """Imports the state of the whole animation from the given NetCDF file, without keeping the frames.
+
+        The time steps are read one at a time to determine the color scales and the wet areas of the whole animation,
+        such that windows of the animation can be imported on their own with `import_window`.
+
+        Args:
+            file_path (Path): Path to the source NetCDF file.
+            config (Config): The converter configuration.
+            state (ConversionState): The state without variables, which is updated with the state of the whole animation.
+
+        Raises:
+            ValueError: When the NetCDF file does not exist.
+        """
+        if not file_path.is_file():
+            raise ValueError(f"NetCDF file does not exist: {file_path}")
+
+        with self._events.stage("open"):
+            ds = Importer._open_dataset(file_path, config)
+        self._parser.parse(ds, config, state, keep_frames=False)
+
+    def import_window(
+        self,
+        file_path: Path,
+        config: Config,
+        state: ConversionState,
+        time_indices: List[int],
+    ) -> List[TriangularMesh]:
+        """Imports triangular meshes with only the frames of a window of the animation from the given NetCDF file.
+
+        The meshes have the color scales and culled dry triangles of the state, such that the meshes of all windows match.
+
+        Args:
+            file_path (Path): Path to the source NetCDF file.
+            config (Config): The converter configuration.
+            state (ConversionState): The state of the whole animation, imported with `import_state`. The state is not updated.
+            time_indices (List[int]): The consecutive time indices of the frames within the window.
 
         Returns:
             List[TriangularMesh]: The list of imported triangular meshes.
 
+        Raises:
+            ValueError: When the NetCDF file does not exist.
+        """
+        # Only the time steps after the last converted time step of the state are imported, up to the end of the window
+        time_index_end = time_indices[-1] if time_indices else config.time_index_start
+        window_state = deepcopy(state)
+        for variable_state in window_state.variables.values():
+            variable_state.time_index_last = time_indices[0] - 1 if time_indices else time_index_end
+
+        window_config = config.copy(update={"time_index_end": time_index_end})
+        return self.import_from(file_path, window_config, window_state)
+
+    def estimate(
+        self,
+        file_path: Path,
+        config: Config,
+        memory_budget: Optional[int] = None,
+    ) -> ConversionEstimate:
+        """Estimates the peak memory and output size of the conversion of the given NetCDF file, without reading any data values.
+
+        Args:
+            file_path (Path): Path to the source NetCDF file.
+            config (Config): The converter configuration.
+            memory_budget (Optional[int], optional): The memory budget in bytes. When the estimated peak memory exceeds it,
+                settings are suggested with which the conversion fits. Defaults to None.
+
+        Returns:
+            ConversionEstimate: The estimate.
+
+        Raises:
+            ValueError: When the NetCDF file does not exist.
+        """
+        if not file_path.is_file():
+            raise ValueError(f"NetCDF file does not exist: {file_path}")
+
+        with Importer._open_dataset(file_path, config) as ds:
+            return Estimator().estimate(ds, config, memory_budget)
+
+    @staticmethod
+    def _open_dataset(file_path: Path, config: Config) -> xr.Dataset:
+        # The map files of all partitions of a partitioned D-HYDRO model are merged into one grid
+        partition_files = []
+        if config.model_type == ModelType.DHYDRO:
+            partition_files = find_partition_files(file_path)
+
+        if len(partition_files) > 1:
+            return merge_partitions(partition_files)
+        return xr.open_dataset(str(file_path))
+
+    def import_frame_times(self, file_path: Path, config: Config) -> Tuple[List[int], np.ndarray]:
+        """Imports the time indices and times of the animation frames from the given NetCDF file, without reading any data values.
+
+        For a partitioned D-HYDRO model, the times are read from the given partition.
+
+        Args:
+            file_path (Path): Path to the source NetCDF file.
+            config (Config): The converter configuration.
+
+        Returns:
+            Tuple[List[int], np.ndarray]: The time index and time of each frame.
+
         Raises:
             ValueError: When the NetCDF file does not exist.
         """
         if not file_path.is_file():
             raise ValueError(f"NetCDF file does not exist: {file_path}")
 
-        ds = xr.open_dataset(str(file_path))
-        return self._parser.parse(ds, config)
+        with xr.open_dataset(str(file_path)) as ds:
+            return Parser.get_frame_times(ds, config)
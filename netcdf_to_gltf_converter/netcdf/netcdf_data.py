@@ -1,13 +1,19 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import xarray as xr
 import xugrid.ugrid.connectivity as connectivity
 from xugrid.ugrid.conventions import X_STANDARD_NAMES, Y_STANDARD_NAMES
 
+from netcdf_to_gltf_converter.config import TriangleOrder
+from netcdf_to_gltf_converter.data.statistics import VariableStatistics
+from netcdf_to_gltf_converter.data.transform import AffineTransform
 from netcdf_to_gltf_converter.data.vector import Vec3
+from netcdf_to_gltf_converter.preprocessing.reprojection import GridReprojector
+from netcdf_to_gltf_converter.preprocessing.optimization import (
+    morton_order, renumber_vertices_by_first_use, tipsify)
 
 
 def get_coordinate_variables(data, standard_names: tuple) -> List[xr.DataArray]:
@@ -28,13 +34,30 @@ class DataVariable():
     The wrapper allows for easier retrieval of relevant data.
     """
 
-    def __init__(self, data: xr.DataArray) -> None:
+    def __init__(
+        self,
+        data: xr.DataArray,
+        coordinate_transform: Optional[AffineTransform] = None,
+        value_transform: Optional[AffineTransform] = None,
+        reprojector: Optional[GridReprojector] = None,
+    ) -> None:
         """Initialize a DataVariable with the specified data.
 
+        The transformations are not applied to the data array, but to the coordinates and values when they are retrieved.
+        The coordinates are first reprojected and then transformed.
+
         Args:
             data (xr.DataArray): The variable data.
+            coordinate_transform (Optional[AffineTransform], optional): The transformation of the x- and y-coordinates. Defaults to no transformation.
+            value_transform (Optional[AffineTransform], optional): The transformation of the variable values, which are z-coordinates. Defaults to no transformation.
+            reprojector (Optional[GridReprojector], optional): The reprojection of the coordinates and, when a value transformation is provided, the variable values. Defaults to no reprojection.
         """
         self._data_array = data
+        self._coordinate_transform = coordinate_transform
+        self._value_transform = value_transform
+        self._reprojector = reprojector
+        self._coordinates: Optional[np.ndarray] = None
+        self._vertical_offsets: Optional[np.ndarray] = None
         self._time_var = get_coordinate_variables(data, ("time",))[0]
         self._x_coords_var = get_coordinate_variables(data, X_STANDARD_NAMES)[0]
         self._y_coords_var = get_coordinate_variables(data, Y_STANDARD_NAMES)[0]
@@ -64,7 +87,17 @@ class DataVariable():
         Returns:
             np.ndarray: A 2D np.ndarray of floats with shape (n, 2) where each row contains a x and y coordinate.
         """
-        return np.column_stack([self.x_coords, self.y_coords])
+        if self._coordinates is None:
+            self._coordinates = self._get_coordinates()
+        return self._coordinates
+
+    def _get_coordinates(self) -> np.ndarray:
+        coordinates = np.column_stack([self.x_coords, self.y_coords])
+        if self._reprojector is not None:
+            coordinates, self._vertical_offsets = self._reprojector.reproject(coordinates)
+        if self._coordinate_transform is not None:
+            coordinates = self._coordinate_transform.transform_horizontal(coordinates)
+        return coordinates
 
     @property
     def time_index_max(self) -> int:
@@ -75,36 +108,84 @@ class DataVariable():
         """
         return self._time_var.size - 1
 
-    def get_data_at_time(self, time_index: int) -> np.ndarray:
+    def get_data_at_time(
+        self, time_index: int, statistics: Optional[VariableStatistics] = None
+    ) -> np.ndarray:
         """Get the variable values at the specified time index.
 
         Args:
             time_index (int): The time index.
+            statistics (Optional[VariableStatistics], optional): The statistics to add the values to, after they are reprojected but before they are transformed. Defaults to None.
 
         Returns:
             np.ndarray: A 1D np.ndarray of floats.
         """
         time_filter = {self._time_var.name : time_index}
-        return self._data_array.isel(**time_filter).values.flatten()
+        values = self._data_array.isel(**time_filter).values.flatten()
+        if self._reprojects_values:
+            values = values + self._get_vertical_offsets()
+        if statistics is not None:
+            statistics.add(values)
+        return self._transform_values(values)
+
+    def transform_statistics(self, statistics: VariableStatistics) -> VariableStatistics:
+        """Get the statistics of the transformed variable values from the statistics of the values from file.
+
+        Args:
+            statistics (VariableStatistics): The statistics of the reprojected values from file.
+
+        Returns:
+            VariableStatistics: The statistics of the values as they are retrieved from this variable.
+        """
+        if self._value_transform is None:
+            return statistics
+        return statistics.transformed(self._value_transform)
     
     @property
     def min(self) -> float:
         """Get the minimum value for this variable across all dimensions.
+
+        This reads all values of the variable; use `VariableStatistics` to collect the statistics while the data is read.
         
         Returns:
             float: The minimum variable value.
         """
-        return self._data_array.min().values
+        return min(self._transform_values(self._get_raw_range()))
     
     @property
     def max(self) -> float:
         """Get the maximum value for this variable across all dimensions.
+
+        This reads all values of the variable; use `VariableStatistics` to collect the statistics while the data is read.
         
         Returns:
             float: The maximum variable value.
         """
-        return self._data_array.max().values
-  
+        return max(self._transform_values(self._get_raw_range()))
+
+    @property
+    def _reprojects_values(self) -> bool:
+        return (
+            self._reprojector is not None
+            and self._reprojector.transform_z
+            and self._value_transform is not None
+        )
+
+    def _get_vertical_offsets(self) -> np.ndarray:
+        if self._vertical_offsets is None:
+            self._coordinates = self._get_coordinates()
+        return self._vertical_offsets
+
+    def _get_raw_range(self) -> np.ndarray:
+        # The transformation is monotonic, so the range of the transformed values follows from the raw range
+        return np.array([self._data_array.min().values, self._data_array.max().values])
+
+    def _transform_values(self, values: np.ndarray) -> np.ndarray:
+        if self._value_transform is None:
+            return values
+        return self._value_transform.transform_vertical(values)
+
+
 class DatasetBase(ABC):
     """Class that serves as a wrapper object for an xarray.Dataset.
     The wrapper allows for easier retrieval of relevant data.
@@ -117,6 +198,9 @@ class DatasetBase(ABC):
             dataset (xr.Dataset): The xarray Dataset.
         """
         self._dataset = dataset
+        self._transform = AffineTransform()
+        self._variable_transforms: Dict[str, AffineTransform] = {}
+        self._reprojector: Optional[GridReprojector] = None
 
     @property
     @abstractmethod
@@ -178,7 +262,12 @@ class DatasetBase(ABC):
             ValueError: When the dataset does not contain a variable with the name.
         """
         data = self.get_array(variable_name)
-        return DataVariable(data)
+        return DataVariable(
+            data,
+            self._transform,
+            self._variable_transforms.get(variable_name),
+            self._reprojector,
+        )
 
     def _raise_if_not_in_dataset(self, name: str):
         if name not in self._dataset:
@@ -213,6 +302,15 @@ class DatasetBase(ABC):
         """
         pass
 
+    @abstractmethod
+    def set_node_coordinates(self, node_coordinates: np.ndarray):
+        """Set the node coordinates of the grid.
+
+        Args:
+            node_coordinates (np.ndarray): An ndarray of floats with shape (n, 2). Each row represents one node and contains the x- and y-coordinate.
+        """
+        pass
+
     @property
     @abstractmethod
     def fill_value(self) -> int:
@@ -223,7 +321,50 @@ class DatasetBase(ABC):
         """
         pass
     
-    @abstractmethod
+    def reproject_coordinates(self, reprojector: GridReprojector) -> None:
+        """
+        Reproject the x- and y-coordinates in the data set to another coordinate system.
+
+        The node coordinates of the grid are reprojected directly. The coordinates of the variables are reprojected
+        when they are retrieved with `get_variable`. When the reprojector transforms the z-coordinates as well,
+        the values of the variables that are transformed with `transform_coordinates` are reprojected when they are retrieved.
+
+        Args:
+            reprojector (GridReprojector): The reprojector to the other coordinate system.
+
+        Raises:
+            ValueError: When the coordinates are already reprojected or transformed.
+        """
+        if self._reprojector is not None or not self._transform.is_identity:
+            raise ValueError("The coordinates should be reprojected once, before they are transformed.")
+
+        node_coordinates, _ = reprojector.reproject(self.node_coordinates)
+        self.set_node_coordinates(node_coordinates)
+        self._log_grid_bounds(self.bounds)
+        self._reprojector = reprojector
+
+    def transform_coordinates(self, transform: AffineTransform, variables: List[str]) -> None:
+        """
+        Transform the x- and y-coordinates and the variable values in the data set with the provided transformation.
+
+        The node coordinates of the grid are transformed directly. The variables in the data set are left unchanged;
+        their coordinates and values are transformed when they are retrieved with `get_variable`, one time step at a time.
+        Consecutive transformations are combined into a single transformation.
+
+        Args:
+            transform (AffineTransform): The transformation to apply.
+            variables (List[str]): The names of the variables for which to transform the values.
+        """
+        if not transform.is_identity:
+            self.set_node_coordinates(transform.transform_horizontal(self.node_coordinates))
+            self._log_grid_bounds(self.bounds)
+
+        self._transform = self._transform.then(transform)
+        for variable_name in variables:
+            self._raise_if_not_in_dataset(variable_name)
+            variable_transform = self._variable_transforms.get(variable_name, AffineTransform())
+            self._variable_transforms[variable_name] = variable_transform.then(transform)
+
     def shift_coordinates(self, shift: Vec3, variables: List[str]) -> None:
         """
         Shift the x- and y-coordinates and the variable values in the data set with the provided shift values.
@@ -235,21 +376,30 @@ class DatasetBase(ABC):
             shift (Vec3): Vector containing the values to shift the coordinates with.
             variables (List[str]): The names of the variables for which to shift the values.
         """
-        pass
-    
-    @abstractmethod
+        self.transform_coordinates(AffineTransform(shift=shift), variables)
+
     def scale_coordinates(self, scale_horizontal: float, scale_vertical: float, variables: List[str]) -> None:
         """
         Scale the x- and y-coordinates and the data values, with the scaling factors that are specified.
-        The original data set is updated with the new coordinates.
 
         Args:
             scale_horizontal (float): The horizontal scale for the x- and y-coordinates of the mesh.
             scale_vertical (float): The vertical scale for the height of the mesh points.
             variables (List[str]): The names of the variables to scale.
         """
+        transform = AffineTransform(scale_horizontal=scale_horizontal, scale_vertical=scale_vertical)
+        self.transform_coordinates(transform, variables)
+
+    @property
+    @abstractmethod
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """Get the bounds of the grid.
+
+        Returns:
+            Tuple[float, float, float, float]: Tuple with min x, min y, max x, max y.
+        """
         pass
-    
+
 
     def triangulate(self):
         """Triangulate the provided grid.
@@ -263,5 +413,31 @@ class DatasetBase(ABC):
         )
         self.set_face_node_connectivity(face_node_connectivity)
         
+    def optimize_vertex_order(self, triangle_order: TriangleOrder, cache_size: int):
+        """Reorder the triangles and renumber the nodes of the triangulated grid for memory access coherence.
+
+        The triangles are reordered for post-transform vertex cache efficiency and the nodes are renumbered
+        in the order in which they are first used by the triangles. Since the variable values are interpolated
+        onto the nodes of the grid, all vertex data (base geometry and frames) follows the same order.
+        This should be done after the grid is triangulated, shifted and scaled.
+
+        Args:
+            triangle_order (TriangleOrder): The method to order the triangles.
+            cache_size (int): The size of the simulated vertex cache.
+        """
+        node_coordinates = self.node_coordinates
+        triangles = self.face_node_connectivity
+
+        if triangle_order == TriangleOrder.TIPSIFY:
+            order = tipsify(triangles, len(node_coordinates), cache_size)
+        elif triangle_order == TriangleOrder.MORTON:
+            order = morton_order(node_coordinates, triangles)
+
+        triangles, node_order = renumber_vertices_by_first_use(
+            triangles[order], len(node_coordinates)
+        )
+        self.set_face_node_connectivity(triangles)
+        self.set_node_coordinates(node_coordinates[node_order])
+
     def _log_grid_bounds(self, bounds: Tuple[float, float, float, float]):
         logging.info(f"Grid bounds: {bounds[0]} (min x), {bounds[1]} (min y), {bounds[2]} (max x), {bounds[3]} (max y)")
\ No newline at end of file
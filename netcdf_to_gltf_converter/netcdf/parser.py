@@ -1,52 +1,105 @@
 import logging
-from typing import List, Union
+from typing import Callable, List, Optional, Tuple, Union
 
 import numpy as np
 import xarray as xr
 
-from netcdf_to_gltf_converter.config import (Config, CrsShifting, ModelType,
+from netcdf_to_gltf_converter.config import (Colormap, Config, CrsShifting,
+                                             ModelType, NanFill, NanFillMethod,
                                              ShiftType, Variable)
-from netcdf_to_gltf_converter.data.mesh import MeshAttributes, TriangularMesh
+from netcdf_to_gltf_converter.data.mesh import (ColorScale, MeshAttributes,
+                                                TriangularMesh)
+from netcdf_to_gltf_converter.data.state import (ConversionState,
+                                                 VariableState,
+                                                 get_fingerprint)
+from netcdf_to_gltf_converter.data.statistics import VariableStatistics
+from netcdf_to_gltf_converter.data.transform import AffineTransform
 from netcdf_to_gltf_converter.data.vector import Vec3
-from netcdf_to_gltf_converter.netcdf.netcdf_data import (DatasetBase,
-                                                         DataVariable)
+from netcdf_to_gltf_converter.netcdf.netcdf_data import (
+    DatasetBase, DataVariable, get_coordinate_variables)
 from netcdf_to_gltf_converter.netcdf.ugrid.ugrid_data import UgridDataset
 from netcdf_to_gltf_converter.netcdf.xbeach.xbeach_data import XBeachDataset
-from netcdf_to_gltf_converter.preprocessing.crs import create_crs_transformer
+from netcdf_to_gltf_converter.preprocessing.crs import (configure_proj,
+                                                        create_crs_transformer)
 from netcdf_to_gltf_converter.preprocessing.interpolation import \
     NearestPointInterpolator
+from netcdf_to_gltf_converter.preprocessing.reprojection import GridReprojector
 from netcdf_to_gltf_converter.utils.arrays import uint32_array
+from netcdf_to_gltf_converter.utils.events import EventEmitter, EventType
 from netcdf_to_gltf_converter.utils.sequences import inclusive_range
 
 
 class Parser:
     """Class to parse a xr.DataArray into a set of TriangularMeshes."""
 
-    def __init__(self) -> None:
-        """Initialize a Parser."""
+    def __init__(self, events: Optional[EventEmitter] = None) -> None:
+        """Initialize a Parser.
+
+        The parser emits the start and end of its stages, and the progress of the frames per variable.
+
+        Args:
+            events (Optional[EventEmitter], optional): The emitter of the conversion events. Defaults to a new EventEmitter.
+        """
 
         self._interpolator = NearestPointInterpolator()
+        self._events = events or EventEmitter()
+
+    @property
+    def events(self) -> EventEmitter:
+        """EventEmitter: The emitter of the conversion events, to which listeners can be added."""
+        return self._events
 
-    def parse(self, netcdf_dataset: xr.Dataset, config: Config) -> List[TriangularMesh]:
+    def parse(
+        self,
+        netcdf_dataset: xr.Dataset,
+        config: Config,
+        state: Optional[ConversionState] = None,
+        keep_frames: bool = True,
+    ) -> List[TriangularMesh]:
         """Parse the provided data set to a list of TriangularMeshes as input for building the glTF data.
 
         Args:
             netcdf_dataset (xr.Dataset): The NetCDF dataset.
             config (Config): The converter configuration.
+            state (Optional[ConversionState], optional): The state of a previous conversion, which is updated with this conversion.
+                For the variables in the state, only the time steps after the last converted time step are parsed as transformations. Defaults to None.
+            keep_frames (bool, optional): Whether the time steps are kept as transformations. When False, the time steps are only read
+                to update the state, and the meshes have no transformations and levels of detail. Defaults to True.
+
+        Raises:
+            ValueError: When the base geometry of a variable differs from the base geometry in the state.
         """
-        if config.model_type == ModelType.DHYDRO:
-            dataset = UgridDataset(netcdf_dataset)
-        elif config.model_type == ModelType.XBEACH:
-            dataset = XBeachDataset(netcdf_dataset)
-        
-        Parser._transform_grid(config, dataset)
+        subset = config.subset.geometry if config.subset else None
+        with self._events.stage("read_grid"):
+            if config.model_type == ModelType.DHYDRO:
+                dataset = UgridDataset(netcdf_dataset, subset)
+            elif config.model_type == ModelType.XBEACH:
+                dataset = XBeachDataset(netcdf_dataset, config.regular_grid, subset)
 
-        dataset.triangulate()
+        with self._events.stage("transform"):
+            shift = Parser._transform_grid(config, dataset, self._events)
+
+        with self._events.stage("triangulate"):
+            dataset.triangulate()
+            if config.mesh_optimization:
+                logging.info(f"OPTIMIZE vertex order with: {config.mesh_optimization.triangle_order} (triangles), first use (vertices)")
+                dataset.optimize_vertex_order(
+                    config.mesh_optimization.triangle_order,
+                    config.mesh_optimization.cache_size,
+                )
 
         triangular_meshes = []
 
         for variable in config.variables:
-            data_mesh = self._parse_variable(variable, dataset, config)
+            with self._events.stage(f"interpolate:{variable.name}"):
+                data_mesh = self._parse_variable(variable, dataset, config, shift, state, keep_frames)
+            if len(data_mesh.triangles) == 0:
+                logging.warning(f"Variable '{variable.name}' has no remaining triangles and is skipped.")
+                continue
+
+            if config.levels_of_detail and keep_frames:
+                with self._events.stage(f"levels_of_detail:{variable.name}"):
+                    Parser._add_levels_of_detail(data_mesh, config)
             triangular_meshes.append(data_mesh)
 
             if variable.use_threshold:
@@ -63,23 +116,70 @@ class Parser:
         variable: Variable,
         dataset: DatasetBase,
         config: Config,
+        shift: Vec3,
+        state: Optional[ConversionState] = None,
+        keep_frames: bool = True,
     ):
         data = dataset.get_variable(variable.name)
-        interpolated_data = self._interpolate(data, config.time_index_start, dataset)
+        nan_filler = Parser._create_nan_filler(variable, dataset, config, shift)
+        statistics = VariableStatistics()
+        interpolated_data = self._interpolate(
+            data, config.time_index_start, dataset, nan_filler, statistics
+        )
 
         base = MeshAttributes(interpolated_data, variable.color)
         triangles = uint32_array(dataset.face_node_connectivity)
+        base_fingerprint = get_fingerprint(interpolated_data, triangles)
+        time_indices = Parser._get_time_indices(data.time_index_max, config)
+
+        variable_state = state.variables.get(variable.name) if state else None
+        if variable_state is not None:
+            if variable_state.base_fingerprint != base_fingerprint:
+                raise ValueError(
+                    f"The base geometry of variable '{variable.name}' differs from the geometry of the previous conversion."
+                )
+            time_indices = [
+                time_index
+                for time_index in time_indices
+                if time_index > variable_state.time_index_last
+            ]
+            logging.info(
+                f"APPEND {len(time_indices)} time steps for '{variable.name}' after time index {variable_state.time_index_last}"
+            )
+
+        # Without keeping the frames, the time steps are only read for the color scale and the wet area
+        read_frames = keep_frames or variable.colormap is not None or variable.dry_threshold is not None
+
         transformations = []
+        value_ranges = []
+        wet_vertices = None
+        if variable.colormap is not None:
+            value_ranges.append(Parser._get_value_range(interpolated_data))
 
-        for time_index in Parser._get_time_indices(data.time_index_max, config):
-            interpolated_data = self._interpolate(data, time_index, dataset)
-            vertex_displacements = Parser.calculate_displacements(
-                interpolated_data, base
+        if variable.dry_threshold is not None:
+            dry_threshold = (variable.dry_threshold - shift.z) * config.scale_vertical
+            wet_vertices = Parser._is_wet(interpolated_data, dry_threshold)
+
+        for frame_index, time_index in enumerate(time_indices if read_frames else []):
+            interpolated_data = self._interpolate(
+                data, time_index, dataset, nan_filler, statistics
             )
-            transformation = MeshAttributes(vertex_displacements, variable.color)
-            transformations.append(transformation)
+            if variable.dry_threshold is not None:
+                wet_vertices |= Parser._is_wet(interpolated_data, dry_threshold)
+            if variable.colormap is not None:
+                value_ranges.append(Parser._get_value_range(interpolated_data))
+
+            if keep_frames:
+                vertex_displacements = Parser.calculate_displacements(
+                    interpolated_data, base
+                )
+                transformation = MeshAttributes(vertex_displacements, variable.color)
+                transformations.append(transformation)
+            self._events.emit(EventType.PROGRESS, variable.name, frame_index + 1, len(time_indices))
 
-        return TriangularMesh(
+        Parser._log_statistics(variable.name, statistics, data)
+
+        triangular_mesh = TriangularMesh(
             base,
             triangles,
             transformations,
@@ -87,6 +187,167 @@ class Parser:
             variable.roughness_factor,
         )
 
+        # Appended time steps keep the color scale and wet area of the previous conversion, since the existing frames depend on them
+        if variable.colormap is not None:
+            if variable_state is not None:
+                triangular_mesh.color_scale = ColorScale(
+                    variable.colormap.colors, *variable_state.color_range
+                )
+            else:
+                triangular_mesh.color_scale = Parser._get_color_scale(
+                    variable.colormap, value_ranges, config, shift
+                )
+
+        if variable.dry_threshold is not None:
+            if variable_state is not None:
+                wet_vertices = variable_state.wet_vertices
+            triangular_mesh = Parser._cull_dry_triangles(
+                triangular_mesh, wet_vertices, variable.name
+            )
+
+        if not np.isfinite(triangular_mesh.base.vertex_positions[:, :2]).all():
+            # Nodes without valid coordinates are not part of any triangle and are removed, such that all vertex positions are finite
+            triangular_mesh = triangular_mesh.extract(np.arange(len(triangular_mesh.triangles)))
+
+        if state is not None:
+            Parser._update_state(
+                state,
+                variable.name,
+                variable_state,
+                base_fingerprint,
+                time_indices,
+                config,
+                triangular_mesh.color_scale,
+                wet_vertices,
+            )
+
+        return triangular_mesh
+
+    @staticmethod
+    def _update_state(
+        state: ConversionState,
+        variable_name: str,
+        variable_state: Optional[VariableState],
+        base_fingerprint: str,
+        time_indices: List[int],
+        config: Config,
+        color_scale: Optional[ColorScale],
+        wet_vertices: Optional[np.ndarray],
+    ):
+        if variable_state is None:
+            variable_state = VariableState(
+                base_fingerprint,
+                config.time_index_start,
+                (color_scale.min_value, color_scale.max_value) if color_scale else None,
+                wet_vertices,
+            )
+            state.variables[variable_name] = variable_state
+
+        if time_indices:
+            variable_state.time_index_last = time_indices[-1]
+
+    @staticmethod
+    def _log_statistics(
+        variable_name: str, statistics: VariableStatistics, data: DataVariable
+    ):
+        logging.info(
+            f"Variable values for '{variable_name}' in the converted time steps: {statistics.min} (min), {statistics.max} (max), {statistics.mean} (mean), {statistics.n_nan_values} (NaN count)"
+        )
+        transformed = data.transform_statistics(statistics)
+        logging.info(
+            f"Transformed variable values for '{variable_name}': {transformed.min} (min), {transformed.max} (max), {transformed.mean} (mean)"
+        )
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            for frame_index, (min_value, max_value) in enumerate(transformed.frame_ranges):
+                logging.debug(f"Transformed variable values for '{variable_name}' in frame {frame_index}: {min_value} (min), {max_value} (max)")
+
+    @staticmethod
+    def _is_wet(interpolated_data: np.ndarray, dry_threshold: float) -> np.ndarray:
+        # NaN values are invalid and compare as not wet
+        return interpolated_data[:, -1] > dry_threshold
+
+    @staticmethod
+    def _get_value_range(interpolated_data: np.ndarray) -> Tuple[float, float]:
+        values = interpolated_data[:, -1]
+        if np.isnan(values).all():
+            return np.nan, np.nan
+
+        return float(np.nanmin(values)), float(np.nanmax(values))
+
+    @staticmethod
+    def _get_color_scale(
+        colormap: Colormap,
+        value_ranges: List[Tuple[float, float]],
+        config: Config,
+        shift: Vec3,
+    ) -> ColorScale:
+        # Configured values are variable values, which are shifted and scaled like the z-coordinates
+        def to_z(value: float) -> float:
+            return (value - shift.z) * config.scale_vertical
+
+        min_values, max_values = np.transpose(value_ranges)
+        min_value = to_z(colormap.value_min) if colormap.value_min is not None else np.nanmin(min_values)
+        max_value = to_z(colormap.value_max) if colormap.value_max is not None else np.nanmax(max_values)
+        logging.info(f"COLOR mesh with colormap from {min_value} (min) to {max_value} (max)")
+
+        return ColorScale(colormap.colors, float(min_value), float(max_value))
+
+    @staticmethod
+    def _cull_dry_triangles(
+        triangular_mesh: TriangularMesh, wet_vertices: np.ndarray, variable_name: str
+    ) -> TriangularMesh:
+        wet_triangles = np.flatnonzero(
+            wet_vertices[triangular_mesh.triangles].any(axis=1)
+        )
+        n_triangles = len(triangular_mesh.triangles)
+        logging.info(
+            f"CULL dry triangles for '{variable_name}': {n_triangles - len(wet_triangles)} of {n_triangles} triangles removed"
+        )
+        if len(wet_triangles) == 0:
+            # Meshes without triangles are skipped, so their vertices do not need to be compacted
+            triangular_mesh.triangles = triangular_mesh.triangles[:0]
+            return triangular_mesh
+
+        return triangular_mesh.extract(wet_triangles)
+
+    @staticmethod
+    def _add_levels_of_detail(triangular_mesh: TriangularMesh, config: Config):
+        levels_of_detail = config.levels_of_detail
+        triangular_mesh.screen_coverage = [levels_of_detail.screen_coverage]
+
+        for level in levels_of_detail.levels:
+            cell_size = level.cell_size * config.scale_horizontal
+            level_of_detail = triangular_mesh.simplify(cell_size)
+            if len(level_of_detail.triangles) == 0:
+                logging.warning(
+                    f"LEVEL OF DETAIL with cell size {cell_size} contains no triangles, skipping this and coarser levels of detail."
+                )
+                break
+
+            logging.info(
+                f"LEVEL OF DETAIL with cell size {cell_size}: {len(level_of_detail.base.vertex_positions)} vertices, {len(level_of_detail.triangles)} triangles"
+            )
+            triangular_mesh.levels_of_detail.append(level_of_detail)
+            triangular_mesh.screen_coverage.append(level.screen_coverage)
+
+    @staticmethod
+    def get_frame_times(netcdf_dataset: xr.Dataset, config: Config) -> Tuple[List[int], np.ndarray]:
+        """Get the time indices and times of the animation frames, without reading any data values.
+
+        The frames of all variables are assumed to have the times of the first variable.
+
+        Args:
+            netcdf_dataset (xr.Dataset): The NetCDF dataset.
+            config (Config): The converter configuration.
+
+        Returns:
+            Tuple[List[int], np.ndarray]: The time index and time of each frame.
+        """
+        data = netcdf_dataset[config.variables[0].name]
+        time_var = get_coordinate_variables(data, ("time",))[0]
+        time_indices = Parser._get_time_indices(time_var.size - 1, config)
+        return time_indices, time_var.values[time_indices]
+
     @staticmethod
     def _get_time_indices(time_index_max: int, config: Config):
         start = config.time_index_start + config.times_per_frame
@@ -99,26 +360,35 @@ class Parser:
         return inclusive_range(start, end, config.times_per_frame)
 
     @staticmethod
-    def _transform_grid(config: Config, dataset: DatasetBase):
+    def _transform_grid(config: Config, dataset: DatasetBase, events: Optional[EventEmitter] = None) -> Vec3:
         variables = [var.name for var in config.variables]
-        Parser._log_variable_values(dataset, variables)
+        configure_proj(config.proj.data_dir, config.proj.network)
+        if config.reprojection:
+            dataset.reproject_coordinates(GridReprojector(config.reprojection, events))
 
+        shift = Vec3()
         if config.shift_coordinates:
             shift = Parser._get_shift_values(config.shift_coordinates, dataset)
-            
             logging.info(f"SHIFT model coordinates with: {shift.x} (x), {shift.y} (y), {shift.z} (z)")
-            dataset.shift_coordinates(shift, variables)
-            Parser._log_variable_values(dataset, variables)
 
         logging.info(f"SCALE model coordinates with: {config.scale_horizontal} (x, y), {config.scale_vertical} (z)")
-        dataset.scale_coordinates(config.scale_horizontal, config.scale_vertical, variables)
+
+        # The shift and scale are applied as one transformation, the variable values are transformed per time step when they are read
+        transform = AffineTransform(shift, config.scale_horizontal, config.scale_vertical)
+        dataset.transform_coordinates(transform, variables)
         Parser._log_variable_values(dataset, variables)
 
+        return shift
+
     @staticmethod
     def _log_variable_values(dataset: DatasetBase, variables: List[str]):
+        # Scanning all time steps of the variables is expensive, the statistics of the converted time steps are logged while parsing
+        if not logging.getLogger().isEnabledFor(logging.DEBUG):
+            return
+
         for variable_name in variables:
             variable = dataset.get_variable(variable_name)
-            logging.info(f"Variable values for '{variable_name}': {variable.min} (min), {variable.max} (max)")
+            logging.debug(f"Variable values for '{variable_name}' in all time steps: {variable.min} (min), {variable.max} (max)")
 
     @staticmethod
     def _get_shift_values(shift_config: Union[ShiftType, CrsShifting], dataset: DatasetBase) -> Vec3:
@@ -135,10 +405,57 @@ class Parser:
 
             return Vec3(shift_config.shift_x, shift_config.shift_y, shift_config.shift_z)
 
-    def _interpolate(self, data: DataVariable, time_index: int, dataset: DatasetBase) -> np.ndarray:
-        return self._interpolator.interpolate(
-            data.coordinates, data.get_data_at_time(time_index), dataset
-        )
+    def _interpolate(
+        self,
+        data: DataVariable,
+        time_index: int,
+        dataset: DatasetBase,
+        nan_filler: Optional[Callable[[int], Union[float, np.ndarray]]] = None,
+        statistics: Optional[VariableStatistics] = None,
+    ) -> np.ndarray:
+        values = data.get_data_at_time(time_index, statistics)
+        if nan_filler is not None:
+            is_nan = np.isnan(values)
+            if is_nan.any():
+                fill_values = np.broadcast_to(nan_filler(time_index), values.shape)
+                values = np.where(is_nan, fill_values, values)
+
+        return self._interpolator.interpolate(data.coordinates, values, dataset)
+
+    @staticmethod
+    def _create_nan_filler(
+        variable: Variable, dataset: DatasetBase, config: Config, shift: Vec3
+    ) -> Optional[Callable[[int], Union[float, np.ndarray]]]:
+        nan_fill = variable.nan_fill
+        if nan_fill is None:
+            if config.model_type != ModelType.XBEACH:
+                return None
+            nan_fill = NanFill()
+
+        # The data has been shifted and scaled, so the fill values are shifted and scaled as well
+        def to_z(value: float) -> float:
+            return (value - shift.z) * config.scale_vertical
+
+        if nan_fill.method == NanFillMethod.CONSTANT:
+            fill_value = to_z(nan_fill.value)
+            return lambda _: fill_value
+
+        if nan_fill.method == NanFillMethod.DRY:
+            fill_value = to_z(variable.dry_threshold)
+            return lambda _: fill_value
+
+        if nan_fill.method == NanFillMethod.BED_LEVEL:
+            bed_level = dataset.get_array(nan_fill.bed_level_variable)
+
+            def get_bed_level(time_index: int) -> np.ndarray:
+                bed_level_at_time = bed_level
+                time_vars = get_coordinate_variables(bed_level, ("time",))
+                if time_vars:
+                    bed_level_at_time = bed_level.isel({time_vars[0].name: time_index})
+
+                return to_z(bed_level_at_time.values.flatten())
+
+            return get_bed_level
 
     @staticmethod
     def calculate_displacements(data: np.ndarray, base: MeshAttributes):
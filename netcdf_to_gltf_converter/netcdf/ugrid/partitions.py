@@ -0,0 +1,386 @@
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import chain
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+import xarray as xr
+import xugrid as xu
+from xarray.backends import BackendArray
+from xarray.core import indexing
+
+from netcdf_to_gltf_converter.netcdf.netcdf_data import get_coordinate_variables
+
+PARTITION_FILE_PATTERN = re.compile(r"^(?P<model>.+)_(?P<partition>\d{4})_map\.nc$")
+"""Pattern of the names of the map files of a partitioned D-HYDRO model: <model>_<partition number>_map.nc."""
+
+DOMAIN_VARIABLE_SUFFIX = "_flowelem_domain"
+"""Suffix of the name of the variable with the domain (partition) number of each face, after the name of the mesh topology."""
+
+FILL_VALUE = -1
+"""The fill value of the connectivity of the merged grid."""
+
+
+def find_partition_files(file_path: Path) -> List[Path]:
+    """Find the map files of all partitions of the model that the map file belongs to.
+
+    Args:
+        file_path (Path): Path to a map file, e.g. model_0000_map.nc.
+
+    Returns:
+        List[Path]: The map files of all partitions, sorted by partition number.
+            Only the provided file when its name does not follow the pattern of partitioned map files.
+    """
+    match = PARTITION_FILE_PATTERN.match(file_path.name)
+    if match is None:
+        return [file_path]
+
+    model = match.group("model")
+    partition_files = [
+        path
+        for path in file_path.parent.glob(f"{_glob_escape(model)}_????_map.nc")
+        if PARTITION_FILE_PATTERN.match(path.name)
+    ]
+    return sorted(partition_files)
+
+
+def _glob_escape(text: str) -> str:
+    """Escape the special characters of a glob pattern.
+
+    Args:
+        text (str): The text to escape.
+
+    Returns:
+        str: The escaped text, which only matches the text itself.
+    """
+    return re.sub(r"([*?\[])", r"[\1]", text)
+
+
+@dataclass
+class PartitionGrid:
+    """Data class containing the part of the grid of a partition that the partition owns, i.e. without its ghost cells."""
+
+    node_indices: np.ndarray
+    """np.ndarray: The indices of the nodes of the owned faces in the partition, an ndarray of integers with shape (n,)."""
+
+    node_coordinates: np.ndarray
+    """np.ndarray: The coordinates of these nodes, an ndarray of floats with shape (n, 2)."""
+
+    face_indices: np.ndarray
+    """np.ndarray: The indices of the owned faces in the partition, an ndarray of integers with shape (m,)."""
+
+    face_node_connectivity: np.ndarray
+    """np.ndarray: The nodes per owned face as positions in `node_indices`, an ndarray of integers with shape (m, k). Padded with the fill value -1."""
+
+    edge_indices: np.ndarray
+    """np.ndarray: The indices of the edges between these nodes in the partition, an ndarray of integers with shape (e,)."""
+
+    edge_node_connectivity: np.ndarray
+    """np.ndarray: The nodes per edge as positions in `node_indices`, an ndarray of integers with shape (e, 2)."""
+
+
+def read_partition_grid(file_path: Path) -> PartitionGrid:
+    """Read the part of the grid that a partition owns from its map file.
+
+    The faces of other partitions (ghost cells) are recognized by the domain number of the faces, which
+    equals the partition number for the owned faces.
+
+    Args:
+        file_path (Path): Path to the map file of the partition.
+
+    Returns:
+        PartitionGrid: The owned part of the grid.
+
+    Raises:
+        ValueError: When the map file does not contain the domain numbers of the faces.
+    """
+    partition_number = int(PARTITION_FILE_PATTERN.match(file_path.name).group("partition"))
+    with xr.open_dataset(file_path) as dataset:
+        topology = get_2d_topology(dataset)
+        domain_variable = f"{topology}{DOMAIN_VARIABLE_SUFFIX}"
+        if domain_variable not in dataset:
+            raise ValueError(f"Partition does not contain the domain numbers of the faces ({domain_variable}): {file_path}")
+
+        grid = xu.Ugrid2d.from_dataset(dataset, topology)
+        face_domains = dataset[domain_variable].values
+
+    face_indices = np.flatnonzero(face_domains == partition_number)
+    faces = grid.face_node_connectivity[face_indices]
+    is_valid = faces != grid.fill_value
+    node_indices, inverse = np.unique(faces[is_valid], return_inverse=True)
+
+    face_node_connectivity = np.full(faces.shape, FILL_VALUE, dtype=np.int64)
+    face_node_connectivity[is_valid] = inverse
+
+    node_positions = np.full(grid.n_node, FILL_VALUE, dtype=np.int64)
+    node_positions[node_indices] = np.arange(len(node_indices))
+    edge_indices = np.empty(0, dtype=np.int64)
+    edge_node_connectivity = np.empty((0, 2), dtype=np.int64)
+    if grid.edge_node_connectivity is not None:
+        edges = node_positions[grid.edge_node_connectivity]
+        edge_indices = np.flatnonzero((edges != FILL_VALUE).all(axis=1))
+        edge_node_connectivity = edges[edge_indices]
+
+    logging.info(
+        f"PARTITION {partition_number}: {len(face_indices)} of {grid.n_face} faces owned, {grid.n_face - len(face_indices)} ghost cells removed"
+    )
+
+    return PartitionGrid(
+        node_indices,
+        grid.node_coordinates[node_indices],
+        face_indices,
+        face_node_connectivity,
+        edge_indices,
+        edge_node_connectivity,
+    )
+
+
+def get_2d_topology(dataset: xr.Dataset) -> str:
+    """Get the name of the 2D mesh topology variable in a UGRID dataset.
+
+    Args:
+        dataset (xr.Dataset): The UGRID dataset.
+
+    Returns:
+        str: The name of the mesh topology variable.
+
+    Raises:
+        ValueError: When the dataset does not contain a 2D mesh topology.
+    """
+    for topology in dataset.ugrid_roles.topology:
+        if dataset[topology].attrs.get("topology_dimension") == 2:
+            return topology
+    raise ValueError("No 2D grid")
+
+
+class PartitionedArray(BackendArray):
+    """Lazy array that stitches the values of a variable from the partitions along the merged grid dimension.
+
+    Only the requested part of each partition is read when the array is indexed.
+    """
+
+    def __init__(self, arrays: List[xr.Variable], axis: int, indices: List[np.ndarray]) -> None:
+        """Initialize a PartitionedArray with the specified arguments.
+
+        Args:
+            arrays (List[xr.Variable]): The lazily loaded variable per partition.
+            axis (int): The axis of the grid dimension.
+            indices (List[np.ndarray]): The indices along the grid dimension per partition, in the merged order.
+                The merged grid dimension consists of these indices of the first partition, followed by those of the second partition, etc.
+        """
+        self._arrays = arrays
+        self._axis = axis
+        self._partitions = np.repeat(np.arange(len(indices)), [len(i) for i in indices])
+        self._indices = np.concatenate(indices)
+
+        shape = list(arrays[0].shape)
+        shape[axis] = len(self._indices)
+        self.shape = tuple(shape)
+        self.dtype = arrays[0].dtype
+
+    def __getitem__(self, key: indexing.ExplicitIndexer) -> np.ndarray:
+        return indexing.explicit_indexing_adapter(
+            key, self.shape, indexing.IndexingSupport.OUTER, self._getitem
+        )
+
+    def _getitem(self, key: Tuple) -> np.ndarray:
+        key = tuple(key) + (slice(None),) * (len(self.shape) - len(key))
+        positions = np.arange(self.shape[self._axis])[key[self._axis]]
+        is_scalar = np.ndim(positions) == 0
+        positions = np.atleast_1d(positions)
+
+        # Integer keys before the grid axis remove dimensions from the result
+        result_axis = sum(not isinstance(k, (int, np.integer)) for k in key[: self._axis])
+
+        partitions = self._partitions[positions]
+        values = []
+        order = []
+        for partition in np.unique(partitions):
+            is_in_partition = partitions == partition
+            partition_key = key[: self._axis] + (self._indices[positions[is_in_partition]],) + key[self._axis + 1 :]
+            values.append(np.asarray(self._arrays[partition][partition_key]))
+            order.append(np.flatnonzero(is_in_partition))
+
+        stitched = np.concatenate(values, axis=result_axis)
+        stitched = np.take(stitched, np.argsort(np.concatenate(order)), axis=result_axis)
+        if is_scalar:
+            stitched = np.take(stitched, 0, axis=result_axis)
+        return stitched
+
+
+def merge_partitions(file_paths: List[Path], n_workers: Optional[int] = None) -> xr.Dataset:
+    """Merge the map files of the partitions of a D-HYDRO model into one UGRID dataset.
+
+    The grids of the partitions are read in parallel processes. The ghost cells of each partition are removed and the nodes
+    and edges on the boundaries between the partitions are merged by their coordinates. The variables of the merged
+    dataset are lazy: indexing a variable only reads the requested values of the owned faces, nodes and edges of each partition.
+    Only the variables on the 2D grid, with at most a time dimension in addition to the grid dimension, are merged.
+    When the partitions contain a different number of time steps, e.g. while the model is still running, only the time
+    steps that all partitions contain are included.
+
+    Args:
+        file_paths (List[Path]): Paths to the map files of the partitions.
+        n_workers (Optional[int], optional): The number of processes that read the grids. Defaults to the number of processors on the machine.
+
+    Returns:
+        xr.Dataset: The merged dataset.
+    """
+    n_workers = min(n_workers or os.cpu_count() or 1, len(file_paths))
+    logging.info(f"MERGE {len(file_paths)} partitions with {n_workers} processes")
+    with ProcessPoolExecutor(max_workers=n_workers) as executor:
+        partition_grids = list(executor.map(read_partition_grid, file_paths))
+
+    datasets = [xr.open_dataset(file_path) for file_path in file_paths]
+    datasets = _select_common_time_steps(datasets)
+    topology = get_2d_topology(datasets[0])
+    partition_grid = xu.Ugrid2d.from_dataset(datasets[0], topology)
+
+    node_coordinates, node_sources, node_inverse = _merge_nodes(partition_grids)
+    face_node_connectivity = _merge_faces(partition_grids, node_inverse)
+    edge_node_connectivity, edge_sources = _merge_edges(partition_grids, node_inverse)
+    merged_grid = xu.Ugrid2d(
+        *node_coordinates.T,
+        FILL_VALUE,
+        face_node_connectivity,
+        name=partition_grid.name,
+        edge_node_connectivity=edge_node_connectivity if partition_grid.edge_node_connectivity is not None else None,
+        indexes=partition_grid._indexes,
+        projected=partition_grid.projected,
+        crs=partition_grid.crs,
+        attrs=partition_grid._attrs,
+    )
+    logging.info(
+        f"MERGE result: {merged_grid.n_node} nodes, {merged_grid.n_face} faces, {merged_grid.n_edge if edge_node_connectivity is not None else 0} edges"
+    )
+
+    sources = {
+        partition_grid.node_dimension: node_sources,
+        partition_grid.face_dimension: [grid.face_indices for grid in partition_grids],
+        partition_grid.edge_dimension: edge_sources,
+    }
+    merged = merged_grid.to_dataset()
+    merged.attrs = datasets[0].attrs
+    for time_var in get_coordinate_variables(datasets[0], ("time",)):
+        merged = merged.assign_coords({time_var.name: time_var})
+
+    for variable_name in _get_variables_to_merge(datasets[0], topology, sources.keys()):
+        variable = datasets[0][variable_name].variable
+        grid_dimension = next(dim for dim in variable.dims if dim in sources)
+        array = PartitionedArray(
+            [dataset[variable_name].variable for dataset in datasets],
+            variable.dims.index(grid_dimension),
+            sources[grid_dimension],
+        )
+        merged[variable_name] = xr.Variable(
+            variable.dims, indexing.LazilyIndexedArray(array), variable.attrs
+        )
+
+    return merged
+
+
+def _select_common_time_steps(datasets: List[xr.Dataset]) -> List[xr.Dataset]:
+    time_vars = get_coordinate_variables(datasets[0], ("time",))
+    if not time_vars:
+        return datasets
+
+    time_dimension = time_vars[0].dims[0]
+    n_times = min(dataset.sizes[time_dimension] for dataset in datasets)
+    return [dataset.isel({time_dimension: slice(0, n_times)}) for dataset in datasets]
+
+
+def _get_variables_to_merge(dataset: xr.Dataset, topology: str, grid_dimensions) -> List[str]:
+    connectivity = dataset.ugrid_roles.connectivity[topology]
+    coordinates = dataset.ugrid_roles.coordinates[topology]
+    topology_variables = set(connectivity.values()) | set(
+        chain.from_iterable(chain.from_iterable(coordinates.values()))
+    )
+    time_dimensions = {time_var.dims[0] for time_var in get_coordinate_variables(dataset, ("time",))}
+
+    variables = []
+    for variable_name, variable in dataset.data_vars.items():
+        variable_grid_dimensions = [dim for dim in variable.dims if dim in grid_dimensions]
+        other_dimensions = [dim for dim in variable.dims if dim not in grid_dimensions]
+        if (
+            variable_name not in topology_variables
+            and len(variable_grid_dimensions) == 1
+            and set(other_dimensions) <= time_dimensions
+        ):
+            variables.append(variable_name)
+
+    return variables
+
+
+def _merge_nodes(
+    partition_grids: List[PartitionGrid],
+) -> Tuple[np.ndarray, List[np.ndarray], np.ndarray]:
+    # Nodes on the boundaries between partitions occur in each of these partitions with the same coordinates
+    stacked_coordinates = np.concatenate([grid.node_coordinates for grid in partition_grids])
+    _, first_positions, inverse = np.unique(
+        stacked_coordinates, axis=0, return_index=True, return_inverse=True
+    )
+
+    # Number the merged nodes in the order of first occurrence, such that they are grouped per partition
+    merged_index = np.empty(len(first_positions), dtype=np.int64)
+    merged_index[np.argsort(first_positions)] = np.arange(len(first_positions))
+    node_inverse = merged_index[inverse.ravel()]
+    first_positions.sort()
+
+    offsets = np.cumsum([0] + [len(grid.node_indices) for grid in partition_grids])
+    sections = np.searchsorted(first_positions, offsets[1:-1])
+    node_sources = [
+        grid.node_indices[positions - offset]
+        for grid, positions, offset in zip(
+            partition_grids, np.split(first_positions, sections), offsets
+        )
+    ]
+
+    return stacked_coordinates[first_positions], node_sources, node_inverse
+
+
+def _merge_faces(partition_grids: List[PartitionGrid], node_inverse: np.ndarray) -> np.ndarray:
+    n_faces = sum(len(grid.face_indices) for grid in partition_grids)
+    n_max_face_nodes = max(grid.face_node_connectivity.shape[1] for grid in partition_grids)
+    face_node_connectivity = np.full((n_faces, n_max_face_nodes), FILL_VALUE, dtype=np.int64)
+
+    face_offset = 0
+    node_offset = 0
+    for grid in partition_grids:
+        faces = grid.face_node_connectivity
+        is_valid = faces != FILL_VALUE
+        merged_faces = face_node_connectivity[face_offset : face_offset + len(faces), : faces.shape[1]]
+        merged_faces[is_valid] = node_inverse[faces[is_valid] + node_offset]
+        face_offset += len(faces)
+        node_offset += len(grid.node_indices)
+
+    return face_node_connectivity
+
+
+def _merge_edges(
+    partition_grids: List[PartitionGrid], node_inverse: np.ndarray
+) -> Tuple[np.ndarray, List[np.ndarray]]:
+    node_offsets = np.cumsum([0] + [len(grid.node_indices) for grid in partition_grids])
+    stacked_edges = np.concatenate(
+        [
+            node_inverse[grid.edge_node_connectivity + node_offset]
+            for grid, node_offset in zip(partition_grids, node_offsets)
+        ]
+    )
+
+    # Edges on the boundaries between partitions occur in each of these partitions, possibly in opposite direction
+    _, first_positions = np.unique(np.sort(stacked_edges, axis=1), axis=0, return_index=True)
+    first_positions.sort()
+
+    edge_offsets = np.cumsum([0] + [len(grid.edge_indices) for grid in partition_grids])
+    sections = np.searchsorted(first_positions, edge_offsets[1:-1])
+    edge_sources = [
+        grid.edge_indices[positions - offset]
+        for grid, positions, offset in zip(
+            partition_grids, np.split(first_positions, sections), edge_offsets
+        )
+    ]
+
+    return stacked_edges[first_positions], edge_sources
@@ -1,11 +1,12 @@
-from typing import List
+import logging
+from typing import Optional, Tuple
 
 import numpy as np
 import xarray as xr
 import xugrid as xu
 
-from netcdf_to_gltf_converter.data.vector import Vec3
 from netcdf_to_gltf_converter.netcdf.netcdf_data import DatasetBase
+from netcdf_to_gltf_converter.preprocessing.subset import Geometry, select_faces
 
 
 class UgridDataset(DatasetBase):
@@ -13,16 +14,27 @@ class UgridDataset(DatasetBase):
     The wrapper allows for easier retrieval of relevant data.
     """
 
-    def __init__(self, dataset: xr.Dataset) -> None:
+    def __init__(self, dataset: xr.Dataset, subset: Optional[Geometry] = None) -> None:
         """Initialize a UgridDataset with the specified arguments.
 
         Args:
             dataset (xr.Dataset): The xarray Dataset.
+            subset (Optional[Geometry], optional): The area of the grid to keep. Only the faces of which the centroid lies within the area,
+                and their nodes and edges, are kept. Defaults to the whole grid.
+
+        Raises:
+            ValueError: When no face lies within the area.
         """
         super().__init__(dataset)
         self._ugrid_data_set = xu.UgridDataset(dataset)  
         self._grid = self._get_ugrid2d()
-        super()._log_grid_bounds(self._grid.bounds)
+        if subset is not None:
+            self._select_subset(subset)
+
+        # The data coordinates are derived from the grid once; transformations are applied when the data is retrieved
+        self._ugrid_data_set = self._ugrid_data_set.ugrid.assign_node_coords().ugrid.assign_face_coords().ugrid.assign_edge_coords()
+        self._dataset = self._ugrid_data_set.obj
+        super()._log_grid_bounds(self.bounds)
 
     @property
     def min_x(self) -> float:
@@ -44,6 +56,15 @@ class UgridDataset(DatasetBase):
         _, min_y, _,_ = self._grid.bounds
         return min_y
 
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """Get the bounds of the grid.
+
+        Returns:
+            Tuple[float, float, float, float]: Tuple with min x, min y, max x, max y.
+        """
+        return self._grid.bounds
+
     @property
     def face_node_connectivity(self) -> np.ndarray:
         """Get the face node connectivity of the grid.
@@ -70,6 +91,18 @@ class UgridDataset(DatasetBase):
         """
         return self._grid.node_coordinates
 
+    def set_node_coordinates(self, node_coordinates: np.ndarray):
+        """Set the node coordinates of the grid.
+
+        Only the grid is updated; the coordinates of the data variables are left unchanged.
+
+        Args:
+            node_coordinates (np.ndarray): An ndarray of floats with shape (n, 2). Each row represents one node and contains the x- and y-coordinate.
+        """
+        self._grid.node_x = node_coordinates[:, 0]
+        self._grid.node_y = node_coordinates[:, 1]
+        self._grid._clear_geometry_properties()
+
     @property
     def fill_value(self) -> int:
         """Get the fill value.
@@ -79,60 +112,19 @@ class UgridDataset(DatasetBase):
         """
         return self._grid.fill_value
                 
-    def shift_coordinates(self, shift: Vec3, variables: List[str]) -> None:
-        """
-        Shift the x- and y-coordinates and the variable values in the data set with the provided shift values.
-        All x-coordinates will be subtracted with `shift.x`.
-        All y_coordinates will be subtracted with `shift.y`.
-        All z_coordinates (variable values) will be subtracted with `shift.z`.
+    def _select_subset(self, subset: Geometry):
+        face_indices = select_faces(self._grid.centroids, subset)
+        if len(face_indices) == 0:
+            raise ValueError("The grid has no faces within the spatial subset.")
 
-        Args:
-            shift (Vec3): Vector containing the values to shift the coordinates with.
-            variables (List[str]): The names of the variables for which to shift the values.
-        """
-        self._grid.node_x = self._grid.node_x - shift.x
-        self._grid.node_y = self._grid.node_y - shift.y
-        self._update()
-        
-        for variable_name in variables:
-            self._subtract_variable_values(variable_name, shift.z)
-           
-    def scale_coordinates(self, scale_horizontal: float, scale_vertical: float, variables: List[str]) -> None:
-        """
-        Scale the x- and y-coordinates and the data values, with the scaling factors that are specified.
-        The original data set is updated with the new coordinates.
+        logging.info(f"SUBSET grid: {len(face_indices)} of {self._grid.n_face} faces selected")
 
-        Args:
-            scale_horizontal (float): The horizontal scale for the x- and y-coordinates of the mesh.
-            scale_vertical (float): The vertical scale for the height of the mesh points.
-            variables (List[str]): The names of the variables to scale.
-        """     
-        self._grid.node_x = self._grid.node_x * scale_horizontal
-        self._grid.node_y = self._grid.node_y * scale_horizontal          
-        self._update()
-        
-        for variable_name in variables:
-            self._multiply_variable_values(variable_name, scale_vertical)
-
-    def _subtract_variable_values(self, variable_name: str, subtraction: float) -> None:
-        variable = self.get_array(variable_name)
-        shifted_coords_var = variable - subtraction
-        self.set_array(shifted_coords_var)
-
-    def _multiply_variable_values(self, variable_name: str, factor: float):
-        variable = self.get_array(variable_name)
-        scaled_coords_var = variable * factor
-        self.set_array(scaled_coords_var)
+        # Selecting on the lazily loaded dataset compacts the connectivity and only reads the selected data indices from file
+        self._ugrid_data_set = self._ugrid_data_set.isel({self._grid.face_dimension: face_indices})
+        self._grid = self._get_ugrid2d()
 
     def _get_ugrid2d(self) -> xu.Ugrid2d:
         for grid in self._ugrid_data_set.grids:
             if isinstance(grid, xu.Ugrid2d):
                 return grid
         raise ValueError("No 2D grid")
- 
-    def _update(self):
-        self._grid._clear_geometry_properties()
-        self._ugrid_data_set: xu.UgridDataset = self._ugrid_data_set.ugrid.assign_node_coords().ugrid.assign_face_coords().ugrid.assign_edge_coords()
-        self._dataset = self._ugrid_data_set.obj
-        
-        super()._log_grid_bounds(self._grid.bounds)
\ No newline at end of file
@@ -1,36 +1,66 @@
-from typing import List, Tuple
+import logging
+from typing import Optional, Tuple
 
 import numpy as np
 import xarray as xr
 from xugrid.ugrid.conventions import X_STANDARD_NAMES, Y_STANDARD_NAMES
 
-from netcdf_to_gltf_converter.data.vector import Vec3
+from netcdf_to_gltf_converter.config import RegularGridOptions, TriangleDiagonal
 from netcdf_to_gltf_converter.netcdf.netcdf_data import (
     DatasetBase, get_coordinate_variables)
 from netcdf_to_gltf_converter.preprocessing import connectivity
-
-xr.set_options(keep_attrs=True)
-"""Attributes need to be preserved when creating a new DataArray with a transformation."""
+from netcdf_to_gltf_converter.preprocessing.subset import Geometry, select_faces
 
 class RegularGrid():
     """Represents a grid from an XBEACH output file. 
     XBEACH uses regular grids.
     """
     
-    def __init__(self, dataset: xr.Dataset):
+    def __init__(
+        self,
+        dataset: xr.Dataset,
+        diagonal: TriangleDiagonal = TriangleDiagonal.FORWARD,
+        active_cells: Optional[np.ndarray] = None,
+    ):
         """Initialize a new instance of the `RegularGrid` class.
 
+        The grid cells are directly split into triangles. Cells with a node without valid coordinates are inactive and are not triangulated.
+
         Args:
             dataset (xr.Dataset): The dataset retrieved from the netCDF file.
+            diagonal (TriangleDiagonal, optional): The diagonal along which the cells are split. Defaults to TriangleDiagonal.FORWARD.
+            active_cells (Optional[np.ndarray], optional): Whether each cell is active, an ndarray of bools with shape (n_rows - 1, n_columns - 1). Defaults to all cells with valid coordinates.
         """
+        self.update_node_coordinates(dataset)
+
         x_coord_var = get_coordinate_variables(dataset, X_STANDARD_NAMES)[0]
-        y_coord_var = get_coordinate_variables(dataset, Y_STANDARD_NAMES)[0]
-        n_vertex_cols = len(x_coord_var.data[0])
-        n_vertex_rows = len(x_coord_var.data)
+        n_vertex_rows, n_vertex_cols = x_coord_var.shape
         
+        is_valid_node = np.isfinite(self.node_x) & np.isfinite(self.node_y)
+        if not is_valid_node.all():
+            is_valid_node = is_valid_node.reshape(n_vertex_rows, n_vertex_cols)
+            valid_cells = (
+                is_valid_node[:-1, :-1]
+                & is_valid_node[:-1, 1:]
+                & is_valid_node[1:, :-1]
+                & is_valid_node[1:, 1:]
+            )
+            active_cells = valid_cells if active_cells is None else active_cells & valid_cells
+
+        self.face_node_connectivity = connectivity.triangles_from_regular(
+            n_vertex_rows, n_vertex_cols, diagonal, active_cells
+        )
+
+    def update_node_coordinates(self, dataset: xr.Dataset):
+        """Update the node coordinates from the coordinate variables in the dataset.
+
+        Args:
+            dataset (xr.Dataset): The dataset retrieved from the netCDF file.
+        """
+        x_coord_var = get_coordinate_variables(dataset, X_STANDARD_NAMES)[0]
+        y_coord_var = get_coordinate_variables(dataset, Y_STANDARD_NAMES)[0]
         self.node_x = x_coord_var.values.flatten()
         self.node_y = y_coord_var.values.flatten()
-        self.face_node_connectivity = connectivity.face_node_connectivity_from_regular(n_vertex_rows, n_vertex_cols)
 
     @property
     def node_coordinates(self) -> np.ndarray:
@@ -43,29 +73,99 @@ class RegularGrid():
     
     @property
     def bounds(self) -> Tuple[float, float, float, float]:
-        """Get the grid bounds.
+        """Get the grid bounds. Nodes without valid coordinates are ignored.
 
         Returns:
             Tuple[float, float, float, float]: Tuple with min x, min y, max x, max y.
         """
-        return (self.node_x.min(), self.node_y.min(), self.node_x.max(), self.node_y.max())
+        return (np.nanmin(self.node_x), np.nanmin(self.node_y), np.nanmax(self.node_x), np.nanmax(self.node_y))
 
 class XBeachDataset(DatasetBase):
     """Class that serves as a wrapper object for an xarray.Dataset with UGrid conventions.
     The wrapper allows for easier retrieval of relevant data.
     """
 
-    def __init__(self, dataset: xr.Dataset) -> None:
+    def __init__(
+        self,
+        dataset: xr.Dataset,
+        options: Optional[RegularGridOptions] = None,
+        subset: Optional[Geometry] = None,
+    ) -> None:
         """Initialize a UgridDataset with the specified arguments.
 
         Args:
             dataset (xr.Dataset): The xarray Dataset.
+            options (Optional[RegularGridOptions], optional): The configuration settings for the regular grid. Defaults to the default RegularGridOptions.
+            subset (Optional[Geometry], optional): The area of the grid to keep. Only the cells of which the centroid lies within the area are triangulated,
+                and only the rows and columns around these cells are read. Defaults to the whole grid.
+
+        Raises:
+            ValueError: When the window of the regular grid options contains fewer than 2 node rows or columns.
+            ValueError: When no cell lies within the area.
         """
-        dataset = dataset.fillna(0) # TODO check what to do with nan values.
-        self._dataset = dataset
-        self._grid = RegularGrid(dataset)
-        self._log_grid_bounds(self._grid.bounds)
+        options = options or RegularGridOptions()
+        if options.is_subsampled:
+            dataset = XBeachDataset._subsample(dataset, options)
+        active_cells = None
+        if subset is not None:
+            dataset, active_cells = XBeachDataset._select_subset(dataset, subset)
+        super().__init__(dataset)
+        self._grid = RegularGrid(dataset, options.diagonal, active_cells)
+        self._log_grid_bounds(self.bounds)
         
+    @staticmethod
+    def _subsample(dataset: xr.Dataset, options: RegularGridOptions) -> xr.Dataset:
+        # Selecting on the lazily loaded dataset only reads the selected hyperslabs from file
+        x_coord_var = get_coordinate_variables(dataset, X_STANDARD_NAMES)[0]
+        row_dim, column_dim = x_coord_var.dims
+
+        def get_slice(index_start: int, index_end: Optional[int], stride: int) -> slice:
+            return slice(index_start, None if index_end is None else index_end + 1, stride)
+
+        selection = {
+            row_dim: get_slice(options.row_index_start, options.row_index_end, options.row_stride),
+            column_dim: get_slice(options.column_index_start, options.column_index_end, options.column_stride),
+        }
+        logging.info(f"SUBSAMPLE regular grid with: {selection[row_dim]} (rows), {selection[column_dim]} (columns)")
+        dataset = dataset.isel(selection)
+        if dataset.sizes[row_dim] < 2 or dataset.sizes[column_dim] < 2:
+            raise ValueError(
+                f"The regular grid has no faces within the selected window: {dataset.sizes[row_dim]} node rows and {dataset.sizes[column_dim]} node columns remain."
+            )
+        return dataset
+
+    @staticmethod
+    def _select_subset(dataset: xr.Dataset, subset: Geometry) -> Tuple[xr.Dataset, np.ndarray]:
+        x_coord_var = get_coordinate_variables(dataset, X_STANDARD_NAMES)[0]
+        y_coord_var = get_coordinate_variables(dataset, Y_STANDARD_NAMES)[0]
+        row_dim, column_dim = x_coord_var.dims
+
+        def get_cell_centers(node_coords: np.ndarray) -> np.ndarray:
+            return (node_coords[:-1, :-1] + node_coords[:-1, 1:] + node_coords[1:, :-1] + node_coords[1:, 1:]) / 4
+
+        cell_x = get_cell_centers(x_coord_var.values)
+        cell_y = get_cell_centers(y_coord_var.values)
+        is_valid_cell = np.isfinite(cell_x) & np.isfinite(cell_y)
+        valid_cells = np.flatnonzero(is_valid_cell)
+        cell_coordinates = np.column_stack([cell_x.ravel()[valid_cells], cell_y.ravel()[valid_cells]])
+
+        selected_cells = np.zeros(cell_x.shape, dtype=bool)
+        selected_cells.flat[valid_cells[select_faces(cell_coordinates, subset)]] = True
+        if not selected_cells.any():
+            raise ValueError("The grid has no faces within the spatial subset.")
+
+        # Only the window of node rows and columns around the selected cells is read from file
+        rows = np.flatnonzero(selected_cells.any(axis=1))
+        columns = np.flatnonzero(selected_cells.any(axis=0))
+        row_slice = slice(rows[0], rows[-1] + 2)
+        column_slice = slice(columns[0], columns[-1] + 2)
+        logging.info(
+            f"SUBSET regular grid: {selected_cells.sum()} of {selected_cells.size} cells selected, {row_slice} (rows), {column_slice} (columns)"
+        )
+
+        active_cells = selected_cells[rows[0] : rows[-1] + 1, columns[0] : columns[-1] + 1]
+        return dataset.isel({row_dim: row_slice, column_dim: column_slice}), active_cells
+
     @property
     def min_x(self) -> float:
         """Gets the smallest x-coordinate of the grid.
@@ -73,7 +173,7 @@ class XBeachDataset(DatasetBase):
         Returns:
             float: A floating value with the smallest x-coordinate.
         """
-        return self._grid.node_x.min()
+        return np.nanmin(self._grid.node_x)
 
     @property
     def min_y(self) -> float:
@@ -82,7 +182,16 @@ class XBeachDataset(DatasetBase):
         Returns:
             float: A floating value with the smallest y-coordinate.
         """
-        return self._grid.node_y.min()
+        return np.nanmin(self._grid.node_y)
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """Get the bounds of the grid.
+
+        Returns:
+            Tuple[float, float, float, float]: Tuple with min x, min y, max x, max y.
+        """
+        return self._grid.bounds
 
     @property
     def face_node_connectivity(self) -> np.ndarray:
@@ -101,6 +210,13 @@ class XBeachDataset(DatasetBase):
         """
         self._grid.face_node_connectivity = face_node_connectivity
 
+    def triangulate(self):
+        """Triangulate the provided grid.
+
+        The regular grid is already triangulated when it is created, so the generic triangulation is skipped.
+        """
+        pass
+
     @property
     def node_coordinates(self) -> np.ndarray:
         """Get the node coordinates of the grid.
@@ -110,78 +226,22 @@ class XBeachDataset(DatasetBase):
         """
         return self._grid.node_coordinates
 
-    @property
-    def fill_value(self) -> int:
-        """Get the fill value.
+    def set_node_coordinates(self, node_coordinates: np.ndarray):
+        """Set the node coordinates of the grid.
 
-        Returns:
-            int: Integer with the fill value.
-        """
-        return -1
-    
-    def shift_coordinates(self, shift: Vec3, variables: List[str]) -> None:
-        """
-        Shift the x- and y-coordinates and the variable values in the data set with the provided shift values.
-        All x-coordinates will be subtracted with `shift.x`.
-        All y_coordinates will be subtracted with `shift.y`.
-        All z_coordinates (variable values) will be subtracted with `shift.z`.
+        Only the grid is updated; the coordinates of the data variables are left unchanged.
 
         Args:
-            shift (Vec3): Vector containing the values to shift the coordinates with.
-            variables (List[str]): The names of the variables for which to shift the values.
+            node_coordinates (np.ndarray): An ndarray of floats with shape (n, 2). Each row represents one node and contains the x- and y-coordinate.
         """
+        self._grid.node_x = node_coordinates[:, 0]
+        self._grid.node_y = node_coordinates[:, 1]
 
-        for x_coord_var in self._x_coord_vars:
-            self._shift(x_coord_var, shift.x)
-
-        for y_coord_var in self._y_coord_vars:
-            self._shift(y_coord_var, shift.y)
-
-        for variable in variables:
-                self._shift(self.get_array(variable), shift.z)
-
-        self._update()
-
-    def _update(self):
-        self._grid = RegularGrid(self._dataset)
-        self._log_grid_bounds(self._grid.bounds)
-        
-    def _shift(self, variable: xr.DataArray, shift: float):
-        shifted_coords_var = variable - shift
-        self.set_array(shifted_coords_var)
-    
-    @property
-    def _x_coord_vars(self):  
-        return get_coordinate_variables(self._dataset, X_STANDARD_NAMES)  
-    
     @property
-    def _y_coord_vars(self):  
-        return get_coordinate_variables(self._dataset, Y_STANDARD_NAMES)  
-     
-    def scale_coordinates(self, scale_horizontal: float, scale_vertical: float, variables: List[str]) -> None:
-        """
-        Scale the x- and y-coordinates and the data values, with the scaling factors that are specified.
-        The original data set is updated with the new coordinates.
+    def fill_value(self) -> int:
+        """Get the fill value.
 
-        Args:
-            scale_horizontal (float): The horizontal scale for the x- and y-coordinates of the mesh.
-            scale_vertical (float): The vertical scale for the height of the mesh points.
-            variables (List[str]): The names of the variables to scale.
+        Returns:
+            int: Integer with the fill value.
         """
-        
-        if scale_horizontal != 1.0:
-            for x_coord_var in self._x_coord_vars:
-                self._scale(x_coord_var, scale_horizontal)
-
-            for y_coord_var in self._y_coord_vars:
-                self._scale(y_coord_var, scale_horizontal)
-
-        if scale_vertical != 1.0:
-            for variable in variables:
-                self._scale(self.get_array(variable), scale_vertical)
-            
-        self._update()
-        
-    def _scale(self, variable: xr.DataArray, scale: float):
-        scaled_coords_var = variable * scale
-        self.set_array(scaled_coords_var)
\ No newline at end of file
+        return -1
@@ -1,8 +1,18 @@
+from typing import Optional
+
+import numpy as np
+
+from netcdf_to_gltf_converter.config import TriangleDiagonal
 from netcdf_to_gltf_converter.utils.arrays import uint32_array
 
+FORWARD_TRIANGLES = np.array([[0, 1, 2], [0, 2, 3]])
+"""The corners of the two triangles of a cell that is split along the diagonal from the lower left to the upper right corner."""
+BACKWARD_TRIANGLES = np.array([[0, 1, 3], [1, 2, 3]])
+"""The corners of the two triangles of a cell that is split along the diagonal from the lower right to the upper left corner."""
+
 
 def face_node_connectivity_from_regular(n_vertex_rows: int, n_vertex_cols: int):
-    """Generates the face-node connectivity based on a regular grid 
+    """Generates the face-node connectivity based on a regular grid
     with the provided number of rows and columns.
 
     Args:
@@ -10,22 +20,70 @@ def face_node_connectivity_from_regular(n_vertex_rows: int, n_vertex_cols: int):
         n_vertex_cols (int): The number of vertex columns.
 
     Returns:
-        np.ndarray: A 2D np.ndarray of floats with shape (nfaces, 4) where each row contains the four node indices of one face. 
+        np.ndarray: A 2D np.ndarray of floats with shape (nfaces, 4) where each row contains the four node indices of one face.
     """
-    
-    node_index = 0
-    faces = []
-        
-    # TODO check if this can be improved
-    for _ in range(n_vertex_rows - 1):
-        for _ in range(n_vertex_cols - 1):               
-            node_indices = [node_index, 
-                      node_index + 1,
-                      node_index + n_vertex_cols + 1, 
-                      node_index + n_vertex_cols, 
-                      ]
-            faces.append(node_indices)  
-            node_index += 1
-        node_index += 1
-
-    return uint32_array(faces)
\ No newline at end of file
+    lower_left = _get_lower_left_nodes(n_vertex_rows, n_vertex_cols)
+
+    return uint32_array(
+        np.column_stack(
+            [
+                lower_left,
+                lower_left + 1,
+                lower_left + n_vertex_cols + 1,
+                lower_left + n_vertex_cols,
+            ]
+        )
+    )
+
+
+def triangles_from_regular(
+    n_vertex_rows: int,
+    n_vertex_cols: int,
+    diagonal: TriangleDiagonal = TriangleDiagonal.FORWARD,
+    active_cells: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Generates the triangles of a regular grid with the provided number of rows and columns.
+
+    Each cell of the grid is split into two triangles along one of its diagonals.
+    The triangles are ordered per cell, row by row, with the same counterclockwise orientation as the cells.
+
+    Args:
+        n_vertex_rows (int): The number of vertex rows.
+        n_vertex_cols (int): The number of vertex columns.
+        diagonal (TriangleDiagonal, optional): The diagonal along which the cells are split. Defaults to TriangleDiagonal.FORWARD.
+        active_cells (Optional[np.ndarray], optional): An ndarray of booleans with shape (n_vertex_rows - 1, n_vertex_cols - 1)
+            that indicates which cells should be triangulated. Defaults to all cells.
+
+    Returns:
+        np.ndarray: An ndarray of integers with shape (m, 3) where each row contains the three node indices of one triangle.
+    """
+    lower_left = _get_lower_left_nodes(n_vertex_rows, n_vertex_cols)
+    if active_cells is not None:
+        lower_left = lower_left[active_cells.ravel()]
+
+    # The corners of each cell in counterclockwise order: lower left, lower right, upper right, upper left
+    corners = np.empty((len(lower_left), 4), dtype=np.uint32)
+    corners[:, 0] = lower_left
+    corners[:, 1] = lower_left + 1
+    corners[:, 2] = lower_left + n_vertex_cols + 1
+    corners[:, 3] = lower_left + n_vertex_cols
+
+    if diagonal == TriangleDiagonal.FORWARD:
+        triangles = corners[:, FORWARD_TRIANGLES]
+    elif diagonal == TriangleDiagonal.BACKWARD:
+        triangles = corners[:, BACKWARD_TRIANGLES]
+    elif diagonal == TriangleDiagonal.ALTERNATING:
+        rows, cols = np.divmod(lower_left, n_vertex_cols)
+        is_forward = (rows + cols) % 2 == 0
+        triangles = np.empty((len(lower_left), 2, 3), dtype=np.uint32)
+        triangles[is_forward] = corners[is_forward][:, FORWARD_TRIANGLES]
+        triangles[~is_forward] = corners[~is_forward][:, BACKWARD_TRIANGLES]
+
+    return triangles.reshape(-1, 3)
+
+
+def _get_lower_left_nodes(n_vertex_rows: int, n_vertex_cols: int) -> np.ndarray:
+    n_cell_rows = max(n_vertex_rows - 1, 0)
+    n_cell_cols = max(n_vertex_cols - 1, 0)
+    rows = np.arange(n_cell_rows, dtype=np.uint32)[:, None] * np.uint32(n_vertex_cols)
+    return (rows + np.arange(n_cell_cols, dtype=np.uint32)).ravel()
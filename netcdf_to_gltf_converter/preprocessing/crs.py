@@ -1,12 +1,40 @@
+import os
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
 import pyproj
+import pyproj.datadir
 import pyproj.network
 from pyproj import CRS
 from pyproj.crs import CompoundCRS
+from pyproj.transformer import TransformerGroup
+
+
+def configure_proj(data_dir: Optional[Path] = None, network: bool = False):
+    """Configure where PROJ finds transformation grids.
+
+    Args:
+        data_dir (Optional[Path], optional): A directory with transformation grids that is added to the PROJ search paths. Defaults to None.
+        network (bool, optional): Whether PROJ may download missing transformation grids from the PROJ content delivery network. Defaults to False.
+    """
+    if data_dir is not None and str(data_dir) not in pyproj.datadir.get_data_dir().split(os.pathsep):
+        pyproj.datadir.append_data_dir(str(data_dir))
+
+    pyproj.network.set_network_enabled(network)
 
 
 def create_crs_transformer(source_crs: CRS, target_crs: CRS) -> pyproj.Transformer:
     """Create a coordinate transformer that transforms the coordinates from a source coordinate system to a target coordinate system.
 
+    The transformer uses the best transformation for which the grids are available in the PROJ search paths,
+    or on the PROJ content delivery network when network access is enabled with `configure_proj`.
+    Transformers are cached per pair of coordinate systems and PROJ configuration, since creating a transformer
+    involves a search through the PROJ database. Transformers are thread-safe and can be shared between threads.
+
     Args:
         source_crs (CRS): The source coordinate system.
         target_crs (CRS): The target coordinate system.
@@ -14,12 +42,98 @@ def create_crs_transformer(source_crs: CRS, target_crs: CRS) -> pyproj.Transform
     Returns:
         pyproj.Transformer: The coordinate transformer
     """
-    pyproj.network.set_network_enabled(True)
+    return _create_crs_transformer(
+        source_crs,
+        target_crs,
+        pyproj.datadir.get_data_dir(),
+        pyproj.network.is_network_enabled(),
+    )
 
-    transformer = pyproj.Transformer.from_crs(
+
+@lru_cache(maxsize=None)
+def _create_crs_transformer(
+    source_crs: CRS, target_crs: CRS, data_dir: str, network: bool
+) -> pyproj.Transformer:
+    return pyproj.Transformer.from_crs(
         crs_from=source_crs, crs_to=target_crs, always_xy=True
     )
-    return transformer
+
+
+def get_missing_grids(source_crs: CRS, target_crs: CRS) -> List[str]:
+    """Get the transformation grids that are not available in the PROJ search paths, but are needed for a more accurate transformation.
+
+    Args:
+        source_crs (CRS): The source coordinate system.
+        target_crs (CRS): The target coordinate system.
+
+    Returns:
+        List[str]: The file names of the missing grids. Empty when the best transformation is available.
+    """
+    transformer_group = _create_transformer_group(source_crs, target_crs)
+
+    missing_grids = []
+    for operation in transformer_group.unavailable_operations:
+        for grid in operation.grids:
+            if not grid.available and grid.short_name not in missing_grids:
+                missing_grids.append(grid.short_name)
+
+    return missing_grids
+
+
+def download_grids(source_crs: CRS, target_crs: CRS, directory: Optional[Path] = None):
+    """Download the missing transformation grids with an open license from the PROJ content delivery network.
+
+    Args:
+        source_crs (CRS): The source coordinate system.
+        target_crs (CRS): The target coordinate system.
+        directory (Optional[Path], optional): The directory to download the grids to. Defaults to the PROJ user data directory.
+    """
+    transformer_group = _create_transformer_group(source_crs, target_crs)
+    transformer_group.download_grids(directory=directory, open_license=True)
+
+
+def _create_transformer_group(source_crs: CRS, target_crs: CRS) -> TransformerGroup:
+    # The missing grids are reported by the caller, instead of by a warning of pyproj
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        return TransformerGroup(source_crs, target_crs, always_xy=True)
+
+
+def transform_coordinates(
+    transformer: pyproj.Transformer,
+    coordinates: np.ndarray,
+    chunk_size: int,
+    n_workers: Optional[int] = None,
+) -> np.ndarray:
+    """Transform a large number of coordinates in chunks that are transformed in parallel.
+
+    PROJ releases the global interpreter lock while transforming, so the chunks are transformed by a pool of threads.
+
+    Args:
+        transformer (pyproj.Transformer): The coordinate transformer.
+        coordinates (np.ndarray): The coordinates, an ndarray of floats with shape (n, 2) or (n, 3). Each row contains the x-, y- and optionally z-coordinate of a point.
+        chunk_size (int): The number of coordinates per chunk.
+        n_workers (Optional[int], optional): The number of threads. Defaults to the default number of threads of a ThreadPoolExecutor.
+
+    Returns:
+        np.ndarray: The transformed coordinates, a new ndarray of float64 with the same shape as the coordinates.
+    """
+    # Each coordinate dimension is a contiguous array, such that the chunks can be transformed in place
+    transformed = [np.array(column, dtype=np.float64) for column in coordinates.T]
+
+    def transform_chunk(start: int):
+        end = start + chunk_size
+        transformer.transform(*[column[start:end] for column in transformed], inplace=True)
+
+    starts = range(0, len(coordinates), chunk_size)
+    if len(starts) <= 1:
+        for start in starts:
+            transform_chunk(start)
+    else:
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            list(executor.map(transform_chunk, starts))
+
+    return np.column_stack(transformed)
 
 
 def create_crs(epsg: int) -> CRS:
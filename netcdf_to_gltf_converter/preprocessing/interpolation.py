@@ -45,10 +45,14 @@ class InterpolatorBase(ABC):
     ) -> np.ndarray:
         points_to_interpolate = dataset.node_coordinates
 
-        interpolated_points = interpolate.griddata(
-            data_coords,
-            data_values,
-            points_to_interpolate,
+        # Points without valid coordinates, e.g. the nodes of inactive cells of a regular grid, are skipped and get a NaN value
+        is_valid_data = np.isfinite(data_coords).all(axis=1)
+        is_valid_point = np.isfinite(points_to_interpolate).all(axis=1)
+        interpolated_points = np.full(len(points_to_interpolate), np.nan)
+        interpolated_points[is_valid_point] = interpolate.griddata(
+            data_coords[is_valid_data],
+            data_values[is_valid_data],
+            points_to_interpolate[is_valid_point],
             method=method,
         )
 
@@ -0,0 +1,177 @@
+from typing import List, Set, Tuple
+
+import numpy as np
+
+from netcdf_to_gltf_converter.utils.arrays import uint32_array
+
+MORTON_BITS = 16
+"""The number of bits per coordinate that are used to compute the Morton codes."""
+
+
+def tipsify(triangles: np.ndarray, n_vertices: int, cache_size: int) -> np.ndarray:
+    """Get the order of the triangles that improves the post-transform vertex cache efficiency.
+
+    The order is determined with the Tipsify algorithm from Sander, Nehab and Barczak (2007),
+    "Fast triangle reordering for vertex locality and reduced overdraw". Triangles are emitted
+    as fans around vertices that are likely still in the vertex cache.
+
+    Args:
+        triangles (np.ndarray): The vertex indices per triangle, an ndarray of integers with shape (m, 3).
+        n_vertices (int): The number of vertices.
+        cache_size (int): The size of the simulated vertex cache.
+
+    Returns:
+        np.ndarray: The triangle indices in the optimized order, an ndarray of integers with shape (m,).
+    """
+    adjacent_triangles = _get_adjacent_triangles(triangles, n_vertices)
+    triangle_vertices = triangles.tolist()
+
+    live_triangles = np.bincount(triangles.ravel(), minlength=n_vertices).tolist()
+    cache_time = [0] * n_vertices
+    emitted = [False] * len(triangle_vertices)
+    dead_end_stack: List[int] = []
+    order: List[int] = []
+
+    time_stamp = cache_size + 1
+    cursor = 0
+    fanning_vertex = 0 if n_vertices > 0 else -1
+
+    while fanning_vertex >= 0:
+        candidates: Set[int] = set()
+
+        for triangle in adjacent_triangles[fanning_vertex]:
+            if emitted[triangle]:
+                continue
+
+            for vertex in triangle_vertices[triangle]:
+                dead_end_stack.append(vertex)
+                candidates.add(vertex)
+                live_triangles[vertex] -= 1
+                if time_stamp - cache_time[vertex] > cache_size:
+                    cache_time[vertex] = time_stamp
+                    time_stamp += 1
+
+            emitted[triangle] = True
+            order.append(triangle)
+
+        fanning_vertex = _get_next_vertex(
+            candidates, cache_size, cache_time, time_stamp, live_triangles
+        )
+        if fanning_vertex < 0:
+            fanning_vertex, cursor = _skip_dead_end(
+                live_triangles, dead_end_stack, cursor
+            )
+
+    return np.array(order, dtype=np.int64)
+
+
+def morton_order(node_coordinates: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+    """Get the order of the triangles along the Morton (Z-order) space-filling curve through their centroids.
+
+    Args:
+        node_coordinates (np.ndarray): The node coordinates, an ndarray of floats with shape (n, 2). Each row contains the x- and y-coordinate of a node.
+        triangles (np.ndarray): The node indices per triangle, an ndarray of integers with shape (m, 3).
+
+    Returns:
+        np.ndarray: The triangle indices in the optimized order, an ndarray of integers with shape (m,).
+    """
+    centroids = node_coordinates[triangles].mean(axis=1)
+    min_corner = centroids.min(axis=0)
+    extent = (centroids.max(axis=0) - min_corner).max()
+    if extent == 0:
+        return np.arange(len(triangles))
+
+    max_cell = (1 << MORTON_BITS) - 1
+    cells = ((centroids - min_corner) / extent * max_cell).astype(np.uint64)
+    codes = _spread_bits(cells[:, 0]) | (_spread_bits(cells[:, 1]) << np.uint64(1))
+
+    return np.argsort(codes, kind="stable")
+
+
+def renumber_vertices_by_first_use(
+    triangles: np.ndarray, n_vertices: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Renumber the vertices in the order in which they are first used by the triangles.
+
+    Vertices that are not used by any triangle are placed after the used vertices, in their original order.
+
+    Args:
+        triangles (np.ndarray): The vertex indices per triangle, an ndarray of integers with shape (m, 3).
+        n_vertices (int): The number of vertices.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The renumbered triangles, an ndarray of integers with shape (m, 3),
+        and the original vertex index for each new vertex index, an ndarray of integers with shape (n,).
+    """
+    used_vertices, first_use = np.unique(triangles.ravel(), return_index=True)
+    used_vertices = used_vertices[np.argsort(first_use)]
+
+    is_used = np.zeros(n_vertices, dtype=bool)
+    is_used[used_vertices] = True
+    vertex_order = np.concatenate([used_vertices, np.flatnonzero(~is_used)])
+
+    new_index = np.empty(n_vertices, dtype=np.int64)
+    new_index[vertex_order] = np.arange(n_vertices)
+
+    return uint32_array(new_index[triangles]), vertex_order
+
+
+def _get_adjacent_triangles(triangles: np.ndarray, n_vertices: int) -> List[List[int]]:
+    corners = triangles.ravel()
+    corner_order = np.argsort(corners, kind="stable")
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(corners, minlength=n_vertices))])
+    adjacent = (corner_order // 3).tolist()
+
+    return [adjacent[offsets[v] : offsets[v + 1]] for v in range(n_vertices)]
+
+
+def _get_next_vertex(
+    candidates: Set[int],
+    cache_size: int,
+    cache_time: List[int],
+    time_stamp: int,
+    live_triangles: List[int],
+) -> int:
+    best_vertex = -1
+    best_priority = -1
+
+    for vertex in candidates:
+        if live_triangles[vertex] <= 0:
+            continue
+
+        # Prefer vertices that will still be in the cache after emitting their remaining triangles
+        priority = 0
+        age = time_stamp - cache_time[vertex]
+        if age + 2 * live_triangles[vertex] <= cache_size:
+            priority = age
+
+        if priority > best_priority:
+            best_priority = priority
+            best_vertex = vertex
+
+    return best_vertex
+
+
+def _skip_dead_end(
+    live_triangles: List[int], dead_end_stack: List[int], cursor: int
+) -> Tuple[int, int]:
+    while dead_end_stack:
+        vertex = dead_end_stack.pop()
+        if live_triangles[vertex] > 0:
+            return vertex, cursor
+
+    while cursor < len(live_triangles):
+        if live_triangles[cursor] > 0:
+            return cursor, cursor
+        cursor += 1
+
+    return -1, cursor
+
+
+def _spread_bits(values: np.ndarray) -> np.ndarray:
+    values = values & np.uint64(0xFFFF)
+    values = (values | (values << np.uint64(8))) & np.uint64(0x00FF00FF)
+    values = (values | (values << np.uint64(4))) & np.uint64(0x0F0F0F0F)
+    values = (values | (values << np.uint64(2))) & np.uint64(0x33333333)
+    values = (values | (values << np.uint64(1))) & np.uint64(0x55555555)
+    return values
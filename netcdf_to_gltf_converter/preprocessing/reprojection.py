@@ -0,0 +1,153 @@
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from netcdf_to_gltf_converter.config import Reprojection
+from netcdf_to_gltf_converter.preprocessing.crs import (create_crs_transformer,
+                                                        transform_coordinates)
+from netcdf_to_gltf_converter.utils.events import EventEmitter, EventType
+
+MEMORY_CACHE_SIZE = 8
+"""The maximum number of reprojected coordinate arrays that a reprojector caches in memory."""
+CACHE_NAME = "reprojection"
+"""The name of the reprojection cache in the cache events."""
+
+
+class GridReprojector:
+    """Class to reproject grid coordinates from the model coordinate system to another coordinate system.
+
+    The reprojected coordinates are cached per fingerprint of the coordinates and the coordinate systems,
+    in memory and optionally in a cache directory, such that the same grid is reprojected only once.
+    The memory cache belongs to the reprojector, such that it is released with the conversion;
+    conversions share reprojected coordinates through the cache directory.
+    """
+
+    def __init__(self, reprojection: Reprojection, events: Optional[EventEmitter] = None) -> None:
+        """Initialize a GridReprojector with the specified arguments.
+
+        Args:
+            reprojection (Reprojection): The configuration settings for the reprojection.
+            events (Optional[EventEmitter], optional): The emitter of the cache hit and miss events. Defaults to a new EventEmitter.
+        """
+        self._reprojection = reprojection
+        self._events = events or EventEmitter()
+        crs_transformation = reprojection.crs_transformation
+        self._transformer = create_crs_transformer(
+            crs_transformation.source_crs, crs_transformation.target_crs
+        )
+        self._memory_cache: "OrderedDict[str, np.ndarray]" = OrderedDict()
+
+    @property
+    def transform_z(self) -> bool:
+        """Get whether the z-coordinates are transformed as well.
+
+        Returns:
+            bool: True when the z-coordinates are transformed; otherwise, False.
+        """
+        return self._reprojection.transform_z
+
+    def reproject(self, coordinates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Reproject the x- and y-coordinates of a set of points.
+
+        When the z-coordinates are transformed as well, the vertical offset of each point is determined by
+        transforming the point at height 0. The offset should be added to the z-coordinates of the point,
+        which is exact for transformations between vertical datums that do not depend on the height.
+
+        Args:
+            coordinates (np.ndarray): The coordinates, an ndarray of floats with shape (n, 2). Each row contains the x- and y-coordinate of a point.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: The reprojected coordinates, an ndarray of floats with shape (n, 2),
+            and the vertical offsets, an ndarray of floats with shape (n,). The offsets are 0 when the z-coordinates are not transformed.
+            Both arrays are read-only, since they are shared with the cache.
+        """
+        fingerprint = self._get_fingerprint(coordinates)
+
+        reprojected = self._get_cached(fingerprint)
+        if reprojected is None:
+            self._events.emit(EventType.CACHE_MISS, CACHE_NAME)
+            reprojected = self._reproject(coordinates)
+            self._cache(fingerprint, reprojected)
+
+        return reprojected[:, :2], reprojected[:, 2]
+
+    def _reproject(self, coordinates: np.ndarray) -> np.ndarray:
+        logging.info(
+            f"REPROJECT {len(coordinates)} coordinates from {self._transformer.source_crs.name} to {self._transformer.target_crs.name}"
+        )
+        n_points = len(coordinates)
+        if self.transform_z:
+            points = np.column_stack([coordinates, np.zeros(n_points)])
+        else:
+            points = coordinates
+
+        reprojected = transform_coordinates(
+            self._transformer,
+            points,
+            self._reprojection.chunk_size,
+            self._reprojection.n_workers,
+        )
+        if not self.transform_z:
+            reprojected = np.column_stack([reprojected, np.zeros(n_points)])
+
+        return reprojected
+
+    def _get_fingerprint(self, coordinates: np.ndarray) -> str:
+        crs_transformation = self._reprojection.crs_transformation
+        fingerprint = hashlib.blake2b(digest_size=16)
+        fingerprint.update(np.ascontiguousarray(coordinates, dtype=np.float64).tobytes())
+        fingerprint.update(crs_transformation.source_crs.to_wkt().encode())
+        fingerprint.update(crs_transformation.target_crs.to_wkt().encode())
+        fingerprint.update(bytes([self.transform_z]))
+        return fingerprint.hexdigest()
+
+    def _get_cached(self, fingerprint: str) -> Optional[np.ndarray]:
+        reprojected = self._memory_cache.get(fingerprint)
+        if reprojected is not None:
+            self._memory_cache.move_to_end(fingerprint)
+            logging.info(f"REPROJECT coordinates from memory cache: {fingerprint}")
+            self._events.emit(EventType.CACHE_HIT, CACHE_NAME)
+            return reprojected
+
+        cache_path = self._get_cache_path(fingerprint)
+        if cache_path is not None and cache_path.is_file():
+            logging.info(f"REPROJECT coordinates from cache file: {cache_path}")
+            reprojected = np.load(cache_path)
+            self._add_to_memory_cache(fingerprint, reprojected)
+            self._events.emit(EventType.CACHE_HIT, CACHE_NAME)
+            return reprojected
+
+        return None
+
+    def _cache(self, fingerprint: str, reprojected: np.ndarray):
+        self._add_to_memory_cache(fingerprint, reprojected)
+
+        cache_path = self._get_cache_path(fingerprint)
+        if cache_path is None:
+            return
+
+        # Write to a temporary file first, such that concurrent conversions never read a partially written file
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = cache_path.with_name(f"{cache_path.stem}.{os.getpid()}.tmp")
+        with open(temporary_path, "wb") as cache_file:
+            np.save(cache_file, reprojected)
+        os.replace(temporary_path, cache_path)
+
+    def _add_to_memory_cache(self, fingerprint: str, reprojected: np.ndarray):
+        # The returned coordinates are views of the cached array, which should not be changed by their users
+        reprojected.setflags(write=False)
+        self._memory_cache[fingerprint] = reprojected
+        self._memory_cache.move_to_end(fingerprint)
+        while len(self._memory_cache) > MEMORY_CACHE_SIZE:
+            self._memory_cache.popitem(last=False)
+
+    def _get_cache_path(self, fingerprint: str) -> Optional[Path]:
+        if self._reprojection.cache_dir is None:
+            return None
+        return self._reprojection.cache_dir / f"{fingerprint}.npy"
+
@@ -0,0 +1,74 @@
+from typing import Tuple
+
+import numpy as np
+
+from netcdf_to_gltf_converter.utils.arrays import uint32_array
+
+
+def cluster_vertices(
+    node_coordinates: np.ndarray, triangles: np.ndarray, cell_size: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Simplify a triangular mesh with vertex clustering.
+
+    The nodes are clustered on a regular grid with cells of the specified size.
+    Each cluster is represented by the original node closest to the centroid of the cluster.
+    Triangles that collapse within a cluster and duplicate triangles are removed.
+
+    Args:
+        node_coordinates (np.ndarray): The node coordinates, an ndarray of floats with shape (n, 2). Each row contains the x- and y-coordinate of a node.
+        triangles (np.ndarray): The node indices per triangle, an ndarray of integers with shape (m, 3).
+        cell_size (float): The size of the clustering grid cells.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: The indices of the original nodes that represent the clusters, an ndarray of integers with shape (k,),
+        and the simplified triangles, an ndarray of integers with shape (l, 3) that contains indices into the representative nodes.
+
+    Raises:
+        ValueError: When the cell size is not larger than zero.
+    """
+    if cell_size <= 0:
+        raise ValueError(f"Cell size should be larger than zero, but was {cell_size}.")
+
+    origin = node_coordinates.min(axis=0)
+    cells = np.floor((node_coordinates - origin) / cell_size).astype(np.int64)
+    _, node_cluster = np.unique(cells, axis=0, return_inverse=True)
+    node_cluster = node_cluster.reshape(-1)
+    n_clusters = node_cluster.max() + 1
+
+    representatives = _get_representative_nodes(
+        node_coordinates, node_cluster, n_clusters
+    )
+
+    cluster_triangles = node_cluster[triangles]
+    cluster_triangles = cluster_triangles[_is_not_degenerate(cluster_triangles)]
+    _, unique_indices = np.unique(
+        np.sort(cluster_triangles, axis=1), axis=0, return_index=True
+    )
+    cluster_triangles = cluster_triangles[np.sort(unique_indices)]
+
+    return representatives, uint32_array(cluster_triangles)
+
+
+def _get_representative_nodes(
+    node_coordinates: np.ndarray, node_cluster: np.ndarray, n_clusters: int
+) -> np.ndarray:
+    cluster_size = np.bincount(node_cluster, minlength=n_clusters)
+    centroids = np.column_stack(
+        [
+            np.bincount(node_cluster, weights=node_coordinates[:, 0]) / cluster_size,
+            np.bincount(node_cluster, weights=node_coordinates[:, 1]) / cluster_size,
+        ]
+    )
+
+    distances = np.linalg.norm(node_coordinates - centroids[node_cluster], axis=1)
+    order = np.lexsort((distances, node_cluster))
+    first_in_cluster = np.searchsorted(node_cluster[order], np.arange(n_clusters))
+    return order[first_in_cluster]
+
+
+def _is_not_degenerate(triangles: np.ndarray) -> np.ndarray:
+    return (
+        (triangles[:, 0] != triangles[:, 1])
+        & (triangles[:, 1] != triangles[:, 2])
+        & (triangles[:, 0] != triangles[:, 2])
+    )
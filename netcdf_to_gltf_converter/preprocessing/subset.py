@@ -0,0 +1,97 @@
+import json
+from pathlib import Path
+
+import geopandas as gpd
+import numpy as np
+import shapely.wkt
+from shapely.errors import ShapelyError
+from shapely.geometry import box, shape
+from shapely.geometry.base import BaseGeometry
+
+Geometry = BaseGeometry
+"""The geometry of an area, e.g. a bounding box or (multi)polygon."""
+
+
+def create_box(min_x: float, min_y: float, max_x: float, max_y: float) -> Geometry:
+    """Create the geometry of a bounding box.
+
+    Args:
+        min_x (float): The smallest x-coordinate.
+        min_y (float): The smallest y-coordinate.
+        max_x (float): The largest x-coordinate.
+        max_y (float): The largest y-coordinate.
+
+    Returns:
+        Geometry: The rectangular polygon.
+    """
+    return box(min_x, min_y, max_x, max_y)
+
+
+def parse_geometry(text: str) -> Geometry:
+    """Parse a geometry from WKT or GeoJSON.
+
+    Args:
+        text (str): The geometry as WKT, or as a GeoJSON geometry, feature or feature collection.
+
+    Returns:
+        Geometry: The geometry. The union of the geometries of a feature collection.
+
+    Raises:
+        ValueError: When the text is neither valid WKT nor valid GeoJSON.
+    """
+    if text.lstrip().startswith("{"):
+        try:
+            geojson = json.loads(text)
+            if geojson.get("type") == "FeatureCollection":
+                return gpd.GeoDataFrame.from_features(geojson["features"]).unary_union
+            if geojson.get("type") == "Feature":
+                geojson = geojson["geometry"]
+            return shape(geojson)
+        except (ValueError, KeyError, AttributeError, TypeError, ShapelyError) as error:
+            raise ValueError(f"Geometry is not valid GeoJSON: {error}") from error
+
+    try:
+        return shapely.wkt.loads(text)
+    except ShapelyError as error:
+        raise ValueError(f"Geometry is not valid WKT: {error}") from error
+
+
+def read_geometry(file_path: Path) -> Geometry:
+    """Read a geometry from a file.
+
+    GeoJSON files (.geojson, .json) are parsed directly; other file types are read with geopandas.
+
+    Args:
+        file_path (Path): Path to the file, e.g. a GeoJSON file or shapefile.
+
+    Returns:
+        Geometry: The union of all geometries in the file.
+
+    Raises:
+        ValueError: When the file does not exist.
+    """
+    if not file_path.is_file():
+        raise ValueError(f"Geometry file does not exist: {file_path}")
+
+    if file_path.suffix.lower() in (".geojson", ".json"):
+        return parse_geometry(file_path.read_text())
+
+    return gpd.read_file(file_path).unary_union
+
+
+def select_faces(face_coordinates: np.ndarray, geometry: Geometry) -> np.ndarray:
+    """Select the faces of which the centroid lies within a geometry.
+
+    The centroids are queried with an STRtree spatial index, such that only the centroids within the envelope of
+    the geometry are tested against the geometry itself.
+
+    Args:
+        face_coordinates (np.ndarray): The coordinates of the face centroids, an ndarray of floats with shape (n, 2).
+        geometry (Geometry): The geometry of the area.
+
+    Returns:
+        np.ndarray: The indices of the selected faces in ascending order, an ndarray of integers with shape (m,).
+    """
+    centroids = gpd.GeoSeries(gpd.points_from_xy(face_coordinates[:, 0], face_coordinates[:, 1]))
+    face_indices = centroids.sindex.query(geometry, predicate="intersects")
+    return np.sort(face_indices)
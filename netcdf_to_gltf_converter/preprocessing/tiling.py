@@ -0,0 +1,191 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+Bounds = Tuple[float, float, float, float]
+"""The bounds of an area: min x, min y, max x, max y."""
+
+
+@dataclass
+class Tile:
+    """Data class representing a node in the quadtree that partitions the points of a mesh into spatial tiles."""
+
+    quadkey: str
+    """str: The path to this tile in the quadtree, with one digit (0-3) per level. The root tile has an empty quadkey."""
+
+    bounds: Bounds
+    """Bounds: The bounds of the quadtree cell: min x, min y, max x, max y."""
+
+    children: List["Tile"] = field(default_factory=list)
+    """List[Tile]: The child tiles. Empty for leaf tiles."""
+
+    @property
+    def is_leaf(self) -> bool:
+        """Get whether this tile is a leaf of the quadtree.
+
+        Returns:
+            bool: True when this tile has no children; otherwise, False.
+        """
+        return not self.children
+
+    def leaves(self) -> List["Tile"]:
+        """Get the leaf tiles of the quadtree starting at this tile.
+
+        Returns:
+            List[Tile]: The leaf tiles, in depth-first order.
+        """
+        if self.is_leaf:
+            return [self]
+
+        return [leaf for child in self.children for leaf in child.leaves()]
+
+    def assign(self, points: np.ndarray) -> Dict[str, np.ndarray]:
+        """Assign the points to the leaf tiles of the quadtree starting at this tile.
+
+        Points are assigned with the same rules that were used to partition the quadtree.
+        Points that fall into a quadrant that is not part of the quadtree are not assigned.
+
+        Args:
+            points (np.ndarray): The points, an ndarray of floats with shape (n, 2). Each row contains the x- and y-coordinate of a point.
+
+        Returns:
+            Dict[str, np.ndarray]: The indices of the assigned points per quadkey of the leaf tiles.
+        """
+        assignment = {}
+        self._assign(points, np.arange(len(points)), assignment)
+        return assignment
+
+    def _assign(
+        self,
+        points: np.ndarray,
+        point_indices: np.ndarray,
+        assignment: Dict[str, np.ndarray],
+    ):
+        if self.is_leaf:
+            assignment[self.quadkey] = point_indices
+            return
+
+        quadrants = _get_quadrants(points[point_indices], self.bounds)
+        for child in self.children:
+            in_quadrant, _ = quadrants[int(child.quadkey[-1])]
+            child._assign(points, point_indices[in_quadrant], assignment)
+
+
+def partition_quadtree(
+    points: np.ndarray, max_points_per_tile: int, max_depth: int
+) -> Tile:
+    """Partition a set of points into spatial tiles with a quadtree.
+
+    A quadtree cell is split into four quadrants as long as it contains more than the maximum number
+    of points and the maximum depth has not been reached. Quadrants without points are omitted.
+    Typically the points are the centroids of the triangles of a mesh.
+
+    Args:
+        points (np.ndarray): The points, an ndarray of floats with shape (n, 2). Each row contains the x- and y-coordinate of a point.
+        max_points_per_tile (int): The maximum number of points per tile.
+        max_depth (int): The maximum depth of the quadtree.
+
+    Returns:
+        Tile: The root tile of the quadtree.
+    """
+    min_x, min_y = points.min(axis=0)
+    max_x, max_y = points.max(axis=0)
+
+    return _partition(
+        quadkey="",
+        bounds=(min_x, min_y, max_x, max_y),
+        points=points,
+        max_points_per_tile=max_points_per_tile,
+        max_depth=max_depth,
+    )
+
+
+def split_triangles(triangles: np.ndarray, max_vertices: int) -> List[np.ndarray]:
+    """Split the triangles of a mesh into consecutive chunks that each use at most the maximum number of vertices.
+
+    Args:
+        triangles (np.ndarray): The vertex indices per triangle, an ndarray of integers with shape (m, 3).
+        max_vertices (int): The maximum number of unique vertices per chunk, at least 3.
+
+    Returns:
+        List[np.ndarray]: The triangle indices per chunk, each an ndarray of integers with shape (k,).
+    """
+    n_triangles = len(triangles)
+    chunks = []
+    start = 0
+
+    def is_valid(end: int) -> bool:
+        return len(np.unique(triangles[start:end])) <= max_vertices
+
+    while start < n_triangles:
+        # Gallop to find an invalid chunk end, then bisect to find the largest valid chunk end
+        step = max(max_vertices // 3, 1)
+        valid_end = min(start + step, n_triangles)
+        invalid_end = n_triangles + 1
+        while valid_end < n_triangles:
+            candidate = min(valid_end + step, n_triangles)
+            if not is_valid(candidate):
+                invalid_end = candidate
+                break
+            valid_end = candidate
+            step *= 2
+
+        while invalid_end - valid_end > 1 and valid_end < n_triangles:
+            middle = (valid_end + invalid_end) // 2
+            if is_valid(middle):
+                valid_end = middle
+            else:
+                invalid_end = middle
+
+        chunks.append(np.arange(start, valid_end))
+        start = valid_end
+
+    return chunks
+
+
+def _partition(
+    quadkey: str,
+    bounds: Bounds,
+    points: np.ndarray,
+    max_points_per_tile: int,
+    max_depth: int,
+) -> Tile:
+    if len(points) <= max_points_per_tile or len(quadkey) >= max_depth:
+        return Tile(quadkey, bounds)
+
+    children = []
+    for quadrant_index, (in_quadrant, quadrant_bounds) in enumerate(
+        _get_quadrants(points, bounds)
+    ):
+        if not in_quadrant.any():
+            continue
+
+        child = _partition(
+            quadkey + str(quadrant_index),
+            quadrant_bounds,
+            points[in_quadrant],
+            max_points_per_tile,
+            max_depth,
+        )
+        children.append(child)
+
+    return Tile(quadkey, bounds, children)
+
+
+def _get_quadrants(
+    points: np.ndarray, bounds: Bounds
+) -> List[Tuple[np.ndarray, Bounds]]:
+    min_x, min_y, max_x, max_y = bounds
+    mid_x = (min_x + max_x) / 2
+    mid_y = (min_y + max_y) / 2
+
+    is_left = points[:, 0] < mid_x
+    is_bottom = points[:, 1] < mid_y
+
+    return [
+        (is_left & is_bottom, (min_x, min_y, mid_x, mid_y)),
+        (~is_left & is_bottom, (mid_x, min_y, max_x, mid_y)),
+        (is_left & ~is_bottom, (min_x, mid_y, mid_x, max_y)),
+        (~is_left & ~is_bottom, (mid_x, mid_y, max_x, max_y)),
+    ]
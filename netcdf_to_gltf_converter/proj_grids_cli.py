@@ -0,0 +1,63 @@
+import argparse
+import sys
+from pathlib import Path
+
+from netcdf_to_gltf_converter.config import Config
+from netcdf_to_gltf_converter.preprocessing.crs import (configure_proj,
+                                                        download_grids,
+                                                        get_missing_grids)
+
+
+def get_args():
+    """Parses and returns the arguments"""
+    parser = argparse.ArgumentParser(
+        description="Verify that the transformation grids needed by a configuration are available locally, and optionally download the missing grids."
+    )
+    parser.add_argument("config", help="Path to the converter configuration file")
+    parser.add_argument(
+        "--prefetch",
+        action="store_true",
+        help="Download the missing grids to the PROJ data directory of the configuration",
+    )
+
+    return parser.parse_args()
+
+
+def verify_grids(config: Config, prefetch: bool) -> bool:
+    """Verify that the transformation grids needed by the configuration are available in the PROJ search paths.
+
+    Args:
+        config (Config): The converter configuration.
+        prefetch (bool): Whether to download the missing grids before verifying.
+
+    Returns:
+        bool: True when all grids are available; otherwise, False.
+    """
+    # Only grids in the search paths count, regardless of whether the conversion may use the network
+    configure_proj(config.proj.data_dir, network=False)
+
+    all_available = True
+    for crs_transformation in config.crs_transformations:
+        source_crs = crs_transformation.source_crs
+        target_crs = crs_transformation.target_crs
+
+        if prefetch and get_missing_grids(source_crs, target_crs):
+            print(f"Downloading grids for {source_crs.name} to {target_crs.name}")
+            download_grids(source_crs, target_crs, config.proj.data_dir)
+
+        missing_grids = get_missing_grids(source_crs, target_crs)
+        if missing_grids:
+            all_available = False
+            print(f"MISSING grids for {source_crs.name} to {target_crs.name}: {', '.join(missing_grids)}")
+        else:
+            print(f"OK {source_crs.name} to {target_crs.name}")
+
+    return all_available
+
+
+if __name__ == "__main__":
+    args = get_args()
+    config = Config.from_file(Path(args.config))
+
+    if not verify_grids(config, args.prefetch):
+        sys.exit(1)
@@ -0,0 +1,130 @@
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional
+
+from strenum import StrEnum
+
+
+class EventType(StrEnum):
+    """The type of a conversion event."""
+
+    STAGE_START = "stage_start"
+    """A stage of the conversion started. The value is None."""
+
+    STAGE_END = "stage_end"
+    """A stage of the conversion ended. The value is the duration of the stage in seconds."""
+
+    PROGRESS = "progress"
+    """A frame of a variable was converted. The value is the number of converted frames and the total is the number of frames to convert."""
+
+    BYTES_WRITTEN = "bytes_written"
+    """A file was written. The name is the file name and the value is the size of the file in bytes."""
+
+    CACHE_HIT = "cache_hit"
+    """Data was taken from a cache. The name is the name of the cache and the value, when known, the size of the data in bytes."""
+
+    CACHE_MISS = "cache_miss"
+    """Data was not found in a cache. The name is the name of the cache and the value, when known, the size of the data in bytes."""
+
+
+@dataclass(frozen=True)
+class Event:
+    """Data class representing an event of a conversion."""
+
+    type: EventType
+    """EventType: The type of the event."""
+
+    name: str
+    """str: The subject of the event, e.g. the stage, variable, file or cache. The names of nested stages are prefixed with the name of their parent stage, separated by a slash."""
+
+    value: Optional[float] = None
+    """Optional[float]: The value of the event, which depends on the event type."""
+
+    total: Optional[float] = None
+    """Optional[float]: The total of a progress event."""
+
+    time: float = field(default_factory=time.time)
+    """float: The time of the event in seconds since the epoch."""
+
+
+Listener = Callable[[Event], None]
+"""A callback that is called with each event."""
+
+
+class EventEmitter:
+    """Class to emit the events of a conversion to the registered listeners.
+
+    The listeners are called synchronously in the order in which they were added. Emitting an event without
+    registered listeners returns immediately, such that events can be emitted unconditionally.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an EventEmitter without listeners."""
+        self._listeners: List[Listener] = []
+        self._stage_names: List[str] = []
+
+    @property
+    def has_listeners(self) -> bool:
+        """bool: Whether any listeners are registered."""
+        return bool(self._listeners)
+
+    def add_listener(self, listener: Listener):
+        """Register a listener, which is called with each next event.
+
+        Args:
+            listener (Listener): The listener.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Listener):
+        """Unregister a listener.
+
+        Args:
+            listener (Listener): The listener.
+
+        Raises:
+            ValueError: When the listener is not registered.
+        """
+        self._listeners.remove(listener)
+
+    def emit(
+        self,
+        event_type: EventType,
+        name: str,
+        value: Optional[float] = None,
+        total: Optional[float] = None,
+    ):
+        """Emit an event to the registered listeners.
+
+        Args:
+            event_type (EventType): The type of the event.
+            name (str): The subject of the event.
+            value (Optional[float], optional): The value of the event. Defaults to None.
+            total (Optional[float], optional): The total of a progress event. Defaults to None.
+        """
+        if not self._listeners:
+            return
+
+        event = Event(event_type, name, value, total)
+        for listener in self._listeners:
+            listener(event)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Emit the start and end of a stage of the conversion, the code within the context.
+
+        The end of the stage is also emitted when the code within the context raises an error.
+
+        Args:
+            name (str): The name of the stage.
+        """
+        self._stage_names.append(name)
+        stage_name = "/".join(self._stage_names)
+        self.emit(EventType.STAGE_START, stage_name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._stage_names.pop()
+            self.emit(EventType.STAGE_END, stage_name, time.perf_counter() - start)
@@ -0,0 +1,54 @@
+import struct
+import zlib
+
+import numpy as np
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+"""The signature at the start of every PNG file."""
+PNG_COLOR_TYPE_RGBA = 6
+"""The PNG color type of images with red, green, blue and alpha channels."""
+
+
+def encode_png(pixels: np.ndarray) -> bytes:
+    """Encode an RGBA image as PNG.
+
+    Args:
+        pixels (np.ndarray): The pixels, an ndarray of uint8 or uint16 with shape (height, width, 4).
+            The data type determines the bit depth of the image.
+
+    Returns:
+        bytes: The PNG file content.
+
+    Raises:
+        ValueError: When the shape or data type of the pixels is not supported.
+    """
+    if pixels.ndim != 3 or pixels.shape[2] != 4:
+        raise ValueError(
+            f"Pixels should have shape (height, width, 4), but had shape {pixels.shape}."
+        )
+    if pixels.dtype not in (np.uint8, np.uint16):
+        raise ValueError(
+            f"Pixels should have data type uint8 or uint16, but had data type {pixels.dtype}."
+        )
+
+    height, width, _ = pixels.shape
+    bit_depth = pixels.dtype.itemsize * 8
+
+    # PNG stores samples big-endian, each row is preceded by its filter type (0: none)
+    rows = pixels.astype(pixels.dtype.newbyteorder(">")).reshape(height, -1).view(np.uint8)
+    scanlines = np.hstack([np.zeros((height, 1), dtype=np.uint8), rows])
+
+    header = struct.pack(">IIBBBBB", width, height, bit_depth, PNG_COLOR_TYPE_RGBA, 0, 0, 0)
+    return b"".join(
+        [
+            PNG_SIGNATURE,
+            _chunk(b"IHDR", header),
+            _chunk(b"IDAT", zlib.compress(scanlines.tobytes(), 9)),
+            _chunk(b"IEND", b""),
+        ]
+    )
+
+
+def _chunk(chunk_type: bytes, data: bytes) -> bytes:
+    checksum = zlib.crc32(chunk_type + data)
+    return struct.pack(">I", len(data)) + chunk_type + data + struct.pack(">I", checksum)
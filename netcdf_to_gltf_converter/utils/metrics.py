@@ -0,0 +1,128 @@
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from netcdf_to_gltf_converter.utils.events import Event, EventType
+
+METRIC_PREFIX = "gltf_converter_"
+"""The prefix of the names of all metrics."""
+WRITE_INTERVAL = 5.0
+"""The default minimum time in seconds between two writes of the metrics file."""
+
+_METRICS = (
+    ("stage_active", "gauge", "Whether the stage of the conversion is running (1) or finished (0)."),
+    ("stage_duration_seconds", "gauge", "The duration of the finished stage of the conversion."),
+    ("frames_done", "gauge", "The number of converted frames of the variable."),
+    ("frames", "gauge", "The number of frames of the variable to convert."),
+    ("written_bytes_total", "counter", "The number of bytes written to the output files."),
+    ("cache_hits_total", "counter", "The number of times data was taken from the cache."),
+    ("cache_misses_total", "counter", "The number of times data was not found in the cache."),
+    ("last_event_timestamp_seconds", "gauge", "The time of the last event of the conversion since the epoch."),
+)
+"""The name, type and description of each metric."""
+
+
+class MetricsExporter:
+    """Class to export the conversion events as metrics to a text file, as a listener of the conversion events.
+
+    The metrics are written in the Prometheus text exposition format, e.g. to be collected by the textfile collector of
+    the Prometheus node exporter. The file is replaced atomically, such that a collector never reads a partially written file.
+    Frequent events, such as the progress of each frame, are written at most once per write interval; the end of each stage
+    is always written.
+    """
+
+    def __init__(
+        self,
+        file_path: Path,
+        labels: Optional[Dict[str, str]] = None,
+        write_interval: float = WRITE_INTERVAL,
+    ) -> None:
+        """Initialize a MetricsExporter with the specified arguments.
+
+        Args:
+            file_path (Path): The path of the metrics file, e.g. a .prom file in the folder of the textfile collector.
+            labels (Optional[Dict[str, str]], optional): The labels that are added to all metrics, e.g. to identify the conversion. Defaults to None.
+            write_interval (float, optional): The minimum time in seconds between two writes of the metrics file. Defaults to 5.0.
+        """
+        self._file_path = file_path
+        self._labels = labels or {}
+        self._write_interval = write_interval
+        self._last_write = 0.0
+        self._samples: Dict[str, Dict[Tuple[Tuple[str, str], ...], float]] = {
+            name: {} for name, _, _ in _METRICS
+        }
+
+    def on_event(self, event: Event):
+        """Update the metrics with a conversion event and write them when the write interval passed.
+
+        Args:
+            event (Event): The conversion event.
+        """
+        if event.type == EventType.STAGE_START:
+            self._set("stage_active", 1, stage=event.name)
+        elif event.type == EventType.STAGE_END:
+            self._set("stage_active", 0, stage=event.name)
+            self._set("stage_duration_seconds", event.value, stage=event.name)
+        elif event.type == EventType.PROGRESS:
+            self._set("frames_done", event.value, variable=event.name)
+            self._set("frames", event.total, variable=event.name)
+        elif event.type == EventType.BYTES_WRITTEN:
+            self._increment("written_bytes_total", event.value)
+        elif event.type == EventType.CACHE_HIT:
+            self._increment("cache_hits_total", 1, cache=event.name)
+        elif event.type == EventType.CACHE_MISS:
+            self._increment("cache_misses_total", 1, cache=event.name)
+        self._set("last_event_timestamp_seconds", event.time)
+
+        if event.type == EventType.STAGE_END or time.monotonic() - self._last_write >= self._write_interval:
+            self.write()
+
+    def write(self):
+        """Write the current metrics to the metrics file."""
+        temporary_path = self._file_path.with_name(f"{self._file_path.name}.{os.getpid()}.tmp")
+        temporary_path.write_text(self.to_text())
+        os.replace(temporary_path, self._file_path)
+        self._last_write = time.monotonic()
+
+    def to_text(self) -> str:
+        """Get the current metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics. Metrics without samples are omitted.
+        """
+        lines: List[str] = []
+        for name, metric_type, description in _METRICS:
+            samples = self._samples[name]
+            if not samples:
+                continue
+
+            metric_name = METRIC_PREFIX + name
+            lines.append(f"# HELP {metric_name} {description}")
+            lines.append(f"# TYPE {metric_name} {metric_type}")
+            for labels, value in samples.items():
+                lines.append(f"{metric_name}{_format_labels(labels)} {value:.17g}")
+
+        return "\n".join(lines) + "\n"
+
+    def _get_key(self, labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+        return tuple({**self._labels, **labels}.items())
+
+    def _set(self, name: str, value: float, **labels: str):
+        self._samples[name][self._get_key(labels)] = float(value)
+
+    def _increment(self, name: str, value: float, **labels: str):
+        key = self._get_key(labels)
+        self._samples[name][key] = self._samples[name].get(key, 0.0) + value
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+
+    formatted = ",".join(f'{name}="{_escape_label_value(value)}"' for name, value in labels)
+    return f"{{{formatted}}}"
+
+
+def _escape_label_value(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,261 @@
+import json
+import os
+import sys
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from pygltflib import GLTF2
+
+from netcdf_to_gltf_converter.utils.events import Event, EventType
+
+COMPONENT_SIZES = {5120: 1, 5121: 1, 5122: 2, 5123: 2, 5125: 4, 5126: 4}
+"""The size in bytes of each glTF accessor component type."""
+N_COMPONENTS = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT2": 4, "MAT3": 9, "MAT4": 16}
+"""The number of components of each glTF accessor type."""
+ATTRIBUTE_CATEGORIES = {"POSITION": "positions", "NORMAL": "normals", "TANGENT": "tangents", "COLOR_0": "colors"}
+"""The accessor category of each glTF vertex attribute. Other attributes, such as texture coordinates, are categorized by the prefix of their name."""
+
+
+@dataclass
+class StageProfile:
+    """Data class containing the measurements of one stage of a conversion."""
+
+    name: str
+    """str: The name of the stage. The names of nested stages are prefixed with the name of their parent stage, separated by a slash."""
+
+    wall_time: float
+    """float: The elapsed time in seconds."""
+
+    cpu_time: float
+    """float: The processor time of the process in seconds, including the time of all threads."""
+
+    rss: Optional[int]
+    """Optional[int]: The resident set size of the process at the end of the stage in bytes. None when it cannot be determined on this platform."""
+
+    peak_rss: Optional[int]
+    """Optional[int]: The peak resident set size of the process up to the end of the stage in bytes. None when it cannot be determined on this platform."""
+
+    traced_peak: Optional[int] = None
+    """Optional[int]: The peak of the memory traced by tracemalloc during the stage in bytes. None when memory is not traced."""
+
+
+def get_rss() -> Optional[int]:
+    """Get the current resident set size of the current process.
+
+    Returns:
+        Optional[int]: The resident set size in bytes. None when it cannot be determined on this platform.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError, IndexError):
+        return None
+
+
+def get_peak_rss() -> Optional[int]:
+    """Get the peak resident set size of the current process.
+
+    Returns:
+        Optional[int]: The peak resident set size in bytes. None when it cannot be determined on this platform.
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # The peak resident set size is reported in kilobytes on Linux and in bytes on macOS
+    return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+def get_available_memory() -> Optional[int]:
+    """Get the available physical memory of the machine.
+
+    On Linux, this is the memory that can be claimed without swapping, including the reclaimable page cache, as
+    reported by `MemAvailable` in /proc/meminfo. On other platforms, or when it is not reported, the free memory is used.
+
+    Returns:
+        Optional[int]: The available memory in bytes. None when it cannot be determined on this platform.
+    """
+    try:
+        with open("/proc/meminfo") as meminfo:
+            for line in meminfo:
+                name, value = line.split(":", 1)
+                if name == "MemAvailable":
+                    # The value is reported in kilobytes
+                    return int(value.split()[0]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def get_accessor_bytes(gltf: GLTF2) -> Dict[str, int]:
+    """Count the bytes of the accessor data of a glTF per category.
+
+    The categories are `indices`, `positions`, `normals`, `tangents`, `colors`, `texcoords`, `morph_targets`,
+    `animation_input` (frame times), `animation_output` (weights) and `other` for the remaining accessors.
+    Accessors that are shared between categories are counted once, in the first category they are used in.
+    The decoded size of embedded images, e.g. colormaps and vertex animation textures, is counted as `images`.
+
+    Args:
+        gltf (GLTF2): The glTF.
+
+    Returns:
+        Dict[str, int]: The number of bytes per category. Categories without data are omitted.
+    """
+    categories: Dict[int, str] = {}
+    for mesh in gltf.meshes:
+        for primitive in mesh.primitives:
+            if primitive.indices is not None:
+                categories.setdefault(primitive.indices, "indices")
+            for attribute, accessor_index in vars(primitive.attributes).items():
+                if accessor_index is not None:
+                    categories.setdefault(accessor_index, _get_attribute_category(attribute))
+            for target in primitive.targets:
+                for accessor_index in vars(target).values():
+                    if accessor_index is not None:
+                        categories.setdefault(accessor_index, "morph_targets")
+
+    for animation in gltf.animations:
+        for sampler in animation.samplers:
+            categories.setdefault(sampler.input, "animation_input")
+            categories.setdefault(sampler.output, "animation_output")
+
+    accessor_bytes: Dict[str, int] = {}
+    for accessor_index, accessor in enumerate(gltf.accessors):
+        category = categories.get(accessor_index, "other")
+        size = accessor.count * N_COMPONENTS[accessor.type] * COMPONENT_SIZES[accessor.componentType]
+        accessor_bytes[category] = accessor_bytes.get(category, 0) + size
+
+    for image in gltf.images:
+        if image.uri is not None and image.uri.startswith("data:"):
+            encoded = image.uri.split(",", 1)[1]
+            accessor_bytes["images"] = accessor_bytes.get("images", 0) + len(encoded) * 3 // 4 - encoded.count("=")
+
+    return accessor_bytes
+
+
+def _get_attribute_category(attribute: str) -> str:
+    if attribute in ATTRIBUTE_CATEGORIES:
+        return ATTRIBUTE_CATEGORIES[attribute]
+    if attribute.startswith("TEXCOORD_"):
+        return "texcoords"
+    return "other"
+
+
+class Profiler:
+    """Class to measure the time and memory of the stages of a conversion, as a listener of the conversion events.
+
+    Each stage records its wall time, processor time and the (peak) resident set size of the process. When memory is
+    traced, the peak memory traced by tracemalloc during each stage is recorded as well, which slows down the conversion.
+    The sizes of the written files are summed from the bytes written events.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        """Initialize a Profiler with the specified arguments.
+
+        Args:
+            trace_memory (bool, optional): Whether the memory allocations are traced with tracemalloc. Defaults to False.
+        """
+        self._trace_memory = trace_memory
+        self._started_tracing = False
+        self._running_stages: List[Tuple[float, float]] = []
+        self._traced_peaks: List[int] = []
+        self._stages: List[StageProfile] = []
+        self._accessor_bytes: Dict[str, int] = {}
+        self._output_bytes = 0
+
+    @property
+    def stages(self) -> List[StageProfile]:
+        """List[StageProfile]: The measurements of the finished stages, in the order in which the stages finished."""
+        return self._stages
+
+    def on_event(self, event: Event):
+        """Measure the stage or count the bytes of a conversion event.
+
+        Args:
+            event (Event): The conversion event.
+        """
+        if event.type == EventType.STAGE_START:
+            self._start_stage()
+        elif event.type == EventType.STAGE_END:
+            self._end_stage(event.name)
+        elif event.type == EventType.BYTES_WRITTEN:
+            self._output_bytes += int(event.value)
+
+    def count_accessor_bytes(self, gltf: GLTF2):
+        """Count the bytes of the accessor data of the resulting glTF per category.
+
+        Args:
+            gltf (GLTF2): The resulting glTF.
+        """
+        self._accessor_bytes = get_accessor_bytes(gltf)
+
+    def _start_stage(self):
+        if self._trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            self._update_traced_peaks()
+            self._traced_peaks.append(0)
+        self._running_stages.append((time.perf_counter(), time.process_time()))
+
+    def _end_stage(self, name: str):
+        wall_start, cpu_start = self._running_stages.pop()
+        wall_time = time.perf_counter() - wall_start
+        cpu_time = time.process_time() - cpu_start
+
+        traced_peak = None
+        if self._trace_memory:
+            self._update_traced_peaks()
+            traced_peak = self._traced_peaks.pop()
+            if self._traced_peaks:
+                self._traced_peaks[-1] = max(self._traced_peaks[-1], traced_peak)
+            elif self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+        self._stages.append(
+            StageProfile(name, wall_time, cpu_time, get_rss(), get_peak_rss(), traced_peak)
+        )
+
+    def to_dict(self) -> dict:
+        """Get the measurements as a dictionary that can be written as JSON.
+
+        Returns:
+            dict: The measurements.
+        """
+        top_level_stages = [stage for stage in self._stages if "/" not in stage.name]
+        return {
+            "wall_time": sum(stage.wall_time for stage in top_level_stages),
+            "cpu_time": sum(stage.cpu_time for stage in top_level_stages),
+            "peak_rss": get_peak_rss(),
+            "stages": [asdict(stage) for stage in self._stages],
+            "accessor_bytes": self._accessor_bytes,
+            "output_bytes": self._output_bytes,
+        }
+
+    def to_file(self, file_path: Path, **properties):
+        """Write the measurements to a JSON file.
+
+        Args:
+            file_path (Path): The path of the JSON file.
+            **properties: Additional properties that are written to the JSON file, e.g. the paths of the converted files.
+        """
+        content = {**properties, **self.to_dict()}
+        with open(file_path, "w") as profile_file:
+            json.dump(content, profile_file, indent=2)
+
+    def _update_traced_peaks(self):
+        # The peak is reset at the start and end of each stage, so the peak of a stage includes the peaks of its nested stages
+        _, traced_peak = tracemalloc.get_traced_memory()
+        if self._traced_peaks:
+            self._traced_peaks[-1] = max(self._traced_peaks[-1], traced_peak)
+        tracemalloc.reset_peak()
@@ -19,9 +19,12 @@ def inclusive_range(start: int, stop: int, step: int) -> List[int]:
 
         >>> inclusive_range(10, 20, 2)
         [10, 12, 14, 16, 18, 20]
+
+        >>> inclusive_range(4, 3, 1)
+        []
     """
     range_list = list(range(start, stop, step))
-    if range_list[-1] != stop:
+    if start <= stop and (not range_list or range_list[-1] != stop):
         range_list.append(stop)
 
     return range_list
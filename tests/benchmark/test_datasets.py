@@ -0,0 +1,46 @@
+import numpy as np
+import xarray as xr
+import xugrid as xu
+
+from netcdf_to_gltf_converter.benchmark.datasets import (
+    FILL_VALUE, UGRID_VARIABLE, XBEACH_VARIABLE, create_mixed_faces,
+    generate_ugrid_dataset, generate_xbeach_dataset)
+
+
+class TestCreateMixedFaces:
+    def test_create_mixed_faces(self):
+        faces = create_mixed_faces(n_rows=4, n_cols=4)
+
+        n_face_nodes = (faces != FILL_VALUE).sum(axis=1)
+        # 3 cells per row: 6 triangles, 3 quadrilaterals, and 1 hexagon followed by 1 quadrilateral
+        assert sorted(n_face_nodes.tolist()) == [3] * 6 + [4] * 4 + [6]
+        np.testing.assert_array_equal(faces[-1], [8, 9, 10, 14, 13, 12])
+
+    def test_create_mixed_faces_covers_lattice(self):
+        faces = create_mixed_faces(n_rows=7, n_cols=6)
+
+        assert np.array_equal(np.unique(faces[faces != FILL_VALUE]), np.arange(7 * 6))
+
+
+class TestGenerateDatasets:
+    def test_generate_ugrid_dataset(self, tmp_path):
+        file_path = tmp_path / "ugrid.nc"
+
+        generate_ugrid_dataset(file_path, n_nodes=50, n_times=3)
+
+        with xr.open_dataset(file_path) as dataset:
+            grid = xu.UgridDataset(dataset).grid
+            assert grid.n_node == 56
+            assert dataset[UGRID_VARIABLE].shape == (3, grid.n_face)
+            assert not np.isnan(dataset[UGRID_VARIABLE].values).any()
+            # All faces are counterclockwise
+            assert (grid.area > 0).all()
+
+    def test_generate_xbeach_dataset(self, tmp_path):
+        file_path = tmp_path / "xbeach.nc"
+
+        generate_xbeach_dataset(file_path, n_nodes=50, n_times=3)
+
+        with xr.open_dataset(file_path) as dataset:
+            assert dataset["globalx"].shape == (7, 8)
+            assert dataset[XBEACH_VARIABLE].shape == (3, 7, 8)
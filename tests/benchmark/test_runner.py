@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from netcdf_to_gltf_converter.benchmark.runner import (STAGES, BenchmarkCase,
+                                                       BenchmarkRunner,
+                                                       compare, read_results,
+                                                       write_results)
+from netcdf_to_gltf_converter.config import ModelType
+
+
+def create_result(stages: dict, throughput: float, peak_rss: int) -> dict:
+    return {"stages": stages, "throughput": throughput, "peak_rss": peak_rss}
+
+
+class TestBenchmarkRunner:
+    @pytest.mark.parametrize("model_type", [ModelType.DHYDRO, ModelType.XBEACH])
+    def test_run_writes_results(self, tmp_path, model_type: ModelType):
+        case = BenchmarkCase(model_type, n_nodes=100, n_times=4)
+
+        results = BenchmarkRunner(tmp_path / "work").run([case])
+        write_results(results, tmp_path / "results.json")
+
+        content = read_results(tmp_path / "results.json")
+        result = content[case.name]
+        assert list(result["stages"]) == list(STAGES)
+        assert result["case"]["model_type"] == str(model_type)
+        assert result["n_frames"] == 4
+        assert result["n_vertices"] > 0
+        assert result["total"] == pytest.approx(sum(result["stages"].values()))
+        assert result["throughput"] == pytest.approx(result["n_vertices"] * 4 / result["total"])
+        assert not any((tmp_path / "work").iterdir())
+
+
+class TestReadResults:
+    def test_read_results_with_non_existing_file_raises_error(self, tmp_path):
+        file_path = tmp_path / "results.json"
+
+        with pytest.raises(ValueError) as error:
+            read_results(file_path)
+
+        assert str(error.value) == f"Benchmark results file does not exist: {file_path}"
+
+
+class TestCompare:
+    def test_compare_flags_regressions(self):
+        baseline = {"case": create_result({"open": 1.0, "build": 2.0, "export": 0.01}, 1000.0, 100)}
+        results = {
+            "case": create_result({"open": 1.05, "build": 3.0, "export": 0.03}, 800.0, 200),
+            "new_case": create_result({"open": 5.0}, 1.0, 1),
+        }
+
+        regressions = compare(results, baseline, tolerance=0.1, min_duration=0.05)
+
+        assert [(regression.case, regression.metric) for regression in regressions] == [
+            ("case", "build"),
+            ("case", "throughput"),
+            ("case", "peak_rss"),
+        ]
+        assert str(regressions[0]) == "case build: 3 (baseline 2, +50.0%)"
+
+    def test_compare_without_regressions(self):
+        baseline = {"case": create_result({"open": 1.0}, 1000.0, None)}
+        results = {"case": create_result({"open": 0.5}, 2000.0, 100)}
+
+        assert compare(results, baseline) == []
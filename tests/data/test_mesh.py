@@ -128,3 +128,112 @@ class TestTriangularMesh:
         assert len(threshold_mesh.transformations) == 0
         assert threshold_mesh.metallic_factor == 0.0
         assert threshold_mesh.roughness_factor == 1.0
+        assert threshold_mesh.constant_height == 0.01
+        assert triangular_mesh.constant_height is None
+
+    def test_simplify(self):
+        vertex_positions = float32_array(
+            [[x, y, 3 * y + x] for y in range(3) for x in range(3)]
+        )
+        base_geometry = MeshAttributes(
+            vertex_positions=vertex_positions, mesh_color=[0.38, 0.73, 0.78, 1.0]
+        )
+        triangles = uint32_array(
+            [
+                [0, 1, 4],
+                [0, 4, 3],
+                [1, 2, 5],
+                [1, 5, 4],
+                [3, 4, 7],
+                [3, 7, 6],
+                [4, 5, 8],
+                [4, 8, 7],
+            ]
+        )
+        transformation = MeshAttributes(
+            vertex_positions=float32_array(
+                [[0, 0, 0.1 * (3 * y + x)] for y in range(3) for x in range(3)]
+            ),
+            mesh_color=[0.38, 0.73, 0.78, 1.0],
+        )
+        triangular_mesh = TriangularMesh(
+            base_geometry, triangles, [transformation], 0.5, 0.75
+        )
+
+        simplified_mesh = triangular_mesh.simplify(cell_size=1.5)
+
+        # The corner vertices represent the four clusters
+        exp_vertex_positions = float32_array(
+            [
+                [0, 0, 0],
+                [0, 2, 6],
+                [2, 0, 2],
+                [2, 2, 8],
+            ]
+        )
+        exp_displacements = float32_array(
+            [
+                [0, 0, 0.0],
+                [0, 0, 0.6],
+                [0, 0, 0.2],
+                [0, 0, 0.8],
+            ]
+        )
+        exp_triangles = uint32_array([[0, 2, 3], [0, 3, 1]])
+
+        assert np.array_equal(
+            simplified_mesh.base.vertex_positions, exp_vertex_positions
+        )
+        assert np.array_equal(simplified_mesh.triangles, exp_triangles)
+        assert len(simplified_mesh.transformations) == 1
+        assert np.array_equal(
+            simplified_mesh.transformations[0].vertex_positions, exp_displacements
+        )
+        assert simplified_mesh.metallic_factor == 0.5
+        assert simplified_mesh.roughness_factor == 0.75
+
+    def test_extract(self):
+        vertex_positions = float32_array(
+            [
+                [0, 0, 1],
+                [1, 0, 2],
+                [1, 1, 3],
+                [0, 1, 4],
+            ]
+        )
+        base_geometry = MeshAttributes(
+            vertex_positions=vertex_positions, mesh_color=[0.38, 0.73, 0.78, 1.0]
+        )
+        triangles = uint32_array(
+            [
+                [0, 1, 2],
+                [0, 2, 3],
+            ]
+        )
+        transformation = MeshAttributes(
+            vertex_positions=float32_array(
+                [
+                    [0, 0, 0.5],
+                    [0, 0, -0.5],
+                    [0, 0, 0.5],
+                    [0, 0, -1.0],
+                ]
+            ),
+            mesh_color=[0.38, 0.73, 0.78, 1.0],
+        )
+        triangular_mesh = TriangularMesh(
+            base_geometry, triangles, [transformation], 0.5, 0.75
+        )
+
+        extracted_mesh = triangular_mesh.extract(np.array([1]))
+
+        exp_vertex_positions = float32_array([[0, 0, 1], [1, 1, 3], [0, 1, 4]])
+        exp_displacements = float32_array([[0, 0, 0.5], [0, 0, 0.5], [0, 0, -1.0]])
+        exp_triangles = uint32_array([[0, 1, 2]])
+
+        assert np.array_equal(extracted_mesh.base.vertex_positions, exp_vertex_positions)
+        assert np.array_equal(extracted_mesh.triangles, exp_triangles)
+        assert len(extracted_mesh.transformations) == 1
+        assert np.array_equal(
+            extracted_mesh.transformations[0].vertex_positions, exp_displacements
+        )
@@ -0,0 +1,51 @@
+import numpy as np
+
+from netcdf_to_gltf_converter.data.state import (ConversionState,
+                                                 VariableState,
+                                                 get_file_fingerprint,
+                                                 get_fingerprint)
+
+
+class TestConversionState:
+    def test_to_file_and_from_file_round_trip(self, tmp_path):
+        wet_vertices = np.array([True, False, False, True, True, False, True, True, False, True])
+        state = ConversionState(
+            "config",
+            {
+                "waterdepth": VariableState("base", 4, (0.5, 2.5), wet_vertices),
+                "bedlevel": VariableState("other_base", 0),
+            },
+        )
+
+        state_path = ConversionState.get_path(tmp_path / "model.glb")
+        state.to_file(state_path)
+        read_state = ConversionState.from_file(state_path)
+
+        assert state_path.name == "model.glb.state.json"
+        assert read_state.config_fingerprint == "config"
+        assert read_state.variables.keys() == state.variables.keys()
+        waterdepth = read_state.variables["waterdepth"]
+        assert waterdepth.base_fingerprint == "base"
+        assert waterdepth.time_index_last == 4
+        assert waterdepth.color_range == (0.5, 2.5)
+        np.testing.assert_array_equal(waterdepth.wet_vertices, wet_vertices)
+        assert read_state.variables["bedlevel"] == VariableState("other_base", 0)
+
+    def test_get_fingerprint_depends_on_content(self):
+        values = np.arange(6, dtype=np.float32)
+
+        assert get_fingerprint(values) == get_fingerprint(values.copy())
+        assert get_fingerprint(values) != get_fingerprint(values[::-1])
+        assert get_fingerprint(values) != get_fingerprint(values, values)
+
+    def test_get_file_fingerprint_depends_on_content(self, tmp_path):
+        file_path = tmp_path / "config.json"
+        other_file_path = tmp_path / "other_config.json"
+        file_path.write_text('{"version": "0.1.0"}')
+        other_file_path.write_text('{"version": "0.2.0"}')
+
+        fingerprint = get_file_fingerprint(file_path)
+
+        assert len(fingerprint) == 32
+        assert fingerprint == get_file_fingerprint(file_path)
+        assert fingerprint != get_file_fingerprint(other_file_path)
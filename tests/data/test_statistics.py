@@ -0,0 +1,49 @@
+import numpy as np
+
+from netcdf_to_gltf_converter.data.statistics import VariableStatistics
+from netcdf_to_gltf_converter.data.transform import AffineTransform
+from netcdf_to_gltf_converter.data.vector import Vec3
+
+
+class TestVariableStatistics:
+    def test_add_collects_statistics_over_time_steps(self):
+        statistics = VariableStatistics()
+
+        statistics.add(np.array([1.0, np.nan, 3.0]))
+        statistics.add(np.array([np.nan, np.nan, np.nan]))
+        statistics.add(np.array([-2.0, 4.0, 6.0]))
+
+        assert statistics.min == -2.0
+        assert statistics.max == 6.0
+        assert statistics.mean == 12.0 / 5
+        assert statistics.n_values == 5
+        assert statistics.n_nan_values == 4
+        assert np.array_equal(
+            statistics.frame_ranges, [(1, 3), (np.nan, np.nan), (-2, 6)], equal_nan=True
+        )
+
+    def test_without_values_has_invalid_statistics(self):
+        statistics = VariableStatistics()
+
+        statistics.add(np.array([np.nan]))
+
+        assert np.isnan(statistics.min)
+        assert np.isnan(statistics.max)
+        assert np.isnan(statistics.mean)
+
+    def test_transformed_equals_statistics_of_transformed_values(self):
+        frames = [np.array([1.0, np.nan, 3.0]), np.array([-2.0, 4.0, 6.0])]
+        transform = AffineTransform(Vec3(z=1.5), scale_vertical=-2.0)
+        statistics = VariableStatistics()
+        exp_statistics = VariableStatistics()
+        for frame in frames:
+            statistics.add(frame)
+            exp_statistics.add(transform.transform_vertical(frame))
+
+        transformed = statistics.transformed(transform)
+
+        assert transformed.min == exp_statistics.min
+        assert transformed.max == exp_statistics.max
+        assert np.isclose(transformed.mean, exp_statistics.mean)
+        assert transformed.n_nan_values == exp_statistics.n_nan_values
+        assert transformed.frame_ranges == exp_statistics.frame_ranges
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from netcdf_to_gltf_converter.data.transform import AffineTransform
+from netcdf_to_gltf_converter.data.vector import Vec3
+
+
+class TestAffineTransform:
+    def test_transform_horizontal_shifts_then_scales(self):
+        transform = AffineTransform(Vec3(1, 2, 3), scale_horizontal=2, scale_vertical=4)
+
+        transformed = transform.transform_horizontal(np.array([[1.0, 2.0], [2.0, 4.0]]))
+
+        assert np.array_equal(transformed, [[0, 0], [2, 4]])
+
+    def test_transform_vertical_shifts_then_scales(self):
+        transform = AffineTransform(Vec3(1, 2, 3), scale_horizontal=2, scale_vertical=4)
+
+        transformed = transform.transform_vertical(np.array([3.0, 4.0, np.nan]))
+
+        assert np.array_equal(transformed, [0, 4, np.nan], equal_nan=True)
+
+    def test_then_equals_consecutive_transformations(self):
+        first = AffineTransform(Vec3(1, 2, 3), scale_horizontal=2, scale_vertical=4)
+        second = AffineTransform(Vec3(-5, 6, 7), scale_horizontal=0.5, scale_vertical=3)
+        coordinates = np.array([[1.0, 2.0], [-3.0, 10.0]])
+        values = np.array([0.0, 8.0])
+
+        combined = first.then(second)
+
+        assert np.allclose(
+            combined.transform_horizontal(coordinates),
+            second.transform_horizontal(first.transform_horizontal(coordinates)),
+        )
+        assert np.allclose(
+            combined.transform_vertical(values),
+            second.transform_vertical(first.transform_vertical(values)),
+        )
+
+    def test_then_after_zero_scale_raises_error(self):
+        transform = AffineTransform(scale_vertical=0.0)
+
+        with pytest.raises(ValueError):
+            transform.then(AffineTransform())
+
+    def test_is_identity(self):
+        assert AffineTransform().is_identity
+        assert not AffineTransform(Vec3(z=1)).is_identity
+        assert not AffineTransform(scale_horizontal=2).is_identity
@@ -0,0 +1,120 @@
+from typing import List
+
+import numpy as np
+import pytest
+from pygltflib import GLTF2
+
+from netcdf_to_gltf_converter.data.mesh import ColorScale, TriangularMesh
+from netcdf_to_gltf_converter.gltf.appender import GLTFAppender
+from netcdf_to_gltf_converter.gltf.builder import GLTFBuilder
+from tests.gltf.test_builder import create_triangular_mesh, read_accessor
+
+
+def with_transformations(
+    triangular_mesh: TriangularMesh, frame_indices: List[int]
+) -> TriangularMesh:
+    mesh = TriangularMesh(
+        triangular_mesh.base,
+        triangular_mesh.triangles,
+        [triangular_mesh.transformations[i] for i in frame_indices],
+        triangular_mesh.metallic_factor,
+        triangular_mesh.roughness_factor,
+    )
+    mesh.color_scale = triangular_mesh.color_scale
+    return mesh
+
+
+def build(*triangular_meshes: TriangularMesh) -> GLTF2:
+    builder = GLTFBuilder()
+    for triangular_mesh in triangular_meshes:
+        builder.add_triangular_mesh(triangular_mesh)
+
+    # Reload the glTF, as the appender does with an existing file
+    return GLTF2.gltf_from_json(builder.finish().to_json())
+
+
+def assert_animations_equal(gltf: GLTF2, exp_gltf: GLTF2):
+    assert len(gltf.meshes) == len(exp_gltf.meshes)
+    for mesh, exp_mesh in zip(gltf.meshes, exp_gltf.meshes):
+        assert mesh.weights == exp_mesh.weights
+        assert len(mesh.primitives) == len(exp_mesh.primitives)
+        for primitive, exp_primitive in zip(mesh.primitives, exp_mesh.primitives):
+            assert len(primitive.targets) == len(exp_primitive.targets)
+            for target, exp_target in zip(primitive.targets, exp_primitive.targets):
+                for attribute in ["POSITION", "TEXCOORD_0"]:
+                    exp_accessor_index = exp_target.get(attribute)
+                    if exp_accessor_index is None:
+                        continue
+                    np.testing.assert_array_equal(
+                        read_accessor(gltf, getattr(target, attribute)),
+                        read_accessor(exp_gltf, exp_accessor_index),
+                    )
+
+    assert len(gltf.animations) == len(exp_gltf.animations)
+    for animation, exp_animation in zip(gltf.animations, exp_gltf.animations):
+        assert len(animation.samplers) == len(exp_animation.samplers)
+        for sampler, exp_sampler in zip(animation.samplers, exp_animation.samplers):
+            np.testing.assert_array_equal(
+                read_accessor(gltf, sampler.input), read_accessor(exp_gltf, exp_sampler.input)
+            )
+            np.testing.assert_array_equal(
+                read_accessor(gltf, sampler.output), read_accessor(exp_gltf, exp_sampler.output)
+            )
+
+
+class TestGLTFAppender:
+    def test_append_triangular_mesh_equals_building_all_frames(self):
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=3, n_frames=4)
+        triangular_mesh.color_scale = ColorScale(
+            colors=[[0.0, 0.0, 1.0, 1.0], [1.0, 0.0, 0.0, 1.0]],
+            min_value=-1.0,
+            max_value=2.0,
+        )
+        threshold_mesh = triangular_mesh.get_threshold_mesh(0.5, [1.0, 1.0, 1.0, 1.0])
+        gltf = build(with_transformations(triangular_mesh, [0, 1]), threshold_mesh)
+        existing_buffers = [buffer.uri for buffer in gltf.buffers]
+
+        appender = GLTFAppender(gltf)
+        appender.append_triangular_mesh(0, with_transformations(triangular_mesh, [2, 3]))
+        appender.append_triangular_mesh(1, threshold_mesh)
+        gltf = appender.finish()
+
+        assert_animations_equal(gltf, build(triangular_mesh, threshold_mesh))
+        # Only the buffer with the time frames and weights of the animation is replaced
+        retained_buffers = [buffer.uri for buffer in gltf.buffers[:-1]]
+        assert len(retained_buffers) == len(existing_buffers) - 1
+        assert all(buffer in existing_buffers for buffer in retained_buffers)
+
+    def test_append_triangular_mesh_without_frames_adds_animation(self):
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=3, n_frames=2)
+        gltf = build(with_transformations(triangular_mesh, []))
+        assert gltf.animations == []
+
+        appender = GLTFAppender(gltf)
+        appender.append_triangular_mesh(0, triangular_mesh)
+        gltf = appender.finish()
+
+        assert_animations_equal(gltf, build(triangular_mesh))
+
+    def test_append_triangular_mesh_with_levels_of_detail(self):
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=3, n_frames=3)
+        first_frames = with_transformations(triangular_mesh, [0])
+        last_frames = with_transformations(triangular_mesh, [1, 2])
+        for mesh in [triangular_mesh, first_frames, last_frames]:
+            mesh.levels_of_detail = [mesh.simplify(cell_size=1.5)]
+            mesh.screen_coverage = [0.5, 0.1]
+
+        appender = GLTFAppender(build(first_frames))
+        appender.append_triangular_mesh(0, last_frames)
+        gltf = appender.finish()
+
+        assert_animations_equal(gltf, build(triangular_mesh))
+
+    def test_append_triangular_mesh_with_other_vertices_raises_error(self):
+        gltf = build(create_triangular_mesh(n_vertix_cols=3, n_frames=1))
+
+        appender = GLTFAppender(gltf)
+        with pytest.raises(ValueError) as error:
+            appender.append_triangular_mesh(0, create_triangular_mesh(n_vertix_cols=4, n_frames=1))
+
+        assert str(error.value) == "The vertices of the mesh of node 0 do not match the vertices in the glTF: [16] (mesh), [9] (glTF)"
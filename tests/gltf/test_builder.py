@@ -1,9 +1,17 @@
+import base64
 import random
 
-from pygltflib import gltf_asdict
+import numpy as np
+import pytest
 
-from netcdf_to_gltf_converter.data.mesh import MeshAttributes, TriangularMesh
-from netcdf_to_gltf_converter.gltf.builder import GLTFBuilder
+from pygltflib import (FLOAT, SHORT, UNSIGNED_BYTE, UNSIGNED_INT, UNSIGNED_SHORT,
+                       gltf_asdict)
+
+from netcdf_to_gltf_converter.config import AnimationMode, ColorMode
+from netcdf_to_gltf_converter.data.mesh import (ColorScale, MeshAttributes,
+                                                TriangularMesh)
+from netcdf_to_gltf_converter.gltf import builder as builder_module
+from netcdf_to_gltf_converter.gltf.builder import BuilderOptions, GLTFBuilder
 from netcdf_to_gltf_converter.utils.arrays import float32_array, uint32_array
 
 
@@ -60,6 +68,20 @@ def create_triangular_mesh(n_vertix_cols: int, n_frames: int, seed: int = 10):
     )
 
 
+def read_accessor(gltf, accessor_index: int) -> np.ndarray:
+    accessor = gltf.accessors[accessor_index]
+    buffer_view = gltf.bufferViews[accessor.bufferView]
+    buffer_data = base64.b64decode(gltf.buffers[buffer_view.buffer].uri.split(",")[1])
+
+    dtypes = {UNSIGNED_BYTE: np.uint8, UNSIGNED_SHORT: np.uint16, UNSIGNED_INT: np.uint32, SHORT: np.int16, FLOAT: np.float32}
+    n_components = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4}[accessor.type]
+    offset = buffer_view.byteOffset + accessor.byteOffset
+    data = np.frombuffer(
+        buffer_data, dtype=dtypes[accessor.componentType], count=accessor.count * n_components, offset=offset
+    )
+    return data.reshape(accessor.count, n_components)
+
+
 class TestGLTFBuilder:
     def test_add_triangular_mesh_produces_valid_gltf(self):
         # Create a mesh with 3x3 vertices with 2 time frames
@@ -80,7 +102,7 @@ class TestGLTFBuilder:
                     "extras": {},
                     "bufferView": 0,
                     "byteOffset": 0,
-                    "componentType": 5125,
+                    "componentType": 5121,
                     "normalized": False,
                     "count": 24,
                     "type": "SCALAR",
@@ -227,7 +249,7 @@ class TestGLTFBuilder:
                     "extras": {},
                     "buffer": 0,
                     "byteOffset": 0,
-                    "byteLength": 96,
+                    "byteLength": 24,
                     "byteStride": None,
                     "target": 34963,
                     "name": None,
@@ -236,7 +258,7 @@ class TestGLTFBuilder:
                     "extensions": {},
                     "extras": {},
                     "buffer": 0,
-                    "byteOffset": 96,
+                    "byteOffset": 24,
                     "byteLength": 324,
                     "byteStride": 12,
                     "target": 34962,
@@ -277,8 +299,8 @@ class TestGLTFBuilder:
                 {
                     "extensions": {},
                     "extras": {},
-                    "uri": "data:application/octet-stream;base64,AAAAAAMAAAAEAAAAAAAAAAQAAAABAAAAAQAAAAQAAAAFAAAAAQAAAAUAAAACAAAAAwAAAAYAAAAHAAAAAwAAAAcAAAAEAAAABAAAAAcAAAAIAAAABAAAAAgAAAAFAAAAAAAAAAAAAABxRxI/AAAAAAAAgD9Zl9s+AAAAAAAAAEDL/RM/AACAPwAAAABqC1M+AACAPwAAgD/SNVA/AACAPwAAAEC41lI/AAAAQAAAAAD6SSc/AAAAQAAAgD84EyQ+AAAAQAAAAECWSgU/AAAAAAAAAABTXLC+AAAAAAAAAABwAAC/AAAAAAAAAACe12c/AAAAAAAAAAC4PH4/AAAAAAAAAADoL2m/AAAAAAAAAAAHZzg/AAAAAAAAAACZVVM+AAAAAAAAAACQeHK+AAAAAAAAAAAwk92+AAAAAAAAAAD8KbM+AAAAAAAAAADS0bC9AAAAAAAAAAB5Ur4+AAAAAAAAAAALu6U+AAAAAAAAAABK6ju/AAAAAAAAAAAKIgk/AAAAAAAAAADf/nY/AAAAAAAAAAClU3A/AAAAAAAAAADkF2g+",
-                    "byteLength": 420,
+                    "uri": "data:application/octet-stream;base64,AAMEAAQBAQQFAQUCAwYHAwcEBAcIBAgFAAAAAAAAAABxRxI/AAAAAAAAgD9Zl9s+AAAAAAAAAEDL/RM/AACAPwAAAABqC1M+AACAPwAAgD/SNVA/AACAPwAAAEC41lI/AAAAQAAAAAD6SSc/AAAAQAAAgD84EyQ+AAAAQAAAAECWSgU/AAAAAAAAAABTXLC+AAAAAAAAAABwAAC/AAAAAAAAAACe12c/AAAAAAAAAAC4PH4/AAAAAAAAAADoL2m/AAAAAAAAAAAHZzg/AAAAAAAAAACZVVM+AAAAAAAAAACQeHK+AAAAAAAAAAAwk92+AAAAAAAAAAD8KbM+AAAAAAAAAADS0bC9AAAAAAAAAAB5Ur4+AAAAAAAAAAALu6U+AAAAAAAAAABK6ju/AAAAAAAAAAAKIgk/AAAAAAAAAADf/nY/AAAAAAAAAAClU3A/AAAAAAAAAADkF2g+",
+                    "byteLength": 348,
                 },
                 {
                     "extensions": {},
@@ -391,3 +413,218 @@ class TestGLTFBuilder:
             "textures": [],
         }
         assert gltf_dict == exp_gltf_dict
+
+    def test_add_triangular_mesh_with_levels_of_detail(self):
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=3, n_frames=2)
+        triangular_mesh.levels_of_detail = [triangular_mesh.simplify(cell_size=1.5)]
+        triangular_mesh.screen_coverage = [0.5, 0.1]
+
+        builder = GLTFBuilder()
+        builder.add_triangular_mesh(triangular_mesh)
+
+        gltf = builder.finish()
+
+        assert gltf.extensionsUsed == ["MSFT_lod"]
+        assert gltf.scenes[0].nodes == [0]
+        assert len(gltf.nodes) == 2
+        assert gltf.nodes[0].extensions == {"MSFT_lod": {"ids": [1]}}
+        assert gltf.nodes[0].extras == {"MSFT_screencoverage": [0.5, 0.1]}
+        assert gltf.nodes[1].mesh == 1
+        assert len(gltf.meshes[1].primitives[0].targets) == 2
+        assert len(gltf.animations) == 1
+        assert [channel.target.node for channel in gltf.animations[0].channels] == [0, 1]
+
+    def test_narrow_indices_uses_unsigned_short_for_medium_meshes(self):
+        triangles = uint32_array([[0, 1, 300]])
+
+        narrowed, component_type = GLTFBuilder._narrow_indices(triangles)
+
+        assert component_type == UNSIGNED_SHORT
+        assert narrowed.dtype == np.uint16
+        assert np.array_equal(narrowed, triangles)
+
+    def test_narrow_indices_keeps_unsigned_int_when_restart_value_is_used(self):
+        triangles = uint32_array([[0, 1, 65535]])
+
+        narrowed, component_type = GLTFBuilder._narrow_indices(triangles)
+
+        assert component_type == UNSIGNED_INT
+        assert narrowed.dtype == np.uint32
+
+    def test_add_triangular_mesh_with_split_primitives(self, monkeypatch):
+        monkeypatch.setattr(builder_module, "MAX_PRIMITIVE_VERTICES", 6)
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=3, n_frames=2)
+
+        builder = GLTFBuilder(BuilderOptions(split_primitives=True))
+        builder.add_triangular_mesh(triangular_mesh)
+
+        gltf = builder.finish()
+
+        primitives = gltf.meshes[0].primitives
+        assert len(primitives) > 1
+        assert sum(gltf.accessors[p.indices].count for p in primitives) == 24
+        for primitive in primitives:
+            assert gltf.accessors[primitive.attributes.POSITION].count <= 6
+            assert len(primitive.targets) == 2
+        assert len(gltf.meshes[0].weights) == 2
+
+    def test_add_triangular_mesh_with_threshold_meshes_shares_geometry(self):
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=3, n_frames=2)
+        threshold_mesh_1 = triangular_mesh.get_threshold_mesh(0.5, [1.0, 1.0, 1.0, 1.0])
+        threshold_mesh_2 = triangular_mesh.get_threshold_mesh(1.5, [1.0, 1.0, 1.0, 1.0])
+
+        builder = GLTFBuilder()
+        builder.add_triangular_mesh(triangular_mesh)
+        builder.add_triangular_mesh(threshold_mesh_1)
+        builder.add_triangular_mesh(threshold_mesh_2)
+
+        gltf = builder.finish()
+
+        primitives = [mesh.primitives[0] for mesh in gltf.meshes]
+        assert len({primitive.indices for primitive in primitives}) == 1
+        assert primitives[1].attributes.POSITION == primitives[2].attributes.POSITION
+        assert gltf.accessors[primitives[1].attributes.POSITION].max[2] == 0.0
+        assert gltf.nodes[0].matrix[12:15] == [0, 0, 0]
+        assert gltf.nodes[1].matrix[12:15] == [0.0, 0.5, 0.0]
+        assert gltf.nodes[2].matrix[12:15] == [0.0, 1.5, 0.0]
+        assert all(buffer_view.byteLength > 0 for buffer_view in gltf.bufferViews)
+        assert all(buffer.byteLength > 0 for buffer in gltf.buffers)
+        for accessor in gltf.accessors:
+            assert accessor.bufferView < len(gltf.bufferViews)
+
+    def test_add_triangular_mesh_with_material_color_mode(self):
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=3, n_frames=2)
+
+        builder = GLTFBuilder(BuilderOptions(color_mode=ColorMode.MATERIAL))
+        builder.add_triangular_mesh(triangular_mesh)
+
+        gltf = builder.finish()
+
+        primitive = gltf.meshes[0].primitives[0]
+        material = gltf.materials[primitive.material]
+        assert primitive.attributes.COLOR_0 is None
+        assert material.pbrMetallicRoughness.baseColorFactor == [0.38, 0.73, 0.78, 1.0]
+        assert len(gltf.buffers) == 2
+        assert [buffer.byteLength for buffer in gltf.buffers] == [348, 8 + 16]
+
+    def test_add_triangular_mesh_with_color_scale(self):
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=3, n_frames=2)
+        triangular_mesh.color_scale = ColorScale(
+            colors=[[0.0, 0.0, 1.0, 1.0], [1.0, 0.0, 0.0, 1.0]],
+            min_value=-1.0,
+            max_value=2.0,
+        )
+
+        builder = GLTFBuilder()
+        builder.add_triangular_mesh(triangular_mesh)
+        builder.add_triangular_mesh(triangular_mesh)
+
+        gltf = builder.finish()
+
+        primitive = gltf.meshes[0].primitives[0]
+        material = gltf.materials[primitive.material]
+        assert primitive.attributes.COLOR_0 is None
+        assert material.pbrMetallicRoughness.baseColorTexture.index == 0
+        assert gltf.materials[1].pbrMetallicRoughness.baseColorTexture.index == 0
+        assert len(gltf.textures) == 1
+        assert gltf.images[0].uri.startswith("data:image/png;base64,")
+
+        texture_coordinates = gltf.accessors[primitive.attributes.TEXCOORD_0]
+        assert texture_coordinates.componentType == UNSIGNED_SHORT
+        assert texture_coordinates.normalized
+        assert texture_coordinates.type == "VEC2"
+        for target in primitive.targets:
+            displacements = gltf.accessors[target.TEXCOORD_0]
+            assert displacements.componentType == SHORT
+            assert displacements.normalized
+
+    def test_get_texture_coordinates_normalizes_values(self):
+        color_scale = ColorScale(colors=[], min_value=-1.0, max_value=1.0)
+        values = float32_array([-2.0, -1.0, 0.0, 1.0, np.nan])
+
+        texture_coordinates = GLTFBuilder._get_texture_coordinates(values, color_scale)
+
+        assert np.array_equal(texture_coordinates[:, 0], [0, 0, 32768, 65535, 0])
+        assert (texture_coordinates[:, 1] == 32767).all()
+
+    def test_add_triangular_mesh_with_split_primitives_keeps_buffer_views_contiguous(
+        self, monkeypatch
+    ):
+        monkeypatch.setattr(builder_module, "MAX_PRIMITIVE_VERTICES", 7)
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=4, n_frames=2)
+
+        builder = GLTFBuilder(BuilderOptions(split_primitives=True))
+        builder.add_triangular_mesh(triangular_mesh)
+
+        gltf = builder.finish()
+
+        for primitive in gltf.meshes[0].primitives:
+            indices = read_accessor(gltf, primitive.indices).ravel()
+            positions = read_accessor(gltf, primitive.attributes.POSITION)
+            triangles = positions[indices].reshape(-1, 3, 3)
+            exp_triangles = triangular_mesh.base.vertex_positions[triangular_mesh.triangles]
+            for triangle in triangles:
+                assert any(np.array_equal(triangle, exp) for exp in exp_triangles)
+
+    def test_add_triangular_mesh_with_vertex_texture_animation_mode(self):
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=3, n_frames=2)
+
+        builder = GLTFBuilder(BuilderOptions(animation_mode=AnimationMode.VERTEX_TEXTURE))
+        builder.add_triangular_mesh(triangular_mesh)
+
+        gltf = builder.finish()
+
+        primitive = gltf.meshes[0].primitives[0]
+        metadata = primitive.extras["vertexAnimationTexture"]
+        assert primitive.targets == []
+        assert gltf.animations == []
+        assert metadata["textures"] == [0]
+        assert metadata["texCoord"] == 0
+        assert metadata["frameCount"] == 2
+        assert metadata["framesPerTexture"] == 2
+        assert metadata["rowsPerFrame"] == 1
+        assert gltf.samplers[gltf.textures[0].sampler].magFilter == 9728
+        assert gltf.images[0].uri.startswith("data:image/png;base64,")
+        assert read_accessor(gltf, primitive.attributes.TEXCOORD_0).shape == (9, 2)
+
+    def test_encode_vertex_animation_texture_wraps_vertices_over_rows(self, monkeypatch):
+        monkeypatch.setattr(builder_module, "MAX_VERTEX_TEXTURE_WIDTH", 2)
+        displacements = float32_array([[0.0, 1.0, 2.0], [4.0, np.nan, -4.0]])
+
+        textures, lookup_coordinates, rows_per_frame, min_value, max_value = (
+            GLTFBuilder._encode_vertex_animation_texture(displacements)
+        )
+
+        assert len(textures) == 1
+        pixels = textures[0]
+        assert pixels.shape == (4, 2, 4)
+        assert rows_per_frame == 2
+        assert (min_value, max_value) == (-4.0, 4.0)
+
+        quantized = pixels[..., 0].astype(np.uint16) << 8 | pixels[..., 1]
+        assert np.array_equal(quantized, [[32768, 40959], [49151, 0], [65535, 0], [0, 0]])
+        assert np.allclose(lookup_coordinates, [[0.25, 0.125], [0.75, 0.125], [0.25, 0.375]])
+
+    def test_encode_vertex_animation_texture_splits_frames_over_textures(self, monkeypatch):
+        monkeypatch.setattr(builder_module, "MAX_VERTEX_TEXTURE_WIDTH", 2)
+        monkeypatch.setattr(builder_module, "MAX_VERTEX_TEXTURE_HEIGHT", 5)
+        displacements = float32_array([[0.0, 1.0, 2.0], [1.0, 1.0, 1.0], [2.0, 0.0, 0.0]])
+
+        textures, lookup_coordinates, rows_per_frame, _, _ = (
+            GLTFBuilder._encode_vertex_animation_texture(displacements)
+        )
+
+        # 2 rows per frame, so 2 frames fit in a texture and the last texture is padded
+        assert rows_per_frame == 2
+        assert [pixels.shape for pixels in textures] == [(4, 2, 4), (4, 2, 4)]
+        quantized = textures[1][..., 0].astype(np.uint16) << 8 | textures[1][..., 1]
+        assert np.array_equal(quantized, [[65535, 0], [0, 0], [0, 0], [0, 0]])
+        assert np.allclose(lookup_coordinates, [[0.25, 0.125], [0.75, 0.125], [0.25, 0.375]])
+
+    def test_encode_vertex_animation_texture_too_many_vertices_raises_error(self, monkeypatch):
+        monkeypatch.setattr(builder_module, "MAX_VERTEX_TEXTURE_WIDTH", 2)
+        monkeypatch.setattr(builder_module, "MAX_VERTEX_TEXTURE_HEIGHT", 1)
+        displacements = float32_array([[0.0, 1.0, 2.0]])
+
+        with pytest.raises(ValueError):
+            GLTFBuilder._encode_vertex_animation_texture(displacements)
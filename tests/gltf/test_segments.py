@@ -0,0 +1,112 @@
+import json
+from functools import partial
+from pathlib import Path
+from typing import List
+
+import numpy as np
+from pygltflib import GLTF2
+
+from netcdf_to_gltf_converter.config import Segmentation
+from netcdf_to_gltf_converter.data.mesh import TriangularMesh
+from netcdf_to_gltf_converter.gltf.segments import (SegmentExporter,
+                                                    split_into_segments)
+from tests.gltf.test_builder import create_triangular_mesh
+
+
+def import_segment(
+    triangular_mesh: TriangularMesh, animation_time_indices: List[int], time_indices: List[int]
+) -> List[TriangularMesh]:
+    frame_indices = [animation_time_indices.index(time_index) for time_index in time_indices]
+    return [triangular_mesh.select_frames(frame_indices)]
+
+
+def read_glb_accessor(gltf: GLTF2, accessor_index: int, folder: Path) -> np.ndarray:
+    accessor = gltf.accessors[accessor_index]
+    buffer_view = gltf.bufferViews[accessor.bufferView]
+    buffer = gltf.buffers[buffer_view.buffer]
+    buffer_data = gltf.binary_blob() if buffer.uri is None else (folder / buffer.uri).read_bytes()
+
+    offset = buffer_view.byteOffset + accessor.byteOffset
+    data = np.frombuffer(buffer_data, dtype=np.float32, count=accessor.count * 3, offset=offset)
+    return data.reshape(accessor.count, 3)
+
+
+class TestSplitIntoSegments:
+    def test_split_into_segments_with_datetimes(self):
+        frame_times = np.array(
+            ["2023-04-27T06:00", "2023-04-27T12:00", "2023-04-28T00:00", "2023-04-30T00:00"],
+            dtype="datetime64[ns]",
+        )
+
+        segments = split_into_segments([1, 2, 4, 12], frame_times, duration=86400.0)
+
+        # The time spans start at the first frame and spans without frames are skipped
+        assert [segment.frame_indices for segment in segments] == [[0, 1, 2], [3]]
+        assert [segment.time_indices for segment in segments] == [[1, 2, 4], [12]]
+
+    def test_split_into_segments_with_seconds(self):
+        frame_times = np.array([0.0, 10.0, 20.0, 30.0, 40.0])
+
+        segments = split_into_segments([0, 1, 2, 3, 4], frame_times, duration=25.0)
+
+        assert [segment.frame_indices for segment in segments] == [[0, 1, 2], [3, 4]]
+        assert np.array_equal(segments[1].times, [30.0, 40.0])
+
+
+class TestSegmentExporter:
+    def test_export_writes_segments_and_manifest(self, tmp_path):
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=3, n_frames=5)
+        frame_times = np.array([0.0, 10.0, 20.0, 30.0, 40.0])
+        segmentation = Segmentation(duration=20.0, n_workers=2)
+        file_path = tmp_path / "model.glb"
+
+        time_indices = [1, 2, 3, 4, 5]
+
+        manifest_path = SegmentExporter(segmentation).export(
+            partial(import_segment, triangular_mesh, time_indices), time_indices, frame_times, file_path
+        )
+
+        assert manifest_path == tmp_path / "model_segments.json"
+        manifest = json.loads(manifest_path.read_text())
+        assert manifest == {
+            "duration": 20.0,
+            "segments": [
+                {"uri": "model_segment000.glb", "n_frames": 2, "time_index_start": 1, "time_index_end": 2, "time_start": 0.0, "time_end": 10.0},
+                {"uri": "model_segment001.glb", "n_frames": 2, "time_index_start": 3, "time_index_end": 4, "time_start": 20.0, "time_end": 30.0},
+                {"uri": "model_segment002.glb", "n_frames": 1, "time_index_start": 5, "time_index_end": 5, "time_start": 40.0, "time_end": 40.0},
+            ],
+        }
+        for segment in manifest["segments"]:
+            segment_gltf = GLTF2.load(tmp_path / segment["uri"])
+            assert len(segment_gltf.meshes[0].weights) == segment["n_frames"]
+            assert len(segment_gltf.buffers) == 1
+
+    def test_export_with_shared_geometry_refers_to_base_file(self, tmp_path):
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=3, n_frames=4)
+        frame_times = np.array(["2023-04-27T00:00", "2023-04-27T12:00", "2023-04-28T00:00", "2023-04-28T12:00"], dtype="datetime64[ns]")
+        segmentation = Segmentation(duration=86400.0, shared_geometry=True, n_workers=2)
+        file_path = tmp_path / "model.glb"
+
+        time_indices = [0, 1, 2, 3]
+
+        manifest_path = SegmentExporter(segmentation).export(
+            partial(import_segment, triangular_mesh, time_indices), time_indices, frame_times, file_path
+        )
+
+        manifest = json.loads(manifest_path.read_text())
+        assert manifest["base"] == "model_base.bin"
+        assert manifest["segments"][1]["time_start"] == "2023-04-28T00:00:00"
+        assert manifest["segments"][1]["time_end"] == "2023-04-28T12:00:00"
+
+        for segment_index, segment in enumerate(manifest["segments"]):
+            segment_gltf = GLTF2.load(tmp_path / segment["uri"])
+            assert segment_gltf.buffers[0].uri is None
+            assert segment_gltf.buffers[1].uri == "model_base.bin"
+
+            primitive = segment_gltf.meshes[0].primitives[0]
+            positions = read_glb_accessor(segment_gltf, primitive.attributes.POSITION, tmp_path)
+            np.testing.assert_array_equal(positions, triangular_mesh.base.vertex_positions)
+            for frame_index, target in enumerate(primitive.targets):
+                displacements = read_glb_accessor(segment_gltf, target["POSITION"], tmp_path)
+                transformation = triangular_mesh.transformations[2 * segment_index + frame_index]
+                np.testing.assert_array_equal(displacements, transformation.vertex_positions)
@@ -0,0 +1,89 @@
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from pygltflib import GLTF2
+
+from netcdf_to_gltf_converter.config import Tiling
+from netcdf_to_gltf_converter.gltf import tileset as tileset_module
+from netcdf_to_gltf_converter.gltf.tileset import TilesetExporter
+from tests.gltf.test_builder import create_triangular_mesh
+
+
+class RecordingExecutor(ThreadPoolExecutor):
+    max_unfinished = 0
+
+    def __init__(self, max_workers: int):
+        super().__init__(max_workers)
+        self.futures = []
+
+    def submit(self, fn, *args):
+        n_unfinished = sum(not future.done() for future in self.futures) + 1
+        RecordingExecutor.max_unfinished = max(RecordingExecutor.max_unfinished, n_unfinished)
+        future = super().submit(fn, *args)
+        self.futures.append(future)
+        return future
+
+
+def export_tile_slowly(*args):
+    time.sleep(0.01)
+
+
+class TestTilesetExporter:
+    def test_export_writes_tiles_and_tileset(self, tmp_path):
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=5, n_frames=2)
+        tiling = Tiling(max_triangles_per_tile=8, max_depth=4, n_workers=2)
+        file_path = tmp_path / "model.glb"
+
+        tileset_path = TilesetExporter(tiling).export([triangular_mesh], file_path)
+
+        assert tileset_path == tmp_path / "model_tileset.json"
+        with open(tileset_path) as tileset_file:
+            tileset = json.load(tileset_file)
+
+        assert tileset["asset"] == {"version": "1.1"}
+        root = tileset["root"]
+        assert root["refine"] == "ADD"
+        assert len(root["boundingVolume"]["box"]) == 12
+        assert [child["content"]["uri"] for child in root["children"]] == [
+            "model_tile0.glb",
+            "model_tile1.glb",
+            "model_tile2.glb",
+            "model_tile3.glb",
+        ]
+
+        for child in root["children"]:
+            tile_gltf = GLTF2.load(tmp_path / child["content"]["uri"])
+            assert len(tile_gltf.meshes) == 1
+            assert len(tile_gltf.meshes[0].primitives[0].targets) == 2
+            assert tile_gltf.accessors[0].count == 8 * 3
+            assert tile_gltf.accessors[1].count == 9
+
+    def test_export_with_different_triangulations(self, tmp_path):
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=5, n_frames=1)
+        culled_mesh = triangular_mesh.extract(np.arange(8))
+        tiling = Tiling(max_triangles_per_tile=8, max_depth=4, n_workers=1)
+
+        tileset_path = TilesetExporter(tiling).export(
+            [triangular_mesh, culled_mesh], tmp_path / "model.gltf"
+        )
+
+        with open(tileset_path) as tileset_file:
+            tileset = json.load(tileset_file)
+
+        tile_uris = [child["content"]["uri"] for child in tileset["root"]["children"]]
+        n_meshes_per_tile = [len(GLTF2.load(tmp_path / uri).meshes) for uri in tile_uris]
+        # The extracted triangles cover the left half of the grid
+        assert n_meshes_per_tile == [2, 1, 2, 1]
+
+    def test_export_keeps_at_most_one_tile_per_worker_in_flight(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(tileset_module, "ProcessPoolExecutor", RecordingExecutor)
+        monkeypatch.setattr(tileset_module, "_export_tile", export_tile_slowly)
+        monkeypatch.setattr(RecordingExecutor, "max_unfinished", 0)
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=9, n_frames=1)
+        tiling = Tiling(max_triangles_per_tile=8, max_depth=4, n_workers=2)
+
+        TilesetExporter(tiling).export([triangular_mesh], tmp_path / "model.glb")
+
+        assert RecordingExecutor.max_unfinished == 2
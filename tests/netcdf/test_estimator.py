@@ -0,0 +1,155 @@
+import pytest
+import xarray as xr
+
+from netcdf_to_gltf_converter.benchmark.datasets import generate_xbeach_dataset
+from netcdf_to_gltf_converter.benchmark.runner import (BenchmarkCase,
+                                                       create_config)
+from netcdf_to_gltf_converter.config import (AnimationMode, Config,
+                                             LevelOfDetail, LevelsOfDetail,
+                                             ModelType, Variable)
+from netcdf_to_gltf_converter.gltf.builder import GLTFBuilder
+from netcdf_to_gltf_converter.netcdf.estimator import (BYTES_PER_TRIANGLE,
+                                                       BYTES_PER_VERTEX_FRAME,
+                                                       Estimator, MeshEstimate)
+from netcdf_to_gltf_converter.netcdf.importer import Importer
+from netcdf_to_gltf_converter.utils.profiling import get_accessor_bytes
+from tests.utils import dhydro_resources
+
+
+def create_dhydro_config(**kwargs) -> Config:
+    variable = Variable(
+        name="Mesh2d_waterdepth",
+        color=[0.38, 0.73, 0.78, 1.0],
+        metallic_factor=0.0,
+        roughness_factor=0.11,
+        use_threshold=True,
+        threshold_height=0.01,
+        threshold_color=[1.0, 1.0, 1.0, 1.0],
+    )
+    return Config(
+        model_type="D-HYDRO",
+        time_index_start=0,
+        times_per_frame=1,
+        shift_coordinates="min",
+        scale_horizontal=1.0,
+        scale_vertical=1.0,
+        variables=[variable],
+        **kwargs,
+    )
+
+
+class TestMeshEstimate:
+    def test_get_peak_memory(self):
+        mesh = MeshEstimate("mesh", 100, 180, 9, vertex_colors=True, colormap=False)
+
+        assert mesh.get_peak_memory() == 100 * 10 * BYTES_PER_VERTEX_FRAME + 180 * BYTES_PER_TRIANGLE
+
+    def test_get_buffer_bytes_morph_targets_with_colormap(self):
+        mesh = MeshEstimate("mesh", 1000, 1800, 3, vertex_colors=False, colormap=True)
+
+        # Indices (uint16), positions, texture coordinates, 3 targets with positions and texture coordinates, times and weights
+        exp_bytes = 3 * 1800 * 2 + 12 * 1000 + 4 * 1000 + 3 * 16 * 1000 + 3 * 4 + 9 * 4
+        assert mesh.get_buffer_bytes(AnimationMode.MORPH_TARGETS) == exp_bytes
+
+    def test_get_buffer_bytes_vertex_texture(self):
+        mesh = MeshEstimate("mesh", 1000, 1800, 3, vertex_colors=True, colormap=False)
+
+        # Indices (uint16), positions, colors, the pixels of 3 frames and the texture lookup coordinates
+        exp_bytes = 3 * 1800 * 2 + 12 * 1000 + 16 * 1000 + 3 * 4 * 1000 + 8 * 1000
+        assert mesh.get_buffer_bytes(AnimationMode.VERTEX_TEXTURE) == exp_bytes
+
+
+class TestEstimator:
+    def test_estimate_matches_imported_meshes(self):
+        file_path = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+        config = create_dhydro_config()
+
+        with xr.open_dataset(file_path) as dataset:
+            estimate = Estimator().estimate(dataset, config)
+        triangular_meshes = Importer().import_from(file_path, config)
+
+        assert estimate.n_vertices == 9
+        assert estimate.n_triangles == 8
+        assert [mesh.name for mesh in estimate.meshes] == ["Mesh2d_waterdepth", "Mesh2d_waterdepth threshold"]
+        for mesh_estimate, triangular_mesh in zip(estimate.meshes, triangular_meshes):
+            assert mesh_estimate.n_vertices == len(triangular_mesh.base.vertex_positions)
+            assert mesh_estimate.n_triangles == len(triangular_mesh.triangles)
+            assert mesh_estimate.n_frames == len(triangular_mesh.transformations)
+        assert estimate.peak_memory == sum(mesh.get_peak_memory() for mesh in estimate.meshes)
+        assert estimate.fits_in_budget
+        assert estimate.suggestions == []
+
+    def test_estimate_buffer_bytes_is_upper_bound_of_accessor_bytes(self):
+        file_path = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+        config = create_dhydro_config()
+
+        with xr.open_dataset(file_path) as dataset:
+            estimate = Estimator().estimate(dataset, config)
+        builder = GLTFBuilder()
+        for triangular_mesh in Importer().import_from(file_path, config):
+            builder.add_triangular_mesh(triangular_mesh)
+        accessor_bytes = sum(get_accessor_bytes(builder.finish()).values())
+
+        buffer_bytes = sum(mesh.get_buffer_bytes(AnimationMode.MORPH_TARGETS) for mesh in estimate.meshes)
+        assert accessor_bytes <= buffer_bytes <= 1.1 * accessor_bytes
+        assert estimate.output_bytes["morph_targets"][".glb"] > buffer_bytes
+        assert estimate.output_bytes["morph_targets"][".gltf"] > estimate.output_bytes["morph_targets"][".glb"]
+
+    def test_estimate_with_levels_of_detail_adds_coarser_meshes(self):
+        file_path = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+        levels_of_detail = LevelsOfDetail(
+            screen_coverage=0.5,
+            levels=[LevelOfDetail(cell_size=2.0, screen_coverage=0.1)],
+        )
+        config = create_dhydro_config(levels_of_detail=levels_of_detail)
+
+        with xr.open_dataset(file_path) as dataset:
+            estimate = Estimator().estimate(dataset, config)
+
+        level_of_detail = estimate.meshes[1]
+        assert level_of_detail.name == "Mesh2d_waterdepth LOD 2.0"
+        assert level_of_detail.n_vertices == 4
+        assert level_of_detail.n_triangles == 2
+        assert level_of_detail.n_frames == estimate.meshes[0].n_frames
+
+    def test_estimate_exceeding_budget_suggests_times_per_frame(self):
+        file_path = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+        config = create_dhydro_config()
+
+        with xr.open_dataset(file_path) as dataset:
+            full_estimate = Estimator().estimate(dataset, config)
+            memory_budget = full_estimate.peak_memory - 1
+            estimate = Estimator().estimate(dataset, config, memory_budget)
+
+        assert not estimate.fits_in_budget
+        assert len(estimate.suggestions) == 1
+        suggestion = estimate.suggestions[0]
+        assert suggestion.settings == {"times_per_frame": 2}
+        assert suggestion.peak_memory <= memory_budget
+        assert suggestion.n_frames == 2
+
+    def test_estimate_exceeding_budget_for_xbeach_suggests_stride(self, tmp_path):
+        case = BenchmarkCase(ModelType.XBEACH, n_nodes=400, n_times=5)
+        file_path = tmp_path / "xboutput.nc"
+        generate_xbeach_dataset(file_path, case.n_nodes, case.n_times)
+        config = create_config(case)
+
+        with xr.open_dataset(file_path) as dataset:
+            memory_budget = 400 * 5 * BYTES_PER_VERTEX_FRAME // 2
+            estimate = Estimator().estimate(dataset, config, memory_budget)
+
+        assert estimate.n_vertices == 400
+        assert estimate.n_triangles == 2 * 19 * 19
+        stride_suggestion = estimate.suggestions[-1]
+        assert stride_suggestion.settings == {"regular_grid.row_stride": 2, "regular_grid.column_stride": 2}
+        assert stride_suggestion.peak_memory <= memory_budget
+        assert stride_suggestion.n_frames == 4
+
+    def test_estimate_variable_not_in_dataset_raises_error(self):
+        file_path = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+        config = create_dhydro_config()
+        config.variables[0].name = "unknown"
+
+        with xr.open_dataset(file_path) as dataset:
+            with pytest.raises(ValueError):
+                Estimator().estimate(dataset, config)
@@ -2,8 +2,11 @@ from pathlib import Path
 
 import numpy as np
 import pytest
+import xarray as xr
 
-from netcdf_to_gltf_converter.config import Config, Variable
+from netcdf_to_gltf_converter.config import (Colormap, Config,
+                                             MeshOptimization, Variable)
+from netcdf_to_gltf_converter.data.state import ConversionState
 from netcdf_to_gltf_converter.netcdf.importer import Importer
 from tests.utils import dhydro_resources
 
@@ -106,3 +109,116 @@ class TestImporter:
             _ = importer.import_from(netcdf, config)
 
         assert str(error.value) == rf"NetCDF file does not exist: {netcdf}"
+
+    def test_import_from_with_dry_threshold_skips_variable_that_is_always_dry(self):
+        file_path = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+
+        variable = Variable(
+            name="Mesh2d_waterdepth",
+            color=[0.38, 0.73, 0.78, 1.0],
+            metallic_factor=0.0,
+            roughness_factor=0.11,
+            use_threshold=False,
+            dry_threshold=5.0,
+        )
+        config = Config(
+            model_type="D-HYDRO",
+            time_index_start=0,
+            times_per_frame=1,
+            shift_coordinates="min",
+            scale_horizontal=1.0,
+            scale_vertical=1.0,
+            variables=[variable],
+        )
+
+        importer = Importer()
+        triangular_meshes = importer.import_from(file_path, config)
+
+        assert triangular_meshes == []
+
+    def test_import_from_with_mesh_optimization_keeps_vertex_values(self):
+        file_path = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+
+        variable = Variable(
+            name="Mesh2d_waterdepth",
+            color=[0.38, 0.73, 0.78, 1.0],
+            metallic_factor=0.0,
+            roughness_factor=0.11,
+            use_threshold=False,
+        )
+        config = Config(
+            model_type="D-HYDRO",
+            time_index_start=0,
+            times_per_frame=1,
+            shift_coordinates="min",
+            scale_horizontal=1.0,
+            scale_vertical=1.0,
+            variables=[variable],
+        )
+
+        importer = Importer()
+        data_mesh = importer.import_from(file_path, config)[0]
+
+        config.mesh_optimization = MeshOptimization(triangle_order="tipsify")
+        optimized_mesh = importer.import_from(file_path, config)[0]
+
+        def sorted_rows(array: np.ndarray) -> np.ndarray:
+            return array[np.lexsort(array.T[::-1])]
+
+        assert np.array_equal(
+            sorted_rows(optimized_mesh.base.vertex_positions),
+            sorted_rows(data_mesh.base.vertex_positions),
+        )
+        assert np.array_equal(
+            sorted_rows(optimized_mesh.base.vertex_positions[optimized_mesh.triangles].reshape(-1, 9)),
+            sorted_rows(data_mesh.base.vertex_positions[data_mesh.triangles].reshape(-1, 9)),
+        )
+
+    def test_import_window_matches_frames_of_whole_animation(self, tmp_path):
+        # Only the last time step is wet, in one face, so the culled triangles depend on the last window
+        file_path = tmp_path / "wet_at_end_map.nc"
+        with xr.open_dataset(dhydro_resources / "3x3nodes_rectilinear_map.nc") as dataset:
+            dataset = dataset.load()
+        waterdepth = dataset["Mesh2d_waterdepth"]
+        dataset["Mesh2d_waterdepth"] = xr.zeros_like(waterdepth)
+        dataset["Mesh2d_waterdepth"][{"time": 4, waterdepth.dims[1]: 3}] = 1.0
+        dataset.to_netcdf(file_path)
+
+        variable = Variable(
+            name="Mesh2d_waterdepth",
+            color=[0.38, 0.73, 0.78, 1.0],
+            metallic_factor=0.0,
+            roughness_factor=0.11,
+            use_threshold=False,
+            dry_threshold=0.5,
+            colormap=Colormap(colors=[[0.0, 0.0, 1.0, 1.0], [1.0, 0.0, 0.0, 1.0]]),
+        )
+        config = Config(
+            model_type="D-HYDRO",
+            time_index_start=0,
+            times_per_frame=1,
+            shift_coordinates="min",
+            scale_horizontal=1.0,
+            scale_vertical=1.0,
+            variables=[variable],
+        )
+
+        importer = Importer()
+        data_mesh = importer.import_from(file_path, config)[0]
+        state = ConversionState("fingerprint")
+        importer.import_state(file_path, config, state)
+        window_meshes = [
+            importer.import_window(file_path, config, state, [1, 2])[0],
+            importer.import_window(file_path, config, state, [3, 4])[0],
+        ]
+
+        assert len(data_mesh.triangles) < 8
+        for window_index, window_mesh in enumerate(window_meshes):
+            assert np.array_equal(window_mesh.triangles, data_mesh.triangles)
+            assert np.array_equal(window_mesh.base.vertex_positions, data_mesh.base.vertex_positions)
+            assert window_mesh.color_scale == data_mesh.color_scale
+            exp_transformations = data_mesh.transformations[2 * window_index:2 * window_index + 2]
+            assert len(window_mesh.transformations) == 2
+            for transformation, exp_transformation in zip(window_mesh.transformations, exp_transformations):
+                assert np.array_equal(transformation.vertex_positions, exp_transformation.vertex_positions)
+        assert state.variables["Mesh2d_waterdepth"].time_index_last == 4
@@ -0,0 +1,147 @@
+from unittest.mock import Mock
+
+import numpy as np
+
+from netcdf_to_gltf_converter.config import (Colormap, Config, NanFill,
+                                             NanFillMethod, Variable)
+
+from netcdf_to_gltf_converter.data.mesh import MeshAttributes, TriangularMesh
+from netcdf_to_gltf_converter.data.vector import Vec3
+from netcdf_to_gltf_converter.netcdf.parser import Parser
+from netcdf_to_gltf_converter.utils.arrays import float32_array, uint32_array
+from tests.netcdf.test_xbeach_data import create_xbeach_dataset
+
+
+def create_xbeach_config(nan_fill: NanFill = None, dry_threshold: float = None) -> Config:
+    variable = Variable(
+        name="zs",
+        color=[0.38, 0.73, 0.78, 1.0],
+        metallic_factor=0.0,
+        roughness_factor=0.11,
+        use_threshold=False,
+        dry_threshold=dry_threshold,
+        nan_fill=nan_fill,
+    )
+    return Config(
+        model_type="XBEACH",
+        time_index_start=0,
+        times_per_frame=1,
+        shift_coordinates={"shift_x": 0.0, "shift_y": 0.0, "shift_z": 1.0},
+        scale_horizontal=1.0,
+        scale_vertical=2.0,
+        variables=[variable],
+    )
+
+
+def create_xbeach_dataset_with_nan():
+    dataset = create_xbeach_dataset(n_rows=2, n_cols=2, n_times=3)
+    dataset["zs"][:, 0, 0] = np.nan
+    dataset["zb"] = (("ny", "nx"), np.full((2, 2), -3.0))
+    return dataset
+
+
+class TestParser:
+    def test_cull_dry_triangles_removes_triangles_without_wet_vertices(self):
+        vertex_positions = float32_array(
+            [
+                [0, 0, 1],
+                [1, 0, 0],
+                [1, 1, 0],
+                [0, 1, np.nan],
+                [2, 0, 0],
+            ]
+        )
+        color = [0.38, 0.73, 0.78, 1.0]
+        triangles = uint32_array([[0, 1, 2], [1, 4, 2], [2, 3, 1]])
+        triangular_mesh = TriangularMesh(
+            MeshAttributes(vertex_positions, color), triangles, [], 0.0, 1.0
+        )
+        wet_vertices = Parser._is_wet(vertex_positions, dry_threshold=0.5)
+
+        culled_mesh = Parser._cull_dry_triangles(
+            triangular_mesh, wet_vertices, "some_var"
+        )
+
+        assert np.array_equal(wet_vertices, [True, False, False, False, False])
+        assert np.array_equal(culled_mesh.triangles, uint32_array([[0, 1, 2]]))
+        assert np.array_equal(
+            culled_mesh.base.vertex_positions, vertex_positions[:3]
+        )
+
+    def test_get_color_scale_uses_value_range_of_all_frames(self):
+        colormap = Colormap(colors=[[0.0, 0.0, 1.0, 1.0], [1.0, 0.0, 0.0, 1.0]])
+        value_ranges = [
+            Parser._get_value_range(float32_array([[0, 0, 1], [1, 0, np.nan]])),
+            Parser._get_value_range(float32_array([[0, 0, -1], [1, 0, 4]])),
+        ]
+        config = Mock(scale_vertical=0.5)
+
+        color_scale = Parser._get_color_scale(colormap, value_ranges, config, Vec3())
+
+        assert color_scale.colors == colormap.colors
+        assert color_scale.min_value == -1.0
+        assert color_scale.max_value == 4.0
+
+    def test_get_color_scale_shifts_and_scales_configured_value_range(self):
+        colormap = Colormap(
+            colors=[[0.0, 0.0, 1.0, 1.0], [1.0, 0.0, 0.0, 1.0]],
+            value_min=2.0,
+            value_max=6.0,
+        )
+        config = Mock(scale_vertical=0.5)
+
+        color_scale = Parser._get_color_scale(
+            colormap, [(-1.0, 4.0)], config, Vec3(0.0, 0.0, 2.0)
+        )
+
+        assert color_scale.min_value == 0.0
+        assert color_scale.max_value == 2.0
+
+    def test_parse_xbeach_without_nan_fill_replaces_nan_by_zero(self):
+        config = create_xbeach_config()
+
+        triangular_meshes = Parser().parse(create_xbeach_dataset_with_nan(), config)
+
+        base_positions = triangular_meshes[0].base.vertex_positions
+        assert base_positions[0, 2] == (0.0 - 1.0) * 2.0
+        assert base_positions[1, 2] == (1.0 - 1.0) * 2.0
+
+    def test_parse_xbeach_with_invalid_node_coordinates_skips_inactive_cells(self):
+        config = create_xbeach_config()
+        config.shift_coordinates = "min"
+        dataset = create_xbeach_dataset(n_rows=4, n_cols=5)
+        dataset["globalx"][1, 2] = np.nan
+        dataset["globaly"][1, 2] = np.nan
+
+        triangular_meshes = Parser().parse(dataset, config)
+
+        mesh = triangular_meshes[0]
+        # The four cells around the invalid node are inactive, and the node and its neighbor on the boundary are unused
+        assert len(mesh.triangles) == 2 * (12 - 4)
+        assert len(mesh.base.vertex_positions) == 20 - 2
+        assert np.isfinite(mesh.base.vertex_positions).all()
+        assert mesh.base.vertex_positions[:, :2].min(axis=0).tolist() == [0.0, 0.0]
+        assert mesh.base.vertex_positions[1].tolist() == [1.0, 0.0, 1.0 * 2.0]
+
+    def test_parse_xbeach_with_bed_level_nan_fill(self):
+        nan_fill = NanFill(method=NanFillMethod.BED_LEVEL, bed_level_variable="zb")
+        config = create_xbeach_config(nan_fill)
+
+        triangular_meshes = Parser().parse(create_xbeach_dataset_with_nan(), config)
+
+        mesh = triangular_meshes[0]
+        assert mesh.base.vertex_positions[0, 2] == (-3.0 - 1.0) * 2.0
+        assert mesh.transformations[0].vertex_positions[0, 2] == 0.0
+
+    def test_parse_xbeach_with_dry_nan_fill_culls_dry_vertices(self):
+        nan_fill = NanFill(method=NanFillMethod.DRY)
+        config = create_xbeach_config(nan_fill, dry_threshold=0.5)
+        dataset = create_xbeach_dataset_with_nan()
+        dataset["zs"][:, 1, :] = 0.0
+
+        triangular_meshes = Parser().parse(dataset, config)
+
+        mesh = triangular_meshes[0]
+        assert len(mesh.triangles) == 1
+        assert len(mesh.base.vertex_positions) == 3
+        assert not np.isnan(mesh.base.vertex_positions).any()
@@ -0,0 +1,139 @@
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+import xarray as xr
+import xugrid as xu
+
+from netcdf_to_gltf_converter.config import Config, Variable
+from netcdf_to_gltf_converter.netcdf.importer import Importer
+from netcdf_to_gltf_converter.netcdf.ugrid.partitions import (
+    find_partition_files, merge_partitions)
+from tests.utils import dhydro_resources
+
+map_file = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+
+
+def write_partition(
+    folder: Path, partition: int, faces: List[int], face_domains: List[int]
+) -> Path:
+    """Write the faces of the 3x3 nodes map file as the map file of one partition, including its ghost cells."""
+    with xr.open_dataset(map_file) as dataset:
+        partition_dataset = xu.UgridDataset(dataset).isel(Mesh2d_nFaces=faces).ugrid.to_dataset()
+        partition_dataset["Mesh2d_flowelem_domain"] = ("Mesh2d_nFaces", np.array(face_domains, dtype=np.int32))
+        file_path = folder / f"model_{partition:04d}_map.nc"
+        partition_dataset.to_netcdf(file_path)
+
+    return file_path
+
+
+@pytest.fixture
+def partition_files(tmp_path: Path) -> List[Path]:
+    # Faces 0 and 1 are on the left, faces 2 and 3 on the right; each partition contains one ghost cell of the other
+    return [
+        write_partition(tmp_path, 0, [0, 1, 2], [0, 0, 1]),
+        write_partition(tmp_path, 1, [1, 2, 3], [0, 1, 1]),
+    ]
+
+
+def sorted_rows(array: np.ndarray) -> np.ndarray:
+    return array[np.lexsort(array.T[::-1])]
+
+
+class TestFindPartitionFiles:
+    def test_find_partition_files(self, partition_files: List[Path]):
+        (partition_files[0].parent / "other_0000_map.nc").touch()
+
+        assert find_partition_files(partition_files[1]) == partition_files
+
+    def test_find_partition_files_without_partition_number(self):
+        assert find_partition_files(map_file) == [map_file]
+
+
+class TestMergePartitions:
+    def test_merge_partitions_removes_ghost_cells(self, partition_files: List[Path]):
+        merged = merge_partitions(partition_files, n_workers=2)
+
+        with xr.open_dataset(map_file) as dataset:
+            grid = xu.Ugrid2d.from_dataset(dataset, "Mesh2d")
+            merged_grid = xu.Ugrid2d.from_dataset(merged, "Mesh2d")
+
+            assert merged_grid.n_node == grid.n_node
+            assert merged_grid.n_edge == grid.n_edge
+            assert merged_grid.n_face == grid.n_face
+            np.testing.assert_array_equal(
+                merged_grid.node_coordinates[merged_grid.face_node_connectivity],
+                grid.node_coordinates[grid.face_node_connectivity],
+            )
+            np.testing.assert_array_equal(
+                sorted_rows(np.sort(merged_grid.edge_coordinates, axis=0)),
+                sorted_rows(np.sort(grid.edge_coordinates, axis=0)),
+            )
+            np.testing.assert_array_equal(merged["Mesh2d_waterdepth"].values, dataset["Mesh2d_waterdepth"].values)
+            np.testing.assert_array_equal(merged["time"].values, dataset["time"].values)
+
+            # The node values follow the merged node numbering
+            node_z = dict(zip(map(tuple, grid.node_coordinates), dataset["Mesh2d_node_z"].values))
+            exp_node_z = [node_z[tuple(node)] for node in merged_grid.node_coordinates]
+            np.testing.assert_array_equal(merged["Mesh2d_node_z"].values, exp_node_z)
+
+    def test_merge_partitions_indexes_lazily(self, partition_files: List[Path]):
+        merged = merge_partitions(partition_files, n_workers=1)
+
+        with xr.open_dataset(map_file) as dataset:
+            np.testing.assert_array_equal(
+                merged["Mesh2d_waterdepth"].isel(time=2).values,
+                dataset["Mesh2d_waterdepth"].isel(time=2).values,
+            )
+            np.testing.assert_array_equal(
+                merged["Mesh2d_waterdepth"].isel(Mesh2d_nFaces=[3, 0]).values,
+                dataset["Mesh2d_waterdepth"].isel(Mesh2d_nFaces=[3, 0]).values,
+            )
+            np.testing.assert_array_equal(
+                merged["Mesh2d_waterdepth"].isel(time=1, Mesh2d_nFaces=2).values,
+                dataset["Mesh2d_waterdepth"].isel(time=1, Mesh2d_nFaces=2).values,
+            )
+
+    def test_merge_partitions_without_domain_numbers_raises_error(self, partition_files: List[Path]):
+        with xr.open_dataset(partition_files[1]) as dataset:
+            dataset = dataset.drop_vars("Mesh2d_flowelem_domain").load()
+        dataset.to_netcdf(partition_files[1])
+
+        with pytest.raises(ValueError) as error:
+            merge_partitions(partition_files, n_workers=1)
+
+        assert str(error.value) == f"Partition does not contain the domain numbers of the faces (Mesh2d_flowelem_domain): {partition_files[1]}"
+
+
+class TestImporterWithPartitions:
+    def test_import_from_partition_file_equals_import_from_map_file(self, partition_files: List[Path]):
+        variable = Variable(
+            name="Mesh2d_waterdepth",
+            color=[0.38, 0.73, 0.78, 1.0],
+            metallic_factor=0.0,
+            roughness_factor=0.11,
+            use_threshold=False,
+        )
+        config = Config(
+            model_type="D-HYDRO",
+            time_index_start=0,
+            times_per_frame=1,
+            shift_coordinates="min",
+            scale_horizontal=1.0,
+            scale_vertical=1.0,
+            variables=[variable],
+        )
+
+        importer = Importer()
+        exp_mesh = importer.import_from(map_file, config)[0]
+        mesh = importer.import_from(partition_files[0], config)[0]
+
+        assert len(mesh.transformations) == len(exp_mesh.transformations)
+        for data_mesh, exp_data_mesh in zip(
+            [mesh.base, *mesh.transformations], [exp_mesh.base, *exp_mesh.transformations]
+        ):
+            np.testing.assert_array_equal(
+                sorted_rows(data_mesh.vertex_positions[mesh.triangles].reshape(-1, 9)),
+                sorted_rows(exp_data_mesh.vertex_positions[exp_mesh.triangles].reshape(-1, 9)),
+            )
@@ -1,12 +1,53 @@
 import numpy as np
+import pytest
 import xarray as xr
 
+from netcdf_to_gltf_converter.config import (CrsTransformation, Reprojection,
+                                             TriangleOrder)
 from netcdf_to_gltf_converter.data.vector import Vec3
 from netcdf_to_gltf_converter.netcdf.ugrid.ugrid_data import UgridDataset
+from netcdf_to_gltf_converter.preprocessing.crs import (create_crs,
+                                                        create_crs_transformer)
+from netcdf_to_gltf_converter.preprocessing.reprojection import GridReprojector
+from netcdf_to_gltf_converter.preprocessing.subset import create_box
 from tests.preprocessing.utils import Factory
 
 
+def create_node_variable(values) -> xr.DataArray:
+    return xr.DataArray(
+        values,
+        dims=["time", "mesh2d_nNodes"],
+        coords={"time": ("time", np.arange(len(values)), {"standard_name": "time"})},
+    )
+
+
 class TestUgridDataset:
+    def test_initializer_with_subset_selects_faces_nodes_and_data(self):
+        grid = Factory.create_rectilinear_grid()
+        ugrid_dataset = grid.to_dataset()
+        face_dimension = grid.face_dimension
+        ugrid_dataset["values"] = xr.DataArray(
+            [[0.0, 1.0, 2.0, 3.0]],
+            dims=["time", face_dimension],
+            coords={"time": ("time", [0], {"standard_name": "time"})},
+        )
+
+        # Only the centroids of the two right faces lie within the box
+        dataset = UgridDataset(ugrid_dataset, create_box(1.0, 0.0, 2.0, 2.0))
+
+        exp_node_coords = np.array([[1, 0], [2, 0], [1, 1], [2, 1], [1, 2], [2, 2]])
+        assert np.array_equal(dataset.node_coordinates, exp_node_coords)
+        assert np.array_equal(dataset.face_node_connectivity, [[0, 1, 3, 2], [2, 3, 5, 4]])
+        assert np.array_equal(dataset.get_variable("values").get_data_at_time(0), [1.0, 3.0])
+
+    def test_initializer_with_subset_outside_grid_raises_error(self):
+        grid = Factory.create_rectilinear_grid()
+
+        with pytest.raises(ValueError) as error:
+            UgridDataset(grid.to_dataset(), create_box(5.0, 5.0, 6.0, 6.0))
+
+        assert str(error.value) == "The grid has no faces within the spatial subset."
+
     def test_triangulate(self):
         grid = Factory.create_rectilinear_grid()
         dataset = UgridDataset(grid.to_dataset())
@@ -66,7 +107,7 @@ class TestUgridDataset:
         dataset = grid.to_dataset()
         
         var_name = "some_var"
-        dataset[var_name] = xr.DataArray([1, 2, 3, 4, 5, 6, 7, 8, 9], dims=[f"mesh2d_nNodes"])
+        dataset[var_name] = create_node_variable([[1, 2, 3, 4, 5, 6, 7, 8, 9]])
         ugrid_dataset = UgridDataset(dataset)
                 
         ugrid_dataset.scale_coordinates(scale_horizontal=2, scale_vertical=3, variables=[var_name])
@@ -74,4 +115,78 @@ class TestUgridDataset:
         # All data values multiplied by 3
         exp_values = np.array([3, 6, 9, 12, 15, 18, 21, 24, 27])
         
-        assert np.array_equal(ugrid_dataset.get_array(var_name).values, exp_values)
+        assert np.array_equal(ugrid_dataset.get_variable(var_name).get_data_at_time(0), exp_values)
+
+    def test_transform_coordinates_transforms_variable_data_when_retrieved(self):
+        grid = Factory.create_rectilinear_grid()
+        dataset = grid.to_dataset()
+        
+        var_name = "some_var"
+        dataset[var_name] = create_node_variable([[1, 2, 3, 4, 5, 6, 7, 8, 9]])
+        ugrid_dataset = UgridDataset(dataset)
+
+        ugrid_dataset.shift_coordinates(Vec3(10, 5, 1), variables=[var_name])
+        ugrid_dataset.scale_coordinates(scale_horizontal=2, scale_vertical=3, variables=[var_name])
+
+        # The data set itself is not rewritten
+        assert np.array_equal(ugrid_dataset.get_array(var_name).values, [[1, 2, 3, 4, 5, 6, 7, 8, 9]])
+
+        variable = ugrid_dataset.get_variable(var_name)
+        assert np.array_equal(variable.get_data_at_time(0), [0, 3, 6, 9, 12, 15, 18, 21, 24])
+        assert variable.min == 0
+        assert variable.max == 24
+        assert np.array_equal(variable.coordinates, ugrid_dataset.node_coordinates)
+        assert np.array_equal(ugrid_dataset.node_coordinates[0], [-20, -10])
+
+    def test_optimize_vertex_order(self):
+        grid = Factory.create_rectilinear_grid()
+        dataset = UgridDataset(grid.to_dataset())
+        dataset.triangulate()
+
+        node_coords = dataset.node_coordinates.copy()
+        triangle_coords = node_coords[dataset.face_node_connectivity]
+
+        dataset.optimize_vertex_order(TriangleOrder.TIPSIFY, cache_size=16)
+
+        # Nodes are renumbered in order of first use
+        first_use = dataset.face_node_connectivity.ravel()
+        _, first_use_index = np.unique(first_use, return_index=True)
+        assert np.array_equal(np.sort(first_use_index), first_use_index)
+
+        # The geometry of the triangles is unchanged
+        optimized_triangle_coords = dataset.node_coordinates[dataset.face_node_connectivity]
+        assert len(optimized_triangle_coords) == len(triangle_coords)
+        for coords in optimized_triangle_coords:
+            assert any(np.array_equal(coords, other) for other in triangle_coords)
+
+    def test_reproject_coordinates_reprojects_grid_and_variable_coordinates(self):
+        grid = Factory.create_rectilinear_grid()
+        dataset = grid.to_dataset()
+        dataset["some_var"] = create_node_variable([[1, 2, 3, 4, 5, 6, 7, 8, 9]])
+        ugrid_dataset = UgridDataset(dataset)
+        reprojection = Reprojection(
+            crs_transformation=CrsTransformation(source_crs=28992, target_crs=4326)
+        )
+
+        ugrid_dataset.reproject_coordinates(GridReprojector(reprojection))
+        ugrid_dataset.scale_coordinates(scale_horizontal=2, scale_vertical=1, variables=["some_var"])
+
+        transformer = create_crs_transformer(create_crs(28992), create_crs(4326))
+        exp_x, exp_y = transformer.transform(grid.node_x, grid.node_y)
+        exp_node_coords = np.column_stack([exp_x, exp_y]) * 2
+        assert np.array_equal(ugrid_dataset.node_coordinates, exp_node_coords)
+
+        variable = ugrid_dataset.get_variable("some_var")
+        assert np.array_equal(variable.coordinates, exp_node_coords)
+        assert np.array_equal(variable.get_data_at_time(0), [1, 2, 3, 4, 5, 6, 7, 8, 9])
+
+    def test_reproject_coordinates_after_transformation_raises_error(self):
+        grid = Factory.create_rectilinear_grid()
+        dataset = UgridDataset(grid.to_dataset())
+        reprojection = Reprojection(
+            crs_transformation=CrsTransformation(source_crs=28992, target_crs=4326)
+        )
+        dataset.shift_coordinates(Vec3(1, 1, 0), variables=[])
+
+        with pytest.raises(ValueError):
+            dataset.reproject_coordinates(GridReprojector(reprojection))
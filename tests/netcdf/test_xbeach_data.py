@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+import xarray as xr
+
+from netcdf_to_gltf_converter.config import RegularGridOptions, TriangleDiagonal
+from netcdf_to_gltf_converter.netcdf.xbeach.xbeach_data import XBeachDataset
+from netcdf_to_gltf_converter.preprocessing.subset import parse_geometry
+
+
+def create_xbeach_dataset(n_rows: int, n_cols: int, n_times: int = 2) -> xr.Dataset:
+    node_x, node_y = np.meshgrid(
+        np.arange(n_cols, dtype=np.float64), np.arange(n_rows, dtype=np.float64)
+    )
+    values = np.arange(n_times * n_rows * n_cols, dtype=np.float64)
+
+    return xr.Dataset(
+        {"zs": (("globaltime", "ny", "nx"), values.reshape(n_times, n_rows, n_cols))},
+        coords={
+            "globalx": (("ny", "nx"), node_x, {"standard_name": "projection_x_coordinate"}),
+            "globaly": (("ny", "nx"), node_y, {"standard_name": "projection_y_coordinate"}),
+            "globaltime": ("globaltime", np.arange(n_times), {"standard_name": "time"}),
+        },
+    )
+
+
+class TestXBeachDataset:
+    def test_initializer_creates_triangles(self):
+        dataset = XBeachDataset(create_xbeach_dataset(n_rows=2, n_cols=3))
+
+        exp_triangles = np.array([[0, 1, 4], [0, 4, 3], [1, 2, 5], [1, 5, 4]])
+        assert np.array_equal(dataset.face_node_connectivity, exp_triangles)
+
+    def test_triangulate_keeps_triangles(self):
+        options = RegularGridOptions(diagonal=TriangleDiagonal.BACKWARD)
+        dataset = XBeachDataset(create_xbeach_dataset(n_rows=2, n_cols=3), options)
+        exp_triangles = dataset.face_node_connectivity.copy()
+
+        dataset.triangulate()
+
+        assert np.array_equal(dataset.face_node_connectivity, exp_triangles)
+
+    def test_initializer_with_invalid_node_coordinates_skips_inactive_cells(self):
+        xbeach_dataset = create_xbeach_dataset(n_rows=3, n_cols=3)
+        xbeach_dataset["globalx"][0, 0] = np.nan
+
+        dataset = XBeachDataset(xbeach_dataset)
+
+        triangles = dataset.face_node_connectivity
+        assert len(triangles) == 6
+        assert 0 not in triangles
+
+    def test_initializer_with_stride_and_window_subsamples_grid_and_data(self):
+        options = RegularGridOptions(
+            row_stride=2, column_stride=2, column_index_start=1, column_index_end=3
+        )
+        dataset = XBeachDataset(create_xbeach_dataset(n_rows=5, n_cols=6), options)
+
+        exp_node_coordinates = np.array([[1, 0], [3, 0], [1, 2], [3, 2], [1, 4], [3, 4]])
+        assert np.array_equal(dataset.node_coordinates, exp_node_coordinates)
+        assert len(dataset.face_node_connectivity) == 4
+
+        data = dataset.get_variable("zs")
+        assert np.array_equal(data.coordinates, exp_node_coordinates)
+        assert np.array_equal(data.get_data_at_time(0), [1, 3, 13, 15, 25, 27])
+
+    @pytest.mark.parametrize(
+        "options",
+        [
+            RegularGridOptions(row_index_start=10),
+            RegularGridOptions(row_index_start=2, row_index_end=2),
+            RegularGridOptions(column_stride=5),
+        ],
+    )
+    def test_initializer_with_window_without_faces_raises_error(self, options: RegularGridOptions):
+        with pytest.raises(ValueError) as error:
+            XBeachDataset(create_xbeach_dataset(n_rows=4, n_cols=4), options)
+
+        assert str(error.value).startswith("The regular grid has no faces within the selected window")
+
+    def test_initializer_with_subset_reads_window_and_skips_cells_outside_area(self):
+        # Triangle that contains the centers of the cells (1, 1), (1, 2) and (2, 2) of the 4x4 cells
+        subset = parse_geometry("POLYGON ((1.1 1.2, 2.8 1.2, 2.8 2.9, 1.1 1.2))")
+        dataset = XBeachDataset(create_xbeach_dataset(n_rows=5, n_cols=5), subset=subset)
+
+        exp_node_coordinates = np.array(
+            [[1, 1], [2, 1], [3, 1], [1, 2], [2, 2], [3, 2], [1, 3], [2, 3], [3, 3]]
+        )
+        assert np.array_equal(dataset.node_coordinates, exp_node_coordinates)
+        assert len(dataset.face_node_connectivity) == 6
+        assert 6 not in dataset.face_node_connectivity
+
+        data = dataset.get_variable("zs")
+        assert np.array_equal(data.get_data_at_time(0), [6, 7, 8, 11, 12, 13, 16, 17, 18])
@@ -0,0 +1,67 @@
+import numpy as np
+import xugrid.ugrid.connectivity as xugrid_connectivity
+
+from netcdf_to_gltf_converter.config import TriangleDiagonal
+from netcdf_to_gltf_converter.preprocessing.connectivity import (
+    face_node_connectivity_from_regular, triangles_from_regular)
+
+
+def test_face_node_connectivity_from_regular():
+    face_node_connectivity = face_node_connectivity_from_regular(3, 4)
+
+    exp_face_node_connectivity = np.array(
+        [
+            [0, 1, 5, 4],
+            [1, 2, 6, 5],
+            [2, 3, 7, 6],
+            [4, 5, 9, 8],
+            [5, 6, 10, 9],
+            [6, 7, 11, 10],
+        ]
+    )
+    assert face_node_connectivity.dtype == np.uint32
+    assert np.array_equal(face_node_connectivity, exp_face_node_connectivity)
+
+
+def test_triangles_from_regular_with_forward_diagonal_equals_generic_triangulation():
+    face_node_connectivity = face_node_connectivity_from_regular(4, 5)
+    exp_triangles, _ = xugrid_connectivity.triangulate(face_node_connectivity, -1)
+
+    triangles = triangles_from_regular(4, 5, TriangleDiagonal.FORWARD)
+
+    assert triangles.dtype == np.uint32
+    assert np.array_equal(triangles, exp_triangles)
+
+
+def test_triangles_from_regular_with_backward_diagonal():
+    triangles = triangles_from_regular(2, 3, TriangleDiagonal.BACKWARD)
+
+    exp_triangles = np.array([[0, 1, 3], [1, 4, 3], [1, 2, 4], [2, 5, 4]])
+    assert np.array_equal(triangles, exp_triangles)
+
+
+def test_triangles_from_regular_with_alternating_diagonal():
+    triangles = triangles_from_regular(3, 3, TriangleDiagonal.ALTERNATING)
+
+    exp_triangles = np.array(
+        [
+            [0, 1, 4],
+            [0, 4, 3],
+            [1, 2, 4],
+            [2, 5, 4],
+            [3, 4, 6],
+            [4, 7, 6],
+            [4, 5, 8],
+            [4, 8, 7],
+        ]
+    )
+    assert np.array_equal(triangles, exp_triangles)
+
+
+def test_triangles_from_regular_with_active_cells_skips_inactive_cells():
+    active_cells = np.array([[True, False], [False, True]])
+
+    triangles = triangles_from_regular(3, 3, active_cells=active_cells)
+
+    exp_triangles = np.array([[0, 1, 4], [0, 4, 3], [4, 5, 8], [4, 8, 7]])
+    assert np.array_equal(triangles, exp_triangles)
@@ -1,9 +1,18 @@
+from pathlib import Path
+
+import numpy as np
+import pyproj.transformer
+import pytest
 from pyproj import CRS
 from pyproj.crs import CompoundCRS
 
-from netcdf_to_gltf_converter.preprocessing.crs import (create_compound_crs,
+from netcdf_to_gltf_converter.preprocessing.crs import (configure_proj,
+                                                        create_compound_crs,
                                                         create_crs,
-                                                        create_crs_transformer)
+                                                        create_crs_transformer,
+                                                        download_grids,
+                                                        get_missing_grids,
+                                                        transform_coordinates)
 
 
 def test_create_crs_transformer():
@@ -16,7 +25,7 @@ def test_create_crs_transformer():
     transformer = create_crs_transformer(source_crs, target_crs)
 
     assert transformer is not None
-    assert transformer.is_network_enabled == True
+    assert transformer.is_network_enabled == False
     assert (
         transformer.source_crs.name
         == "WGS 84 (with axis order normalized for visualization)"
@@ -24,6 +33,71 @@ def test_create_crs_transformer():
     assert transformer.target_crs.name == "Amersfoort / RD New + NAP height"
 
 
+def test_create_crs_transformer_with_network_enabled():
+    configure_proj(network=True)
+    try:
+        transformer = create_crs_transformer(create_crs(4979), create_crs(7415))
+    finally:
+        configure_proj(network=False)
+
+    assert transformer.is_network_enabled == True
+    assert create_crs_transformer(create_crs(4979), create_crs(7415)).is_network_enabled == False
+
+
+def test_get_missing_grids_without_grids_returns_empty_list():
+    missing_grids = get_missing_grids(create_crs(28992), create_crs(4326))
+
+    assert missing_grids == []
+
+
+def test_get_missing_grids_with_missing_grids_returns_grid_names():
+    missing_grids = get_missing_grids(create_crs(4979), create_crs(7415))
+    if not missing_grids:
+        pytest.skip("The grids are installed on this machine.")
+
+    assert "nl_nsgi_nlgeo2018.tif" in missing_grids
+    assert len(missing_grids) == len(set(missing_grids))
+
+
+def test_download_grids_downloads_missing_grids_to_directory(tmp_path: Path, monkeypatch):
+    missing_grids = get_missing_grids(create_crs(4979), create_crs(7415))
+    if not missing_grids:
+        pytest.skip("The grids are installed on this machine.")
+
+    downloads = []
+
+    def download(file_url: str, short_name: str, directory: Path, **kwargs):
+        downloads.append((short_name, directory))
+
+    monkeypatch.setattr(pyproj.transformer, "_download_resource_file", download)
+
+    download_grids(create_crs(4979), create_crs(7415), tmp_path)
+
+    assert {short_name for short_name, _ in downloads} == set(missing_grids)
+    assert all(directory == tmp_path for _, directory in downloads)
+
+
+def test_create_crs_transformer_reuses_transformer():
+    source_crs = create_crs(28992)
+    target_crs = create_crs(4326)
+
+    transformer = create_crs_transformer(source_crs, target_crs)
+
+    assert create_crs_transformer(create_crs(28992), create_crs(4326)) is transformer
+
+
+def test_transform_coordinates_in_chunks_equals_transforming_at_once():
+    transformer = create_crs_transformer(create_crs(28992), create_crs(4326))
+    coordinates = np.column_stack([np.linspace(0, 280000, 11), np.linspace(300000, 620000, 11)])
+
+    transformed = transform_coordinates(transformer, coordinates, chunk_size=3, n_workers=2)
+
+    exp_x, exp_y = transformer.transform(coordinates[:, 0], coordinates[:, 1])
+    assert transformed.shape == (11, 2)
+    assert np.array_equal(transformed, np.column_stack([exp_x, exp_y]))
+    assert np.array_equal(coordinates[:, 0], np.linspace(0, 280000, 11))
+
+
 def test_create_crs():
     epsg = 7415
 
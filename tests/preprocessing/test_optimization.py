@@ -0,0 +1,53 @@
+import numpy as np
+
+from netcdf_to_gltf_converter.preprocessing.optimization import (
+    morton_order, renumber_vertices_by_first_use, tipsify)
+from netcdf_to_gltf_converter.utils.arrays import float32_array, uint32_array
+from tests.preprocessing.utils import create_grid_triangles
+
+
+def get_average_cache_miss_ratio(triangles: np.ndarray, cache_size: int) -> float:
+    cache = []
+    n_misses = 0
+    for vertex in triangles.ravel():
+        if vertex in cache:
+            continue
+        n_misses += 1
+        cache.append(vertex)
+        if len(cache) > cache_size:
+            cache.pop(0)
+
+    return n_misses / len(triangles)
+
+
+def test_tipsify_improves_vertex_cache_efficiency():
+    _, triangles = create_grid_triangles(n_vertex_cols=30)
+    shuffled_triangles = triangles[np.random.default_rng(1).permutation(len(triangles))]
+
+    order = tipsify(shuffled_triangles, n_vertices=900, cache_size=16)
+
+    assert np.array_equal(np.sort(order), np.arange(len(triangles)))
+    assert get_average_cache_miss_ratio(
+        shuffled_triangles[order], 16
+    ) < 0.5 * get_average_cache_miss_ratio(shuffled_triangles, 16)
+
+
+def test_morton_order():
+    node_coordinates = float32_array([[0, 0], [1, 0], [0, 1], [1, 1], [2, 0], [2, 1]])
+    triangles = uint32_array([[4, 5, 3], [0, 1, 2], [1, 3, 2], [1, 4, 3]])
+
+    order = morton_order(node_coordinates, triangles)
+
+    assert np.array_equal(order, [1, 2, 3, 0])
+
+
+def test_renumber_vertices_by_first_use():
+    triangles = uint32_array([[4, 2, 3], [2, 0, 3]])
+
+    renumbered_triangles, vertex_order = renumber_vertices_by_first_use(
+        triangles, n_vertices=6
+    )
+
+    assert np.array_equal(renumbered_triangles, uint32_array([[0, 1, 2], [1, 3, 2]]))
+    assert np.array_equal(vertex_order, [4, 2, 3, 0, 1, 5])
+    assert renumbered_triangles.dtype == np.uint32
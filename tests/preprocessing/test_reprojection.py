@@ -0,0 +1,103 @@
+from pathlib import Path
+
+import numpy as np
+
+import netcdf_to_gltf_converter.preprocessing.reprojection as reprojection_module
+from netcdf_to_gltf_converter.config import CrsTransformation, Reprojection
+from netcdf_to_gltf_converter.preprocessing.crs import (create_crs,
+                                                        create_crs_transformer)
+from netcdf_to_gltf_converter.preprocessing.reprojection import GridReprojector
+from netcdf_to_gltf_converter.utils.events import EventEmitter, EventType
+
+
+def create_reprojection(**kwargs) -> Reprojection:
+    return Reprojection(
+        crs_transformation=CrsTransformation(source_crs=28992, target_crs=4326),
+        **kwargs,
+    )
+
+
+def create_coordinates() -> np.ndarray:
+    return np.column_stack([np.linspace(0, 280000, 7), np.linspace(300000, 620000, 7)])
+
+
+class TestGridReprojector:
+    def test_reproject_transforms_coordinates(self):
+        reprojector = GridReprojector(create_reprojection(chunk_size=2))
+        coordinates = create_coordinates()
+
+        reprojected, vertical_offsets = reprojector.reproject(coordinates)
+
+        transformer = create_crs_transformer(create_crs(28992), create_crs(4326))
+        exp_x, exp_y = transformer.transform(coordinates[:, 0], coordinates[:, 1])
+        assert np.array_equal(reprojected, np.column_stack([exp_x, exp_y]))
+        assert np.array_equal(vertical_offsets, np.zeros(7))
+
+    def test_reproject_same_grid_twice_uses_memory_cache(self, monkeypatch):
+        reprojector = GridReprojector(create_reprojection())
+        coordinates = create_coordinates()
+        exp_reprojected, _ = reprojector.reproject(coordinates)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("The coordinates should not be transformed again.")
+
+        monkeypatch.setattr(reprojection_module, "transform_coordinates", fail)
+        reprojected, _ = reprojector.reproject(coordinates.copy())
+
+        assert np.array_equal(reprojected, exp_reprojected)
+
+    def test_reproject_with_cache_dir_reuses_cache_file(self, tmp_path: Path, monkeypatch):
+        coordinates = create_coordinates()
+        reprojection = create_reprojection(cache_dir=tmp_path / "cache")
+        exp_reprojected, _ = GridReprojector(reprojection).reproject(coordinates)
+
+        assert len(list((tmp_path / "cache").glob("*.npy"))) == 1
+
+        def fail(*args, **kwargs):
+            raise AssertionError("The coordinates should not be transformed again.")
+
+        monkeypatch.setattr(reprojection_module, "transform_coordinates", fail)
+        reprojected, _ = GridReprojector(reprojection).reproject(coordinates)
+
+        assert np.array_equal(reprojected, exp_reprojected)
+
+    def test_reproject_other_grid_does_not_use_cache(self):
+        reprojector = GridReprojector(create_reprojection())
+        coordinates = create_coordinates()
+        reprojector.reproject(coordinates)
+
+        reprojected, _ = reprojector.reproject(coordinates[:3])
+
+        assert len(reprojected) == 3
+        assert len(reprojector._memory_cache) == 2
+
+    def test_reproject_returns_read_only_coordinates(self):
+        reprojector = GridReprojector(create_reprojection())
+
+        reprojected, vertical_offsets = reprojector.reproject(create_coordinates())
+
+        assert not reprojected.flags.writeable
+        assert not vertical_offsets.flags.writeable
+
+    def test_reproject_with_other_reprojector_does_not_share_memory_cache(self):
+        events = EventEmitter()
+        received = []
+        events.add_listener(lambda event: received.append(event.type))
+        coordinates = create_coordinates()
+        GridReprojector(create_reprojection(), events).reproject(coordinates)
+
+        GridReprojector(create_reprojection(), events).reproject(coordinates)
+
+        assert received == [EventType.CACHE_MISS, EventType.CACHE_MISS]
+
+    def test_reproject_emits_cache_events(self):
+        events = EventEmitter()
+        received = []
+        events.add_listener(lambda event: received.append((event.type, event.name)))
+        reprojector = GridReprojector(create_reprojection(), events)
+        coordinates = create_coordinates()
+
+        reprojector.reproject(coordinates)
+        reprojector.reproject(coordinates)
+
+        assert received == [(EventType.CACHE_MISS, "reprojection"), (EventType.CACHE_HIT, "reprojection")]
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from netcdf_to_gltf_converter.preprocessing.simplification import \
+    cluster_vertices
+from netcdf_to_gltf_converter.utils.arrays import float32_array, uint32_array
+
+
+def test_cluster_vertices():
+    # 3x3 nodes, clustered into 2x2 cells
+    node_coordinates = float32_array(
+        [[0, 0], [1, 0], [2, 0], [0, 1], [1, 1], [2, 1], [0, 2], [1, 2], [2, 2]]
+    )
+    triangles = uint32_array(
+        [
+            [0, 1, 4],
+            [0, 4, 3],
+            [1, 2, 5],
+            [1, 5, 4],
+            [3, 4, 7],
+            [3, 7, 6],
+            [4, 5, 8],
+            [4, 8, 7],
+        ]
+    )
+
+    representatives, simplified_triangles = cluster_vertices(
+        node_coordinates, triangles, cell_size=1.5
+    )
+
+    exp_representatives = np.array([0, 6, 2, 8])
+    exp_triangles = uint32_array([[0, 2, 3], [0, 3, 1]])
+
+    assert np.array_equal(representatives, exp_representatives)
+    assert np.array_equal(simplified_triangles, exp_triangles)
+    assert simplified_triangles.dtype == np.uint32
+
+
+def test_cluster_vertices_with_small_cell_size_keeps_mesh():
+    node_coordinates = float32_array([[0, 0], [1, 0], [1, 1], [0, 1]])
+    triangles = uint32_array([[0, 1, 2], [0, 2, 3]])
+
+    representatives, simplified_triangles = cluster_vertices(
+        node_coordinates, triangles, cell_size=0.5
+    )
+
+    assert np.array_equal(node_coordinates[representatives][simplified_triangles], node_coordinates[triangles])
+
+
+def test_cluster_vertices_with_invalid_cell_size_raises_error():
+    node_coordinates = float32_array([[0, 0], [1, 0], [1, 1]])
+    triangles = uint32_array([[0, 1, 2]])
+
+    with pytest.raises(ValueError) as error:
+        cluster_vertices(node_coordinates, triangles, cell_size=0.0)
+
+    assert str(error.value) == "Cell size should be larger than zero, but was 0.0."
@@ -0,0 +1,68 @@
+import geopandas as gpd
+import numpy as np
+import pytest
+from shapely.geometry import Polygon
+
+from netcdf_to_gltf_converter.preprocessing.subset import (create_box,
+                                                           parse_geometry,
+                                                           read_geometry,
+                                                           select_faces)
+
+
+class TestParseGeometry:
+    def test_parse_geometry_from_wkt(self):
+        geometry = parse_geometry("POLYGON ((0 0, 2 0, 2 2, 0 0))")
+
+        assert geometry.equals(Polygon([(0, 0), (2, 0), (2, 2)]))
+
+    def test_parse_geometry_from_geojson(self):
+        geometry = parse_geometry(
+            '{"type": "Polygon", "coordinates": [[[0, 0], [2, 0], [2, 2], [0, 0]]]}'
+        )
+
+        assert geometry.equals(Polygon([(0, 0), (2, 0), (2, 2)]))
+
+    def test_parse_geometry_from_geojson_feature_collection_returns_union(self):
+        geometry = parse_geometry(
+            '{"type": "FeatureCollection", "features": ['
+            '{"type": "Feature", "properties": {}, "geometry": {"type": "Polygon", "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 1], [0, 0]]]}},'
+            '{"type": "Feature", "properties": {}, "geometry": {"type": "Polygon", "coordinates": [[[1, 0], [2, 0], [2, 1], [1, 1], [1, 0]]]}}'
+            "]}"
+        )
+
+        assert geometry.equals(create_box(0, 0, 2, 1))
+
+    def test_parse_geometry_with_invalid_geojson_raises_error(self):
+        with pytest.raises(ValueError) as error:
+            parse_geometry('{"type": "Polygon"')
+
+        assert str(error.value).startswith("Geometry is not valid GeoJSON")
+
+
+class TestReadGeometry:
+    def test_read_geometry_returns_union(self, tmp_path):
+        file_path = tmp_path / "area.geojson"
+        polygons = [create_box(0, 0, 1, 1), create_box(1, 0, 2, 1)]
+        file_path.write_text(gpd.GeoDataFrame(geometry=polygons).to_json())
+
+        geometry = read_geometry(file_path)
+
+        assert geometry.equals(create_box(0, 0, 2, 1))
+
+    def test_read_geometry_file_does_not_exist_raises_error(self, tmp_path):
+        file_path = tmp_path / "area.geojson"
+
+        with pytest.raises(ValueError) as error:
+            read_geometry(file_path)
+
+        assert str(error.value) == f"Geometry file does not exist: {file_path}"
+
+
+class TestSelectFaces:
+    def test_select_faces_returns_sorted_indices_of_centroids_within_geometry(self):
+        face_coordinates = np.array([[5.0, 5.0], [0.5, 0.5], [1.5, 0.5], [0.5, 1.5]])
+        geometry = parse_geometry("POLYGON ((0 0, 2 0, 0 2, 0 0))")
+
+        face_indices = select_faces(face_coordinates, geometry)
+
+        assert np.array_equal(face_indices, [1, 2, 3])
@@ -0,0 +1,64 @@
+import numpy as np
+
+from netcdf_to_gltf_converter.preprocessing.tiling import (partition_quadtree,
+                                                           split_triangles)
+from tests.preprocessing.utils import create_grid_triangles
+
+
+def get_triangle_centroids(n_vertex_cols: int):
+    node_coordinates, triangles = create_grid_triangles(n_vertex_cols)
+    return node_coordinates[triangles].mean(axis=1)
+
+
+def test_partition_quadtree_splits_into_quadrants():
+    centroids = get_triangle_centroids(n_vertex_cols=5)
+
+    root = partition_quadtree(centroids, max_points_per_tile=8, max_depth=4)
+
+    leaves = root.leaves()
+    assert root.quadkey == ""
+    assert not root.is_leaf
+    assert [leaf.quadkey for leaf in leaves] == ["0", "1", "2", "3"]
+    assert leaves[3].bounds[2:] == (centroids[:, 0].max(), centroids[:, 1].max())
+
+
+def test_assign_returns_points_per_leaf():
+    centroids = get_triangle_centroids(n_vertex_cols=5)
+    root = partition_quadtree(centroids, max_points_per_tile=8, max_depth=4)
+
+    assignment = root.assign(centroids)
+
+    assert list(assignment.keys()) == ["0", "1", "2", "3"]
+    assert all(len(indices) == 8 for indices in assignment.values())
+    all_indices = np.sort(np.concatenate(list(assignment.values())))
+    assert np.array_equal(all_indices, np.arange(len(centroids)))
+
+
+def test_partition_quadtree_with_max_depth_zero_returns_single_tile():
+    centroids = get_triangle_centroids(n_vertex_cols=5)
+
+    root = partition_quadtree(centroids, max_points_per_tile=1, max_depth=0)
+
+    assert root.is_leaf
+    assert root.leaves() == [root]
+    assert np.array_equal(root.assign(centroids)[""], np.arange(len(centroids)))
+
+
+def test_split_triangles_returns_chunks_with_at_most_max_vertices():
+    _, triangles = create_grid_triangles(n_vertex_cols=10)
+
+    chunks = split_triangles(triangles, max_vertices=20)
+
+    assert len(chunks) > 1
+    assert np.array_equal(np.concatenate(chunks), np.arange(len(triangles)))
+    for chunk in chunks:
+        assert len(np.unique(triangles[chunk])) <= 20
+
+
+def test_split_triangles_with_few_vertices_returns_single_chunk():
+    _, triangles = create_grid_triangles(n_vertex_cols=3)
+
+    chunks = split_triangles(triangles, max_vertices=9)
+
+    assert len(chunks) == 1
+    assert np.array_equal(chunks[0], np.arange(len(triangles)))
@@ -3,6 +3,7 @@ import xugrid as xu
 
 import netcdf_to_gltf_converter.preprocessing.connectivity as connectivity
 from netcdf_to_gltf_converter.netcdf.ugrid.ugrid_data import UgridDataset
+from netcdf_to_gltf_converter.utils.arrays import float32_array, uint32_array
 
 
 class Factory:
@@ -23,4 +24,19 @@ class Factory:
         fill_value = -1
         face_node_connectivity = connectivity.face_node_connectivity_from_regular(3, 3)
 
-        return xu.Ugrid2d(node_x, node_y, fill_value, face_node_connectivity)
\ No newline at end of file
+        return xu.Ugrid2d(node_x, node_y, fill_value, face_node_connectivity)
+
+
+def create_grid_triangles(n_vertex_cols: int):
+    """Create the node coordinates and triangles of a square grid with n_vertex_cols x n_vertex_cols nodes and 2 triangles per cell."""
+    node_coordinates = float32_array(
+        [[x, y] for y in range(n_vertex_cols) for x in range(n_vertex_cols)]
+    )
+    triangles = []
+    for row in range(n_vertex_cols - 1):
+        for col in range(n_vertex_cols - 1):
+            node_index = row * n_vertex_cols + col
+            triangles.append([node_index, node_index + 1, node_index + n_vertex_cols + 1])
+            triangles.append([node_index, node_index + n_vertex_cols + 1, node_index + n_vertex_cols])
+
+    return node_coordinates, uint32_array(triangles)
@@ -0,0 +1,197 @@
+import json
+import os
+from collections import deque
+from concurrent.futures import Future
+from pathlib import Path
+
+import pytest
+
+from netcdf_to_gltf_converter import batch
+from netcdf_to_gltf_converter.batch import (BatchJob,
+                                            BatchJobResult, BatchRunner,
+                                            estimate_memory, find_jobs,
+                                            read_manifest, write_summary)
+from netcdf_to_gltf_converter.netcdf.estimator import (BYTES_PER_TRIANGLE,
+                                                       BYTES_PER_VERTEX_FRAME)
+from tests.utils import dhydro_resources, reference_files
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, job, *args):
+        self.submitted.append(job)
+        return Future()
+
+
+def run_job_or_terminate(job: BatchJob, grid_cache_dir):
+    if job.gltf.stem == "terminate":
+        os._exit(1)
+    return 0.0, None
+
+
+def create_job(gltf: Path) -> BatchJob:
+    return BatchJob(
+        dhydro_resources / "3x3nodes_rectilinear_map.nc",
+        gltf,
+        dhydro_resources / "config.json",
+    )
+
+
+class TestReadManifest:
+    def test_read_json_manifest_with_default_config(self, tmp_path: Path):
+        manifest = tmp_path / "manifest.json"
+        content = {
+            "config": "config.json",
+            "jobs": [
+                {"netcdf": "a_map.nc", "gltf": "a.glb"},
+                {"netcdf": "b_map.nc", "gltf": "b.glb", "config": "other.json"},
+            ],
+        }
+        manifest.write_text(json.dumps(content))
+
+        jobs = read_manifest(manifest)
+
+        assert jobs == [
+            BatchJob(tmp_path / "a_map.nc", tmp_path / "a.glb", tmp_path / "config.json"),
+            BatchJob(tmp_path / "b_map.nc", tmp_path / "b.glb", tmp_path / "other.json"),
+        ]
+
+    def test_read_csv_manifest(self, tmp_path: Path):
+        manifest = tmp_path / "manifest.csv"
+        manifest.write_text("netcdf,gltf,config\na_map.nc,a.glb,\nb_map.nc,b.glb,other.json\n")
+
+        jobs = read_manifest(manifest, default_config=Path("config.json"))
+
+        assert jobs == [
+            BatchJob(tmp_path / "a_map.nc", tmp_path / "a.glb", Path("config.json")),
+            BatchJob(tmp_path / "b_map.nc", tmp_path / "b.glb", tmp_path / "other.json"),
+        ]
+
+    def test_read_manifest_without_config_raises_error(self, tmp_path: Path):
+        manifest = tmp_path / "manifest.json"
+        manifest.write_text(json.dumps([{"netcdf": "a_map.nc", "gltf": "a.glb"}]))
+
+        with pytest.raises(ValueError) as error:
+            read_manifest(manifest)
+
+        assert "a_map.nc" in str(error.value)
+
+
+def test_find_jobs_creates_job_per_matching_file(tmp_path: Path):
+    config = dhydro_resources / "config.json"
+
+    jobs = find_jobs(str(dhydro_resources / "*.nc"), config, tmp_path, ".gltf")
+
+    assert len(jobs) > 0
+    assert all(job.netcdf.suffix == ".nc" for job in jobs)
+    assert all(job.gltf == tmp_path / f"{job.netcdf.stem}.gltf" for job in jobs)
+    assert all(job.config == config for job in jobs)
+
+
+def test_estimate_memory_uses_dimensions_and_frames():
+    job = create_job(Path("output.gltf"))
+
+    # 9 vertices and 8 triangles, with the base geometry and 4 frames for the variable and a static threshold mesh
+    exp_variable_memory = 9 * 5 * BYTES_PER_VERTEX_FRAME + 8 * BYTES_PER_TRIANGLE
+    exp_threshold_memory = 9 * 1 * BYTES_PER_VERTEX_FRAME + 8 * BYTES_PER_TRIANGLE
+    assert estimate_memory(job) == exp_variable_memory + exp_threshold_memory
+
+
+class TestBatchRunner:
+    def test_run_converts_jobs_and_reports_failures(self, tmp_path: Path):
+        succeeding_job = create_job(tmp_path / "output" / "3x3nodes_rectilinear_map.gltf")
+        failing_job = BatchJob(
+            dhydro_resources / "3x3nodes_rectilinear_map.nc",
+            tmp_path / "failing.txt",
+            dhydro_resources / "config.json",
+        )
+        runner = BatchRunner(n_workers=2, retries=1)
+
+        results = runner.run([succeeding_job, failing_job])
+
+        assert results[0].succeeded
+        assert results[0].attempts == 1
+        assert (
+            succeeding_job.gltf.read_bytes()
+            == (reference_files / "3x3nodes_rectilinear_map.gltf").read_bytes()
+        )
+        assert not results[1].succeeded
+        assert results[1].attempts == 2
+        assert "unsupported file type" in results[1].error
+
+    def test_submit_admitted_respects_memory_limit(self):
+        jobs = [create_job(Path(f"{index}.gltf")) for index in range(3)]
+        estimates = {0: 60, 1: 50, 2: 10}
+        pending = deque([(0, 1), (1, 1), (2, 1)])
+        runner = BatchRunner(n_workers=3, memory_limit=100)
+        executor = FakeExecutor()
+        running = {}
+
+        runner._submit_admitted(executor, jobs, pending, running, estimates, set())
+
+        # The second job does not fit next to the first job, and jobs start in order
+        assert executor.submitted == [jobs[0]]
+        assert list(pending) == [(1, 1), (2, 1)]
+
+    def test_submit_admitted_starts_too_large_job_on_its_own(self):
+        jobs = [create_job(Path("0.gltf"))]
+        runner = BatchRunner(n_workers=2, memory_limit=100)
+        executor = FakeExecutor()
+
+        runner._submit_admitted(executor, jobs, deque([(0, 1)]), {}, {0: 500}, set())
+
+        assert executor.submitted == [jobs[0]]
+
+    def test_submit_admitted_starts_isolated_job_on_its_own(self):
+        jobs = [create_job(Path(f"{index}.gltf")) for index in range(3)]
+        pending = deque([(1, 1), (2, 1)])
+        runner = BatchRunner(n_workers=3)
+        executor = FakeExecutor()
+        running = {Future(): (0, 1)}
+
+        runner._submit_admitted(executor, jobs, pending, running, {0: 10, 1: 10, 2: 10}, {1})
+
+        assert executor.submitted == []
+
+        running.clear()
+        runner._submit_admitted(executor, jobs, pending, running, {0: 10, 1: 10, 2: 10}, {1})
+
+        assert executor.submitted == [jobs[1]]
+        assert list(pending) == [(2, 1)]
+
+    def test_run_with_terminated_process_only_charges_terminated_job(self, tmp_path: Path, monkeypatch):
+        monkeypatch.setattr(batch, "_run_job", run_job_or_terminate)
+        jobs = [
+            create_job(tmp_path / "terminate.gltf"),
+            create_job(tmp_path / "a.gltf"),
+            create_job(tmp_path / "b.gltf"),
+        ]
+        runner = BatchRunner(n_workers=3, retries=1)
+
+        results = runner.run(jobs)
+
+        assert not results[0].succeeded
+        assert results[0].attempts == 2
+        assert "terminated abruptly" in results[0].error
+        assert all(result.succeeded for result in results[1:])
+        assert all(result.attempts == 1 for result in results[1:])
+
+
+def test_write_summary(tmp_path: Path):
+    job = create_job(Path("output.gltf"))
+    results = [
+        BatchJobResult(job, True, 1, 1.5, 100),
+        BatchJobResult(job, False, 2, 0.5, 100, "error"),
+    ]
+    summary_path = tmp_path / "summary.json"
+
+    write_summary(results, summary_path)
+
+    summary = json.loads(summary_path.read_text())
+    assert summary["n_jobs"] == 2
+    assert summary["n_succeeded"] == 1
+    assert summary["n_failed"] == 1
+    assert summary["jobs"][1]["error"] == "error"
+    assert summary["jobs"][0]["job"]["netcdf"] == str(job.netcdf)
@@ -1,6 +1,11 @@
+import pytest
+from pydantic import ValidationError
 from pyproj.crs import CompoundCRS
 
-from netcdf_to_gltf_converter.config import CrsTransformation
+from netcdf_to_gltf_converter.config import (Colormap, CrsTransformation,
+                                             LevelOfDetail, LevelsOfDetail,
+                                             RegularGridOptions, Reprojection,
+                                             Segmentation, SpatialSubset)
 
 
 class TestCrsTransformation:
@@ -41,3 +46,150 @@ class TestCrsTransformation:
             == "WGS 84 / UTM zone 17N + NAVD88 height"
         )
         assert isinstance(crs_transformation.target_crs, CompoundCRS)
+
+
+class TestReprojection:
+    def test_construction_with_defaults(self):
+        reprojection = Reprojection(
+            crs_transformation=CrsTransformation(source_crs=28992, target_crs=4326)
+        )
+
+        assert reprojection.transform_z == False
+        assert reprojection.chunk_size == 100000
+        assert reprojection.n_workers is None
+        assert reprojection.cache_dir is None
+
+    def test_construction_with_geocentric_target_crs_raises_error(self):
+        with pytest.raises(ValidationError):
+            Reprojection(
+                crs_transformation=CrsTransformation(source_crs=4979, target_crs=4978)
+            )
+
+    @pytest.mark.parametrize("field", ["chunk_size", "n_workers"])
+    def test_construction_with_non_positive_value_raises_error(self, field: str):
+        with pytest.raises(ValidationError):
+            Reprojection(
+                crs_transformation=CrsTransformation(source_crs=28992, target_crs=4326),
+                **{field: 0},
+            )
+
+
+class TestLevelsOfDetail:
+    def test_construction_with_decreasing_screen_coverage(self):
+        levels_of_detail = LevelsOfDetail(
+            screen_coverage=0.5,
+            levels=[
+                LevelOfDetail(cell_size=10.0, screen_coverage=0.2),
+                LevelOfDetail(cell_size=50.0, screen_coverage=0.0),
+            ],
+        )
+
+        assert len(levels_of_detail.levels) == 2
+
+    def test_construction_with_increasing_screen_coverage_raises_error(self):
+        with pytest.raises(ValidationError) as error:
+            LevelsOfDetail(
+                screen_coverage=0.5,
+                levels=[LevelOfDetail(cell_size=10.0, screen_coverage=0.6)],
+            )
+
+        assert (
+            "The screen coverage should decrease with each coarser level of detail."
+            in str(error.value)
+        )
+
+    def test_construction_with_invalid_cell_size_raises_error(self):
+        with pytest.raises(ValidationError) as error:
+            LevelOfDetail(cell_size=0.0, screen_coverage=0.5)
+
+        assert "Value must be larger than 0.0" in str(error.value)
+
+
+class TestColormap:
+    def test_construction_with_single_color_raises_error(self):
+        with pytest.raises(ValidationError) as error:
+            Colormap(colors=[[0.0, 0.0, 1.0, 1.0]])
+
+        assert "A colormap should contain at least 2 colors." in str(error.value)
+
+    def test_construction_with_invalid_color_raises_error(self):
+        with pytest.raises(ValidationError) as error:
+            Colormap(colors=[[0.0, 0.0, 1.0, 1.0], [2.0, 0.0, 0.0, 1.0]])
+
+        assert "The color channel 2.0 is outside of range 0.0-1.0." in str(error.value)
+
+    def test_construction_with_invalid_value_range_raises_error(self):
+        with pytest.raises(ValidationError) as error:
+            Colormap(
+                colors=[[0.0, 0.0, 1.0, 1.0], [1.0, 0.0, 0.0, 1.0]],
+                value_min=2.0,
+                value_max=1.0,
+            )
+
+        assert "The minimum value should be smaller than the maximum value." in str(
+            error.value
+        )
+
+
+class TestRegularGridOptions:
+    def test_is_subsampled_with_defaults_returns_false(self):
+        assert not RegularGridOptions().is_subsampled
+
+    def test_is_subsampled_with_stride_returns_true(self):
+        assert RegularGridOptions(row_stride=2).is_subsampled
+
+    def test_construction_with_invalid_stride_raises_error(self):
+        with pytest.raises(ValidationError) as error:
+            RegularGridOptions(column_stride=0)
+
+        assert "Value must be larger than 0" in str(error.value)
+
+    def test_construction_with_invalid_window_raises_error(self):
+        with pytest.raises(ValidationError) as error:
+            RegularGridOptions(row_index_start=5, row_index_end=4)
+
+        assert "The row index end should be larger than or equal to the row index start." in str(
+            error.value
+        )
+
+
+class TestSpatialSubset:
+    def test_geometry_with_bbox(self):
+        subset = SpatialSubset(bbox=[0.0, 1.0, 2.0, 3.0])
+
+        assert subset.geometry.bounds == (0.0, 1.0, 2.0, 3.0)
+
+    def test_geometry_with_wkt_polygon(self):
+        subset = SpatialSubset(polygon="POLYGON ((0 0, 2 0, 0 2, 0 0))")
+
+        assert subset.geometry.area == 2.0
+
+    def test_construction_with_invalid_bbox_raises_error(self):
+        with pytest.raises(ValidationError) as error:
+            SpatialSubset(bbox=[2.0, 1.0, 0.0, 3.0])
+
+        assert "The minimum coordinates of a bounding box should be smaller than the maximum coordinates." in str(
+            error.value
+        )
+
+    def test_construction_with_invalid_polygon_raises_error(self):
+        with pytest.raises(ValidationError) as error:
+            SpatialSubset(polygon="POLYGON ((0 0, 2 0")
+
+        assert "Geometry is not valid WKT" in str(error.value)
+
+    def test_construction_with_multiple_areas_raises_error(self):
+        with pytest.raises(ValidationError) as error:
+            SpatialSubset(bbox=[0.0, 1.0, 2.0, 3.0], polygon="POLYGON ((0 0, 2 0, 0 2, 0 0))")
+
+        assert "Exactly one of 'bbox', 'polygon' and 'polygon_file' should be specified." in str(
+            error.value
+        )
+
+
+class TestSegmentation:
+    def test_construction_with_non_positive_duration_raises_error(self):
+        with pytest.raises(ValidationError) as error:
+            Segmentation(duration=0.0)
+
+        assert "Value must be larger than 0.0" in str(error.value)
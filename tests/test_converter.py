@@ -1,8 +1,12 @@
+import json
 from pathlib import Path
 
 import pytest
+import xarray as xr
+from pygltflib import GLTF2
 
 from netcdf_to_gltf_converter.converter import Converter
+from netcdf_to_gltf_converter.utils.events import EventType
 from tests.utils import assert_files_equal, dhydro_resources, reference_files
 
 
@@ -48,3 +52,134 @@ class TestConverter:
         converter.run()
 
         assert_files_equal(gltf, reference_gltf)   
+
+    def test_run_dhydro_append_appends_new_time_steps(self, tmp_path):
+        netcdf = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+        config = dhydro_resources / "config.json"
+        partial_netcdf = tmp_path / "partial_map.nc"
+        with xr.open_dataset(netcdf) as dataset:
+            dataset.isel(time=slice(0, 3)).to_netcdf(partial_netcdf)
+
+        gltf = tmp_path / "appended.glb"
+        Converter(partial_netcdf, gltf, config, append=True).run()
+        assert len(GLTF2.load(gltf).meshes[0].weights) == 2
+
+        Converter(netcdf, gltf, config, append=True).run()
+        complete_gltf = tmp_path / "complete.glb"
+        Converter(netcdf, complete_gltf, config).run()
+
+        appended = GLTF2.load(gltf)
+        complete = GLTF2.load(complete_gltf)
+        assert [mesh.weights for mesh in appended.meshes] == [mesh.weights for mesh in complete.meshes]
+        state = json.loads((tmp_path / "appended.glb.state.json").read_text())
+        assert state["variables"]["Mesh2d_waterdepth"]["time_index_last"] == 4
+
+        # Without new time steps, the glTF file is not rewritten
+        modified_time = gltf.stat().st_mtime_ns
+        Converter(netcdf, gltf, config, append=True).run()
+        assert gltf.stat().st_mtime_ns == modified_time
+
+    def test_run_dhydro_without_append_removes_state_of_previous_conversion(self, tmp_path):
+        netcdf = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+        config = dhydro_resources / "config.json"
+        partial_netcdf = tmp_path / "partial_map.nc"
+        with xr.open_dataset(netcdf) as dataset:
+            dataset.isel(time=slice(0, 3)).to_netcdf(partial_netcdf)
+
+        gltf = tmp_path / "appended.glb"
+        Converter(netcdf, gltf, config, append=True).run()
+        Converter(partial_netcdf, gltf, config).run()
+
+        assert not (tmp_path / "appended.glb.state.json").exists()
+
+        # The next append converts all time steps, instead of none according to the stale state
+        Converter(netcdf, gltf, config, append=True).run()
+        assert len(GLTF2.load(gltf).meshes[0].weights) == 4
+
+    def test_run_dhydro_append_with_other_config_raises_error(self, tmp_path):
+        netcdf = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+        config = dhydro_resources / "config.json"
+        other_config = tmp_path / "config.json"
+        other_config.write_text(config.read_text().replace('"scale_vertical": 0.5', '"scale_vertical": 1.0'))
+
+        gltf = tmp_path / "appended.glb"
+        Converter(netcdf, gltf, config, append=True).run()
+
+        converter = Converter(netcdf, gltf, other_config, append=True)
+        with pytest.raises(ValueError) as error:
+            converter.run()
+
+        assert str(error.value).startswith("The configuration file differs from the configuration of the previous conversion")
+
+    def test_run_dhydro_with_segmentation_writes_segments(self, tmp_path):
+        netcdf = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+        config = tmp_path / "config.json"
+        config_content = json.loads((dhydro_resources / "config.json").read_text())
+        config_content["segmentation"] = {"duration": 43200.0, "shared_geometry": True, "n_workers": 1}
+        config.write_text(json.dumps(config_content))
+
+        gltf = tmp_path / "segmented.glb"
+        Converter(netcdf, gltf, config).run()
+
+        manifest = json.loads((tmp_path / "segmented_segments.json").read_text())
+        assert [segment["time_index_start"] for segment in manifest["segments"]] == [1, 3]
+        assert [segment["n_frames"] for segment in manifest["segments"]] == [2, 2]
+        assert (tmp_path / manifest["base"]).is_file()
+        for segment in manifest["segments"]:
+            segment_gltf = GLTF2.load(tmp_path / segment["uri"])
+            assert len(segment_gltf.meshes[0].weights) == 2
+
+    def test_run_dhydro_with_profile_writes_profile_next_to_log_file(self, tmp_path):
+        netcdf = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+        config = dhydro_resources / "config.json"
+
+        gltf = tmp_path / "profiled.glb"
+        Converter(netcdf, gltf, config, profile=True).run()
+
+        log_file = next(tmp_path.glob("gltf_converter_*_profiled.log"))
+        profile = json.loads(log_file.with_suffix(".profile.json").read_text())
+        assert profile["gltf"] == str(gltf)
+        assert [stage["name"] for stage in profile["stages"]] == [
+            "import/open",
+            "import/read_grid",
+            "import/transform",
+            "import/triangulate",
+            "import/interpolate:Mesh2d_waterdepth",
+            "import",
+            "build",
+            "finish",
+            "export",
+        ]
+        assert profile["output_bytes"] == gltf.stat().st_size
+        assert set(profile["accessor_bytes"]) >= {"indices", "positions", "morph_targets", "animation_input", "animation_output"}
+
+    def test_run_dhydro_with_metrics_file_writes_metrics(self, tmp_path):
+        netcdf = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+        config = dhydro_resources / "config.json"
+        metrics_file = tmp_path / "conversion.prom"
+
+        gltf = tmp_path / "converted.glb"
+        converter = Converter(netcdf, gltf, config, metrics_file=metrics_file)
+        progress = []
+        converter.events.add_listener(lambda event: progress.append(event.value) if event.type == EventType.PROGRESS else None)
+        converter.run()
+
+        assert progress == [1, 2, 3, 4]
+        lines = metrics_file.read_text().splitlines()
+        assert 'gltf_converter_frames_done{gltf="converted.glb",variable="Mesh2d_waterdepth"} 4' in lines
+        assert f'gltf_converter_written_bytes_total{{gltf="converted.glb"}} {gltf.stat().st_size}' in lines
+        assert 'gltf_converter_stage_active{gltf="converted.glb",stage="export"} 0' in lines
+
+    def test_estimate_dhydro_does_not_write_gltf(self, tmp_path):
+        netcdf = dhydro_resources / "3x3nodes_rectilinear_map.nc"
+        config = dhydro_resources / "config.json"
+
+        gltf = tmp_path / "converted.glb"
+        converter = Converter(netcdf, gltf, config)
+        estimate = converter.estimate(memory_budget=1)
+
+        assert not gltf.exists()
+        assert estimate.n_vertices == 9
+        assert estimate.n_triangles == 8
+        assert [mesh.n_frames for mesh in estimate.meshes] == [4, 0]
+        assert not estimate.fits_in_budget
@@ -0,0 +1,69 @@
+from typing import List
+
+import pytest
+
+from netcdf_to_gltf_converter.gltf.builder import (ACCESSOR_CACHE_NAME,
+                                                   GLTFBuilder)
+from netcdf_to_gltf_converter.utils.events import (Event, EventEmitter,
+                                                   EventType)
+from tests.gltf.test_builder import create_triangular_mesh
+
+
+class TestEventEmitter:
+    def test_emit_calls_listeners(self):
+        events = EventEmitter()
+        received: List[Event] = []
+        events.add_listener(received.append)
+
+        events.emit(EventType.PROGRESS, "Mesh2d_waterdepth", 2, 10)
+
+        assert len(received) == 1
+        assert received[0].type == EventType.PROGRESS
+        assert received[0].name == "Mesh2d_waterdepth"
+        assert (received[0].value, received[0].total) == (2, 10)
+
+    def test_emit_after_removing_listener_does_not_call_listener(self):
+        events = EventEmitter()
+        received: List[Event] = []
+        events.add_listener(received.append)
+        events.remove_listener(received.append)
+
+        events.emit(EventType.CACHE_HIT, "accessors")
+
+        assert not events.has_listeners
+        assert received == []
+
+    def test_stage_emits_start_and_end_of_nested_stages(self):
+        events = EventEmitter()
+        received: List[Event] = []
+        events.add_listener(received.append)
+
+        with pytest.raises(ValueError):
+            with events.stage("import"):
+                with events.stage("transform"):
+                    raise ValueError("error")
+
+        assert [(event.type, event.name) for event in received] == [
+            (EventType.STAGE_START, "import"),
+            (EventType.STAGE_START, "import/transform"),
+            (EventType.STAGE_END, "import/transform"),
+            (EventType.STAGE_END, "import"),
+        ]
+        assert received[2].value <= received[3].value
+
+
+class TestGLTFBuilderEvents:
+    def test_add_triangular_mesh_emits_accessor_cache_events(self):
+        events = EventEmitter()
+        received: List[Event] = []
+        events.add_listener(received.append)
+        builder = GLTFBuilder(events=events)
+
+        # The second mesh shares all accessors with the first mesh
+        builder.add_triangular_mesh(create_triangular_mesh(n_vertix_cols=3, n_frames=2))
+        n_misses = len(received)
+        builder.add_triangular_mesh(create_triangular_mesh(n_vertix_cols=3, n_frames=2))
+
+        assert n_misses > 0
+        assert all(event.type == EventType.CACHE_MISS for event in received[:n_misses])
+        assert {(event.type, event.name) for event in received[n_misses:]} >= {(EventType.CACHE_HIT, ACCESSOR_CACHE_NAME)}
@@ -0,0 +1,53 @@
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from netcdf_to_gltf_converter.utils.images import PNG_SIGNATURE, encode_png
+
+
+def decode_png(png: bytes):
+    assert png[:8] == PNG_SIGNATURE
+
+    chunks = {}
+    offset = 8
+    while offset < len(png):
+        (length,) = struct.unpack(">I", png[offset : offset + 4])
+        chunk_type = png[offset + 4 : offset + 8]
+        data = png[offset + 8 : offset + 8 + length]
+        (checksum,) = struct.unpack(">I", png[offset + 8 + length : offset + 12 + length])
+        assert checksum == zlib.crc32(chunk_type + data)
+        chunks[chunk_type] = data
+        offset += 12 + length
+
+    width, height, bit_depth, color_type = struct.unpack(">IIBB", chunks[b"IHDR"][:10])
+    dtype = np.dtype(">u1") if bit_depth == 8 else np.dtype(">u2")
+    scanlines = np.frombuffer(zlib.decompress(chunks[b"IDAT"]), dtype=np.uint8)
+    scanlines = scanlines.reshape(height, -1)
+    assert (scanlines[:, 0] == 0).all()
+
+    pixels = scanlines[:, 1:].copy().view(dtype).reshape(height, width, 4)
+    return pixels, bit_depth, color_type
+
+
+@pytest.mark.parametrize("dtype, exp_bit_depth", [(np.uint8, 8), (np.uint16, 16)])
+def test_encode_png_returns_decodable_rgba_image(dtype, exp_bit_depth):
+    pixels = np.arange(2 * 3 * 4, dtype=dtype).reshape(2, 3, 4) * 7
+
+    png = encode_png(pixels)
+
+    decoded_pixels, bit_depth, color_type = decode_png(png)
+    assert bit_depth == exp_bit_depth
+    assert color_type == 6
+    assert np.array_equal(decoded_pixels, pixels)
+
+
+def test_encode_png_with_unsupported_shape_raises_value_error():
+    with pytest.raises(ValueError):
+        encode_png(np.zeros((2, 3), dtype=np.uint8))
+
+
+def test_encode_png_with_unsupported_dtype_raises_value_error():
+    with pytest.raises(ValueError):
+        encode_png(np.zeros((2, 3, 4), dtype=np.float32))
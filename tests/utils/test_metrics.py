@@ -0,0 +1,32 @@
+from netcdf_to_gltf_converter.utils.events import EventEmitter, EventType
+from netcdf_to_gltf_converter.utils.metrics import MetricsExporter
+
+
+class TestMetricsExporter:
+    def test_on_event_writes_metrics_at_end_of_stage(self, tmp_path):
+        file_path = tmp_path / "conversion.prom"
+        exporter = MetricsExporter(file_path, {"gltf": 'model "a".glb'}, write_interval=3600.0)
+        events = EventEmitter()
+        events.add_listener(exporter.on_event)
+
+        with events.stage("import"):
+            events.emit(EventType.PROGRESS, "Mesh2d_waterdepth", 3, 4)
+            events.emit(EventType.CACHE_HIT, "reprojection")
+            events.emit(EventType.CACHE_HIT, "reprojection")
+        events.emit(EventType.BYTES_WRITTEN, "model.glb", 2048)
+
+        lines = file_path.read_text().splitlines()
+        assert "# TYPE gltf_converter_stage_active gauge" in lines
+        assert 'gltf_converter_stage_active{gltf="model \\"a\\".glb",stage="import"} 0' in lines
+        assert 'gltf_converter_frames_done{gltf="model \\"a\\".glb",variable="Mesh2d_waterdepth"} 3' in lines
+        assert 'gltf_converter_frames{gltf="model \\"a\\".glb",variable="Mesh2d_waterdepth"} 4' in lines
+        assert 'gltf_converter_cache_hits_total{gltf="model \\"a\\".glb",cache="reprojection"} 2' in lines
+        # The bytes written after the stage ended are written with the next write
+        assert not any(line.startswith("gltf_converter_written_bytes_total") for line in lines)
+
+        exporter.write()
+
+        lines = file_path.read_text().splitlines()
+        assert "# TYPE gltf_converter_written_bytes_total counter" in lines
+        assert 'gltf_converter_written_bytes_total{gltf="model \\"a\\".glb"} 2048' in lines
+        assert list(tmp_path.iterdir()) == [file_path]
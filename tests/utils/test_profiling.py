@@ -0,0 +1,108 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from netcdf_to_gltf_converter.gltf.builder import GLTFBuilder
+from netcdf_to_gltf_converter.utils.events import EventEmitter, EventType
+from netcdf_to_gltf_converter.utils import profiling
+from netcdf_to_gltf_converter.utils.profiling import (Profiler,
+                                                      get_accessor_bytes,
+                                                      get_available_memory)
+from tests.gltf.test_builder import create_triangular_mesh
+
+
+class TestProfiler:
+    def test_on_event_records_nested_stages(self):
+        profiler = Profiler()
+        events = EventEmitter()
+        events.add_listener(profiler.on_event)
+
+        with events.stage("import"):
+            with events.stage("open"):
+                pass
+            with events.stage("transform"):
+                pass
+        with events.stage("export"):
+            pass
+
+        assert [stage.name for stage in profiler.stages] == ["import/open", "import/transform", "import", "export"]
+        import_stage = profiler.stages[2]
+        assert import_stage.wall_time >= profiler.stages[0].wall_time + profiler.stages[1].wall_time
+        assert import_stage.traced_peak is None
+
+    def test_stage_with_trace_memory_records_peak_of_nested_stages(self):
+        profiler = Profiler(trace_memory=True)
+        events = EventEmitter()
+        events.add_listener(profiler.on_event)
+
+        with events.stage("import"):
+            with events.stage("allocate"):
+                data = np.ones(1_000_000)
+                del data
+
+        allocate_stage, import_stage = profiler.stages
+        assert allocate_stage.traced_peak >= 8_000_000
+        assert import_stage.traced_peak >= allocate_stage.traced_peak
+
+    def test_on_event_records_stage_that_raises_error(self):
+        profiler = Profiler()
+        events = EventEmitter()
+        events.add_listener(profiler.on_event)
+
+        with pytest.raises(ValueError):
+            with events.stage("import"):
+                raise ValueError("error")
+
+        assert [stage.name for stage in profiler.stages] == ["import"]
+
+    def test_on_event_counts_bytes_written(self):
+        profiler = Profiler()
+        events = EventEmitter()
+        events.add_listener(profiler.on_event)
+
+        events.emit(EventType.BYTES_WRITTEN, "model_tile0.glb", 100)
+        events.emit(EventType.BYTES_WRITTEN, "model_tile1.glb", 50)
+
+        assert profiler.to_dict()["output_bytes"] == 150
+
+    def test_to_file(self, tmp_path):
+        profiler = Profiler()
+        events = EventEmitter()
+        events.add_listener(profiler.on_event)
+        with events.stage("import"):
+            pass
+        file_path = tmp_path / "profile.json"
+
+        profiler.to_file(file_path, netcdf="model_map.nc")
+
+        profile = json.loads(file_path.read_text())
+        assert profile["netcdf"] == "model_map.nc"
+        assert profile["wall_time"] == profile["stages"][0]["wall_time"]
+        assert set(profile["stages"][0]) == {"name", "wall_time", "cpu_time", "rss", "peak_rss", "traced_peak"}
+
+
+def test_get_available_memory_reads_available_memory_from_meminfo(monkeypatch):
+    meminfo = "MemTotal:       16000000 kB\nMemFree:         1000000 kB\nMemAvailable:    6000000 kB\n"
+    monkeypatch.setattr(profiling, "open", lambda path: io.StringIO(meminfo), raising=False)
+
+    assert get_available_memory() == 6000000 * 1024
+
+
+class TestGetAccessorBytes:
+    def test_get_accessor_bytes(self):
+        triangular_mesh = create_triangular_mesh(n_vertix_cols=3, n_frames=2)
+        builder = GLTFBuilder()
+        builder.add_triangular_mesh(triangular_mesh)
+        gltf = builder.finish()
+
+        accessor_bytes = get_accessor_bytes(gltf)
+
+        n_vertices = len(triangular_mesh.base.vertex_positions)
+        assert accessor_bytes["positions"] == n_vertices * 3 * 4
+        assert accessor_bytes["morph_targets"] == 2 * n_vertices * 3 * 4
+        # The indices of a mesh with fewer than 256 vertices are stored as unsigned bytes
+        assert accessor_bytes["indices"] == triangular_mesh.triangles.size
+        assert accessor_bytes["animation_input"] == 2 * 4
+        assert accessor_bytes["animation_output"] == 2 * 2 * 4
@@ -11,3 +11,15 @@ def test_inclusive_range_with_stop_value_not_included_in_step_increments():
     result = inclusive_range(3, 21, 5)
     expected = [3, 8, 13, 18, 21]
     assert result == expected
+
+
+def test_inclusive_range_with_start_equal_to_stop_value():
+    result = inclusive_range(3, 3, 1)
+    expected = [3]
+    assert result == expected
+
+
+def test_inclusive_range_with_start_after_stop_value():
+    result = inclusive_range(4, 3, 1)
+    expected = []
+    assert result == expected